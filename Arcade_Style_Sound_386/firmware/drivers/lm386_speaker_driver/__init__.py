@@ -8,7 +8,7 @@
 
 # ======================================== 导入相关模块 =========================================
 
-from .code.lm386_speaker import LMSpeaker
+# 导出接口在首次访问时才导入对应子模块，见 __getattr__
 
 # ======================================== 全局变量 ============================================
 
@@ -16,6 +16,15 @@ __all__ = ['LMSpeaker']
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问导出名称时才导入定义它的子模块，并缓存到包的命名空间中。"""
+    if name == "LMSpeaker":
+        from .code.lm386_speaker import LMSpeaker as value
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ===========================================
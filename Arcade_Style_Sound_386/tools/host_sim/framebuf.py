@@ -0,0 +1,197 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/10/27 下午2:30
+# @Author  : 李清水
+# @File    : framebuf.py
+# @Description : 主机模拟器中的 framebuf 模块替身，按 MicroPython 的像素格式读写缓冲区
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+# ======================================== 全局变量 ============================================
+
+MONO_VLSB = 0
+MONO_HLSB = 3
+MONO_HMSB = 4
+RGB565 = 1
+GS2_HMSB = 5
+GS4_HMSB = 2
+GS8 = 6
+
+MVLSB = MONO_VLSB
+
+# text() 的字符宽高，与 MicroPython 内置 8x8 字体一致
+_FONT_W = 8
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+
+class FrameBuffer:
+    """
+    帧缓冲区，像素布局与 MicroPython 的 framebuf 一致，驱动写入后的 buffer 可直接比对。
+
+    text() 不带字库，以字符外框代替字形，只用于观察布局与计时。
+
+    ==========================================
+
+    Frame buffer with the same pixel layout as MicroPython's framebuf, so buffers written by
+    drivers can be compared directly.
+
+    text() has no font; it draws a box per character, which is enough for layout and timing.
+    """
+
+    def __init__(self, buffer, width: int, height: int, format: int, stride: int | None = None) -> None:
+        self._buf = buffer
+        self.width = width
+        self.height = height
+        self.format = format
+        self.stride = width if stride is None else stride
+
+    # ---------- 像素读写 ----------
+
+    def _get(self, x: int, y: int) -> int:
+        buf, fmt, stride = self._buf, self.format, self.stride
+        if fmt == MONO_VLSB:
+            return (buf[(y >> 3) * stride + x] >> (y & 7)) & 1
+        if fmt == MONO_HLSB:
+            return (buf[(y * stride + x) >> 3] >> (7 - (x & 7))) & 1
+        if fmt == MONO_HMSB:
+            return (buf[(y * stride + x) >> 3] >> (x & 7)) & 1
+        if fmt == RGB565:
+            i = (y * stride + x) * 2
+            return buf[i] | (buf[i + 1] << 8)
+        if fmt == GS8:
+            return buf[y * stride + x]
+        if fmt == GS4_HMSB:
+            i = (y * stride + x) >> 1
+            return (buf[i] >> 4) & 0x0F if x & 1 == 0 else buf[i] & 0x0F
+        i = (y * stride + x) >> 2
+        return (buf[i] >> ((3 - (x & 3)) * 2)) & 0x03
+
+    def _set(self, x: int, y: int, c: int) -> None:
+        buf, fmt, stride = self._buf, self.format, self.stride
+        if fmt == MONO_VLSB:
+            i, bit = (y >> 3) * stride + x, 1 << (y & 7)
+        elif fmt == MONO_HLSB:
+            i, bit = (y * stride + x) >> 3, 0x80 >> (x & 7)
+        elif fmt == MONO_HMSB:
+            i, bit = (y * stride + x) >> 3, 1 << (x & 7)
+        elif fmt == RGB565:
+            i = (y * stride + x) * 2
+            buf[i] = c & 0xFF
+            buf[i + 1] = (c >> 8) & 0xFF
+            return
+        elif fmt == GS8:
+            buf[y * stride + x] = c & 0xFF
+            return
+        elif fmt == GS4_HMSB:
+            i = (y * stride + x) >> 1
+            if x & 1 == 0:
+                buf[i] = (buf[i] & 0x0F) | ((c & 0x0F) << 4)
+            else:
+                buf[i] = (buf[i] & 0xF0) | (c & 0x0F)
+            return
+        else:
+            i = (y * stride + x) >> 2
+            shift = (3 - (x & 3)) * 2
+            buf[i] = (buf[i] & ~(0x03 << shift)) | ((c & 0x03) << shift)
+            return
+        if c & 1:
+            buf[i] |= bit
+        else:
+            buf[i] &= ~bit
+
+    def pixel(self, x: int, y: int, c: int | None = None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        if c is None:
+            return self._get(x, y)
+        self._set(x, y, c)
+
+    # ---------- 绘图 ----------
+
+    def fill_rect(self, x: int, y: int, w: int, h: int, c: int) -> None:
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, self.width), min(y + h, self.height)
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                self._set(xx, yy, c)
+
+    def fill(self, c: int) -> None:
+        if self.format in (MONO_VLSB, MONO_HLSB, MONO_HMSB):
+            v = 0xFF if c & 1 else 0x00
+            self._buf[:] = bytes([v]) * len(self._buf)
+        else:
+            self.fill_rect(0, 0, self.width, self.height, c)
+
+    def hline(self, x: int, y: int, w: int, c: int) -> None:
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x: int, y: int, h: int, c: int) -> None:
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x: int, y: int, w: int, h: int, c: int, f: bool = False) -> None:
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.hline(x, y, w, c)
+        self.hline(x, y + h - 1, w, c)
+        self.vline(x, y, h, c)
+        self.vline(x + w - 1, y, h, c)
+
+    def line(self, x1: int, y1: int, x2: int, y2: int, c: int) -> None:
+        dx, dy = abs(x2 - x1), -abs(y2 - y1)
+        sx, sy = (1 if x1 < x2 else -1), (1 if y1 < y2 else -1)
+        err = dx + dy
+        while True:
+            self.pixel(x1, y1, c)
+            if x1 == x2 and y1 == y2:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+            if e2 <= dx:
+                err += dx
+                y1 += sy
+
+    def ellipse(self, x: int, y: int, xr: int, yr: int, c: int, f: bool = False, m: int = 0xF) -> None:
+        for yy in range(-yr, yr + 1):
+            for xx in range(-xr, xr + 1):
+                if xx * xx * yr * yr + yy * yy * xr * xr <= xr * xr * yr * yr:
+                    self.pixel(x + xx, y + yy, c)
+
+    def text(self, s: str, x: int, y: int, c: int = 1) -> None:
+        for ch in str(s):
+            if ch != " ":
+                self.rect(x + 1, y, _FONT_W - 2, _FONT_W - 1, c)
+            x += _FONT_W
+
+    def scroll(self, xstep: int, ystep: int) -> None:
+        w, h = self.width, self.height
+        snap = [[self._get(x, y) for x in range(w)] for y in range(h)]
+        for y in range(h):
+            for x in range(w):
+                sx, sy = x - xstep, y - ystep
+                if 0 <= sx < w and 0 <= sy < h:
+                    self._set(x, y, snap[sy][sx])
+
+    def blit(self, fbuf: "FrameBuffer", x: int, y: int, key: int = -1, palette: "FrameBuffer" = None) -> None:
+        for yy in range(fbuf.height):
+            for xx in range(fbuf.width):
+                c = fbuf._get(xx, yy)
+                if c == key:
+                    continue
+                if palette is not None:
+                    c = palette._get(c, 0)
+                self.pixel(x + xx, y + yy, c)
+
+
+def FrameBuffer1(buffer, width: int, height: int, stride: int | None = None) -> FrameBuffer:
+    return FrameBuffer(buffer, width, height, MONO_VLSB, stride)
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ============================================
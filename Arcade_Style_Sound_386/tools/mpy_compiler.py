@@ -9,16 +9,24 @@
 # ======================================== 导入相关模块 =========================================
 
 import os
+import re
 import sys
+import time
 import shutil
+import filecmp
+import hashlib
 import subprocess
 import argparse
 from pathlib import Path
 from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dependency_analyzer import DependencyAnalyzer
 
 # ======================================== 全局变量 ============================================
 
+# 生成的manifest.py首先包含端口自带的清单（rp2为asyncio等），再追加项目模块
+MANIFEST_INCLUDE = "$(PORT_DIR)/boards/manifest.py"
+
 # ======================================== 功能函数 ============================================
 
 # ======================================== 自定义类 ============================================
@@ -40,16 +48,32 @@ class MPYCompiler:
         dependency_analyzer (DependencyAnalyzer | None): 依赖分析器实例，用于扫描和解析文件依赖，初始为None。
         dependencies (dict[str, set[str]]): 存储文件依赖关系的字典，键为文件名（含路径），值为其依赖的文件名集合。
         compile_order (list[str]): 按依赖顺序排序的待编译文件列表，先编译被依赖文件。
+        jobs (int): 并行编译的文件数，1为串行编译。
+        timings (dict[str, float]): 每个文件的编译耗时（秒），键为文件名（含路径）。
+        cache_dir (Path | None): 编译缓存目录的绝对路径，默认为输出目录旁的mpy_cache，None表示不使用缓存。
+        cache_hits (set[str]): 本次编译中命中缓存的文件名集合。
+        tree_shake (bool): 是否只编译从main.py、boot.py可达的模块。
+        keep (tuple[str, ...]): 开启tree shaking时强制保留的module_id通配模式，如"drivers/*/code/*"。
+        excluded (list[str]): tree shaking排除的文件名列表（含路径）。
+        dep_cache (str | None): 依赖分析解析缓存文件的路径，None表示使用编译缓存目录下的dep_cache.json。
+        manifest (Path | None): 生成的冻结清单manifest.py的绝对路径，None表示不生成。
+        frozen (bool): 是否从输出目录中去掉已写入清单的包（模块改由固件镜像提供）。
+        frozen_files (list[str]): 写入清单的文件名列表（含路径）。
 
     Methods:
-        __init__(source_dir: str = "../firmware", output_dir: str = "../build/firmware_mpy", mpy_cross_opts: list[str] | None = None, verbose: bool = False) -> None: 初始化MPY编译器实例，验证源目录并准备输出目录。
+        __init__(source_dir: str = "../firmware", output_dir: str = "../build/firmware_mpy", mpy_cross_opts: list[str] | None = None, verbose: bool = False, jobs: int = 1, cache_dir: str | None = None, use_cache: bool = True, tree_shake: bool = False, keep: tuple[str, ...] = (), dep_cache: str | None = None, manifest: str | None = None, frozen: bool = False) -> None: 初始化MPY编译器实例，验证源目录并准备输出目录。
         _check_required_files() -> None: 内部方法，检查源目录是否包含boot.py、main.py等必要文件。
         analyze_dependencies() -> None: 分析源目录中Python文件的内部依赖关系，生成依赖数据。
         _extract_dependencies() -> None: 内部方法，从dependency_analyzer中提取并格式化依赖关系到dependencies属性。
+        _shake_dependencies() -> None: 内部方法，从dependencies中去掉main.py、boot.py不可达的文件并输出排除报告。
+        _freeze_dependencies() -> None: 内部方法，把可达的包内模块写入manifest.py，frozen时从dependencies中去掉这些包。
+        _frozen_opt() -> int | None: 内部方法，从编译选项中取出-O优化级别，写入清单的opt参数。
         determine_compile_order() -> None: 基于依赖关系进行拓扑排序，确定最终的文件编译顺序，处理循环依赖。
-        compile_files() -> None: 按compile_order编译所有文件，清空输出目录、复制目录结构并统计编译结果。
+        compile_files() -> None: 按compile_order编译所有文件（jobs大于1时并行编译），清空输出目录、复制目录结构并统计编译结果与耗时。
         _copy_directory_structure() -> None: 内部方法，复制源目录的目录结构到输出目录（不复制文件）。
-        _compile_single_file(file_path: str) -> None: 内部方法，调用mpy-cross工具编译单个Python文件为mpy文件。
+        _compile_single_file(file_path: str) -> float: 内部方法，调用mpy-cross工具编译单个Python文件为mpy文件（命中缓存时直接取缓存），返回耗时。
+        _cache_key(source_file: Path) -> str: 内部方法，由源文件内容、mpy-cross版本与编译选项计算缓存键。
+        _prune_output(expected: set[Path]) -> None: 内部方法，删除输出目录中不再对应任何源文件的过期文件与目录。
         run() -> None: 执行完整编译流程：依赖分析→确定顺序→编译文件，捕获并处理流程中的异常。
 
     Notes:
@@ -57,6 +81,14 @@ class MPYCompiler:
         2. 初始化时会自动创建输出目录（若不存在），编译前会清空输出目录中的现有内容。
         3. 若检测到循环依赖，会将未通过拓扑排序的文件追加到编译顺序末尾，并输出警告（verbose模式下）。
         4. 编译结果会输出成功/失败数量及失败文件详情，最终显示输出目录路径。
+        5. 每个文件由独立的mpy-cross进程编译，互不依赖，因此并行编译时各文件的完成顺序不固定；结果摘要仍按编译顺序列出失败文件。
+        6. 编译缓存以源文件内容、相对路径、mpy-cross版本与编译选项的SHA-256为键；命中时以硬链接（不支持时复制）取出缓存的mpy文件，
+           输出目录中内容未变的文件保持不动，只删除过期文件，而不是每次清空输出目录。
+        7. 开启tree shaking时只编译从main.py、boot.py沿导入关系可达的模块（含其父包的__init__.py），不可达模块不会出现在输出目录中，
+           因此也不会被上传到设备；只通过__import__等方式动态导入的模块需用keep保留。
+        8. 生成的manifest.py以module()逐个列出main.py、boot.py可达的包内模块（drivers、libs、tasks等目录下，含keep匹配的模块），
+           main.py、boot.py与顶层模块（conf.py、board.py）仍放在文件系统中，便于修改配置。设备的sys.path中""先于".frozen"，
+           文件系统上同名的包目录会遮蔽冻结的包，因此frozen时这些顶层包目录下的文件全部不再输出。
 
     ==========================================
 
@@ -76,16 +108,32 @@ class MPYCompiler:
         dependency_analyzer (DependencyAnalyzer | None): Instance of the dependency analyzer, used to scan and parse file dependencies, initially None.
         dependencies (dict[str, set[str]]): Dictionary storing file dependency relationships, with keys as filenames (including paths) and values as sets of dependent filenames.
         compile_order (list[str]): List of files to be compiled sorted by dependency order, with dependent files compiled first.
+        jobs (int): Number of files compiled in parallel, 1 for serial compilation.
+        timings (dict[str, float]): Compile time of each file in seconds, keyed by filename (including path).
+        cache_dir (Path | None): Absolute path of the build cache directory, mpy_cache next to the output directory by default, None when caching is disabled.
+        cache_hits (set[str]): Filenames served from the cache in this build.
+        tree_shake (bool): Whether to compile only the modules reachable from main.py and boot.py.
+        keep (tuple[str, ...]): fnmatch patterns of module_ids always kept when tree shaking, such as "drivers/*/code/*".
+        excluded (list[str]): Filenames (including paths) excluded by tree shaking.
+        dep_cache (str | None): Path of the dependency parse cache file, None for dep_cache.json in the build cache directory.
+        manifest (Path | None): Absolute path of the generated freeze manifest manifest.py, None to skip it.
+        frozen (bool): Whether to leave the packages listed in the manifest out of the output directory (the firmware image provides them).
+        frozen_files (list[str]): Filenames (including paths) written to the manifest.
 
     Methods:
-        __init__(source_dir: str = "../firmware", output_dir: str = "../build/firmware_mpy", mpy_cross_opts: list[str] | None = None, verbose: bool = False) -> None: Initialize the MPY compiler instance, verify the source directory and prepare the output directory.
+        __init__(source_dir: str = "../firmware", output_dir: str = "../build/firmware_mpy", mpy_cross_opts: list[str] | None = None, verbose: bool = False, jobs: int = 1, cache_dir: str | None = None, use_cache: bool = True, tree_shake: bool = False, keep: tuple[str, ...] = (), dep_cache: str | None = None, manifest: str | None = None, frozen: bool = False) -> None: Initialize the MPY compiler instance, verify the source directory and prepare the output directory.
         _check_required_files() -> None: Internal method to check if the source directory contains necessary files like boot.py and main.py.
         analyze_dependencies() -> None: Analyze internal dependencies of Python files in the source directory and generate dependency data.
         _extract_dependencies() -> None: Internal method to extract and format dependency relationships from dependency_analyzer into the dependencies attribute.
+        _shake_dependencies() -> None: Internal method to drop files unreachable from main.py and boot.py from dependencies and print an exclusion report.
+        _freeze_dependencies() -> None: Internal method to write the reachable package modules to manifest.py and, when frozen, drop those packages from dependencies.
+        _frozen_opt() -> int | None: Internal method to take the -O optimization level from the compile options for the opt argument of the manifest.
         determine_compile_order() -> None: Perform topological sorting based on dependencies to determine the final file compilation order and handle circular dependencies.
-        compile_files() -> None: Compile all files in compile_order, clear the output directory, copy the directory structure, and count compilation results.
+        compile_files() -> None: Compile all files in compile_order (in parallel when jobs is greater than 1), clear the output directory, copy the directory structure, and count compilation results and times.
         _copy_directory_structure() -> None: Internal method to copy the directory structure of the source directory to the output directory (without copying files).
-        _compile_single_file(file_path: str) -> None: Internal method to invoke the mpy-cross tool to compile a single Python file into an mpy file.
+        _compile_single_file(file_path: str) -> float: Internal method to invoke the mpy-cross tool to compile a single Python file into an mpy file (or take it from the cache on a hit) and return the elapsed time.
+        _cache_key(source_file: Path) -> str: Internal method to compute the cache key from the source content, the mpy-cross version and the compile options.
+        _prune_output(expected: set[Path]) -> None: Internal method to delete stale files and directories in the output directory that no longer match any source file.
         run() -> None: Execute the complete compilation process: dependency analysis → order determination → file compilation, catch and handle exceptions in the process.
 
     Notes:
@@ -93,6 +141,17 @@ class MPYCompiler:
         2. The output directory is automatically created during initialization (if it does not exist), and existing content in the output directory is cleared before compilation.
         3. If circular dependencies are detected, files that fail topological sorting will be appended to the end of the compilation order, and a warning will be output (in verbose mode).
         4. The compilation results will output the number of successful/failed compilations and details of failed files, and finally display the output directory path.
+        5. Each file is compiled by its own mpy-cross process independently of the others, so files finish in no fixed order when compiling in parallel; the summary still lists failed files in compile order.
+        6. The build cache is keyed by the SHA-256 of the source content, the relative path, the mpy-cross version and the compile options; on a hit the cached mpy file is
+           hardlinked (or copied where links are unsupported). Unchanged files in the output directory are left in place and only stale entries are
+           deleted, instead of clearing the output directory on every build.
+        7. With tree shaking enabled only the modules reachable from main.py and boot.py through imports (plus the __init__.py of their parent
+           packages) are compiled; unreachable modules are left out of the output directory and therefore never uploaded to the device. Modules
+           that are only imported dynamically, e.g. through __import__, must be kept with keep.
+        8. The generated manifest.py lists the package modules reachable from main.py and boot.py (under drivers, libs, tasks and so on,
+           including modules matched by keep) one module() call each; main.py, boot.py and the top-level modules (conf.py, board.py) stay on
+           the filesystem so the configuration remains editable. "" precedes ".frozen" in sys.path on the device, so a package directory of the
+           same name on the filesystem would shadow the frozen package; when frozen, nothing under those top-level package directories is output.
     """
 
     def __init__(
@@ -101,6 +160,14 @@ class MPYCompiler:
         output_dir: str = "../build/firmware_mpy",
         mpy_cross_opts: list[str] | None = None,
         verbose: bool = False,
+        jobs: int = 1,
+        cache_dir: str | None = None,
+        use_cache: bool = True,
+        tree_shake: bool = False,
+        keep: tuple[str, ...] = (),
+        dep_cache: str | None = None,
+        manifest: str | None = None,
+        frozen: bool = False,
     ):
         """
         初始化MPY编译器实例，完成路径规范化、输出目录创建及必要校验。
@@ -110,9 +177,19 @@ class MPYCompiler:
             output_dir: 编译后mpy文件输出目录的路径字符串，默认为"../build/firmware_mpy"。
             mpy_cross_opts: 传递给mpy-cross工具的编译选项列表，为None时初始化为空列表。
             verbose: 是否开启详细日志输出，True显示详细信息，False仅显示关键信息。
+            jobs: 并行编译的文件数，默认为1（串行编译），小于1时使用CPU核心数。
+            cache_dir: 编译缓存目录的路径字符串，为None时使用输出目录旁的mpy_cache目录。
+            use_cache: 是否使用编译缓存，False时每次都调用mpy-cross编译。
+            tree_shake: 是否只编译从main.py、boot.py可达的模块，默认为False（编译全部文件）。
+            keep: 开启tree shaking时强制保留的module_id通配模式。
+            dep_cache: 依赖分析解析缓存文件的路径字符串，为None时使用编译缓存目录下的dep_cache.json；
+                多个项目共用同一编译缓存目录时应分别指定，避免并行构建时互相覆盖。
+            manifest: 冻结清单manifest.py的输出路径字符串，为None时不生成。
+            frozen: 是否从输出目录中去掉写入清单的包，需配合manifest使用，默认为False。
 
         Raises:
             FileNotFoundError: 若指定的源目录不存在，或源目录缺少必要文件。
+            ValueError: 指定了frozen但未指定manifest。
 
         ==========================================
 
@@ -123,9 +200,19 @@ class MPYCompiler:
             output_dir: Path string of the output directory for compiled mpy files, default is "../build/firmware_mpy".
             mpy_cross_opts: List of compilation options passed to the mpy-cross tool, initialized as an empty list if None.
             verbose: Whether to enable verbose log output, True for detailed information, False for only key information.
+            jobs: Number of files compiled in parallel, default is 1 (serial), the CPU count is used when less than 1.
+            cache_dir: Path string of the build cache directory, mpy_cache next to the output directory when None.
+            use_cache: Whether to use the build cache; when False mpy-cross is invoked for every file.
+            tree_shake: Whether to compile only the modules reachable from main.py and boot.py, default is False (compile every file).
+            keep: fnmatch patterns of module_ids always kept when tree shaking.
+            dep_cache: Path string of the dependency parse cache file, dep_cache.json in the build cache directory when None;
+                set it per project when several projects share one build cache directory, so parallel builds do not overwrite each other.
+            manifest: Output path string of the freeze manifest manifest.py, not generated when None.
+            frozen: Whether to leave the packages written to the manifest out of the output directory, requires manifest, default is False.
 
         Raises:
             FileNotFoundError: If the specified source directory does not exist, or the source directory lacks necessary files.
+            ValueError: frozen is set without manifest.
         """
         # 规范化路径
         self.source_dir = Path(source_dir).resolve()
@@ -137,11 +224,35 @@ class MPYCompiler:
         # 初始化编译选项
         self.mpy_cross_opts = mpy_cross_opts if mpy_cross_opts else []
         self.verbose = verbose
+        # 并行编译数，小于1时使用CPU核心数
+        self.jobs = jobs if jobs >= 1 else (os.cpu_count() or 1)
 
         # 存储依赖分析结果
         self.dependency_analyzer = None
         self.dependencies = {}  # {文件名: 依赖文件列表}
         self.compile_order = []  # 编译顺序列表
+        self.timings = {}  # {文件名: 编译耗时（秒）}
+
+        # 编译缓存：放在输出目录之外，避免被上传到设备
+        if use_cache:
+            self.cache_dir = Path(cache_dir).resolve() if cache_dir else self.output_dir.parent / "mpy_cache"
+        else:
+            self.cache_dir = None
+        self.cache_hits = set()
+        self._cache_salt = None  # mpy-cross版本与编译选项，首次计算缓存键时获取
+
+        # tree shaking：只编译入口可达的模块
+        self.tree_shake = tree_shake
+        self.keep = tuple(keep)
+        self.excluded = []
+        self.dep_cache = dep_cache
+
+        # 冻结清单：可达的包内模块改由固件镜像提供
+        if frozen and not manifest:
+            raise ValueError("frozen需要同时指定manifest")
+        self.manifest = Path(manifest).resolve() if manifest else None
+        self.frozen = frozen
+        self.frozen_files = []
 
         # 检查源目录是否存在
         if not self.source_dir.exists():
@@ -205,10 +316,14 @@ class MPYCompiler:
             print(f"开始分析依赖关系，源目录: {self.source_dir}")
 
         # 使用依赖分析器获取依赖关系
+        # 解析缓存与编译缓存放在同一目录，--no-cache时一并关闭
         self.dependency_analyzer = DependencyAnalyzer(
             root=str(self.source_dir),
             out_md=str(self.output_dir.parent / "dependencies.md"),
             verbose=self.verbose,
+            cache_path=self.dep_cache or (str(self.cache_dir / "dep_cache.json") if self.cache_dir else None),
+            use_cache=self.cache_dir is not None,
+            jobs=self.jobs,
         )
 
         # 运行完整的依赖分析流程
@@ -220,6 +335,10 @@ class MPYCompiler:
 
         # 提取依赖关系
         self._extract_dependencies()
+        if self.tree_shake:
+            self._shake_dependencies()
+        if self.manifest:
+            self._freeze_dependencies()
 
         if self.verbose:
             print(f"依赖分析完成，共分析 {len(self.dependencies)} 个文件")
@@ -256,6 +375,102 @@ class MPYCompiler:
 
             self.dependencies[file_path] = internal_deps
 
+    def _shake_dependencies(self) -> None:
+        """
+        内部方法：从dependencies中去掉main.py、boot.py不可达的文件，并输出排除报告。
+
+        可达集合由DependencyAnalyzer.reachable_modules()计算（入口为main与boot，包含main对drivers、libs、tasks
+        包__init__的强制依赖及各级父包的__init__），keep中的通配模式作为额外入口。被排除的文件记录在excluded属性中，
+        报告列出每个文件及源码总字节数。
+
+        ==========================================
+
+        Internal method: Drop files unreachable from main.py and boot.py from dependencies and print an exclusion report.
+
+        The reachable set comes from DependencyAnalyzer.reachable_modules() (entries main and boot, including main's forced dependencies on
+        the drivers, libs and tasks package __init__ files and the __init__ of every parent package), with the patterns in keep as extra entries.
+        Excluded files are recorded in the excluded attribute, and the report lists each file and the total source bytes.
+        """
+        reachable = self.dependency_analyzer.reachable_modules(keep=self.keep)
+        reachable_files = {module_id.replace("/", os.sep) + ".py" for module_id in reachable}
+
+        self.excluded = sorted(f for f in self.dependencies if f not in reachable_files)
+        self.dependencies = {
+            file: {dep for dep in deps if dep in reachable_files}
+            for file, deps in self.dependencies.items()
+            if file in reachable_files
+        }
+
+        total_bytes = sum((self.source_dir / f).stat().st_size for f in self.excluded)
+        print(f"tree shaking: 保留 {len(self.dependencies)} 个文件，排除 {len(self.excluded)} 个文件（{total_bytes} 字节源码）")
+        for file in self.excluded:
+            print(f"  排除: {file}")
+
+    def _freeze_dependencies(self) -> None:
+        """
+        内部方法：把main.py、boot.py可达的包内模块写入manifest.py，frozen时从dependencies中去掉这些包的全部文件。
+
+        可达集合与tree shaking相同（含keep匹配的模块），只取位于子目录中的模块，按路径排序后每个文件写一行
+        module("drivers/xxx/code/xxx.py", base_path=...)，base_path为源目录相对于清单所在目录的路径，
+        编译选项中有-O时一并写入opt。frozen时，写入清单的模块所在顶层目录下的文件（含不可达文件）都不再编译输出。
+
+        ==========================================
+
+        Internal method: Write the package modules reachable from main.py and boot.py to manifest.py and, when frozen, drop every file of
+        those packages from dependencies.
+
+        The reachable set is the same as for tree shaking (including modules matched by keep); only modules in subdirectories are taken.
+        Each file, sorted by path, becomes one module("drivers/xxx/code/xxx.py", base_path=...) line, where base_path is the source
+        directory relative to the directory of the manifest; an -O level in the compile options is written as opt. When frozen, no file
+        under the top-level directories of the listed modules (unreachable files included) is compiled to the output.
+        """
+        reachable = self.dependency_analyzer.reachable_modules(keep=self.keep)
+        self.frozen_files = sorted(
+            module_id.replace("/", os.sep) + ".py" for module_id in reachable if "/" in module_id
+        )
+
+        base_path = Path(os.path.relpath(self.source_dir, self.manifest.parent)).as_posix()
+        opt = self._frozen_opt()
+        opt_arg = f", opt={opt}" if opt is not None else ""
+        lines = [
+            "# 由tools/mpy_compiler.py根据依赖分析生成，请勿手动修改",
+            "# 冻结main.py、boot.py可达的包内模块；main.py、boot.py与顶层模块仍从文件系统加载",
+            f"# 构建固件: make -C ports/rp2 BOARD=RPI_PICO FROZEN_MANIFEST={self.manifest.as_posix()}",
+            "",
+            f'include("{MANIFEST_INCLUDE}")',
+            "",
+        ]
+        for file in self.frozen_files:
+            lines.append(f'module("{Path(file).as_posix()}", base_path="{base_path}"{opt_arg})')
+        self.manifest.parent.mkdir(parents=True, exist_ok=True)
+        self.manifest.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        total_bytes = sum((self.source_dir / f).stat().st_size for f in self.frozen_files)
+        print(f"manifest: 冻结 {len(self.frozen_files)} 个模块（{total_bytes} 字节源码）-> {self.manifest}")
+
+        if self.frozen:
+            roots = {Path(f).parts[0] for f in self.frozen_files}
+            dropped = {f for f in self.dependencies if Path(f).parts[0] in roots}
+            self.dependencies = {
+                file: deps - dropped for file, deps in self.dependencies.items() if file not in dropped
+            }
+            print(f"frozen: 输出目录中不再包含 {', '.join(sorted(roots))} 下的 {len(dropped)} 个文件")
+
+    def _frozen_opt(self) -> int | None:
+        """
+        内部方法：从编译选项中取出-O优化级别（-O2或-OO形式），没有时返回None。
+
+        ==========================================
+
+        Internal method: Take the -O optimization level (as -O2 or -OO) from the compile options, None when absent.
+        """
+        for opt in self.mpy_cross_opts:
+            match = re.fullmatch(r"-O(\d|O*)", opt)
+            if match:
+                level = match.group(1)
+                return int(level) if level.isdigit() else len(level) + 1
+        return None
+
     def determine_compile_order(self) -> None:
         """
         基于依赖关系进行拓扑排序，确定Python文件的编译顺序，优先编译被依赖文件。
@@ -326,9 +541,10 @@ class MPYCompiler:
         """
         按照determine_compile_order()确定的顺序，编译所有Python文件为mpy文件。
 
-        执行流程包括：清空输出目录现有内容、复制源目录结构到输出目录、按顺序调用_compile_single_file()
-        编译每个文件，并统计编译成功/失败的数量及失败文件详情。最后输出编译结果摘要（成功数、失败数、总计）
-        及输出目录路径。若未先执行determine_compile_order()，将抛出RuntimeError。
+        执行流程包括：复制源目录结构到输出目录、按顺序调用_compile_single_file()
+        编译每个文件，并统计编译成功/失败的数量及失败文件详情。jobs大于1时按编译顺序把文件提交到线程池，
+        由多个mpy-cross进程同时编译。编译完成后删除输出目录中的过期文件（源文件已删除或改名），内容未变的文件保持不动。最后输出编译结果摘要（成功数、失败数、总计、总耗时与逐文件耗时之和）
+        及输出目录路径，verbose模式下另列出耗时最长的文件。若未先执行determine_compile_order()，将抛出RuntimeError。
 
         Raises:
             RuntimeError: 若未先调用determine_compile_order()方法确定编译顺序。
@@ -337,10 +553,12 @@ class MPYCompiler:
 
         Compile all Python files into mpy files in the order determined by determine_compile_order().
 
-        The execution process includes: clearing existing content in the output directory, copying the source directory structure to the output directory,
+        The execution process includes: copying the source directory structure to the output directory,
         calling _compile_single_file() to compile each file in order, and counting the number of successful/failed compilations and details of failed files.
-        Finally, output a summary of compilation results (number of successes, failures, total) and the output directory path. A RuntimeError is raised if
-        determine_compile_order() is not executed first.
+        When jobs is greater than 1 the files are submitted to a thread pool in compile order and compiled by several mpy-cross processes at once.
+        Afterwards stale files in the output directory (whose sources were deleted or renamed) are removed and unchanged files are left in place.
+        Finally, output a summary of compilation results (number of successes, failures, total, wall time and the sum of per-file times) and the output
+        directory path, plus the slowest files in verbose mode. A RuntimeError is raised if determine_compile_order() is not executed first.
 
         Raises:
             RuntimeError: If the determine_compile_order() method is not called first to determine the compilation order.
@@ -348,15 +566,7 @@ class MPYCompiler:
         if not self.compile_order:
             raise RuntimeError("请先调用determine_compile_order()确定编译顺序")
 
-        # 先清空输出目录，但保留目录结构
-        if self.output_dir.exists():
-            for item in self.output_dir.iterdir():
-                if item.is_dir():
-                    shutil.rmtree(item)
-                else:
-                    item.unlink()
-
-        # 复制目录结构
+        # 复制目录结构，输出目录中已有的文件保留，编译后再删除过期文件
         self._copy_directory_structure()
 
         # 按顺序编译文件
@@ -364,29 +574,75 @@ class MPYCompiler:
         success_count = 0
         fail_count = 0
         failed_files = []
-
-        for i, file_path in enumerate(self.compile_order, 1):
-            try:
-                if self.verbose:
-                    print(f"正在编译 ({i}/{total_files}): {file_path}")
-                else:
-                    print(f"编译中... ({i}/{total_files})", end="\r")
-
-                self._compile_single_file(file_path)
-                success_count += 1
-            except Exception as e:
-                fail_count += 1
-                failed_files.append((file_path, str(e)))
-                if self.verbose:
-                    print(f"编译失败 {file_path}: {str(e)}")
-        # 复制不能编译的文件
-        shutil.copy(f'{self.source_dir}/main.py', f'{self.output_dir}/main.py')
-        shutil.copy(f'{self.source_dir}/boot.py', f'{self.output_dir}/boot.py')
+        self.timings = {}
+        self.cache_hits = set()
+        start = time.perf_counter()
+
+        if self.jobs > 1:
+            errors = {}
+            with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                # mpy-cross在独立进程中编译，线程只负责等待进程结束
+                futures = {
+                    pool.submit(self._compile_single_file, file_path): file_path
+                    for file_path in self.compile_order
+                }
+                for i, future in enumerate(as_completed(futures), 1):
+                    file_path = futures[future]
+                    try:
+                        self.timings[file_path] = future.result()
+                        if self.verbose:
+                            print(f"已编译 ({i}/{total_files}): {file_path} ({self.timings[file_path]:.2f}s)")
+                        else:
+                            print(f"编译中... ({i}/{total_files})", end="\r")
+                    except Exception as e:
+                        errors[file_path] = str(e)
+                        if self.verbose:
+                            print(f"编译失败 {file_path}: {str(e)}")
+            # 按编译顺序汇总失败文件，使输出与串行编译一致
+            failed_files = [(f, errors[f]) for f in self.compile_order if f in errors]
+            fail_count = len(failed_files)
+            success_count = total_files - fail_count
+        else:
+            for i, file_path in enumerate(self.compile_order, 1):
+                try:
+                    if self.verbose:
+                        print(f"正在编译 ({i}/{total_files}): {file_path}")
+                    else:
+                        print(f"编译中... ({i}/{total_files})", end="\r")
+
+                    self.timings[file_path] = self._compile_single_file(file_path)
+                    success_count += 1
+                except Exception as e:
+                    fail_count += 1
+                    failed_files.append((file_path, str(e)))
+                    if self.verbose:
+                        print(f"编译失败 {file_path}: {str(e)}")
+        elapsed = time.perf_counter() - start
+        # 复制不能编译的文件，内容未变时保持不动
+        for name in ("main.py", "boot.py"):
+            target = self.output_dir / name
+            if not (target.exists() and filecmp.cmp(self.source_dir / name, target, shallow=False)):
+                shutil.copy(self.source_dir / name, target)
         Path(f'{self.output_dir}/main.mpy').unlink(missing_ok=True)
         Path(f'{self.output_dir}/boot.mpy').unlink(missing_ok=True)
+
+        # 删除过期文件：只保留每个源文件对应的mpy文件以及main.py、boot.py
+        expected = {self.output_dir / "main.py", self.output_dir / "boot.py"}
+        for file_path in self.compile_order:
+            expected.add(self.output_dir / file_path.replace(".py", ".mpy"))
+        self._prune_output(expected)
+
         # 输出编译结果摘要
         print("\n" + "=" * 50)
         print(f"编译完成: 成功 {success_count}, 失败 {fail_count}, 总计 {total_files}")
+        if self.cache_dir is not None:
+            print(f"编译缓存: 命中 {len(self.cache_hits)}, 编译 {success_count - len(self.cache_hits)}（{self.cache_dir}）")
+        print(f"编译耗时: {elapsed:.2f}s（逐文件耗时之和 {sum(self.timings.values()):.2f}s，并行数 {self.jobs}）")
+
+        if self.verbose and self.timings:
+            print("\n耗时最长的文件:")
+            for file, seconds in sorted(self.timings.items(), key=lambda kv: kv[1], reverse=True)[:5]:
+                print(f"  {seconds:6.2f}s  {file}")
 
         if failed_files:
             print("\n编译失败的文件:")
@@ -417,17 +673,91 @@ class MPYCompiler:
                 if self.verbose:
                     print(f"创建目录: {target_dir}")
 
-    def _compile_single_file(self, file_path: str) -> None:
+    def _prune_output(self, expected: set[Path]) -> None:
+        """
+        内部方法：删除输出目录中不在expected内的文件，以及源目录中已不存在的空目录（开启tree shaking或frozen时删除所有空目录）。
+
+        Args:
+            expected: 本次编译应保留的输出文件绝对路径集合。
+
+        ==========================================
+
+        Internal method: Delete files in the output directory that are not in expected, and empty directories that no longer exist in the source
+        directory (every empty directory when tree shaking or frozen is enabled).
+
+        Args:
+            expected: Set of absolute paths of output files to keep in this build.
+        """
+        for root, dirs, files in os.walk(self.output_dir, topdown=False):
+            root_path = Path(root)
+            for name in files:
+                path = root_path / name
+                if path not in expected:
+                    path.unlink()
+                    if self.verbose:
+                        print(f"删除过期文件: {path}")
+            rel_path = root_path.relative_to(self.output_dir)
+            # tree shaking排除或已冻结的包在源目录中仍然存在，其空目录同样不需要上传
+            stale = self.tree_shake or self.frozen or not (self.source_dir / rel_path).is_dir()
+            if root_path != self.output_dir and stale and not any(root_path.iterdir()):
+                root_path.rmdir()
+                if self.verbose:
+                    print(f"删除过期目录: {root_path}")
+
+    def _cache_key(self, source_file: Path) -> str:
+        """
+        内部方法：计算源文件的编译缓存键。
+
+        缓存键为源文件内容、相对于源目录的路径（编译时以-s嵌入mpy文件）、mpy-cross版本与编译选项（--compat、--bytecode、-O、-march等）
+        的SHA-256，任何一项变化都会使缓存失效。mpy-cross版本只在首次调用时获取一次。
+
+        Args:
+            source_file: 源文件的绝对路径。
+
+        Returns:
+            str: 十六进制的缓存键。
+
+        ==========================================
+
+        Internal method: Compute the build cache key of a source file.
+
+        The key is the SHA-256 of the source content, the path relative to the source directory (embedded into the mpy file with -s), the
+        mpy-cross version and the compile options (--compat, --bytecode, -O, -march, ...), so a change to any of them invalidates the cache.
+        The mpy-cross version is queried only once, on the first call.
+
+        Args:
+            source_file: Absolute path of the source file.
+
+        Returns:
+            str: Hexadecimal cache key.
+        """
+        if self._cache_salt is None:
+            result = subprocess.run(
+                ["python", "-m", "mpy_cross", "--version"],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            )
+            self._cache_salt = (result.stdout.strip() + "\0" + "\0".join(self.mpy_cross_opts)).encode()
+        digest = hashlib.sha256(self._cache_salt)
+        digest.update(b"\0" + source_file.relative_to(self.source_dir).as_posix().encode() + b"\0")
+        digest.update(source_file.read_bytes())
+        return digest.hexdigest()
+
+    def _compile_single_file(self, file_path: str) -> float:
         """
         内部方法：调用mpy-cross工具编译单个Python文件为mpy文件。
 
         首先验证源文件是否存在，然后构建输出mpy文件的路径（替换.py为.mpy，保持相对路径结构），
-        确保输出文件所在目录存在。接着构建mpy-cross的命令行（包含源文件、输出文件及编译选项），
+        确保输出文件所在目录存在。接着构建mpy-cross的命令行（包含源文件、输出文件、以-s嵌入的相对路径及编译选项），
         通过subprocess.run()执行命令，若返回码非0则抛出RuntimeError。verbose模式下输出编译成功日志。
+        启用缓存时先按缓存键查找：命中则以硬链接（不支持时复制）取出缓存文件，输出文件已与缓存一致时不做任何操作；
+        未命中则编译后把结果存入缓存。该方法可在多个线程中同时调用。
 
         Args:
             file_path: 待编译的Python文件路径（相对于源目录的路径字符串）。
 
+        Returns:
+            float: 编译耗时，单位为秒。
+
         Raises:
             FileNotFoundError: 若待编译的源文件不存在。
             RuntimeError: 若mpy-cross命令执行失败（返回码非0）或执行过程中出现异常。
@@ -437,13 +767,18 @@ class MPYCompiler:
         Internal method: Invoke the mpy-cross tool to compile a single Python file into an mpy file.
 
         First, verify if the source file exists, then build the path of the output mpy file (replace .py with .mpy, maintain the relative path structure),
-        and ensure the directory where the output file is located exists. Next, build the command line for mpy-cross (including source file, output file, and
-        compilation options), execute the command via subprocess.run(), and raise a RuntimeError if the return code is non-zero. A log of successful compilation
-        is output in verbose mode.
+        and ensure the directory where the output file is located exists. Next, build the command line for mpy-cross (including source file, output file, the relative
+        path embedded with -s, and compilation options), execute the command via subprocess.run(), and raise a RuntimeError if the return code is non-zero. A log of successful compilation
+        is output in verbose mode. With caching enabled the cache key is looked up first: on a hit the cached file is hardlinked (copied where links are
+        unsupported), and nothing is done when the output already matches it; on a miss the compiled file is stored in the cache. This method may be
+        called from several threads at once.
 
         Args:
             file_path: Path string of the Python file to be compiled (relative to the source directory).
 
+        Returns:
+            float: Elapsed time in seconds.
+
         Raises:
             FileNotFoundError: If the source file to be compiled does not exist.
             RuntimeError: If the mpy-cross command execution fails (non-zero return code) or an exception occurs during execution.
@@ -459,8 +794,32 @@ class MPYCompiler:
         # 确保输出目录存在
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # 构建mpy-cross命令
-        cmd = ["python", "-m", "mpy_cross", str(source_file), "-o", str(output_file)]
+        start = time.perf_counter()
+
+        # 查找编译缓存
+        cached = None
+        if self.cache_dir is not None:
+            key = self._cache_key(source_file)
+            cached = self.cache_dir / key[:2] / (key + ".mpy")
+            if cached.exists():
+                if not (output_file.exists() and (os.path.samefile(cached, output_file)
+                                                  or filecmp.cmp(cached, output_file, shallow=False))):
+                    # 先删除旧文件，避免写入与缓存共享的硬链接
+                    output_file.unlink(missing_ok=True)
+                    try:
+                        os.link(cached, output_file)
+                    except OSError:
+                        shutil.copy(cached, output_file)
+                self.cache_hits.add(file_path)
+                if self.verbose and self.jobs == 1:
+                    print(f"命中缓存: {output_file}")
+                return time.perf_counter() - start
+
+        # 输出文件可能是缓存文件的硬链接，先删除再由mpy-cross写入新文件
+        output_file.unlink(missing_ok=True)
+
+        # 构建mpy-cross命令，嵌入设备上的相对路径而非主机绝对路径，使相同源文件在不同项目、不同主机上编译结果一致
+        cmd = ["python", "-m", "mpy_cross", str(source_file), "-o", str(output_file), "-s", Path(rel_path).as_posix()]
 
         # 添加额外编译选项
         cmd.extend(self.mpy_cross_opts)
@@ -474,12 +833,21 @@ class MPYCompiler:
             if result.returncode != 0:
                 raise RuntimeError(f"编译错误: {result.stderr}")
 
-            if self.verbose:
+            if self.verbose and self.jobs == 1:
                 print(f"编译成功: {output_file}")
 
         except Exception as e:
             raise RuntimeError(f"编译失败: {str(e)}") from e
 
+        # 存入缓存：先写临时文件再原子替换，并行编译时不会读到不完整的缓存文件
+        if cached is not None:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_suffix(f".{os.getpid()}.{id(output_file)}.tmp")
+            shutil.copy(output_file, tmp)
+            os.replace(tmp, cached)
+
+        return time.perf_counter() - start
+
     def run(self) -> None:
         """
         执行完整的MPY编译流程，串联依赖分析、顺序确定和文件编译环节。
@@ -536,6 +904,26 @@ if __name__ == "__main__":
         default=0,
     )
 
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="并行编译的文件数，默认为1（串行编译），0表示使用全部CPU核心",
+        type=int,
+        default=1,
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        help="编译缓存目录，默认为输出目录旁的mpy_cache",
+        metavar="DIR",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        help="不使用编译缓存，每个文件都调用mpy-cross编译",
+        action="store_true",
+    )
+
     parser.add_argument(
         "--compat", help="指定MicroPython兼容版本，如1.19", metavar="VERSION"
     )
@@ -550,7 +938,35 @@ if __name__ == "__main__":
         "--arch", help="指定目标架构，如armv7m, xtensa等", metavar="ARCH"
     )
 
+    parser.add_argument(
+        "--tree-shake",
+        help="只编译从main.py、boot.py沿导入关系可达的模块，并列出被排除的文件",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--keep",
+        help="开启--tree-shake时强制保留的module_id通配模式，可重复指定，如--keep 'drivers/*/code/*'",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+    )
+
+    parser.add_argument(
+        "--manifest",
+        help="生成冻结清单manifest.py，列出main.py、boot.py可达的包内模块，用于构建自定义固件，如--manifest ../build/manifest.py",
+        metavar="FILE",
+    )
+
+    parser.add_argument(
+        "--frozen",
+        help="与--manifest同用：输出目录中不再包含已冻结的包，设备需刷入包含这些模块的自定义固件",
+        action="store_true",
+    )
+
     args = parser.parse_args()
+    if args.frozen and not args.manifest:
+        parser.error("--frozen需要同时指定--manifest")
 
     # 构建mpy-cross编译选项
     mpy_cross_opts = []
@@ -569,6 +985,13 @@ if __name__ == "__main__":
         output_dir=args.output,
         mpy_cross_opts=mpy_cross_opts,
         verbose=bool(args.verbose),
+        jobs=args.jobs,
+        cache_dir=args.cache_dir,
+        use_cache=not args.no_cache,
+        tree_shake=args.tree_shake,
+        keep=tuple(args.keep),
+        manifest=args.manifest,
+        frozen=args.frozen,
     )
 
     compiler.run()
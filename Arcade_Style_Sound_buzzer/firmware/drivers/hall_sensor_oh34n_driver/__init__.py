@@ -8,7 +8,7 @@
 
 # ======================================== 导入相关模块 =========================================
 
-from .code.hall_sensor_oh34n import HallSensorOH34N
+# 导出接口在首次访问时才导入对应子模块，见 __getattr__
 
 # ======================================== 全局变量 ============================================
 
@@ -16,6 +16,15 @@ __all__ = ['HallSensorOH34N']
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问导出名称时才导入定义它的子模块，并缓存到包的命名空间中。"""
+    if name == "HallSensorOH34N":
+        from .code.hall_sensor_oh34n import HallSensorOH34N as value
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ===========================================
@@ -9,7 +9,7 @@
 
 # ======================================== 导入相关模块 =========================================
 
-from .code.touchkey import TouchKey
+# 导出接口在首次访问时才导入对应子模块，见 __getattr__
 
 # ======================================== 全局变量 ============================================
 
@@ -17,6 +17,15 @@ __all__ = ['TouchKey']
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问导出名称时才导入定义它的子模块，并缓存到包的命名空间中。"""
+    if name == "TouchKey":
+        from .code.touchkey import TouchKey as value
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ===========================================
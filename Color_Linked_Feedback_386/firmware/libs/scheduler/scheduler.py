@@ -7,7 +7,7 @@
 # @License : MIT
 # 代码参考：https://github.com/micropython-Chinese-Community/micropython-simple-scheduler/tree/main
 
-__version__ = "1.0.0"
+__version__ = "1.1.0"
 __author__ = "shaoziyang"
 __license__ = "MIT"
 __platform__ = "MicroPython v1.23"
@@ -18,10 +18,50 @@ __chip__ = "All"
 # 导入const常量标识符
 from micropython import const
 # 导入硬件相关模块
+import machine
 from machine import Timer
+# 导入时间相关模块
+from time import ticks_ms, ticks_us, ticks_add, ticks_diff, sleep_ms
+# 导入数组模块，用于预分配任务统计数据
+from array import array
+# 导入线程模块，用于在RP2040的第二个核心上运行调度循环（部分端口不支持）
+try:
+    import _thread
+except ImportError:
+    _thread = None
 
 # ======================================== 全局变量 ============================================
 
+# 部分端口不支持lightsleep，此时回退到machine.idle
+_lightsleep = getattr(machine, "lightsleep", None)
+
+# 任务统计数组中各字段的下标
+_S_RUNS    = const(0)   # 执行次数
+_S_RT_MIN  = const(1)   # 最短执行时间（us）
+_S_RT_MAX  = const(2)   # 最长执行时间（us）
+_S_RT_SUM  = const(3)   # 执行时间累加（us），用于计算平均值
+_S_RT_N    = const(4)   # 参与累加的次数
+_S_LAT_MIN = const(5)   # 最小启动延迟（ms），相对于应执行时刻
+_S_LAT_MAX = const(6)   # 最大启动延迟（ms）
+_S_LAT_SUM = const(7)   # 启动延迟累加（ms）
+_S_OVR     = const(8)   # 错过的执行周期数（超过一个周期未执行）
+_S_HIST    = const(9)   # 执行时间直方图起始下标
+# 直方图桶数：<64us、<128us、... 每桶翻倍，最后一桶为 >=16ms
+_HIST_BUCKETS = const(10)
+_STATS_LEN    = const(19)
+# 累加值上限，超过后累加值与次数同时减半，避免产生长整型分配内存
+_SUM_LIMIT    = const(0x1FFFFFFF)
+
+# 核心统计数组中各字段的下标
+_C_RUNS    = const(0)   # 任务执行次数
+_C_BUSY_MS = const(1)   # 执行任务的累计时间（ms）
+_C_BUSY_US = const(2)   # 不足1ms的余数（us）
+_C_T0      = const(3)   # 统计起始时刻（ticks_ms）
+# 核心1空闲时单次睡眠的最长时间（ms），决定其响应跨核心恢复任务的延迟
+_CORE1_POLL_MS = const(10)
+# 错误环形缓冲区的条目数
+_ERR_RING_SIZE = const(8)
+
 # ======================================== 功能函数 ============================================
 
 # ======================================== 自定义类 ============================================
@@ -33,19 +73,48 @@ class Task():
 
     该类允许任务根据设定的时间间隔重复执行，并支持暂停和恢复任务。可以用于实现定时任务调度等功能。
 
+    任务执行被推迟超过一个周期时，按 policy 指定的补偿策略处理错过的周期：
+        - CATCHUP_SKIP：跳过错过的周期，只执行一次，下一次执行时刻保持原有相位，长期速率不漂移。
+        - CATCHUP_ONCE：只执行一次，并从本次执行时刻重新开始计时（旧版行为，会累积漂移）。
+        - CATCHUP_BURST：连续补执行错过的周期，最多补 BURST_LIMIT 个周期，超出部分按 CATCHUP_SKIP 处理。
+
+    指定 event 后任务还会在事件触发时执行，interval 为0时任务只由事件触发，详见 Event 类。
+
+    max_runtime 与 heartbeat 供 Watchdog 看门狗服务检查任务是否存活：单次执行超过 max_runtime，
+    或超过 heartbeat 未成功执行完一次（回调未抛出异常），即视为任务失效。
+
     Attributes:
         TASK_RUN (int): 任务运行状态标识符，值为0，表示任务正在运行。
         TASK_STOP (int): 任务停止状态标识符，值为1，表示任务已停止。
+        CATCHUP_SKIP (int): 补偿策略，跳过错过的周期并保持相位。
+        CATCHUP_ONCE (int): 补偿策略，执行一次并重新计时。
+        CATCHUP_BURST (int): 补偿策略，连续补执行错过的周期。
+        BURST_LIMIT (int): CATCHUP_BURST 策略最多补执行的周期数。
         _callback (callable): 执行任务的回调函数，任务执行时调用。
         _param (tuple): 任务回调函数的参数。
         _intv (int): 任务执行的时间间隔，单位为毫秒，默认值为1000ms。
         _state (int): 任务状态，默认为 TASK_RUN，表示任务正在运行。
+        _policy (int): 错过周期时的补偿策略，默认为 CATCHUP_SKIP。
         _cnt (int): 任务计数器，表示任务已执行的次数，默认值为10。
         _rt (int): 任务执行的返回值或其他辅助信息，默认值为0。
+        _sched (Scheduler): 任务所属的调度器，未添加时为None。
+        _pos (int): 任务在所属调度器任务列表中的下标（句柄），未添加时为-1。
+        _hidx (int): 堆调度模式下任务在最小堆中的下标，不在堆中时为-1。
+        _deadline (int): 堆调度模式下任务下一次执行的绝对时刻（ticks_ms）。
+        _stats (array): 调度器开启统计时预分配的执行统计数组，否则为None。
+        _event (Event): 触发任务执行的事件，未指定时为None。
+        _evonly (bool): 任务是否只由事件触发（指定了事件且间隔不大于0）。
+        _maxrt (int): 单次执行允许的最长时间，单位为毫秒，0表示不检查。
+        _hb (int): 两次成功执行之间允许的最长间隔（心跳超时），单位为毫秒，0表示不检查。
+        _beat (int): 最近一次成功执行完成（或添加、恢复）的时刻（ticks_ms）。
+        _fails (int): 连续执行失败（回调抛出异常）的次数。
+        _backoff (int): 熔断暂停时长，单位为毫秒，每次熔断翻倍，成功执行后清零。
+        _retry (int): 熔断暂停后自动恢复的时刻（ticks_ms）。
+        _tripped (bool): 任务是否因连续失败被调度器自动暂停（熔断）。
 
     Methods:
-        __init__(self, callback, *param, interval=1000, state=TASK_RUN) -> None:
-            初始化Task类实例，设置回调函数、参数、间隔时间和任务状态。
+        __init__(self, callback, *param, interval=1000, state=TASK_RUN, policy=CATCHUP_SKIP, event=None, max_runtime=0, heartbeat=0) -> None:
+            初始化Task类实例，设置回调函数、参数、间隔时间、任务状态、补偿策略、触发事件和存活检查参数。
 
         pause(self) -> None:
             暂停任务，将任务状态设置为TASK_STOP。
@@ -53,23 +122,35 @@ class Task():
         resume(self) -> None:
             恢复任务，将任务状态设置为TASK_RUN。
 
-        run(self) -> None:
-            执行任务回调函数，并传入相关参数。
+        run(self) -> object:
+            执行任务回调函数，并传入相关参数，返回回调函数的返回值。
     """
 
     # 任务状态标识符
     TASK_RUN  = const(0)
     TASK_STOP = const(1)
 
-    def __init__(self, callback: callable, *param: object, interval: int = 1000, state: int = TASK_RUN) -> None:
+    # 错过周期时的补偿策略
+    CATCHUP_SKIP  = const(0)
+    CATCHUP_ONCE  = const(1)
+    CATCHUP_BURST = const(2)
+    BURST_LIMIT   = const(8)
+
+    def __init__(self, callback: callable, *param: object, interval: int = 1000, state: int = TASK_RUN,
+                 policy: int = CATCHUP_SKIP, event: "Event" = None, max_runtime: int = 0,
+                 heartbeat: int = 0) -> None:
         """
-        初始化Task类实例，设置回调函数、参数、执行间隔时间和任务状态。
+        初始化Task类实例，设置回调函数、参数、执行间隔时间、任务状态、补偿策略、触发事件和存活检查参数。
 
         Args:
             callback (callable): 任务执行时调用的回调函数。
             *param (object): 传递给回调函数的参数。
             interval (int, optional): 任务执行的时间间隔，单位为毫秒。默认为1000ms。
             state (int, optional): 任务的初始状态，默认为TASK_RUN，表示任务正在运行。
+            policy (int, optional): 错过周期时的补偿策略，默认为CATCHUP_SKIP。
+            event (Event, optional): 触发任务执行的事件，默认为None；指定事件且interval为0时任务只由事件触发。
+            max_runtime (int, optional): 单次执行允许的最长时间，单位为毫秒，默认为0（不检查）。
+            heartbeat (int, optional): 两次成功执行之间允许的最长间隔，单位为毫秒，默认为0（不检查）。
 
         Returns:
             None
@@ -78,8 +159,23 @@ class Task():
         self._param = param
         self._intv = interval
         self._state = state
+        self._policy = policy
         self._cnt = 10
         self._rt = 0
+        self._sched = None
+        self._pos = -1
+        self._hidx = -1
+        self._deadline = 0
+        self._stats = None
+        self._event = event
+        self._evonly = event is not None and interval <= 0
+        self._maxrt = max_runtime
+        self._hb = heartbeat
+        self._beat = 0
+        self._fails = 0
+        self._backoff = 0
+        self._retry = 0
+        self._tripped = False
 
     def pause(self) -> None:
         """
@@ -113,9 +209,207 @@ class Task():
             None
 
         Returns:
+            object: 回调函数的返回值；协程回调返回协程对象，由AsyncScheduler等待执行。
+        """
+        return self._callback(*self._param)
+
+# 定义Event事件类
+class Event():
+    """
+    Event 类，由中断触发的任务事件，用于替代固定周期轮询。
+
+    任务创建时通过 event 参数声明事件源；引脚中断或驱动回调调用 set() 后，
+    调度器在主循环的下一轮执行该任务。set() 只修改预分配的标志与属性，不分配内存，
+    可直接作为 Pin.irq 的 handler（hard=True 亦可）或驱动的 callback 使用。
+
+    任务间隔为0时任务只由事件触发，事件未发生时不占用任何轮询时间；
+    任务间隔大于0时任务既按周期执行，也在事件发生时立即执行一次。
+    两次执行之间多次触发的事件合并为一次，每个事件只能绑定一个任务。
+
+    Attributes:
+        value (object): 最近一次 set() 传入的值，如触发中断的 Pin 对象或驱动回调参数。
+        _flag (bool): 事件是否已触发且尚未处理。
+        _t (int): 最近一次触发的时刻（ticks_ms），用于统计响应延迟。
+        _sched (Scheduler): 绑定任务所属的调度器，未绑定时为None。
+        _task (Task): 绑定的任务，未绑定时为None。
+        _tsf (asyncio.ThreadSafeFlag): AsyncScheduler 使用的唤醒标志，同步调度器中为None。
+
+    Methods:
+        __init__(self) -> None: 初始化事件，状态为未触发。
+        set(self, value: object = None) -> None: 触发事件，可在中断中调用。
+        clear(self) -> None: 清除未处理的事件。
+        is_set(self) -> bool: 返回事件是否已触发且尚未处理。
+
+    Example:
+        >>> evt = Event()
+        >>> hall.set_callback(evt.set)
+        >>> sc.add(Task(task_obj.on_hall, interval=0, event=evt))
+    """
+
+    def __init__(self) -> None:
+        """
+        初始化事件，状态为未触发。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.value = None
+        self._flag = False
+        self._t = 0
+        self._sched = None
+        self._task = None
+        self._tsf = None
+
+    def set(self, value: object = None) -> None:
+        """
+        触发事件，绑定的任务将在调度器主循环的下一轮执行，可在中断中调用。
+
+        Args:
+            value (object, optional): 随事件传递的值，任务回调可通过 event.value 读取。
+
+        Returns:
+            None
+        """
+        self.value = value
+        self._t = ticks_ms()
+        self._flag = True
+        s = self._sched
+        if s is not None:
+            s._evpending = True
+        f = self._tsf
+        if f is not None:
+            f.set()
+
+    def clear(self) -> None:
+        """
+        清除未处理的事件。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self._flag = False
+
+    def is_set(self) -> bool:
+        """
+        返回事件是否已触发且尚未处理。
+
+        Args:
+            None
+
+        Returns:
+            bool: 已触发且尚未处理时返回True。
+        """
+        return self._flag
+
+# 定义CoreQueue跨核心消息队列类
+class CoreQueue():
+    """
+    CoreQueue 类，带锁保护的定长环形消息队列，用于两个核心上的任务之间传递数据。
+
+    RP2040 端口的两个核心并行执行Python代码，分属两个核心的任务不应直接共享可变对象，
+    应通过本队列传递消息。缓冲区在创建时预分配，put/get 均为非阻塞操作，不分配内存。
+
+    Attributes:
+        _buf (list): 预分配的环形缓冲区。
+        _size (int): 队列容量。
+        _head (int): 读位置。
+        _tail (int): 写位置。
+        _n (int): 当前消息数。
+        _dropped (int): 队列满时被丢弃的消息数。
+        _lock (_thread.LockType): 保护队列的锁，不支持_thread的端口为None。
+
+    Methods:
+        __init__(self, size: int = 16) -> None: 初始化队列并预分配缓冲区。
+        put(self, item: object) -> bool: 写入一条消息，队列满时返回False。
+        get(self) -> object: 读出一条消息，队列空时返回None。
+        __len__(self) -> int: 返回当前消息数。
+    """
+
+    def __init__(self, size: int = 16) -> None:
+        """
+        初始化队列并预分配缓冲区。
+
+        Args:
+            size (int, optional): 队列容量，默认为16。
+
+        Returns:
+            None
+        """
+        self._buf = [None] * size
+        self._size = size
+        self._head = 0
+        self._tail = 0
+        self._n = 0
+        self._dropped = 0
+        self._lock = _thread.allocate_lock() if _thread else None
+
+    def put(self, item: object) -> bool:
+        """
+        写入一条消息，非阻塞。
+
+        Args:
+            item (object): 消息对象。
+
+        Returns:
+            bool: 写入成功返回True，队列已满返回False。
+        """
+        lock = self._lock
+        if lock:
+            lock.acquire()
+        try:
+            if self._n >= self._size:
+                self._dropped += 1
+                return False
+            self._buf[self._tail] = item
+            self._tail = (self._tail + 1) % self._size
+            self._n += 1
+            return True
+        finally:
+            if lock:
+                lock.release()
+
+    def get(self) -> object:
+        """
+        读出一条消息，非阻塞。
+
+        Args:
+            None
+
+        Returns:
+            object: 最早写入的消息，队列为空时返回None。
+        """
+        lock = self._lock
+        if lock:
+            lock.acquire()
+        try:
+            if self._n == 0:
+                return None
+            item = self._buf[self._head]
+            self._buf[self._head] = None
+            self._head = (self._head + 1) % self._size
+            self._n -= 1
+            return item
+        finally:
+            if lock:
+                lock.release()
+
+    def __len__(self) -> int:
+        """
+        返回当前消息数。
+
+        Args:
             None
+
+        Returns:
+            int: 队列中的消息数。
         """
-        self._callback(*self._param)
+        return self._n
 
 # 定义Scheduler调度类
 class Scheduler():
@@ -126,34 +420,112 @@ class Scheduler():
     任务可以是任意可调用对象，调度器会根据设定的时间间隔定期检查并执行任务。
     此外，调度器还支持任务空闲和任务错误的回调函数，用于处理任务执行过程中的特殊情况。
 
+    调度器支持两种模式：
+        - MODE_TICK：默认模式，定时器中断为每个任务累加节拍，主循环轮询全部任务。
+        - MODE_HEAP：堆调度模式，任务按绝对截止时刻（ticks_ms）存放在最小堆中，
+          主循环每次只处理已到期的任务，不再依赖定时器中断，任务较多、节拍较短时抖动更小。
+
+    在支持 _thread 的双核芯片（如RP2040）上，add(task, core=1) 会把任务放到第二个核心上运行：
+    调度器首次添加核心1任务时创建一个 MODE_HEAP 子调度器，在 scheduler() 启动时于核心1上运行其主循环。
+    两个核心的任务集相互独立，跨核心数据交换应使用 CoreQueue。
+
+    任务可通过 Event 声明事件源：中断中调用 event.set() 后，主循环在下一轮优先执行事件任务，
+    响应延迟不再受任务间隔限制。只由事件触发的任务（间隔为0）不参与节拍计数与最小堆，
+    无节拍模式下引脚中断唤醒CPU后即可执行。
+
+    创建 Watchdog 看门狗服务后，主循环在所有任务存活时喂狗，详见 watchdog 模块。
+
+    任务出错时不阻塞调度：异常记录到预分配的错误环形缓冲区（任务、异常类型、时刻、连续次数），
+    再交给 task_err 回调处理。同一任务连续失败 err_limit 次后熔断：任务被自动暂停，
+    经过 BACKOFF_MIN_MS 起按指数增长（上限 BACKOFF_MAX_MS）的退避时间后自动恢复试运行，
+    试运行再次失败立即重新熔断，成功则退避时间清零。传感器断开只影响对应任务，其他任务照常运行。
+
+    无节拍（tickless）低功耗模式为可选项，开启后自动使用 MODE_HEAP，并停止周期定时器：
+        - TICKLESS_IDLE：距下一个截止时刻较近时调用 machine.idle() 等待中断。
+        - TICKLESS_LIGHTSLEEP：距下一个截止时刻不小于 LIGHTSLEEP_MIN_MS 时调用
+          machine.lightsleep()，引脚中断（如板载按键）仍可唤醒。
+
     Attributes:
+        MODE_TICK (int): 定时器节拍轮询模式。
+        MODE_HEAP (int): 截止时刻最小堆模式。
+        TICKLESS_OFF (int): 关闭无节拍模式，主循环持续轮询。
+        TICKLESS_IDLE (int): 空闲时使用machine.idle()等待。
+        TICKLESS_LIGHTSLEEP (int): 空闲时使用machine.lightsleep()睡眠至下一个截止时刻。
+        LIGHTSLEEP_MIN_MS (int): 使用lightsleep的最短等待时间，更短的等待使用idle。
+        HIST_EDGES_US (tuple): 执行时间直方图各桶的上边界（us）。
+        MAX_SLEEP_MS (int): 无任务待执行时单次睡眠的最长时间。
+        ERR_LIMIT (int): 默认的熔断阈值，任务连续失败次数达到该值时自动暂停。
+        BACKOFF_MIN_MS (int): 首次熔断的暂停时长。
+        BACKOFF_MAX_MS (int): 熔断暂停时长的上限。
         tm (machine.Timer): 定时器实例，用于触发任务的调度。
         interval (int): 定时器的时间间隔，单位为毫秒。
         task_idle (callable): 任务空闲时调用的回调函数。
         task_err (callable): 任务执行出错时调用的回调函数。
         tasks (list): 任务列表，存储所有已注册的任务实例。
+        mode (int): 调度模式，MODE_TICK 或 MODE_HEAP。
+        tickless (int): 无节拍低功耗模式，TICKLESS_OFF、TICKLESS_IDLE 或 TICKLESS_LIGHTSLEEP。
+        profile (bool): 是否记录每个任务的执行时间、启动延迟与错过周期统计。
+        core (int): 调度循环所在的核心编号，0 或 1。
+        core1 (Scheduler): 核心1上的子调度器，未添加核心1任务时为None。
+        err_limit (int): 熔断阈值，0表示不自动暂停出错的任务。
 
     Methods:
-        __init__(self, tm: Timer, interval: int = 100, task_idle: callable = None, task_err: callable = None):
-            初始化调度器实例，设置定时器、时间间隔和回调函数。
+        __init__(self, tm: Timer, interval: int = 100, task_idle: callable = None, task_err: callable = None, mode: int = MODE_TICK, tickless: int = TICKLESS_OFF, profile: bool = False, err_limit: int = ERR_LIMIT):
+            初始化调度器实例，设置定时器、时间间隔、回调函数、调度模式、无节拍模式、性能统计开关和熔断阈值。
 
         _tmrirq(self, t: Timer) -> None:
             定时器中断回调函数，用于触发任务的调度。
 
+        _exec(self, task: Task, late: int = 0) -> None:
+            执行任务回调并捕获异常，开启统计时记录执行时间与启动延迟。
+
+        _record(self, task: Task, dt: int, late: int) -> None:
+            将一次执行的耗时与延迟写入任务统计数组。
+
+        _on_error(self, task: Task, e: Exception) -> None:
+            记录任务异常，调用错误回调，连续失败达到阈值时熔断任务。
+
+        _untrip(self, task: Task) -> None:
+            结束任务的熔断状态并恢复试运行。
+
+        _retry_due(self) -> None:
+            恢复熔断暂停时间已到的任务。
+
         _run(self, task: Task) -> None:
             执行单个任务的回调函数。
 
+        _next_deadline(self, task: Task, now: int, late: int) -> int:
+            按补偿策略计算任务的下一次截止时刻。
+
+        _run_due(self) -> None:
+            堆调度模式下执行所有已到期的任务。
+
+        _run_events(self) -> None:
+            执行事件已触发的任务。
+
+        _sleep(self) -> None:
+            无节拍模式下睡眠至下一个任务截止时刻或外部中断。
+
+        next_wait_ms(self) -> int:
+            返回距下一个任务截止时刻的毫秒数。
+
         scheduler(self) -> None:
+            启动调度器，若存在核心1任务则先在核心1上启动子调度器，然后运行主循环。
+
+        _loop(self) -> None:
             调度器的主循环，负责循环执行所有已注册的任务。
 
+        _get_core1(self) -> Scheduler:
+            获取（必要时创建）核心1上的子调度器。
+
         find(self, task: Task) -> int:
-            查找指定任务在任务列表中的索引。
+            通过任务句柄查找指定任务在任务列表中的索引。
 
         clear(self) -> None:
             清空任务列表。
 
-        add(self, task: Task, state: int = Task.TASK_RUN) -> None:
-            添加任务到任务列表中。
+        add(self, task: Task, state: int = Task.TASK_RUN, core: int = 0) -> None:
+            添加任务到指定核心的任务列表中。
 
         delete(self, task: Task) -> None:
             从任务列表中删除指定任务。
@@ -166,18 +538,55 @@ class Scheduler():
 
         run(self, task: Task) -> None:
             执行指定任务的回调函数。
+
+        stats(self) -> None:
+            打印各核心负载与所有任务的执行统计表（可在REPL中调用）。
+
+        stats_reset(self) -> None:
+            清零所有任务的执行统计。
+
+        errors(self) -> None:
+            打印错误环形缓冲区与处于熔断状态的任务（可在REPL中调用）。
     """
 
+    # 调度模式标识符
+    MODE_TICK = const(0)
+    MODE_HEAP = const(1)
+
+    # 无节拍低功耗模式标识符
+    TICKLESS_OFF        = const(0)
+    TICKLESS_IDLE       = const(1)
+    TICKLESS_LIGHTSLEEP = const(2)
+
+    # lightsleep最短等待时间与单次睡眠上限，单位为毫秒
+    LIGHTSLEEP_MIN_MS = const(10)
+    MAX_SLEEP_MS      = const(1000)
+
+    # 执行时间直方图各桶的上边界，单位为微秒
+    HIST_EDGES_US = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+    # 熔断阈值与退避时长，单位为毫秒
+    ERR_LIMIT      = const(5)
+    BACKOFF_MIN_MS = const(1000)
+    BACKOFF_MAX_MS = const(60000)
+
     def __init__(self, tm: Timer, interval: int = 100, task_idle: callable = None,
-                 task_err: callable = None) -> None:
+                 task_err: callable = None, mode: int = MODE_TICK, tickless: int = TICKLESS_OFF,
+                 profile: bool = False, err_limit: int = ERR_LIMIT) -> None:
         """
         初始化调度类实例，设置定时器、定时器间隔、任务空闲回调函数和任务错误回调函数。
 
         Args:
-            tm (machine.Timer): 定时器实例，用于调度任务。
+            tm (machine.Timer): 定时器实例，用于调度任务；MODE_HEAP 模式下不使用，可为None。
             interval (int, optional): 定时器间隔，单位为毫秒。默认为100ms。
             task_idle (callable, optional): 任务空闲时调用的回调函数，默认为None。
             task_err (callable, optional): 任务出现错误时调用的回调函数，默认为None。
+            mode (int, optional): 调度模式，默认为MODE_TICK。
+            tickless (int, optional): 无节拍低功耗模式，默认为TICKLESS_OFF；开启时强制使用MODE_HEAP。
+            profile (bool, optional): 是否开启任务执行统计，默认为False。统计数组在添加任务时预分配，
+                                      执行路径中不分配内存。
+            err_limit (int, optional): 熔断阈值，任务连续失败该次数后自动暂停并退避重试，
+                                       默认为ERR_LIMIT，为0时不熔断。
 
         Returns:
             None
@@ -187,7 +596,44 @@ class Scheduler():
         self._task_err  = task_err
         self._interval  = interval
         self._tmr       = tm
-        self._tmr.init(period=interval, callback=self._tmrirq)
+        self._tickless  = tickless
+        self._profile   = profile
+        # 无节拍模式依赖截止时刻，强制使用堆调度
+        if tickless != Scheduler.TICKLESS_OFF:
+            mode = Scheduler.MODE_HEAP
+        self._mode      = mode
+        # 最小堆，按任务截止时刻排序（仅MODE_HEAP使用）
+        self._heap      = []
+        # 是否有恢复运行但尚未重新入堆的任务
+        self._dirty     = False
+        # 绑定了事件的任务，以及是否有已触发但尚未处理的事件（由Event.set()在中断中设置）
+        self._evtasks   = []
+        self._evpending = False
+        # 正在执行的任务及其开始时刻（ticks_ms），供看门狗检测卡死的任务
+        self._cur       = None
+        self._cur_t0    = 0
+        self._watchdog  = None
+        # 多核相关：所在核心、核心1子调度器、保护任务结构的锁
+        self._core      = 0
+        self._core1     = None
+        self._lock      = None
+        self._running   = False
+        # 核心统计：执行次数、累计忙碌时间，用于计算核心负载
+        self._cstats    = array('i', [0, 0, 0, ticks_ms()])
+        # 熔断阈值与处于熔断状态的任务数
+        self._err_limit = err_limit
+        self._ntripped  = 0
+        # 错误环形缓冲区，_err_head 指向最近一条记录
+        self._err_task  = [None] * _ERR_RING_SIZE
+        self._err_type  = [None] * _ERR_RING_SIZE
+        self._err_ts    = array('i', [0] * _ERR_RING_SIZE)
+        self._err_cnt   = array('i', [0] * _ERR_RING_SIZE)
+        self._err_head  = 0
+        if mode == Scheduler.MODE_TICK:
+            self._tmr.init(period=interval, callback=self._tmrirq)
+        elif tickless != Scheduler.TICKLESS_OFF and tm is not None:
+            # 停止周期定时器，避免其中断反复唤醒CPU
+            self._tmr.deinit()
 
     def _tmrirq(self, t: Timer) -> None:
         """
@@ -206,6 +652,165 @@ class Scheduler():
                 # 任务_tasks[i]的执行时间间隔+1
                 self._tasks[i]._rt += 1
 
+    def _exec(self, task: Task, late: int = 0) -> None:
+        """
+        执行任务回调函数，捕获异常并转交任务错误回调函数。
+
+        Args:
+            task (Task): 任务实例。
+            late (int, optional): 本次执行相对应执行时刻的延迟，单位为毫秒，仅用于统计。
+
+        Returns:
+            None
+        """
+        if self._profile:
+            t0 = ticks_us()
+        # 先写开始时刻再写任务，看门狗中断读到任务时开始时刻已有效
+        self._cur_t0 = ticks_ms()
+        self._cur = task
+        try:
+            task.run()
+            if task._hb:
+                task._beat = ticks_ms()
+            if task._fails:
+                # 成功执行，清零连续失败次数与退避时长
+                task._fails = 0
+                task._backoff = 0
+        except Exception as e:
+            # 若是发生异常，则记录异常并执行任务错误回调函数
+            self._on_error(task, e)
+        self._cur = None
+        if self._profile:
+            dt = ticks_diff(ticks_us(), t0)
+            self._record(task, dt, late)
+            # 核心负载统计，累计时间按ms+us余数保存，避免长整型
+            cs = self._cstats
+            cs[_C_RUNS] += 1
+            us = cs[_C_BUSY_US] + dt
+            if us >= 1000:
+                cs[_C_BUSY_MS] += us // 1000
+                us %= 1000
+            cs[_C_BUSY_US] = us
+
+    def _record(self, task: Task, dt: int, late: int) -> None:
+        """
+        将一次执行的耗时、启动延迟与错过周期数写入任务的预分配统计数组，不分配内存。
+
+        Args:
+            task (Task): 任务实例。
+            dt (int): 本次执行耗时，单位为微秒。
+            late (int): 本次启动延迟，单位为毫秒。
+
+        Returns:
+            None
+        """
+        st = task._stats
+        if st is None:
+            return
+        n = st[_S_RUNS]
+        if n == 0 or dt < st[_S_RT_MIN]:
+            st[_S_RT_MIN] = dt
+        if dt > st[_S_RT_MAX]:
+            st[_S_RT_MAX] = dt
+        if n == 0 or late < st[_S_LAT_MIN]:
+            st[_S_LAT_MIN] = late
+        if late > st[_S_LAT_MAX]:
+            st[_S_LAT_MAX] = late
+        if n < _SUM_LIMIT:
+            st[_S_RUNS] = n + 1
+        # 累加值接近小整数上限时减半，平均值保持不变
+        if st[_S_RT_SUM] > _SUM_LIMIT - dt or st[_S_LAT_SUM] > _SUM_LIMIT - late:
+            st[_S_RT_SUM] >>= 1
+            st[_S_LAT_SUM] >>= 1
+            st[_S_RT_N] >>= 1
+        st[_S_RT_SUM] += dt
+        st[_S_LAT_SUM] += late
+        st[_S_RT_N] += 1
+        # 延迟超过一个周期，说明错过了执行时隙
+        if task._intv > 0 and late >= task._intv:
+            st[_S_OVR] += late // task._intv
+        # 直方图：<64us为第0桶，此后每桶上限翻倍
+        b = 0
+        edge = 64
+        while b < _HIST_BUCKETS - 1 and dt >= edge:
+            b += 1
+            edge <<= 1
+        st[_S_HIST + b] += 1
+
+    def _on_error(self, task: Task, e: Exception) -> None:
+        """
+        记录任务异常并调用任务错误回调函数，连续失败达到熔断阈值时自动暂停任务。
+
+        同一任务连续抛出同类型异常时合并为环形缓冲区中的一条记录，只累加次数并更新时刻。
+
+        Args:
+            task (Task): 抛出异常的任务。
+            e (Exception): 异常对象。
+
+        Returns:
+            None
+        """
+        now = ticks_ms()
+        et = type(e)
+        i = self._err_head
+        if self._err_task[i] is task and self._err_type[i] is et:
+            if self._err_cnt[i] < _SUM_LIMIT:
+                self._err_cnt[i] += 1
+        else:
+            i = (i + 1) % _ERR_RING_SIZE
+            self._err_head = i
+            self._err_task[i] = task
+            self._err_type[i] = et
+            self._err_cnt[i] = 1
+        self._err_ts[i] = now
+        if self._task_err:
+            self._task_err(e)
+        # 任务在回调中删除了自身时不再熔断
+        if self._err_limit <= 0 or task._sched is not self:
+            return
+        task._fails += 1
+        if task._fails >= self._err_limit and task._state == Task.TASK_RUN:
+            # 熔断：暂停任务，退避时长从BACKOFF_MIN_MS起每次翻倍
+            b = task._backoff * 2 if task._backoff else Scheduler.BACKOFF_MIN_MS
+            if b > Scheduler.BACKOFF_MAX_MS:
+                b = Scheduler.BACKOFF_MAX_MS
+            task._backoff = b
+            task._retry = ticks_add(now, b)
+            task._tripped = True
+            self._ntripped += 1
+            task.pause()
+            print('task {} paused for {}ms after {} errors'.format(task._pos, b, task._fails))
+
+    def _untrip(self, task: Task) -> None:
+        """
+        结束任务的熔断状态并恢复试运行，试运行失败一次即重新熔断。
+
+        Args:
+            task (Task): 处于熔断状态的任务。
+
+        Returns:
+            None
+        """
+        task._tripped = False
+        self._ntripped -= 1
+        task._fails = self._err_limit - 1
+        self.resume(task)
+
+    def _retry_due(self) -> None:
+        """
+        恢复熔断暂停时间已到的任务。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        now = ticks_ms()
+        for task in self._tasks:
+            if task._tripped and ticks_diff(now, task._retry) >= 0:
+                self._untrip(task)
+
     def _run(self, task: Task) -> None:
         """
         执行单个任务回调函数。
@@ -216,22 +821,348 @@ class Scheduler():
         Returns:
             None
         """
-        # 判断任务状态是否为TASK_RUN
-        if task._state == Task.TASK_RUN:
-            try:
-                # 判断任务执行时间间隔是否大于等于任务需要执行的时间间隔
-                if task._rt >= task._cnt:
-                    # 若是，则执行任务回调函数
+        # 判断任务状态是否为TASK_RUN，只由事件触发的任务不参与节拍计数
+        if task._state == Task.TASK_RUN and not task._evonly:
+            # 判断任务执行时间间隔是否大于等于任务需要执行的时间间隔
+            rt = task._rt
+            cnt = task._cnt
+            if rt >= cnt:
+                # 若是，则按补偿策略扣除节拍后执行任务回调函数，多累加的节拍即为启动延迟
+                policy = task._policy
+                if cnt <= 0 or policy == Task.CATCHUP_ONCE:
                     task._rt = 0
-                    task.run()
-            except Exception as e:
-                # 若是发生异常，则执行任务错误回调函数
-                if self._task_err:
-                    self._task_err(e)
+                elif policy == Task.CATCHUP_BURST and rt < cnt * (Task.BURST_LIMIT + 1):
+                    task._rt = rt - cnt
+                else:
+                    # 只保留不足一个周期的余数，保持相位
+                    task._rt = rt % cnt
+                self._exec(task, (rt - cnt) * self._interval)
+
+    # ---------- 最小堆（按截止时刻排序，task._hidx 为堆内句柄） ----------
+
+    def _hup(self, i: int) -> None:
+        """
+        堆元素上浮，恢复最小堆性质。
+
+        Args:
+            i (int): 待上浮元素的下标。
+
+        Returns:
+            None
+        """
+        heap = self._heap
+        task = heap[i]
+        dl = task._deadline
+        while i > 0:
+            p = (i - 1) >> 1
+            parent = heap[p]
+            # 使用ticks_diff比较，保证ticks_ms回绕时顺序正确
+            if ticks_diff(dl, parent._deadline) >= 0:
+                break
+            heap[i] = parent
+            parent._hidx = i
+            i = p
+        heap[i] = task
+        task._hidx = i
+
+    def _hdown(self, i: int) -> None:
+        """
+        堆元素下沉，恢复最小堆性质。
+
+        Args:
+            i (int): 待下沉元素的下标。
+
+        Returns:
+            None
+        """
+        heap = self._heap
+        n = len(heap)
+        task = heap[i]
+        dl = task._deadline
+        while True:
+            c = 2 * i + 1
+            if c >= n:
+                break
+            if c + 1 < n and ticks_diff(heap[c + 1]._deadline, heap[c]._deadline) < 0:
+                c += 1
+            child = heap[c]
+            if ticks_diff(child._deadline, dl) >= 0:
+                break
+            heap[i] = child
+            child._hidx = i
+            i = c
+        heap[i] = task
+        task._hidx = i
+
+    def _hpush(self, task: Task) -> None:
+        """
+        将任务按截止时刻压入最小堆。
+
+        Args:
+            task (Task): 任务实例。
+
+        Returns:
+            None
+        """
+        self._heap.append(task)
+        self._hup(len(self._heap) - 1)
+
+    def _hremove(self, task: Task) -> None:
+        """
+        通过任务句柄将任务从最小堆中移除，复杂度O(log n)。
+
+        Args:
+            task (Task): 任务实例。
+
+        Returns:
+            None
+        """
+        i = task._hidx
+        if i < 0:
+            return
+        heap = self._heap
+        last = heap.pop()
+        task._hidx = -1
+        if last is not task:
+            heap[i] = last
+            last._hidx = i
+            self._hdown(i)
+            self._hup(last._hidx)
+
+    def _requeue(self) -> None:
+        """
+        将恢复运行但不在堆中的任务重新入堆，截止时刻为当前时刻加任务间隔。
+
+        暂停/恢复可能在中断回调中调用，为避免在中断中修改堆结构，
+        resume() 只设置 _dirty 标志，由主循环在此处统一完成入堆。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self._dirty = False
+        now = ticks_ms()
+        for task in self._tasks:
+            if task._state == Task.TASK_RUN and task._hidx < 0 and not task._evonly:
+                task._deadline = ticks_add(now, task._intv)
+                self._hpush(task)
+
+    def _next_deadline(self, task: Task, now: int, late: int) -> int:
+        """
+        按任务的补偿策略计算下一次截止时刻。
+
+        截止时刻在上一次截止时刻的基础上累加任务间隔，而非以执行时刻为起点，
+        因此任务执行耗时与启动延迟不会累积为长期漂移，且间隔不受定时器节拍截断。
+        间隔为0的任务按1ms计算，与节拍模式一样每轮循环最多执行一次。
+
+        Args:
+            task (Task): 任务实例。
+            now (int): 当前时刻（ticks_ms）。
+            late (int): 本次启动相对截止时刻的延迟，单位为毫秒。
+
+        Returns:
+            int: 下一次截止时刻（ticks_ms）。
+        """
+        intv = task._intv
+        policy = task._policy
+        if intv <= 0:
+            # 截止时刻晚于当前时刻，否则任务会回到堆顶，在同一次 _run_due() 中反复执行
+            return ticks_add(now, 1)
+        if policy == Task.CATCHUP_ONCE:
+            return ticks_add(now, intv)
+        if policy == Task.CATCHUP_BURST and late < intv * Task.BURST_LIMIT:
+            # 逐个周期补执行
+            return ticks_add(task._deadline, intv)
+        # 跳过错过的周期，下一次截止时刻保持原有相位且晚于当前时刻
+        return ticks_add(task._deadline, (late // intv + 1) * intv)
+
+    def _run_due(self) -> None:
+        """
+        堆调度模式下执行所有已到期的任务，只访问堆顶已到期的任务。
+
+        只执行进入本函数时已到期的任务，执行期间新到期的任务留到下一轮循环，
+        避免空闲回调、事件与喂狗被饿死。已暂停的任务到期出堆后不再入堆，恢复时由 _requeue() 重新加入。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        # 核心1子调度器的任务结构可能被核心0修改，出堆/入堆时加锁；
+        # 执行回调前释放锁，核心0的 run()/delete() 不必等待回调结束，回调中也可以操作其他核心1任务
+        lock = self._lock
+        heap = self._heap
+        start = ticks_ms()
+        while True:
+            if lock:
+                lock.acquire()
+            try:
+                if self._dirty:
+                    self._requeue()
+                if not heap:
+                    return
+                task = heap[0]
+                if ticks_diff(task._deadline, start) > 0:
+                    return
+                self._hremove(task)
+                if task._state != Task.TASK_RUN:
+                    continue
+                now = ticks_ms()
+                late = ticks_diff(now, task._deadline)
+                # 先重新入堆再执行，使任务在回调中删除/暂停自身时状态一致
+                task._deadline = self._next_deadline(task, now, late)
+                self._hpush(task)
+            finally:
+                if lock:
+                    lock.release()
+            self._exec(task, late)
+
+    def _run_events(self) -> None:
+        """
+        执行事件已触发的任务，启动延迟为事件触发时刻到执行时刻的间隔。
+
+        先清除事件标志再执行回调，回调执行期间再次触发的事件会在下一轮循环中处理；
+        任务暂停期间触发的事件被丢弃。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        # 与 _run_due() 相同，只在读取与清除事件标志时加锁，执行回调时不持有锁
+        lock = self._lock
+        evtasks = self._evtasks
+        self._evpending = False
+        i = 0
+        while True:
+            if lock:
+                lock.acquire()
+            try:
+                if i >= len(evtasks):
+                    return
+                task = evtasks[i]
+                i += 1
+                evt = task._event
+                fire = evt._flag and task._state == Task.TASK_RUN
+                evt._flag = False
+                if fire:
+                    late = ticks_diff(ticks_ms(), evt._t)
+            finally:
+                if lock:
+                    lock.release()
+            if fire:
+                self._exec(task, late)
+
+    def next_wait_ms(self) -> int:
+        """
+        返回距下一个任务截止时刻的毫秒数，可用于在空闲回调中判断剩余的空闲时间。
+
+        无任务在堆中时返回 MAX_SLEEP_MS；已有任务到期、有待入堆任务或有未处理的事件时返回0。
+        处于熔断状态的任务按其自动恢复时刻计算。MODE_TICK 模式下按各任务剩余节拍数估算，
+        当前节拍已经过的时间未知，结果少算一个节拍，偏保守。
+
+        Args:
+            None
+
+        Returns:
+            int: 距下一个截止时刻的毫秒数，不超过MAX_SLEEP_MS。
+        """
+        if self._dirty or self._evpending:
+            return 0
+        now = ticks_ms()
+        wait = Scheduler.MAX_SLEEP_MS
+        if self._heap:
+            wait = ticks_diff(self._heap[0]._deadline, now)
+        elif self._mode == Scheduler.MODE_TICK:
+            for task in self._tasks:
+                if task._state == Task.TASK_RUN and not task._evonly:
+                    w = (task._cnt - task._rt - 1) * self._interval
+                    if w < wait:
+                        wait = w
+        if self._ntripped:
+            # 熔断任务的恢复时刻同样视为截止时刻
+            for task in self._tasks:
+                if task._tripped:
+                    w = ticks_diff(task._retry, now)
+                    if w < wait:
+                        wait = w
+        if wait <= 0:
+            return 0
+        if wait > Scheduler.MAX_SLEEP_MS:
+            return Scheduler.MAX_SLEEP_MS
+        return wait
+
+    def _sleep(self) -> None:
+        """
+        无节拍模式下睡眠至下一个任务截止时刻。
+
+        等待时间不小于 LIGHTSLEEP_MIN_MS 且选择 TICKLESS_LIGHTSLEEP 时调用 machine.lightsleep()，
+        否则调用 machine.idle() 等待任意中断。引脚中断会提前唤醒CPU，
+        中断回调中恢复的任务将在下一轮循环中入堆。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        wait = self.next_wait_ms()
+        if wait <= 0:
+            return
+        # 开启看门狗时，单次睡眠不超过喂狗周期
+        wd = self._watchdog
+        if wd is not None and wait > wd._feed_ms:
+            wait = wd._feed_ms
+        if self._core == 1:
+            # 核心1没有本地中断源，分段睡眠，以便及时响应核心0恢复的任务
+            while wait > 0 and self._running and not self._dirty and not self._evpending:
+                step = wait if wait < _CORE1_POLL_MS else _CORE1_POLL_MS
+                sleep_ms(step)
+                wait -= step
+            return
+        if (self._tickless == Scheduler.TICKLESS_LIGHTSLEEP and _lightsleep
+                and wait >= Scheduler.LIGHTSLEEP_MIN_MS):
+            _lightsleep(wait)
+        else:
+            machine.idle()
+
+    def _get_core1(self) -> "Scheduler":
+        """
+        获取核心1上的子调度器，首次调用时创建。
+
+        子调度器使用 MODE_HEAP（核心1上没有定时器中断），空闲时按下一个截止时刻睡眠，
+        并继承本调度器的错误回调、统计开关与熔断阈值。
+
+        Args:
+            None
+
+        Returns:
+            Scheduler: 核心1上的子调度器。
+
+        Raises:
+            ValueError: 当前端口不支持 _thread，无法使用第二个核心。
+        """
+        if self._core1 is None:
+            if _thread is None:
+                raise ValueError('core 1 requires _thread support')
+            sub = Scheduler(None, interval=self._interval, task_err=self._task_err,
+                            mode=Scheduler.MODE_HEAP, tickless=Scheduler.TICKLESS_IDLE,
+                            profile=self._profile, err_limit=self._err_limit)
+            sub._core = 1
+            sub._lock = _thread.allocate_lock()
+            self._core1 = sub
+        return self._core1
 
     def scheduler(self) -> None:
         """
-        调度器的主循环，负责循环执行所有已注册的任务。
+        启动调度器：若存在核心1任务，先在核心1上启动子调度器的主循环，再在当前核心运行主循环。
+        挂接了看门狗服务时，进入主循环前启动看门狗。
+
+        主循环因 KeyboardInterrupt 退出时，同时通知核心1的子调度器停止。
 
         Args:
             None
@@ -239,17 +1170,54 @@ class Scheduler():
         Returns:
             None
         """
+        self._running = True
+        core1 = self._core1
+        if core1 is not None and not core1._running:
+            core1._running = True
+            _thread.start_new_thread(core1._loop, ())
+        if self._watchdog is not None:
+            self._watchdog.start()
+        self._loop()
+        if core1 is not None:
+            core1._running = False
+        self._running = False
+
+    def _loop(self) -> None:
+        """
+        调度器的主循环，负责循环执行所有已注册的任务。
+
+        Args:
+            None
 
+        Returns:
+            None
+        """
         # 轮询检测任务状态，判断是否执行任务
-        while True:
+        while self._running:
             try:
-                # 执行到达执行时间间隔的任务
-                for i in range(len(self._tasks)):
-                    task = self._tasks[i]
-                    self._run(task)
+                # 恢复熔断暂停时间已到的任务
+                if self._ntripped:
+                    self._retry_due()
+                # 优先执行事件已触发的任务
+                if self._evpending:
+                    self._run_events()
+                if self._mode == Scheduler.MODE_HEAP:
+                    # 只执行堆顶已到期的任务
+                    self._run_due()
+                else:
+                    # 执行到达执行时间间隔的任务
+                    for i in range(len(self._tasks)):
+                        task = self._tasks[i]
+                        self._run(task)
                 # 若空闲，则执行任务空闲回调函数
                 if self._task_idle:
                     self._task_idle()
+                # 所有任务存活时喂狗
+                if self._watchdog is not None:
+                    self._watchdog.feed()
+                # 无节拍模式下睡眠至下一个截止时刻
+                if self._tickless != Scheduler.TICKLESS_OFF:
+                    self._sleep()
             except KeyboardInterrupt:
                 return
             # 发生异常时，抛出异常位置和类型
@@ -258,18 +1226,17 @@ class Scheduler():
 
     def find(self, task: Task) -> int:
         """
-        查找指定任务在任务列表中的索引。
+        查找指定任务在任务列表中的索引，通过任务句柄实现O(1)查找。
 
         Args:
             task (Task): 待查找的任务实例。
 
         Returns:
-            int: 任务在任务列表中的索引。
+            int: 任务在任务列表中的索引，未找到时返回None。
         """
-        try:
-            return self._tasks.index(task)
-        except:
-            return None
+        if task._sched is self:
+            return task._pos
+        return None
 
     def clear(self) -> None:
         """
@@ -281,24 +1248,64 @@ class Scheduler():
         Returns:
             None
         """
+        for task in self._tasks:
+            task._sched = None
+            task._pos = -1
+            task._hidx = -1
+            task._tripped = False
+        self._ntripped = 0
+        for task in self._evtasks:
+            task._event._sched = None
+            task._event._task = None
         self._tasks.clear()
+        self._heap.clear()
+        self._evtasks.clear()
 
-    def add(self, task: Task, state: int = Task.TASK_RUN) -> None:
+    def add(self, task: Task, state: int = Task.TASK_RUN, core: int = 0) -> None:
         """
         添加任务到任务列表中。
 
         Args:
             task (Task): 任务实例，需要添加的任务。
             state (int, optional): 任务状态，默认为Task.TASK_RUN，表示任务正在运行。
+            core (int, optional): 运行任务的核心编号，默认为0；为1时任务由核心1上的子调度器执行。
 
         Returns:
             None
+
+        Raises:
+            ValueError: core为1但当前端口不支持 _thread，或任务的事件已绑定其他任务。
         """
+        if core == 1 and self._core == 0:
+            self._get_core1().add(task, state)
+            return
         if self.find(task) == None:
+            evt = task._event
+            if evt is not None:
+                if evt._task is not None and evt._task is not task:
+                    raise ValueError('event already bound to another task')
+                # 绑定事件，此后event.set()会通知本调度器
+                evt._task = task
+                evt._sched = self
+                self._evtasks.append(task)
+            task._sched = self
+            task._pos = len(self._tasks)
+            task._beat = ticks_ms()
             self._tasks.append(task)
             # task._cnt为任务需要执行的时间间隔
             # 任务需要执行的时间间隔 = 任务间隔 // 定时器间隔
             task._cnt = task._intv // self._interval
+            if self._mode == Scheduler.MODE_TICK and task._intv % self._interval:
+                # 节拍模式下间隔会被截断为定时器间隔的整数倍，堆调度模式无此限制
+                print('warning: task interval {}ms truncated to {}ms, use MODE_HEAP for exact timing'.format(
+                    task._intv, task._cnt * self._interval))
+            if self._profile:
+                # 统计数组在此预分配，执行路径中只做原地更新
+                task._stats = array('i', [0] * _STATS_LEN)
+            if self._mode == Scheduler.MODE_HEAP and not task._evonly:
+                # 截止时刻 = 当前时刻 + 任务间隔
+                task._deadline = ticks_add(ticks_ms(), task._intv)
+                self._hpush(task)
             print('add task:', task._callback.__name__)
         if state == Task.TASK_STOP:
             self.pause(task)
@@ -313,11 +1320,38 @@ class Scheduler():
         Returns:
             None
         """
-        try:
-            # 删除指定任务
-            self._tasks.remove(task)
-        except:
+        if self._core1 is not None and task._sched is self._core1:
+            self._core1.delete(task)
+            return
+        pos = self.find(task)
+        if pos == None:
             print('del task <', task, '> error')
+            return
+        # 其他核心修改本调度器的任务结构时需加锁（执行回调时不持有锁，核心1任务删除自身时同样加锁）
+        lock = self._lock
+        if lock:
+            lock.acquire()
+        try:
+            # 删除指定任务，并更新其后任务的句柄
+            self._tasks.pop(pos)
+            for i in range(pos, len(self._tasks)):
+                self._tasks[i]._pos = i
+            self._hremove(task)
+            if task._tripped:
+                task._tripped = False
+                self._ntripped -= 1
+            evt = task._event
+            if evt is not None and evt._task is task:
+                self._evtasks.remove(task)
+                # _run_events() 按下标遍历，删除后其后的任务前移，重新检查一轮以免漏掉已触发的事件
+                self._evpending = True
+                evt._sched = None
+                evt._task = None
+            task._sched = None
+            task._pos = -1
+        finally:
+            if lock:
+                lock.release()
 
     def pause(self, task: Task) -> None:
         """
@@ -329,8 +1363,14 @@ class Scheduler():
         Returns:
             None
         """
-        if self.find(task) != None:
-            self._tasks[self.find(task)].pause()
+        if self._core1 is not None and task._sched is self._core1:
+            self._core1.pause(task)
+        elif self.find(task) != None:
+            # 手动暂停的任务不再自动恢复
+            if task._tripped:
+                task._tripped = False
+                self._ntripped -= 1
+            task.pause()
 
     def resume(self, task: Task) -> None:
         """
@@ -342,8 +1382,20 @@ class Scheduler():
         Returns:
             None
         """
-        if self.find(task) != None:
-            self._tasks[self.find(task)].resume()
+        if self._core1 is not None and task._sched is self._core1:
+            self._core1.resume(task)
+        elif self.find(task) != None:
+            # 手动恢复时结束熔断状态
+            if task._tripped:
+                task._tripped = False
+                self._ntripped -= 1
+            # 暂停期间不计入心跳超时
+            task._beat = ticks_ms()
+            task.resume()
+            # 堆调度模式下，若任务已出堆，则由主循环重新入堆；
+            # 节拍模式下任务不入堆（_hidx恒为-1），不能设置 _dirty，否则 next_wait_ms() 一直返回0
+            if self._mode == Scheduler.MODE_HEAP and task._hidx < 0 and not task._evonly:
+                self._dirty = True
 
     def run(self, task: Task) -> None:
         """
@@ -355,9 +1407,131 @@ class Scheduler():
         Returns:
             None
         """
-        if self.find(task) != None:
-            task._rt = task._cnt
-            self._run(task)
+        core1 = self._core1
+        if core1 is not None and task._sched is core1 and task._evonly:
+            # 只由事件触发的核心1任务，通过触发其事件请求核心1执行
+            task._event.set()
+        elif core1 is not None and task._sched is core1:
+            # 核心1任务不能在核心0上执行，只将其截止时刻提前到当前时刻，由核心1尽快执行
+            core1._lock.acquire()
+            try:
+                core1._hremove(task)
+                if task._state == Task.TASK_RUN:
+                    task._deadline = ticks_ms()
+                    core1._hpush(task)
+            finally:
+                core1._lock.release()
+        elif self.find(task) != None:
+            if task._evonly:
+                if task._state == Task.TASK_RUN:
+                    self._exec(task)
+            elif self._mode == Scheduler.MODE_HEAP:
+                if task._state == Task.TASK_RUN:
+                    # 立即执行，并以当前时刻重新计算截止时刻
+                    self._hremove(task)
+                    task._deadline = ticks_add(ticks_ms(), task._intv)
+                    self._hpush(task)
+                    self._exec(task)
+            else:
+                task._rt = task._cnt
+                self._run(task)
+
+    def stats(self) -> None:
+        """
+        打印所有任务的执行统计表，可在REPL中直接调用，输出经UART/USB串口显示。
+
+        每行包括：任务序号与名称、执行间隔、执行次数、执行时间最小/平均/最大值（us）、
+        启动延迟最小/平均/最大值（ms）、错过的周期数，以及执行时间直方图。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if not self._profile:
+            print('stats: profile disabled, create Scheduler with profile=True')
+            return
+        cs = self._cstats
+        elapsed = ticks_diff(ticks_ms(), cs[_C_T0])
+        print('core{}: tasks {}, runs {}, busy {}ms / {}ms, load {}%'.format(
+            self._core, len(self._tasks), cs[_C_RUNS], cs[_C_BUSY_MS], elapsed,
+            cs[_C_BUSY_MS] * 100 // elapsed if elapsed > 0 else 0))
+        print('id name               intv   runs  rt_min  rt_avg  rt_max  lat_min lat_avg lat_max  miss')
+        for task in self._tasks:
+            st = task._stats
+            cb = task._callback
+            name = getattr(cb, '__name__', '?')
+            # 绑定方法显示为 类名.方法名，便于区分多个 tick
+            owner = getattr(cb, '__self__', None)
+            if owner is not None:
+                name = type(owner).__name__ + '.' + name
+            n = st[_S_RT_N]
+            rt_avg = st[_S_RT_SUM] // n if n else 0
+            lat_avg = st[_S_LAT_SUM] // n if n else 0
+            print('{:<2} {:<18} {:>5} {:>6} {:>7} {:>7} {:>7} {:>8} {:>7} {:>7} {:>5}'.format(
+                task._pos, name[:18], task._intv, st[_S_RUNS],
+                st[_S_RT_MIN], rt_avg, st[_S_RT_MAX],
+                st[_S_LAT_MIN], lat_avg, st[_S_LAT_MAX], st[_S_OVR]))
+            print('   hist(us) <{}: {}'.format(
+                '/<'.join(str(e) for e in Scheduler.HIST_EDGES_US) + '/>=',
+                '/'.join(str(st[_S_HIST + b]) for b in range(_HIST_BUCKETS))))
+        if self._core1 is not None:
+            self._core1.stats()
+
+    def stats_reset(self) -> None:
+        """
+        清零所有任务的执行统计。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        for task in self._tasks:
+            st = task._stats
+            if st is not None:
+                for i in range(_STATS_LEN):
+                    st[i] = 0
+        cs = self._cstats
+        cs[_C_RUNS] = 0
+        cs[_C_BUSY_MS] = 0
+        cs[_C_BUSY_US] = 0
+        cs[_C_T0] = ticks_ms()
+        if self._core1 is not None:
+            self._core1.stats_reset()
+
+    def errors(self) -> None:
+        """
+        打印错误环形缓冲区（由新到旧）与处于熔断状态的任务，可在REPL中直接调用。
+
+        每条记录包括：任务序号与名称、异常类型、连续次数、距今时间（ms）。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        now = ticks_ms()
+        print('core{}: errors (newest first)'.format(self._core))
+        print('id name               type               count   age_ms')
+        i = self._err_head
+        for _ in range(_ERR_RING_SIZE):
+            task = self._err_task[i]
+            if task is not None:
+                name = getattr(task._callback, '__name__', '?')
+                print('{:<2} {:<18} {:<18} {:>5} {:>8}'.format(
+                    task._pos, name[:18], self._err_type[i].__name__[:18],
+                    self._err_cnt[i], ticks_diff(now, self._err_ts[i])))
+            i = (i - 1) % _ERR_RING_SIZE
+        for task in self._tasks:
+            if task._tripped:
+                print('tripped: task {} fails {} backoff {}ms retry in {}ms'.format(
+                    task._pos, task._fails, task._backoff, ticks_diff(task._retry, now)))
+        if self._core1 is not None:
+            self._core1.errors()
 
 # ======================================== 初始化配置 ==========================================
 
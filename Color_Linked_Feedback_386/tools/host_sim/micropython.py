@@ -0,0 +1,66 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/10/27 下午2:10
+# @Author  : 李清水
+# @File    : micropython.py
+# @Description : 主机模拟器中的 micropython 模块替身，schedule 回调由虚拟时钟执行
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+from .clock import CLOCK
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+def const(expr):
+    return expr
+
+
+def native(func):
+    return func
+
+
+viper = native
+
+
+def schedule(func, arg) -> None:
+    CLOCK.schedule(func, arg)
+
+
+def alloc_emergency_exception_buf(size: int) -> None:
+    pass
+
+
+def opt_level(level: int | None = None):
+    return 0 if level is None else None
+
+
+def kbd_intr(chr: int) -> None:
+    pass
+
+
+def heap_lock() -> int:
+    return 0
+
+
+def heap_unlock() -> int:
+    return 0
+
+
+def mem_info(verbose: bool = False) -> None:
+    import gc
+    print("stack: 0 out of 7936")
+    print("GC: total: {}, used: {}, free: {}".format(
+        gc.mem_alloc() + gc.mem_free(), gc.mem_alloc(), gc.mem_free()))
+
+
+def qstr_info(verbose: bool = False) -> None:
+    pass
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ============================================
@@ -8,9 +8,7 @@
 
 # ======================================== 导入相关模块 =========================================
 
-# 显式导出子包或子模块
-from . import bus_step_motor_driver
-from . import pn532_driver
+# 子包在首次访问时才导入，见 __getattr__
 
 # ======================================== 全局变量 ============================================
 
@@ -23,6 +21,14 @@ __all__ = [
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问驱动子包时才导入，`from drivers.xxx import Yyy` 只加载用到的驱动包。"""
+    if name not in __all__:
+        raise AttributeError(name)
+    # 导入子模块时会把它设为包的属性
+    __import__(__name__ + "." + name)
+    return globals()[name]
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ==========================================
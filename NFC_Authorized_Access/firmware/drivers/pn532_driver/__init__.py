@@ -8,8 +8,7 @@
 
 # ======================================== 导入相关模块 =========================================
 
-from .code.pn532 import PN532
-from .code.uart import PN532_UART
+# 导出接口在首次访问时才导入对应子模块，见 __getattr__
 
 # ======================================== 全局变量 ============================================
 
@@ -17,6 +16,17 @@ __all__ = ['PN532', 'PN532_UART']
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问导出名称时才导入定义它的子模块，并缓存到包的命名空间中。"""
+    if name == "PN532":
+        from .code.pn532 import PN532 as value
+    elif name == "PN532_UART":
+        from .code.uart import PN532_UART as value
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ===========================================
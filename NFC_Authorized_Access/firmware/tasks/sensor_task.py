@@ -9,7 +9,7 @@
 # ======================================== 导入相关模块 ============================================
 
 import time
-from firmware.drivers.bus_step_motor_driver import BusStepMotor  # 仅用于类型提示和常量引用,使用thonny删掉firmware.
+from drivers.bus_step_motor_driver import BusStepMotor  # 仅用于类型提示和常量引用
 
 # ======================================== 核心参数配置 ============================================
 # 电机控制参数（与BusStepMotor驱动匹配）
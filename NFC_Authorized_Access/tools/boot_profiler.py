@@ -0,0 +1,541 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/11/13 上午9:40
+# @Author  : 李清水
+# @File    : boot_profiler.py
+# @Description : 设备端启动导入分析：包装__import__记录每个模块的导入耗时与堆内存占用，取回主机生成排序表与火焰图
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+import ast
+import html
+import time
+from pathlib import Path
+
+from raw_repl import RawREPL, RawREPLError
+
+# ======================================== 全局变量 ============================================
+
+# 在设备上执行的分析器：替换builtins.__import__，每次导入记录一条
+# (深度, (名称, level, 导入方模块名, 导入方是否为包, fromlist), 开始时刻us, 耗时us, 堆占用, 自身耗时us, 自身堆占用, 新加载模块数)，
+# 自身耗时/堆占用扣除了嵌套导入的部分；boot.py与main.py由_bp_run执行并以同样方式记录。
+# MicroPython调用被替换的__import__时globals为None，原__import__又按调用者（即_bp_import所在的__main__）解析相对导入，
+# 因此相对导入在包装函数中换算为绝对名称后以level=0调用。导入方依次取：
+#   1. 正在执行模块体的模块：栈顶导入调用尚未加载的各级模块中，最后一个已出现在sys.modules中且未执行完的；
+#   2. 上一条导入语句返回的模块：模块级__getattr__（按需导入的包）在导入语句返回后才执行其中的相对导入。
+# 第一个能找到对应文件（或已加载）的候选即为导入方；都找不到时取第一个，由原__import__报告ImportError。
+PROFILER_SCRIPT = """
+import builtins,sys,time,gc,os
+_bp_orig=builtins.__import__
+_bp_rec=[]
+_bp_stk=[]
+_bp_from=None
+def _bp_enter(pd):
+    _bp_stk.append([time.ticks_us(),gc.mem_free(),len(sys.modules),0,0,0,pd])
+def _bp_exit(key):
+    t,m,n,ct,cm,cn,pd=_bp_stk.pop()
+    dt=time.ticks_diff(time.ticks_us(),t)
+    dm=m-gc.mem_free()
+    dn=len(sys.modules)-n
+    for p in _bp_stk:
+        for x in pd:
+            if x in p[6]:
+                p[6].remove(x)
+    if _bp_stk:
+        p=_bp_stk[-1]
+        p[3]+=dt
+        p[4]+=dm
+        p[5]+=dn
+    _bp_rec.append((len(_bp_stk),key,time.ticks_diff(t,_bp_t0),dt,dm,dt-ct,dm-cm,dn-cn))
+def _bp_pend(name):
+    r=[]
+    s=''
+    for x in name.split('.'):
+        s=s+'.'+x if s else x
+        if s not in sys.modules:
+            r.append(s)
+    return r
+def _bp_has(name):
+    if name in sys.modules:
+        return True
+    p=name.replace('.','/')
+    for d in sys.path:
+        for e in ('.py','.mpy','/__init__.py','/__init__.mpy'):
+            try:
+                os.stat(d+'/'+p+e)
+                return True
+            except OSError:
+                pass
+    return False
+def _bp_abs(name,lv,ctx,pkg):
+    b=ctx if pkg else ctx[:ctx.rfind('.')] if '.' in ctx else ''
+    for _ in range(lv-1):
+        b=b[:b.rfind('.')] if '.' in b else ''
+    if not name:
+        return b
+    return b+'.'+name if b else name
+def _bp_ctx(name,lv):
+    cs=[]
+    if _bp_stk:
+        for x in reversed(_bp_stk[-1][6]):
+            if x in sys.modules:
+                cs.append(x)
+                break
+    if _bp_from and _bp_from not in cs:
+        cs.append(_bp_from)
+    if not cs:
+        raise ImportError('--profile-boot: unknown importer for relative import '+'.'*lv+name)
+    for c in cs+[cs[0]]:
+        pkg=hasattr(sys.modules.get(c),'__path__')
+        full=_bp_abs(name,lv,c,pkg)
+        if _bp_has(full):
+            break
+    return full,c,pkg
+def _bp_import(name,g=None,l=None,f=None,lv=0):
+    global _bp_from
+    prev=_bp_from
+    ctx,pkg,full=None,False,name
+    if lv:
+        if g:
+            ctx,pkg=g.get('__name__'),'__path__' in g
+            full=_bp_abs(name,lv,ctx,pkg)
+        else:
+            full,ctx,pkg=_bp_ctx(name,lv)
+    _bp_enter(_bp_pend(full))
+    try:
+        r=_bp_orig(full,g,l,f,0)
+    finally:
+        _bp_exit((name,lv,ctx,pkg,f))
+    _bp_from=prev if f is True or (lv and not g and ctx==prev) else full
+    return r
+def _bp_run(path):
+    _bp_enter([])
+    try:
+        exec(open(path).read(),{'__name__':'__main__'})
+    finally:
+        _bp_exit((path,0,None,False,None))
+gc.collect()
+builtins.__import__=_bp_import
+_bp_t0=time.ticks_us()
+"""
+
+# 按启动顺序运行boot.py与main.py，不等待结束（main.py通常是无限循环）；
+# 各自捕获异常，boot.py出错时main.py照常运行，异常以"@E 路径 异常"一行输出，支持时随后打印调用栈
+RUN_SCRIPT = """
+for _bp_p in ('/boot.py','/main.py'):
+    try:
+        _bp_run(_bp_p)
+    except Exception as _bp_e:
+        print('@E',_bp_p,repr(_bp_e))
+        if hasattr(sys,'print_exception'):
+            sys.print_exception(_bp_e)
+"""
+
+# 中断后取回记录并恢复原来的__import__，每条记录输出一行"@B 记录"
+DUMP_SCRIPT = """
+builtins.__import__=_bp_orig
+for r in _bp_rec:
+    print('@B',repr(r))
+"""
+
+# 火焰图中每层的高度（像素）
+FLAME_ROW = 22
+
+# ======================================== 功能函数 ============================================
+
+
+def parse_records(output: str) -> list[dict]:
+    """
+    解析DUMP_SCRIPT的输出，还原相对导入的完整模块名，按开始时刻排序返回。
+
+    Args:
+        output (str): 设备输出。
+
+    Returns:
+        list[dict]: 每次导入一条记录，键为depth、name、start_us、total_us、total_mem、self_us、self_mem、new_modules。
+
+    ==========================================
+
+    Parse the output of DUMP_SCRIPT, resolve the full module name of relative imports, and return the records sorted
+    by start time.
+
+    Args:
+        output (str): Device output.
+
+    Returns:
+        list[dict]: One record per import, keys depth, name, start_us, total_us, total_mem, self_us, self_mem and new_modules.
+    """
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("@B "):
+            continue
+        depth, key, start, total, mem, self_us, self_mem, new = ast.literal_eval(line[3:].strip())
+        name, level, importer, is_pkg, fromlist = key
+        if level and importer is None:
+            # 设备端未能确定导入方（导入失败），保留相对形式
+            name = "." * level + name
+        elif level:
+            # 相对导入：以导入方所在的包为基准，level每多1向上一级
+            base = importer if is_pkg else importer.rpartition(".")[0]
+            for _ in range(level - 1):
+                base = base.rpartition(".")[0]
+            name = f"{base}.{name}" if name else f"{base}.{','.join(fromlist or ())}"
+        records.append({
+            "depth": depth, "name": name, "start_us": start, "total_us": total, "total_mem": mem,
+            "self_us": self_us, "self_mem": self_mem, "new_modules": new,
+        })
+    records.sort(key=lambda r: (r["start_us"], r["depth"]))
+    return records
+
+
+def parse_errors(output: str) -> list[str]:
+    """
+    从固件输出中取出RUN_SCRIPT报告的异常：每个"@E"行连同其后的调用栈合为一条。
+
+    Args:
+        output (str): 运行boot.py与main.py期间的设备输出。
+
+    Returns:
+        list[str]: 每个异常一条文本，首行为"路径 异常"。
+
+    ==========================================
+
+    Extract the exceptions reported by RUN_SCRIPT from the firmware output: each "@E" line together with the
+    traceback after it becomes one entry.
+
+    Args:
+        output (str): Device output while boot.py and main.py run.
+
+    Returns:
+        list[str]: One text per exception, the first line being "path exception".
+    """
+    errors = []
+    lines = output.replace("\r", "").splitlines()
+    for i, line in enumerate(lines):
+        if not line.startswith("@E "):
+            continue
+        block = [line[3:]]
+        if i + 1 < len(lines) and lines[i + 1].startswith("Traceback"):
+            # 调用栈：Traceback行、缩进的File行，最后一行为异常类型与信息
+            j = i + 2
+            while j < len(lines) and lines[j].startswith(" "):
+                j += 1
+            block += lines[i + 1:j + 1]
+        errors.append("\n".join(block))
+    return errors
+
+
+def _ms(us: int) -> str:
+    return f"{us / 1000:.1f}"
+
+
+# ======================================== 自定义类 ============================================
+
+
+class BootProfiler:
+    """
+    启动导入分析器：在设备上以包装过的__import__运行boot.py与main.py，记录每个模块的导入耗时与堆内存占用，取回主机生成报告。
+
+    分析在一个raw REPL会话中完成，不在设备上写任何文件：
+    1. 打开会话（raw REPL内软复位，得到未导入任何模块的干净解释器），执行PROFILER_SCRIPT替换builtins.__import__；
+    2. 不等待结束地依次运行/boot.py与/main.py，等待duration秒（应长于main.py开始采样前的初始化与延时），
+       两者分别捕获异常，boot.py出错不影响main.py运行，设备端异常总是显示在终端中；
+    3. 中断程序，执行DUMP_SCRIPT取回记录并恢复__import__，最后软复位让设备正常运行。
+    每次import语句都会调用__import__，已加载模块的导入（new_modules为0且只查表）在报告中合并统计。
+
+    Attributes:
+        deployer (MPYDeployer): 提供端口的部署器。
+        duration (float): 运行boot.py与main.py后等待的时间，单位为秒。
+        records (list[dict]): 取回的导入记录，见parse_records()。
+        errors (list[str]): boot.py与main.py运行时抛出的异常，见parse_errors()。
+
+    Methods:
+        __init__(deployer, duration=6.0) -> None: 初始化分析器。
+        run() -> list[dict]: 在设备上执行分析并取回记录。
+        format_table(top=0) -> str: 按自身耗时排序的导入表。
+        format_flame(width=40) -> str: 按导入顺序缩进的文本火焰图。
+        write_html(path) -> None: 写出HTML火焰图。
+
+    Notes:
+        1. 设备固件需启用MICROPY_CAN_OVERRIDE_BUILTINS（rp2等官方端口默认启用），否则替换__import__不生效，记录为空。
+        2. 堆占用为导入前后gc.mem_free()之差，导入过程中发生垃圾回收时可能偏小甚至为负；记录本身占用的少量内存计入上层导入。
+        3. 重新运行main.py不经过硬件复位，外设初始化耗时可能与掉电复位后略有不同。
+        4. MicroPython调用被替换的__import__时不传globals，相对导入的导入方按调用栈与上一条导入推断（见PROFILER_SCRIPT上方注释），
+           推断依据sys.path下的文件，冻结在固件中的包内相对导入按第一个候选解析，个别情况下记录的模块名可能不准确。
+
+    ==========================================
+
+    Boot import profiler: runs boot.py and main.py on the device with a wrapped __import__, records the time and heap
+    cost of every module import, and pulls the records back to the host for a report.
+
+    Profiling happens in one raw REPL session without writing any file to the device:
+    1. Open the session (soft reset inside the raw REPL, giving a clean interpreter without imported modules) and
+       execute PROFILER_SCRIPT to replace builtins.__import__;
+    2. Run /boot.py and then /main.py without waiting for them, and wait duration seconds (longer than the setup and
+       delays before main.py starts sampling); each catches its own exceptions, so an error in boot.py does not stop
+       main.py, and device-side exceptions are always shown in the terminal;
+    3. Interrupt the program, execute DUMP_SCRIPT to fetch the records and restore __import__, then soft-reset so
+       the device runs normally.
+    Every import statement calls __import__; imports of already loaded modules (new_modules is 0, only a lookup) are
+    merged in the report.
+
+    Attributes:
+        deployer (MPYDeployer): Deployer providing the port.
+        duration (float): Time to wait after starting boot.py and main.py, in seconds.
+        records (list[dict]): Fetched import records, see parse_records().
+        errors (list[str]): Exceptions raised while boot.py and main.py ran, see parse_errors().
+
+    Methods:
+        __init__(deployer, duration=6.0) -> None: Initialize the profiler.
+        run() -> list[dict]: Profile on the device and fetch the records.
+        format_table(top=0) -> str: Import table sorted by self time.
+        format_flame(width=40) -> str: Text flame chart indented in import order.
+        write_html(path) -> None: Write an HTML flame chart.
+
+    Notes:
+        1. The firmware must enable MICROPY_CAN_OVERRIDE_BUILTINS (on by default in official ports such as rp2);
+           otherwise replacing __import__ has no effect and no records are collected.
+        2. The heap cost is the difference of gc.mem_free() before and after the import; a garbage collection during
+           the import makes it smaller or even negative. The few bytes of the records themselves are charged to the
+           enclosing import.
+        3. Running main.py again skips the hardware reset, so peripheral setup may take slightly different time than
+           after a brown-out reset.
+        4. MicroPython passes no globals to an overridden __import__, so the importer of a relative import is inferred
+           from the import stack and the previous import (see the comment above PROFILER_SCRIPT). The inference checks
+           files under sys.path; relative imports inside packages frozen into the firmware use the first candidate,
+           so the recorded module name may occasionally be wrong.
+    """
+
+    def __init__(self, deployer, duration: float = 6.0):
+        """
+        初始化分析器。
+
+        Args:
+            deployer (MPYDeployer): 部署器，需使用raw传输。
+            duration (float, optional): 运行boot.py与main.py后等待的时间，单位为秒，默认为6。
+
+        Raises:
+            ValueError: 部署器不是raw传输。
+
+        ==========================================
+
+        Initialize the profiler.
+
+        Args:
+            deployer (MPYDeployer): Deployer, must use the raw transport.
+            duration (float, optional): Time to wait after starting boot.py and main.py, in seconds, default is 6.
+
+        Raises:
+            ValueError: The deployer does not use the raw transport.
+        """
+        if deployer.transport != "raw":
+            raise ValueError("启动分析需要raw传输（pip install pyserial）")
+        self.deployer = deployer
+        self.duration = duration
+        self.records = []
+        self.errors = []
+
+    def run(self) -> list[dict]:
+        """
+        在设备上执行分析并取回记录，结束后软复位设备。
+        boot.py与main.py抛出的异常总是打印；未取回/main.py的记录时打印警告。
+
+        Returns:
+            list[dict]: 导入记录。
+
+        Raises:
+            RawREPLError: 通信失败、设备端出错或未取回任何记录。
+
+        ==========================================
+
+        Profile on the device and fetch the records, then soft-reset the device.
+        Exceptions raised by boot.py and main.py are always printed; a warning is printed when no /main.py record
+        comes back.
+
+        Returns:
+            list[dict]: Import records.
+
+        Raises:
+            RawREPLError: Communication failed, a device-side error, or no record was fetched.
+        """
+        session: RawREPL = self.deployer._open_session()
+        try:
+            session.exec(PROFILER_SCRIPT)
+            session.exec_nowait(RUN_SCRIPT)
+            print(f"已启动boot.py与main.py，{self.duration:.1f}秒后取回导入记录 ...")
+            output = bytearray()
+            deadline = time.monotonic() + self.duration
+            while True:
+                # 固件输出只在详细模式下显示，保留下来用于取出设备端异常
+                data = session.read_available()
+                output += data
+                if data and self.deployer.verbose:
+                    print(data.replace(b"\x04", b"").decode(errors="replace"), end="")
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(0.05)
+            session.interrupt()
+            self.records = parse_records(session.exec(DUMP_SCRIPT, timeout=30).decode(errors="replace"))
+            session.soft_reset()
+        finally:
+            session.close()
+        # 设备端异常总是显示，不依赖详细模式
+        self.errors = parse_errors(output.replace(b"\x04", b"").decode(errors="replace"))
+        for error in self.errors:
+            print(f"✗ 设备端异常 {error}")
+        if not self.records:
+            raise RawREPLError("未取回导入记录，固件可能不支持替换builtins.__import__")
+        if not any(r["name"] == "/main.py" for r in self._roots()):
+            print(f"⚠ 未取回/main.py的记录：{self.duration:.1f}秒内boot.py未运行结束，报告只包含boot.py的导入，可增大--profile-time")
+        return self.records
+
+    def _roots(self) -> list[dict]:
+        return [r for r in self.records if r["depth"] == 0]
+
+    def _scale(self) -> int:
+        """
+        火焰图的时间轴长度：最后一次非根记录结束的时刻。main.py是无限循环，按它的总耗时缩放会使导入条几乎不可见。
+
+        ==========================================
+
+        Length of the flame chart time axis: the end of the last non-root record. main.py is an endless loop, so
+        scaling by its total time would make the import bars almost invisible.
+        """
+        ends = [r["start_us"] + r["total_us"] for r in self.records if r["depth"] > 0]
+        return max(ends + [r["start_us"] + r["total_us"] for r in self._roots() if r["name"] == "/boot.py"] + [1])
+
+    def format_table(self, top: int = 0) -> str:
+        """
+        生成按自身耗时排序的导入表，同名的多次导入合并为一行，末尾给出汇总。
+
+        Args:
+            top (int, optional): 只列出前top行，0表示全部。
+
+        Returns:
+            str: 表格文本。
+
+        ==========================================
+
+        Produce the import table sorted by self time, merging repeated imports of the same name into one row, with a
+        summary at the end.
+
+        Args:
+            top (int, optional): List only the first top rows, 0 for all.
+
+        Returns:
+            str: Table text.
+        """
+        rows = {}
+        for r in self.records:
+            if r["depth"] == 0:
+                continue
+            row = rows.setdefault(r["name"], {"count": 0, "total_us": 0, "self_us": 0, "total_mem": 0, "self_mem": 0, "new": 0})
+            row["count"] += 1
+            row["new"] += r["new_modules"]
+            row["total_us"] += r["total_us"]
+            row["self_us"] += r["self_us"]
+            row["total_mem"] += r["total_mem"]
+            row["self_mem"] += r["self_mem"]
+        ordered = sorted(rows.items(), key=lambda kv: kv[1]["self_us"], reverse=True)
+        if top:
+            ordered = ordered[:top]
+
+        width = max([len(name) for name, _ in ordered] + [4])
+        lines = [
+            f"{'模块':<{width - 2}}  次数  新模块  自身(ms)  累计(ms)  自身堆(B)  累计堆(B)",
+            "-" * (width + 58),
+        ]
+        for name, row in ordered:
+            lines.append(
+                f"{name:<{width}}  {row['count']:>4}  {row['new']:>6}  {_ms(row['self_us']):>8}  {_ms(row['total_us']):>8}"
+                f"  {row['self_mem']:>9}  {row['total_mem']:>9}"
+            )
+
+        lines.append("-" * (width + 58))
+        for root in self._roots():
+            children = [r for r in self.records if r["depth"] == 1 and root["start_us"] <= r["start_us"] <= root["start_us"] + root["total_us"]]
+            imports_us = sum(r["total_us"] for r in children)
+            imports_mem = sum(r["total_mem"] for r in children)
+            line = f"{root['name']}: 导入 {len(children)} 次，耗时 {_ms(imports_us)} ms，堆占用 {imports_mem} B"
+            if children:
+                last = max(r["start_us"] + r["total_us"] for r in children) - root["start_us"]
+                line += f"，最后一次导入完成于开始后 {_ms(last)} ms"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def format_flame(self, width: int = 40) -> str:
+        """
+        生成按导入顺序缩进的文本火焰图：每条记录一行，条形长度与耗时成正比，已加载模块的查表导入省略。
+
+        Args:
+            width (int, optional): 时间轴对应的字符数。
+
+        Returns:
+            str: 火焰图文本。
+
+        ==========================================
+
+        Produce a text flame chart indented in import order: one line per record with a bar proportional to its time;
+        lookups of already loaded modules are omitted.
+
+        Args:
+            width (int, optional): Characters for the whole time axis.
+
+        Returns:
+            str: Flame chart text.
+        """
+        scale = self._scale()
+        shown = [r for r in self.records if r["depth"] == 0 or r["new_modules"] or r["self_us"] >= 1000]
+        name_width = max([2 * r["depth"] + len(r["name"]) for r in shown] + [4])
+        lines = []
+        for r in shown:
+            label = "  " * r["depth"] + r["name"]
+            offset = min(width, r["start_us"] * width // scale)
+            bar = max(1, min(width - offset, r["total_us"] * width // scale))
+            lines.append(f"{label:<{name_width}}  {_ms(r['total_us']):>8} ms  {' ' * offset}{'█' * bar}")
+        return "\n".join(lines)
+
+    def write_html(self, path: str) -> None:
+        """
+        写出HTML火焰图：横轴为启动后的时间，纵轴为导入深度，悬停显示耗时与堆占用。
+
+        Args:
+            path (str): 输出文件路径。
+
+        ==========================================
+
+        Write an HTML flame chart: time since start on the horizontal axis, import depth on the vertical axis, with
+        time and heap cost shown on hover.
+
+        Args:
+            path (str): Output file path.
+        """
+        scale = self._scale()
+        blocks = []
+        for r in self.records:
+            if r["depth"] and not r["new_modules"] and r["self_us"] < 1000:
+                continue
+            left = min(100.0, r["start_us"] * 100 / scale)
+            width = max(0.2, min(100.0 - left, r["total_us"] * 100 / scale))
+            title = (f"{r['name']}\n累计 {_ms(r['total_us'])} ms，自身 {_ms(r['self_us'])} ms\n"
+                     f"累计堆 {r['total_mem']} B，自身堆 {r['self_mem']} B，新模块 {r['new_modules']}")
+            hue = 20 + (hash(r["name"]) % 40)
+            blocks.append(
+                f'<div class="b" style="left:{left:.3f}%;width:{width:.3f}%;top:{r["depth"] * FLAME_ROW}px;'
+                f'background:hsl({hue},85%,60%)" title="{html.escape(title)}">{html.escape(r["name"])}</div>'
+            )
+        depth = max([r["depth"] for r in self.records] + [0]) + 1
+        Path(path).write_text(
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>启动导入火焰图</title><style>"
+            "body{font:12px sans-serif;margin:16px}#c{position:relative;height:%dpx;border-bottom:1px solid #999}"
+            ".b{position:absolute;height:%dpx;line-height:%dpx;overflow:hidden;white-space:nowrap;box-sizing:border-box;"
+            "border:1px solid #fff;padding:0 3px}</style></head><body><h3>启动导入火焰图（时间轴 %s ms）</h3>"
+            "<div id=\"c\">%s</div></body></html>\n"
+            % (depth * FLAME_ROW, FLAME_ROW, FLAME_ROW, _ms(scale), "\n".join(blocks)),
+            encoding="utf-8",
+        )
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ============================================
@@ -13,9 +13,7 @@ __platform__ = "MicroPython v1.23"
 
 # ======================================== 导入相关模块 =========================================
 
-# 导入 code 文件夹下的 ProgressBar 类和 EC11Encoder 类到包顶层
-from .code.processbar import ProgressBar
-from .code.ec11encoder import EC11Encoder
+# 导出接口在首次访问时才导入对应子模块，见 __getattr__
 
 # ======================================== 全局变量 ============================================
 
@@ -23,6 +21,17 @@ __all__ = ["ProgressBar", "EC11Encoder"]
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问导出名称时才导入定义它的子模块，并缓存到包的命名空间中。"""
+    if name == "ProgressBar":
+        from .code.processbar import ProgressBar as value
+    elif name == "EC11Encoder":
+        from .code.ec11encoder import EC11Encoder as value
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ===========================================
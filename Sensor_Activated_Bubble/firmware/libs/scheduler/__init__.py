@@ -3,7 +3,7 @@
 # @Time    : 2025/9/9 下午10:43   
 # @Author  : 李清水            
 # @File    : __init__.py       
-# @Description : 将 code 中的 Task 与 Scheduler 暴露到包顶层，方便导入使用。
+# @Description : 将 code 中的 Task、Event、Scheduler、CoreQueue、AsyncScheduler 与 Watchdog 暴露到包顶层，方便导入使用。
 # @License : CC BY-NC 4.0
 
 # ======================================== 导入相关模块 =========================================
@@ -11,7 +11,9 @@
 # 将调度器核心类导出到包顶层
 from .scheduler import (
     Task,
+    Event,
     Scheduler,
+    CoreQueue,
     __version__,
     __author__,
     __license__,
@@ -24,7 +26,11 @@ from .scheduler import (
 # 对外接口
 __all__ = [
     "Task",
+    "Event",
     "Scheduler",
+    "CoreQueue",
+    "AsyncScheduler",
+    "Watchdog",
     "__version__",
     "__author__",
     "__license__",
@@ -34,6 +40,27 @@ __all__ = [
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name: str):
+    """
+    按需导入 AsyncScheduler 与 Watchdog，未使用异步调度或看门狗的应用不会加载对应模块，节省启动时间与内存。
+
+    Args:
+        name (str): 访问的属性名。
+
+    Returns:
+        object: 对应的类对象。
+
+    Raises:
+        AttributeError: 属性不存在。
+    """
+    if name == "AsyncScheduler":
+        from .async_scheduler import AsyncScheduler
+        return AsyncScheduler
+    if name == "Watchdog":
+        from .watchdog import Watchdog
+        return Watchdog
+    raise AttributeError(name)
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ==========================================
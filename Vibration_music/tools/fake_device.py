@@ -0,0 +1,489 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/10/30 下午2:40
+# @Author  : 李清水
+# @File    : fake_device.py
+# @Description : 基于伪终端的MicroPython假设备，实现raw REPL与raw-paste协议，用于在主机上测试部署工具
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+import io
+import os
+import sys
+import tty
+import time
+import zlib
+import types
+import errno
+import struct
+import argparse
+import builtins
+import threading
+import tracemalloc
+import contextlib
+from pathlib import Path
+
+# ======================================== 全局变量 ============================================
+
+RAW_PROMPT = b"raw REPL; CTRL-B to exit\r\n>"
+BANNER = b"MicroPython v1.23.0 on 2024-06-02; GraftPort-RP2040 (fake) with RP2040\r\nType \"help()\" for more information.\r\n>>> "
+
+# raw-paste模式的流控窗口大小（真实设备为128字节）
+PASTE_WINDOW = 128
+
+# gc.mem_free()模拟的堆大小（字节），已用部分由tracemalloc统计
+HEAP_SIZE = 192 * 1024
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+
+class _DeviceOS:
+    """
+    设备端os模块替身：把设备上的绝对路径映射到主机上的根目录，接口与MicroPython的os一致。
+
+    ==========================================
+
+    Device-side os module stand-in: maps absolute device paths into a root directory on the host, with the
+    MicroPython os interface.
+    """
+
+    def __init__(self, root: Path):
+        self._root = root
+
+    def _path(self, path: str) -> Path:
+        parts = [p for p in str(path).split("/") if p and p != "."]
+        if ".." in parts:
+            raise OSError(errno.EINVAL)
+        return self._root.joinpath(*parts)
+
+    def ilistdir(self, path: str = "/"):
+        for entry in sorted(self._path(path).iterdir()):
+            if entry.is_dir():
+                yield (entry.name, 0x4000, 0, 0)
+            else:
+                yield (entry.name, 0x8000, 0, entry.stat().st_size)
+
+    def listdir(self, path: str = "/") -> list:
+        return [e[0] for e in self.ilistdir(path)]
+
+    def stat(self, path: str) -> tuple:
+        p = self._path(path)
+        if not p.exists():
+            raise OSError(errno.ENOENT)
+        return (0x4000 if p.is_dir() else 0x8000, 0, 0, 0, 0, 0, 0 if p.is_dir() else p.stat().st_size, 0, 0, 0)
+
+    def mkdir(self, path: str) -> None:
+        p = self._path(path)
+        if p.exists():
+            raise OSError(errno.EEXIST)
+        p.mkdir()
+
+    def remove(self, path: str) -> None:
+        p = self._path(path)
+        if not p.is_file():
+            raise OSError(errno.ENOENT)
+        p.unlink()
+
+    def rmdir(self, path: str) -> None:
+        p = self._path(path)
+        if not p.is_dir():
+            raise OSError(errno.ENOENT)
+        if any(p.iterdir()):
+            raise OSError(errno.EACCES)
+        p.rmdir()
+
+    def rename(self, old: str, new: str) -> None:
+        os.replace(self._path(old), self._path(new))
+
+    def statvfs(self, path: str = "/") -> tuple:
+        return (4096, 4096, 352, 300, 300, 0, 0, 0, 0, 255)
+
+    def uname(self) -> tuple:
+        return ("rp2", "rp2", "1.23.0", "v1.23.0", "GraftPort-RP2040 (fake) with RP2040")
+
+    def sync(self) -> None:
+        pass
+
+
+class _DeflateIO:
+    """
+    设备端deflate.DeflateIO替身（仅解压），用zlib实现，支持RAW、ZLIB、GZIP与AUTO格式。
+
+    ==========================================
+
+    Device-side deflate.DeflateIO stand-in (decompression only) built on zlib, supporting the RAW, ZLIB, GZIP and
+    AUTO formats.
+    """
+
+    AUTO, RAW, ZLIB, GZIP = 0, 1, 2, 3
+
+    def __init__(self, stream, format: int = 0, wbits: int = 0, close: bool = False):
+        bits = wbits or 15
+        if format == self.RAW:
+            bits = -bits
+        elif format == self.GZIP:
+            bits += 16
+        elif format == self.AUTO:
+            bits += 32
+        self._stream = stream
+        self._close = close
+        self._inflate = zlib.decompressobj(bits)
+        self._pending = b""
+
+    def read(self, n: int = -1) -> bytes:
+        while (n < 0 or len(self._pending) < n) and not self._inflate.eof:
+            chunk = self._stream.read(256)
+            if not chunk:
+                break
+            self._pending += self._inflate.decompress(chunk)
+        if n < 0:
+            n = len(self._pending)
+        data, self._pending = self._pending[:n], self._pending[n:]
+        return data
+
+    def readinto(self, buf) -> int:
+        data = self.read(len(buf))
+        buf[:len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if self._close:
+            self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class _DeviceBuiltins:
+    """
+    设备端builtins模块替身：读写的是设备代码的__builtins__字典，赋值builtins.__import__只影响设备代码，不影响主机进程。
+
+    ==========================================
+
+    Device-side builtins module stand-in backed by the __builtins__ dict of device code, so assigning
+    builtins.__import__ affects device code only, not the host process.
+    """
+
+    def __init__(self, namespace: dict):
+        object.__setattr__(self, "_namespace", namespace)
+
+    def __getattr__(self, name: str):
+        try:
+            return self._namespace[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value) -> None:
+        self._namespace[name] = value
+
+
+def _device_gc():
+    """
+    设备端gc模块替身：mem_free()/mem_alloc()以HEAP_SIZE为总堆，用tracemalloc统计已分配的字节数（首次调用时开始统计）。
+
+    ==========================================
+
+    Device-side gc module stand-in: mem_free()/mem_alloc() treat HEAP_SIZE as the heap and count allocated bytes with
+    tracemalloc (tracing starts on first use).
+    """
+    def mem_alloc() -> int:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return tracemalloc.get_traced_memory()[0]
+
+    return types.SimpleNamespace(
+        collect=lambda: None, enable=lambda: None, disable=lambda: None,
+        mem_alloc=mem_alloc, mem_free=lambda: HEAP_SIZE - mem_alloc(),
+    )
+
+
+def _device_time():
+    """
+    设备端time模块替身：在主机time模块的基础上提供MicroPython的ticks_us/ticks_ms/ticks_diff与sleep_ms/sleep_us。
+
+    ==========================================
+
+    Device-side time module stand-in: the host time module plus MicroPython's ticks_us/ticks_ms/ticks_diff and
+    sleep_ms/sleep_us.
+    """
+    device_time = types.SimpleNamespace(**{name: getattr(time, name) for name in dir(time) if not name.startswith("_")})
+    device_time.ticks_us = lambda: time.perf_counter_ns() // 1000
+    device_time.ticks_ms = lambda: time.perf_counter_ns() // 1000000
+    device_time.ticks_diff = lambda a, b: a - b
+    device_time.sleep_ms = lambda ms: time.sleep(ms / 1000)
+    device_time.sleep_us = lambda us: time.sleep(us / 1000000)
+    return device_time
+
+
+class FakeDevice:
+    """
+    基于伪终端的MicroPython假设备。
+
+    在后台线程中实现普通REPL、raw REPL与raw-paste模式（含流控窗口），收到的代码在CPython中执行，
+    os模块与open()被映射到主机上的根目录，因此部署工具可以像对真实设备一样建目录、写文件、计算哈希并软复位。
+    串口客户端（pyserial、mpremote）打开port属性给出的伪终端路径即可连接。
+
+    Attributes:
+        root (Path): 模拟设备文件系统的主机目录。
+        port (str): 伪终端从设备路径，如/dev/pts/3。
+        raw_paste (bool): 是否支持raw-paste模式，False时模拟不支持该模式的旧固件。
+        deflate (bool): 是否提供deflate模块，False时模拟v1.21之前没有该模块的固件。
+        execs (int): 执行代码的次数。
+        bytes_received (int): 收到的字节数。
+        soft_resets (int): 软复位次数（raw REPL内与普通REPL中的都计入）。
+        main_runs (int): 普通REPL中软复位后运行main.py的次数。
+
+    ==========================================
+
+    pty-based fake MicroPython device.
+
+    A background thread implements the friendly REPL, the raw REPL and raw-paste mode (with its flow-control
+    window). Received code runs in CPython with the os module and open() mapped into a root directory on the host,
+    so deploy tools can create directories, write files, compute hashes and soft-reset as on a real board. Serial
+    clients (pyserial, mpremote) connect by opening the pty path given by the port attribute.
+
+    Attributes:
+        root (Path): Host directory backing the device filesystem.
+        port (str): pty slave path, such as /dev/pts/3.
+        raw_paste (bool): Whether raw-paste mode is supported; False emulates older firmware without it.
+        deflate (bool): Whether the deflate module is available; False emulates firmware older than v1.21 without it.
+        execs (int): Number of code executions.
+        bytes_received (int): Bytes received.
+        soft_resets (int): Soft resets (both in the raw REPL and in the friendly REPL).
+        main_runs (int): Times main.py ran after a soft reset in the friendly REPL.
+    """
+
+    def __init__(self, root: str, raw_paste: bool = True, deflate: bool = True):
+        """
+        创建伪终端并启动后台线程。
+
+        Args:
+            root: 模拟设备文件系统的主机目录，不存在时自动创建。
+            raw_paste: 是否支持raw-paste模式。
+            deflate: 是否提供deflate模块。
+
+        ==========================================
+
+        Create the pty and start the background thread.
+
+        Args:
+            root: Host directory backing the device filesystem, created when missing.
+            raw_paste: Whether raw-paste mode is supported.
+            deflate: Whether the deflate module is available.
+        """
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.raw_paste = raw_paste
+        self.deflate = deflate
+        self.execs = 0
+        self.bytes_received = 0
+        self.soft_resets = 0
+        self.main_runs = 0
+
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+
+        self._os = _DeviceOS(self.root)
+        self._mode = "friendly"
+        self._buf = bytearray()
+        self._pasted = 0
+        self._globals = {}
+        self._reset_globals()
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "FakeDevice":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        停止后台线程并关闭伪终端。
+
+        ==========================================
+
+        Stop the background thread and close the pty.
+        """
+        self._running = False
+        for fd in (self._slave, self._master):
+            with contextlib.suppress(OSError):
+                os.close(fd)
+
+    def _reset_globals(self) -> None:
+        real_import = builtins.__import__
+        device_os = self._os
+        device_builtins = dict(vars(builtins))
+        device_modules = {
+            "os": device_os, "uos": device_os, "builtins": _DeviceBuiltins(device_builtins),
+            "gc": _device_gc(), "time": _device_time(),
+        }
+        if self.deflate:
+            device_modules["deflate"] = types.SimpleNamespace(
+                DeflateIO=_DeflateIO, AUTO=_DeflateIO.AUTO, RAW=_DeflateIO.RAW, ZLIB=_DeflateIO.ZLIB,
+                GZIP=_DeflateIO.GZIP,
+            )
+
+        def _import(name, *args, **kwargs):
+            if name in device_modules:
+                return device_modules[name]
+            return real_import(name, *args, **kwargs)
+
+        def _open(path, mode="r", *args, **kwargs):
+            return open(device_os._path(path), mode, *args, **kwargs)
+
+        def _exec(code, globals=None, locals=None):
+            # 与MicroPython一致：exec()新建的全局字典同样使用设备的builtins
+            if globals is None:
+                # 未指定命名空间时在调用者的命名空间中执行
+                frame = sys._getframe(1)
+                globals, locals = frame.f_globals, frame.f_locals if locals is None else locals
+            globals.setdefault("__builtins__", device_builtins)
+            return exec(code, globals, locals)
+
+        device_builtins["__import__"] = _import
+        device_builtins["open"] = _open
+        device_builtins["exec"] = _exec
+        self._globals = {"__builtins__": device_builtins, "__name__": "__main__"}
+
+    def _send(self, data: bytes) -> None:
+        with contextlib.suppress(OSError):
+            os.write(self._master, data)
+
+    def _execute(self, code: bytes) -> None:
+        """
+        执行一段代码，按raw REPL格式回送：标准输出、0x04、错误输出、0x04、提示符。
+
+        ==========================================
+
+        Execute code and reply in raw REPL format: stdout, 0x04, error output, 0x04, prompt.
+        """
+        self.execs += 1
+        out = io.StringIO()
+        err = ""
+        try:
+            with contextlib.redirect_stdout(out):
+                exec(compile(code.decode(), "<stdin>", "exec"), self._globals)
+        except Exception as e:
+            code = e.args[0] if isinstance(e, OSError) and e.args and isinstance(e.args[0], int) else None
+            if code is not None:
+                # 与MicroPython一致：OSError: [Errno 2] ENOENT
+                err = f"Traceback (most recent call last):\n  File \"<stdin>\"\nOSError: [Errno {code}] {errno.errorcode.get(code, '')}\n"
+            else:
+                err = f"Traceback (most recent call last):\n  File \"<stdin>\"\n{type(e).__name__}: {e}\n"
+        self._send(out.getvalue().replace("\n", "\r\n").encode() + b"\x04"
+                   + err.replace("\n", "\r\n").encode() + b"\x04>")
+
+    def _soft_reset(self) -> None:
+        self.soft_resets += 1
+        self._reset_globals()
+        self._send(b"MPY: soft reboot\r\n")
+
+    def _feed(self, byte: int) -> None:
+        """
+        按当前模式处理一个输入字节。
+
+        ==========================================
+
+        Process one input byte according to the current mode.
+        """
+        b = bytes([byte])
+        if self._mode == "paste":
+            if b == b"\x04":
+                self._send(b"\x04")
+                self._mode = "raw"
+                code, self._buf = bytes(self._buf), bytearray()
+                self._execute(code)
+                return
+            self._buf.append(byte)
+            self._pasted += 1
+            if self._pasted % PASTE_WINDOW == 0:
+                # 消费完一个窗口，允许主机继续发送
+                self._send(b"\x01")
+            return
+
+        if self._mode == "friendly":
+            if b == b"\x01":
+                self._mode = "raw"
+                self._buf = bytearray()
+                self._send(b"\r\n" + RAW_PROMPT)
+            elif b == b"\x04":
+                self.main_runs += 1
+                self._soft_reset()
+                self._send(BANNER)
+            elif b in (b"\x02", b"\x03"):
+                self._send(b"\r\n>>> ")
+            return
+
+        # raw REPL
+        if b == b"\x01" and self._buf == b"\x05A":
+            # raw-paste请求：0x05 'A' 0x01
+            self._buf = bytearray()
+            if self.raw_paste:
+                self._mode = "paste"
+                self._pasted = 0
+                self._send(b"R\x01" + struct.pack("<H", PASTE_WINDOW))
+            else:
+                # 旧固件不认识该请求，只会重新输出提示符
+                self._send(RAW_PROMPT)
+        elif b == b"\x01":
+            self._buf = bytearray()
+            self._send(b"\r\n" + RAW_PROMPT)
+        elif b == b"\x02":
+            self._mode = "friendly"
+            self._send(b"\r\n" + BANNER)
+        elif b == b"\x03":
+            self._buf = bytearray()
+        elif b == b"\x04":
+            if not self._buf:
+                self._send(b"OK\r\n")
+                self._soft_reset()
+                self._send(RAW_PROMPT)
+            else:
+                self._send(b"OK")
+                code, self._buf = bytes(self._buf), bytearray()
+                self._execute(code)
+        else:
+            self._buf.append(byte)
+
+    def _serve(self) -> None:
+        while self._running:
+            try:
+                data = os.read(self._master, 4096)
+            except OSError:
+                break
+            self.bytes_received += len(data)
+            for byte in data:
+                self._feed(byte)
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="基于伪终端的MicroPython假设备，用于在主机上测试mpy_uploader等部署工具",
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument("root", help="模拟设备文件系统的主机目录")
+    parser.add_argument("--no-raw-paste", help="模拟不支持raw-paste模式的旧固件", action="store_true")
+    parser.add_argument("--no-deflate", help="模拟没有deflate模块的旧固件", action="store_true")
+    args = parser.parse_args()
+
+    device = FakeDevice(args.root, raw_paste=not args.no_raw_paste, deflate=not args.no_deflate)
+    print(f"假设备已启动，串口: {device.port}（Ctrl-C退出）")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        device.close()
+        print(f"执行 {device.execs} 次，接收 {device.bytes_received} 字节，软复位 {device.soft_resets} 次")
+        sys.exit(0)
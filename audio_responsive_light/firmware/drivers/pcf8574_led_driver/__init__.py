@@ -8,10 +8,8 @@
 
 # ======================================== 导入相关模块 =========================================
 
-# 显式导出子包或子模块
-from .code.pcf8574 import PCF8574
+# 导出接口在首次访问时才导入对应子模块，见 __getattr__
 
-from .code.led_bar import LEDBar
 
 # ======================================== 全局变量 ============================================
 
@@ -21,6 +19,17 @@ __all__ = ["PCF8574",
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问导出名称时才导入定义它的子模块，并缓存到包的命名空间中。"""
+    if name == "PCF8574":
+        from .code.pcf8574 import PCF8574 as value
+    elif name == "LEDBar":
+        from .code.led_bar import LEDBar as value
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ==========================================
@@ -26,7 +26,7 @@ from drivers.max9814_mic_driver import MAX9814Mic
 from drivers.pcf8574_led_driver import PCF8574, LEDBar
 
 # 导入tasks文件夹下面任务模块
-from tasks.maintenance import task_idle_callback, task_err_callback
+from tasks.maintenance import GCManager, task_err_callback
 from tasks.maintenance import GC_THRESHOLD_BYTES, ERROR_REPEAT_DELAY_S
 from tasks.sensor_task import micTask
 
@@ -224,8 +224,12 @@ print("Error repeat delay:", ERROR_REPEAT_DELAY_S)
 sensor_task_obj = micTask(AudioFrequencyAnalyzer=analyzer, LEDBar=ledbar,debug=True)
 sensor_task = Task(sensor_task_obj.tick, interval=10,  state=Task.TASK_RUN)
 
-# 创建任务调度器,定时周期为50ms
-sc = Scheduler(Timer(-1), interval=5, task_idle=task_idle_callback, task_err=task_err_callback)
+# 垃圾回收管理器：只在距下一次10ms音频采样足够远时回收，避免回收停顿打断采样
+gcm = GCManager()
+
+# 创建任务调度器，使用截止时刻最小堆模式，空闲回调可获得准确的剩余空闲时间
+sc = Scheduler(Timer(-1), interval=5, task_idle=gcm, task_err=task_err_callback, mode=Scheduler.MODE_HEAP)
+gcm.attach(sc)
 
 # 添加任务
 sc.add(sensor_task)
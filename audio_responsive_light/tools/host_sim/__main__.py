@@ -0,0 +1,24 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/10/27 上午10:00
+# @Author  : 李清水
+# @File    : __main__.py
+# @Description : 主机模拟器命令行入口，支持 python tools/host_sim 与 python -m host_sim 两种运行方式
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+import os
+import sys
+
+if not __package__:
+    # 以目录方式运行时 sys.path[0] 为本包目录，其中的 machine.py 等会遮蔽包内相对导入，改为 tools 目录
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    from host_sim.runtime import main
+else:
+    from .runtime import main
+
+# ========================================  主程序  ============================================
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,713 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/10/27 下午3:40
+# @Author  : 李清水
+# @File    : runtime.py
+# @Description : 主机模拟器运行器：安装替身模块、在虚拟时钟上运行固件并统计各任务的延迟与吞吐量
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+import io
+import os
+import gc
+import sys
+import json
+import time
+import marshal
+import runpy
+import signal
+import argparse
+import importlib
+import importlib.abc
+import importlib.machinery
+import traceback
+import subprocess
+import contextlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from .clock import CLOCK, SimTimeout, SimReset, TICKS_MAX, ticks_diff
+from . import machine, micropython, framebuf, neopixel, rp2, i2c_devices
+from .bench import BENCHES, run_bench, format_bench
+
+# ======================================== 全局变量 ============================================
+
+# 模拟的堆大小（RP2040 上 MicroPython 约 192KB）与启动后的基础占用，单位为字节
+HEAP_BYTES = 192 * 1024
+HEAP_BASE = 24 * 1024
+# 每次任务执行估算的分配量，用于驱动 gc.threshold 自动回收与 GCManager 的分配速率统计
+ALLOC_PER_EXEC = 64
+# 导入的固件模块常驻堆中：按去掉文档字符串的 CPython 字节码大小乘以该比例估算（与 mpy 加载后的占用相当）
+MODULE_HEAP_RATIO = 0.5
+# 仿真结束时正在执行的任务已运行超过该时间（虚拟毫秒，任务的 max_runtime 更长时取后者）即判定为卡死
+STALL_MS = 5000
+
+# MicroPython 中带 u 前缀的模块名到 CPython 模块的映射
+_ALIASES = {
+    "utime": "time",
+    "ustruct": "struct",
+    "ubinascii": "binascii",
+    "ujson": "json",
+    "uos": "os",
+    "ucollections": "collections",
+    "uerrno": "errno",
+    "uarray": "array",
+    "urandom": "random",
+    "uhashlib": "hashlib",
+    "ure": "re",
+}
+
+# 模拟堆的状态，gc 替身函数共用
+_heap = {"alloc": HEAP_BASE, "base": HEAP_BASE, "threshold": -1, "collects": 0, "modules": 0}
+
+# ======================================== 功能函数 ============================================
+
+def _gc_collect() -> int:
+    CLOCK.charge("gc")
+    _heap["alloc"] = _heap["base"]
+    _heap["collects"] += 1
+    return 0
+
+
+def _gc_mem_alloc() -> int:
+    return _heap["alloc"]
+
+
+def _gc_mem_free() -> int:
+    return HEAP_BYTES - _heap["alloc"]
+
+
+def _gc_threshold(amount: int | None = None):
+    if amount is None:
+        return _heap["threshold"]
+    _heap["threshold"] = amount
+
+
+def _allocate(nbytes: int) -> None:
+    """
+    记录一次估算的堆分配，超过 gc.threshold 或堆满时与 MicroPython 一样自动回收。
+
+    ==========================================
+
+    Record an estimated heap allocation; like MicroPython, collect automatically when it
+    exceeds gc.threshold or the heap is full.
+    """
+    _heap["alloc"] += nbytes
+    th = _heap["threshold"]
+    if _heap["alloc"] >= HEAP_BYTES or (th > 0 and _heap["alloc"] - _heap["base"] >= th):
+        _gc_collect()
+
+
+def _print_exception(exc: BaseException, file=None) -> None:
+    traceback.print_exception(exc, file=file or sys.stdout)
+
+
+def install(limit_us: int | None = None, platform: str = "rp2") -> None:
+    """
+    安装替身模块并把时钟归零：machine、micropython、framebuf、neopixel、rp2 指向本包，
+    time 的 ticks/sleep 函数与 gc 的内存函数改为虚拟实现，u 前缀模块名指向 CPython 同名模块，
+    sys.platform 改为目标端口名，固件中按端口选择实现的代码（如红外发射、看门狗崩溃记录）走目标分支。
+
+    Args:
+        limit_us (int | None): 仿真时长上限，单位为微秒，None 表示不限制。
+        platform (str): 模拟的 sys.platform，默认为 rp2。
+
+    ==========================================
+
+    Install the stand-in modules and rewind the clock: machine, micropython, framebuf,
+    neopixel and rp2 point to this package, the time ticks/sleep functions and the gc memory
+    functions become virtual, u-prefixed module names point to the CPython modules, and
+    sys.platform becomes the target port so port-specific firmware code (IR transmitter,
+    watchdog crash record) takes the target branch.
+
+    Args:
+        limit_us (int | None): Simulation limit in microseconds, None for no limit.
+        platform (str): Simulated sys.platform, rp2 by default.
+    """
+    CLOCK.reset(limit_us)
+    machine.reset_state()
+    _heap.update(alloc=HEAP_BASE, base=HEAP_BASE, threshold=-1, collects=0, modules=0)
+    CLOCK.install_time()
+    sys.modules.update({
+        "machine": machine,
+        "micropython": micropython,
+        "framebuf": framebuf,
+        "neopixel": neopixel,
+        "rp2": rp2,
+    })
+    for alias, name in _ALIASES.items():
+        sys.modules[alias] = importlib.import_module(name)
+    gc.collect = _gc_collect
+    gc.mem_alloc = _gc_mem_alloc
+    gc.mem_free = _gc_mem_free
+    gc.threshold = _gc_threshold
+    sys.print_exception = _print_exception
+    sys.platform = platform
+
+
+def _module_heap(path: str) -> int:
+    """
+    估算一个固件模块导入后常驻堆中的字节数，见 MODULE_HEAP_RATIO。
+
+    ==========================================
+
+    Estimate the bytes a firmware module keeps on the heap once imported, see MODULE_HEAP_RATIO.
+    """
+    try:
+        code = compile(Path(path).read_bytes(), path, "exec", optimize=2)
+    except (OSError, SyntaxError, ValueError):
+        return 0
+    return int(len(marshal.dumps(code)) * MODULE_HEAP_RATIO)
+
+
+def _task_name(task) -> str:
+    """
+    返回任务回调的可读名称，绑定方法显示为 类名.方法名。
+
+    ==========================================
+
+    Return a readable name of the task callback; bound methods show as Class.method.
+    """
+    cb = task._callback
+    owner = getattr(cb, "__self__", None)
+    name = getattr(cb, "__name__", repr(cb))
+    if owner is not None and not isinstance(owner, type(sys)):
+        return "{}.{}".format(type(owner).__name__, name)
+    return name
+
+
+def _hook_scheduler(metrics: "Metrics") -> bool:
+    """
+    包装固件调度器的 scheduler/_exec/_run/_run_due/_on_error：记录主循环是否启动，
+    按调用计入调度开销并记录每个任务的执行统计。固件中没有 libs.scheduler 时返回 False。
+
+    ==========================================
+
+    Wrap scheduler/_exec/_run/_run_due/_on_error of the firmware scheduler: record whether the
+    main loop started, charge dispatch costs per call and record per-task execution statistics.
+    Returns False when the firmware has no libs.scheduler.
+    """
+    try:
+        mod = importlib.import_module("libs.scheduler.scheduler")
+    except ImportError:
+        return False
+    sched = mod.Scheduler
+    orig_exec, orig_run, orig_run_due = sched._exec, sched._run, sched._run_due
+    orig_on_error, orig_scheduler = sched._on_error, sched.scheduler
+
+    def scheduler(self) -> None:
+        metrics.sched = self
+        orig_scheduler(self)
+
+    def _exec(self, task, late: int = 0) -> None:
+        CLOCK.charge("exec")
+        _allocate(ALLOC_PER_EXEC)
+        t0 = CLOCK.now
+        orig_exec(self, task, late)
+        metrics.record(self, task, late, CLOCK.now - t0)
+
+    def _run(self, task) -> None:
+        CLOCK.charge("dispatch")
+        orig_run(self, task)
+
+    def _run_due(self) -> None:
+        CLOCK.charge("dispatch")
+        orig_run_due(self)
+
+    def _on_error(self, task, e) -> None:
+        metrics.error(self, task, e)
+        orig_on_error(self, task, e)
+
+    sched.scheduler = scheduler
+    sched._exec = _exec
+    sched._run = _run
+    sched._run_due = _run_due
+    sched._on_error = _on_error
+    return True
+
+
+class _FirmwareImports(importlib.abc.MetaPathFinder):
+    """
+    记录固件目录中模块的导入：每加载一个模块，把它的估算大小计入常驻堆（gc.collect 不会回收），
+    按需导入的驱动包因此在 gc.mem_free() 与运行结果中体现出节省的内存。
+
+    ==========================================
+
+    Track imports of modules from the firmware directory: every loaded module adds its estimated
+    size to the resident heap (not reclaimed by gc.collect), so lazily imported driver packages
+    show their savings in gc.mem_free() and in the run result.
+    """
+
+    def __init__(self, src: Path):
+        self._src = src
+
+    def find_spec(self, fullname, path, target=None):
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if spec is None or not spec.origin or not Path(spec.origin).is_relative_to(self._src):
+            return None
+        size = _module_heap(spec.origin)
+        _heap["base"] += size
+        _heap["alloc"] += size
+        _heap["modules"] += 1
+        return spec
+
+
+def run_firmware(source_dir: str, seconds: float = 10.0, scenario: str | None = None, boot: bool = True,
+                 wall_timeout: float = 120.0, quiet: bool = False, i2c: list | None = None,
+                 devices: list | None = None) -> dict:
+    """
+    在虚拟时钟上依次运行固件的 boot.py 与 main.py，直到仿真时长用完、固件复位或主程序退出。
+
+    每个进程只能运行一次：固件模块会留在 sys.modules 中。批量运行请使用 run_all()，
+    它为每个项目启动独立的子进程。
+
+    Args:
+        source_dir (str): 固件目录（包含 main.py）。
+        seconds (float): 仿真时长，单位为虚拟秒。
+        scenario (str | None): 场景脚本路径，脚本中可通过全局变量 sim 注入激励。
+        boot (bool): 是否先运行 boot.py。
+        wall_timeout (float): 真实时间上限，单位为秒，防止不调用任何外设的死循环卡住仿真。
+        quiet (bool): 是否捕获固件输出，只在结果中保留最后若干行。
+        i2c (list | None): 预先挂接通用寄存器设备的 (总线编号, 地址) 列表。
+        devices (list | None): 预先挂接的芯片模拟器，元素为 (芯片名, 总线编号, 地址)，
+                               或字符串 "auto"（按固件中的驱动类自动挂接，见 i2c_devices.attach_auto）。
+
+    Returns:
+        dict: 运行结果，包括 status（ok/no-scheduler/stalled/reset/exited/crashed/wall-timeout）、虚拟与真实耗时、
+              加速比、外设调用次数、gc 次数、导入的固件模块数与估算的常驻堆大小、各任务统计与各 I2C 总线的传输统计。
+
+    ==========================================
+
+    Run the firmware's boot.py and main.py on the virtual clock until the simulated duration
+    is used up, the firmware resets, or main exits.
+
+    Only one run per process is supported because firmware modules stay in sys.modules.
+    Use run_all() for batches; it starts a subprocess per project.
+
+    Args:
+        source_dir (str): Firmware directory (containing main.py).
+        seconds (float): Simulated duration in virtual seconds.
+        scenario (str | None): Scenario script path; it injects stimuli through the global sim.
+        boot (bool): Whether to run boot.py first.
+        wall_timeout (float): Real-time limit in seconds, guards against loops that never call a peripheral.
+        quiet (bool): Capture firmware output and keep only the last lines in the result.
+        i2c (list | None): (bus id, address) pairs to attach generic register devices to.
+        devices (list | None): Chip emulators to attach, as (chip name, bus id, address), or
+                               the string "auto" (attach by the driver classes found in the
+                               firmware, see i2c_devices.attach_auto).
+
+    Returns:
+        dict: Result with status (ok/no-scheduler/stalled/reset/exited/crashed/wall-timeout), virtual and real
+              durations, speed-up, peripheral call count, gc count, imported firmware modules
+              with their estimated resident heap, per-task statistics and per-I2C-bus transfer
+              statistics.
+    """
+    src = Path(source_dir).resolve()
+    if not (src / "main.py").is_file():
+        raise FileNotFoundError(f"main.py not found in {src}")
+
+    install(int(seconds * 1_000_000))
+    sys.path.insert(0, str(src))
+    sys.meta_path.insert(0, _FirmwareImports(src))
+    os.chdir(src)
+
+    metrics = Metrics()
+    hooked = _hook_scheduler(metrics)
+    sim = Sim()
+    for bus_id, addr in i2c or ():
+        sim.i2c(bus_id).attach(machine.RegisterDevice(addr))
+    for item in devices or ():
+        if item == "auto":
+            i2c_devices.attach_auto(str(src))
+        else:
+            chip, bus_id, addr = item
+            sim.i2c(bus_id).attach(i2c_devices.CHIPS[chip][0](addr))
+    if scenario:
+        sim.load(scenario)
+
+    wall = {"expired": False}
+
+    def _on_alarm(signum, frame):
+        wall["expired"] = True
+        raise SimTimeout()
+
+    use_alarm = hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, wall_timeout)
+
+    out = io.StringIO()
+    status, detail = "exited", ""
+    t0 = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(out) if quiet else contextlib.nullcontext():
+            for name in ("boot.py", "main.py") if boot else ("main.py",):
+                if (src / name).is_file():
+                    runpy.run_path(str(src / name), run_name="__main__")
+    except SimTimeout:
+        pass
+    except SimReset as e:
+        status, detail = "reset", str(e)
+    except SystemExit:
+        pass
+    except Exception:
+        status, detail = "crashed", traceback.format_exc()
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    wall_s = time.perf_counter() - t0
+
+    if wall["expired"]:
+        status = "wall-timeout"
+    elif status == "exited" and CLOCK.timed_out:
+        status = "ok"
+        if hooked and metrics.sched is None:
+            # 启动阶段的延时用完了仿真时长，调度器主循环尚未启动，任务统计为空，不能算作 ok
+            status, detail = "no-scheduler", "scheduler() not reached within {}s, increase -t".format(seconds)
+        elif hooked:
+            # 主循环已启动，但任务卡死在回调中或从未完成一次执行
+            stuck = metrics.stalled((CLOCK.now // 1000) & TICKS_MAX)
+            if stuck:
+                status, detail = "stalled", stuck
+    virtual_s = CLOCK.now / 1_000_000
+    return {
+        "project": src.parent.name,
+        "status": status,
+        "detail": detail,
+        "virtual_s": round(virtual_s, 3),
+        "wall_s": round(wall_s, 3),
+        "speedup": round(virtual_s / wall_s, 1) if wall_s > 0 else 0.0,
+        "hal_calls": CLOCK.calls,
+        "gc_collects": _heap["collects"],
+        "modules": _heap["modules"],
+        "module_heap": _heap["base"] - HEAP_BASE,
+        "scheduler": hooked,
+        "tasks": metrics.report(virtual_s),
+        "i2c": [bus.stats(CLOCK.now) for _, bus in sorted(machine._i2c_buses.items())],
+        "output_tail": out.getvalue().splitlines()[-20:] if quiet else [],
+    }
+
+
+def format_report(result: dict) -> str:
+    """
+    把 run_firmware() 的结果格式化为文本表格。
+
+    ==========================================
+
+    Format a run_firmware() result as a text table.
+    """
+    lines = [
+        "=" * 78,
+        "项目: {project}  状态: {status}  虚拟 {virtual_s}s / 真实 {wall_s}s (x{speedup})".format(**result),
+        "外设调用: {hal_calls}  gc.collect: {gc_collects}  固件模块: {modules}（常驻堆约 {module_heap}B）".format(**result),
+    ]
+    if result["detail"]:
+        lines.append(result["detail"].rstrip())
+    if result["tasks"]:
+        lines.append("{:<32} {:>4} {:>7} {:>8} {:>9} {:>9} {:>6} {:>7}".format(
+            "task", "core", "runs", "runs/s", "late_avg", "late_max", "errors", "busy%"))
+        for t in result["tasks"]:
+            lines.append("{:<32} {:>4} {:>7} {:>8} {:>9} {:>9} {:>6} {:>7}".format(
+                t["name"][:32], t["core"], t["runs"], t["rate"], t["late_avg_ms"], t["late_max_ms"],
+                t["errors"], t["busy_pct"]))
+    elif not result["scheduler"]:
+        lines.append("（固件未使用 libs.scheduler，无任务统计）")
+    for bus in result.get("i2c", ()):
+        lines.append("I2C{bus}: 传输 {transactions}  无应答 {nacks}  占用 {busy_us}us ({util_pct}%)".format(**bus))
+        for d in bus["devices"]:
+            lines.append("  {:<16} {:>5} {:>8} {:>8} {:>8} {:>10}".format(
+                d["device"][:16], d["addr"], d["transactions"], d["bytes_written"], d["bytes_read"], d["bus_us"]))
+    return "\n".join(lines)
+
+
+def run_all(root: str, seconds: float = 10.0, jobs: int = 4, wall_timeout: float = 120.0) -> list:
+    """
+    对 root 下每个包含 firmware/main.py 的项目启动独立子进程运行仿真，返回各项目结果。
+    各项目按固件中的驱动类自动挂接 I2C 芯片模拟器。
+
+    ==========================================
+
+    Run the simulation for every project under root that has firmware/main.py, each in its own
+    subprocess, and return the results. I2C chip emulators are attached automatically from the
+    driver classes found in each firmware.
+    """
+    projects = sorted(p for p in Path(root).resolve().iterdir() if (p / "firmware" / "main.py").is_file())
+    entry = str(Path(__file__).resolve().parent)
+
+    def _one(project: Path) -> dict:
+        cmd = [sys.executable, entry, "-s", str(project / "firmware"), "-t", str(seconds),
+               "--wall-timeout", str(wall_timeout), "--device", "auto", "--json", "-q"]
+        try:
+            proc = subprocess.run(cmd, capture_output=True, text=True, timeout=wall_timeout + 30)
+            return json.loads(proc.stdout.strip().splitlines()[-1])
+        except Exception as e:
+            return {"project": project.name, "status": "crashed", "detail": str(e), "virtual_s": 0,
+                    "wall_s": 0, "speedup": 0, "hal_calls": 0, "gc_collects": 0, "modules": 0,
+                    "module_heap": 0, "scheduler": False,
+                    "tasks": [], "i2c": [], "output_tail": []}
+
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        return list(pool.map(_one, projects))
+
+
+def format_summary(results: list) -> str:
+    """
+    把 run_all() 的结果汇总为每个项目一行的表格。
+
+    ==========================================
+
+    Summarize run_all() results as a table with one line per project.
+    """
+    lines = ["{:<30} {:<12} {:>6} {:>8} {:>9} {:>9} {:>8} {:>8} {:>10}".format(
+        "project", "status", "tasks", "runs/s", "late_avg", "late_max", "speedup", "modules", "module_kb")]
+    for r in results:
+        tasks = r["tasks"]
+        rate = round(sum(t["rate"] for t in tasks), 1)
+        runs = sum(t["runs"] for t in tasks)
+        late_avg = round(sum(t["late_avg_ms"] * t["runs"] for t in tasks) / runs, 2) if runs else 0
+        late_max = max((t["late_max_ms"] for t in tasks), default=0)
+        lines.append("{:<30} {:<12} {:>6} {:>8} {:>9} {:>9} {:>8} {:>8} {:>10}".format(
+            r["project"][:30], r["status"], len(tasks), rate, late_avg, late_max, r["speedup"],
+            r["modules"], round(r["module_heap"] / 1024, 1)))
+    return "\n".join(lines)
+
+
+def main(argv: list | None = None) -> int:
+    """
+    命令行入口。
+
+    ==========================================
+
+    Command line entry.
+    """
+    parser = argparse.ArgumentParser(
+        description="主机模拟器 - 在 CPython 上以虚拟时钟运行 MicroPython 固件并统计任务延迟与吞吐量",
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument("-s", "--source", help="固件目录，默认为../firmware", default="../firmware")
+    parser.add_argument("-t", "--time", help="仿真时长，单位为虚拟秒，默认为10", type=float, default=10.0)
+    parser.add_argument("--scenario", help="场景脚本，通过全局变量 sim 注入引脚电平、串口数据等激励")
+    parser.add_argument("--i2c", help="在总线上挂接通用寄存器设备，如 --i2c 0:0x3c,0x20", action="append",
+                        default=[], metavar="BUS:ADDR[,ADDR]")
+    parser.add_argument("--device", help="挂接芯片模拟器，如 --device ssd1306@0:0x3c；auto 表示按固件中的驱动类自动挂接\n"
+                        "可用芯片: " + ", ".join(i2c_devices.CHIPS), action="append", default=[],
+                        metavar="CHIP@BUS:ADDR|auto")
+    parser.add_argument("--bench", help="运行 I2C 驱动基准测试而不运行固件，可用: " + ", ".join(BENCHES),
+                        choices=list(BENCHES), metavar="NAME")
+    parser.add_argument("--freq", help="--bench 的总线频率列表，单位为 Hz，默认为100000,400000",
+                        default="100000,400000")
+    parser.add_argument("-n", "--calls", help="--bench 的调用次数，默认为100", type=int, default=100)
+    parser.add_argument("--no-boot", help="不运行 boot.py", action="store_true")
+    parser.add_argument("--wall-timeout", help="真实时间上限，单位为秒，默认为120", type=float, default=120.0)
+    parser.add_argument("--cost", help="覆盖调用开销，如 --cost dispatch=30，单位为微秒", action="append",
+                        default=[], metavar="KIND=US")
+    parser.add_argument("--all", help="批量运行该目录下所有项目的固件，每个项目一个子进程", metavar="ROOT")
+    parser.add_argument("-j", "--jobs", help="--all 模式下并行运行的项目数，默认为4", type=int, default=4)
+    parser.add_argument("--json", help="以 JSON 输出结果", action="store_true")
+    parser.add_argument("-q", "--quiet", help="不打印固件输出", action="store_true")
+    args = parser.parse_args(argv)
+
+    for item in args.cost:
+        kind, _, us = item.partition("=")
+        if kind not in CLOCK.costs:
+            parser.error(f"unknown cost kind: {kind}")
+        CLOCK.costs[kind] = int(us)
+
+    i2c = []
+    for item in args.i2c:
+        bus, _, addrs = item.partition(":")
+        i2c.extend((int(bus), int(a, 0)) for a in addrs.split(",") if a)
+
+    devices = []
+    for item in args.device:
+        if item == "auto":
+            devices.append(item)
+            continue
+        chip, _, where = item.partition("@")
+        bus, _, addr = where.partition(":")
+        if chip not in i2c_devices.CHIPS or not addr:
+            parser.error(f"invalid --device: {item}")
+        devices.append((chip, int(bus), int(addr, 0)))
+
+    if args.bench:
+        try:
+            rows = run_bench(args.source, args.bench, [int(f) for f in args.freq.split(",")], args.calls)
+        except LookupError as e:
+            print(f"错误: {e}", file=sys.stderr)
+            return 2
+        print(json.dumps(rows, ensure_ascii=False) if args.json else format_bench(rows))
+        return 0
+
+    if args.all:
+        results = run_all(args.all, args.time, args.jobs, args.wall_timeout)
+        print(json.dumps(results, ensure_ascii=False) if args.json else format_summary(results))
+        return 0 if all(r["status"] == "ok" for r in results) else 1
+
+    try:
+        result = run_firmware(args.source, args.time, args.scenario, not args.no_boot,
+                              args.wall_timeout, args.quiet, i2c, devices)
+    except FileNotFoundError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps(result, ensure_ascii=False) if args.json else format_report(result))
+    return 0 if result["status"] == "ok" else 1
+
+# ======================================== 自定义类 ============================================
+
+
+class Metrics:
+    """
+    每个任务的执行统计：执行次数、启动延迟（调度器传入的 late）、执行耗时与异常次数，
+    以及已启动主循环的调度器（用于判断是否卡死）。
+
+    ==========================================
+
+    Per-task execution statistics: runs, start latency (late as passed by the scheduler),
+    execution time and exceptions, plus the scheduler whose main loop has started (to detect stalls).
+    """
+
+    def __init__(self) -> None:
+        self._tasks = {}
+        # 已启动主循环 scheduler() 的调度器，未启动时为None
+        self.sched = None
+
+    def _entry(self, sched, task) -> dict:
+        e = self._tasks.get(id(task))
+        if e is None:
+            e = self._tasks[id(task)] = {
+                "task": task, "core": getattr(sched, "_core", 0), "runs": 0, "errors": 0,
+                "late_sum": 0, "late_max": 0, "busy_us": 0,
+            }
+        return e
+
+    def record(self, sched, task, late: int, busy_us: int) -> None:
+        e = self._entry(sched, task)
+        e["runs"] += 1
+        e["late_sum"] += late
+        e["late_max"] = max(e["late_max"], late)
+        e["busy_us"] += busy_us
+
+    def error(self, sched, task, exc: Exception) -> None:
+        self._entry(sched, task)["errors"] += 1
+
+    def stalled(self, now_ms: int) -> str:
+        """
+        判断已启动的调度器是否卡死：某个核心正在执行的任务已运行超过 STALL_MS（或其更长的 max_runtime），
+        或没有任何任务完成过一次执行。
+
+        Args:
+            now_ms (int): 当前虚拟时刻（ticks_ms）。
+
+        Returns:
+            str: 卡死说明，未卡死时为空字符串。
+
+        ==========================================
+
+        Whether the started scheduler is stuck: the task in progress on some core has been running longer than
+        STALL_MS (or its longer max_runtime), or no task has completed a single run.
+
+        Args:
+            now_ms (int): Current virtual time (ticks_ms).
+
+        Returns:
+            str: Description of the stall, empty when not stalled.
+        """
+        sc = self.sched
+        while sc is not None:
+            task = sc._cur
+            if task is not None:
+                elapsed = ticks_diff(now_ms, sc._cur_t0)
+                if elapsed >= max(STALL_MS, task._maxrt):
+                    return "task {} on core {} running for {}ms".format(_task_name(task), sc._core, elapsed)
+            sc = sc._core1
+        if not any(e["runs"] for e in self._tasks.values()):
+            return "no task run completed"
+        return ""
+
+    def report(self, virtual_s: float) -> list:
+        rows = []
+        for e in self._tasks.values():
+            runs = e["runs"]
+            rows.append({
+                "name": _task_name(e["task"]),
+                "core": e["core"],
+                "interval_ms": e["task"]._intv if hasattr(e["task"], "_intv") else None,
+                "runs": runs,
+                "rate": round(runs / virtual_s, 2) if virtual_s else 0.0,
+                "late_avg_ms": round(e["late_sum"] / runs, 2) if runs else 0.0,
+                "late_max_ms": e["late_max"],
+                "errors": e["errors"],
+                "busy_pct": round(e["busy_us"] / (virtual_s * 10_000), 2) if virtual_s else 0.0,
+            })
+        return rows
+
+
+class Sim:
+    """
+    场景脚本使用的接口，脚本以全局变量 sim 访问，在固件启动前执行。
+
+    Methods:
+        at(ms, fn) / every(ms, fn, start_ms=None): 在虚拟时刻调用 fn()。
+        pin(id) -> _PinState: 引脚状态，drive(v) 驱动输入电平并触发中断。
+        press(id, at_ms, hold_ms=100, active=0): 在 at_ms 按下按键，hold_ms 后松开。
+        uart(id) -> UART: 串口，feed(data) 注入接收数据，tx 为已发送数据。
+        adc(ch, value): 设置 ADC 读数，value 可为以毫秒时刻为参数的函数。
+        i2c(id) -> _I2CBus: I2C 总线，attach(dev) 挂接设备。
+        stop(): 提前结束仿真。
+
+    ==========================================
+
+    Interface for scenario scripts, available as the global sim and run before the firmware starts.
+
+    Methods:
+        at(ms, fn) / every(ms, fn, start_ms=None): Call fn() at a virtual time.
+        pin(id) -> _PinState: Pin state; drive(v) drives the input level and fires interrupts.
+        press(id, at_ms, hold_ms=100, active=0): Press a button at at_ms and release after hold_ms.
+        uart(id) -> UART: UART; feed(data) injects received data, tx holds written data.
+        adc(ch, value): Set an ADC reading; value may be a function of the time in ms.
+        i2c(id) -> _I2CBus: I2C bus; attach(dev) attaches a device.
+        stop(): End the simulation early.
+    """
+
+    clock = CLOCK
+
+    def load(self, path: str) -> None:
+        code = compile(Path(path).read_text(encoding="utf-8"), str(path), "exec")
+        exec(code, {"sim": self, "__name__": "__scenario__"})
+
+    def now_ms(self) -> int:
+        return CLOCK.now // 1000
+
+    def at(self, ms: float, fn) -> None:
+        CLOCK.call_at(int(ms * 1000), fn)
+
+    def every(self, ms: float, fn, start_ms: float | None = None) -> None:
+        period = int(ms * 1000)
+        CLOCK.call_at(period if start_ms is None else int(start_ms * 1000), fn, period)
+
+    def pin(self, pin_id):
+        return machine.Pin(pin_id)._st
+
+    def press(self, pin_id, at_ms: float, hold_ms: float = 100, active: int = 0) -> None:
+        st = self.pin(pin_id)
+        self.at(at_ms, lambda: st.drive(active))
+        self.at(at_ms + hold_ms, lambda: st.drive(1 - active))
+
+    def uart(self, uart_id: int = 0) -> machine.UART:
+        return machine.UART(uart_id)
+
+    def adc(self, ch, value) -> None:
+        if isinstance(ch, int) and 0 <= ch <= 4:
+            ch += 26
+        machine._adc_values[ch] = value
+
+    def i2c(self, bus_id: int = 0):
+        return machine.I2C(bus_id)._bus
+
+    def stop(self) -> None:
+        CLOCK.stopped = True
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ============================================
@@ -0,0 +1,47 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/10/27 上午10:00
+# @Author  : 李清水
+# @File    : __init__.py
+# @Description : 主机模拟器：在 CPython 上以确定性的虚拟时钟运行 firmware/main.py，提供 machine 等模块的替身
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+from .clock import CLOCK, COSTS, VirtualClock, SimTimeout, SimReset
+from .runtime import install, run_firmware, run_all, format_report, format_summary, Metrics, Sim
+from .machine import I2CDevice, RegisterDevice
+from .i2c_devices import CHIPS, attach_auto
+from .bench import BENCHES, run_bench, format_bench
+
+# ======================================== 全局变量 ============================================
+
+__all__ = [
+    "CLOCK",
+    "COSTS",
+    "VirtualClock",
+    "SimTimeout",
+    "SimReset",
+    "install",
+    "run_firmware",
+    "run_all",
+    "format_report",
+    "format_summary",
+    "Metrics",
+    "Sim",
+    "I2CDevice",
+    "RegisterDevice",
+    "CHIPS",
+    "attach_auto",
+    "BENCHES",
+    "run_bench",
+    "format_bench",
+]
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ============================================
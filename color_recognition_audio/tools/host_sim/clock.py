@@ -0,0 +1,515 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/10/27 上午10:05
+# @Author  : 李清水
+# @File    : clock.py
+# @Description : 主机模拟器的虚拟时钟，替换 time.ticks_* / sleep_* 并驱动虚拟定时器与软中断回调
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+import time
+import heapq
+import threading
+from collections import deque
+
+# ======================================== 全局变量 ============================================
+
+# MicroPython ticks 周期为 2^30，与固件中的 ticks_add/ticks_diff 语义保持一致
+TICKS_PERIOD = 1 << 30
+TICKS_MAX = TICKS_PERIOD - 1
+TICKS_HALF = TICKS_PERIOD >> 1
+
+# 虚拟时钟起点对应的 UNIX 时间（2025-01-01 00:00:00），time.time()/localtime() 以此为基准
+EPOCH_S = 1735689600
+
+# 超时后允许应用清理（except KeyboardInterrupt 分支）的虚拟时长，单位为微秒
+GRACE_US = 1_000_000
+
+# micropython.schedule 队列深度，与 MicroPython 默认值一致
+SCHEDULE_DEPTH = 8
+
+# 各类硬件调用消耗的虚拟时间，单位为微秒。仿真不计量 Python 代码本身的执行时间，
+# 只按调用次数推进虚拟时钟，保证忙等循环可以结束，结果与主机性能无关。
+COSTS = {
+    # 读取 ticks_ms/ticks_us/ticks_cpu
+    "ticks": 1,
+    # 一次普通外设调用（Pin.value、ADC.read_u16、PWM.duty_u16 等）
+    "hal": 2,
+    # 一次 I2C 传输的软件开销，总线时间另按位数与时钟频率计算
+    "i2c": 10,
+    # 调度器检查一个任务是否到期（Scheduler._run / _run_due）
+    "dispatch": 20,
+    # 调度器执行一次任务回调的固定开销（Scheduler._exec）
+    "exec": 50,
+    # 一次 gc.collect()
+    "gc": 1500,
+}
+
+# 保存被替换前的 time 函数，供主机侧计时使用
+_real_time = time.time
+_real_localtime = time.localtime
+_real_gmtime = time.gmtime
+_real_sleep = time.sleep
+
+# ======================================== 功能函数 ============================================
+
+def ticks_add(ticks: int, delta: int) -> int:
+    """
+    按 MicroPython 语义计算 ticks 加法，结果回绕到 [0, TICKS_MAX]。
+
+    Args:
+        ticks (int): 起始 ticks 值。
+        delta (int): 增量，可为负数。
+
+    Returns:
+        int: 回绕后的 ticks 值。
+
+    ==========================================
+
+    Add a delta to a ticks value with MicroPython wrap-around semantics.
+
+    Args:
+        ticks (int): Start ticks value.
+        delta (int): Delta, may be negative.
+
+    Returns:
+        int: Wrapped ticks value.
+    """
+    return (ticks + delta) & TICKS_MAX
+
+
+def ticks_diff(ticks1: int, ticks2: int) -> int:
+    """
+    按 MicroPython 语义计算两个 ticks 的有符号差值 ticks1 - ticks2。
+
+    Args:
+        ticks1 (int): 较晚的 ticks 值。
+        ticks2 (int): 较早的 ticks 值。
+
+    Returns:
+        int: 范围为 [-TICKS_HALF, TICKS_HALF) 的差值。
+
+    ==========================================
+
+    Signed difference ticks1 - ticks2 with MicroPython wrap-around semantics.
+
+    Args:
+        ticks1 (int): Later ticks value.
+        ticks2 (int): Earlier ticks value.
+
+    Returns:
+        int: Difference in the range [-TICKS_HALF, TICKS_HALF).
+    """
+    return ((ticks1 - ticks2 + TICKS_HALF) & TICKS_MAX) - TICKS_HALF
+
+# ======================================== 自定义类 ============================================
+
+
+class SimTimeout(KeyboardInterrupt):
+    """
+    仿真时长到达上限时由虚拟时钟抛出。
+
+    继承 KeyboardInterrupt，固件中 `except Exception` 不会吞掉它，而 Scheduler 主循环
+    会像在 REPL 中按下 Ctrl-C 一样正常退出。
+
+    ==========================================
+
+    Raised by the virtual clock when the simulated duration is reached.
+
+    Derives from KeyboardInterrupt so `except Exception` in firmware does not swallow it,
+    while the Scheduler main loop exits just as it does on Ctrl-C at the REPL.
+    """
+
+
+class SimReset(BaseException):
+    """
+    固件请求复位（machine.reset()、deepsleep()）或看门狗超时时抛出，结束本次仿真。
+
+    ==========================================
+
+    Raised when the firmware resets the chip (machine.reset(), deepsleep()) or the
+    watchdog expires; it ends the simulation run.
+    """
+
+
+class _Event:
+    """
+    虚拟时钟上的一个定时事件，period_us 大于0时为周期事件。
+
+    ==========================================
+
+    A timed event on the virtual clock; periodic when period_us is greater than 0.
+    """
+
+    __slots__ = ("due", "period", "callback", "cancelled")
+
+    def __init__(self, due: int, period: int, callback) -> None:
+        self.due = due
+        self.period = period
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class VirtualClock:
+    """
+    确定性的虚拟时钟，单位为微秒，所有时间只在固件调用 sleep/ticks/外设函数时推进。
+
+    推进时钟时按截止时刻依次触发到期的定时事件（machine.Timer、看门狗、场景脚本注入的激励），
+    随后执行 micropython.schedule 排队的软回调。中断回调执行期间不再嵌套触发其他事件，
+    其中的外设调用只累加时间，与单核芯片关中断执行 ISR 的行为一致。
+
+    Attributes:
+        now (int): 当前虚拟时刻，单位为微秒。
+        limit (int | None): 仿真时长上限，到达后抛出 SimTimeout；None 表示不限制。
+        stopped (bool): 场景脚本是否请求提前结束。
+        timed_out (bool): 是否已到达仿真时长上限（或已请求结束）。
+        calls (int): 累计的外设调用次数。
+        costs (dict[str, int]): 各类调用消耗的虚拟时间，默认复制自 COSTS。
+
+    Methods:
+        reset(limit_us: int | None = None) -> None: 清空事件并把时钟归零。
+        call_at(due_us: int, callback, period_us: int = 0) -> _Event: 在指定时刻注册事件。
+        call_later(delay_us: int, callback, period_us: int = 0) -> _Event: 在若干微秒后注册事件。
+        schedule(func, arg) -> None: micropython.schedule 的实现。
+        charge(kind: str, n: int = 1) -> None: 按调用类型推进时钟。
+        advance(us: int) -> None: 推进时钟并触发期间到期的事件。
+        idle(max_us: int) -> None: 推进到下一个事件或 max_us 之后，用于 machine.idle()。
+        ticks_ms() / ticks_us() / ticks_cpu() -> int: 读取 ticks。
+        install_time() -> None: 把虚拟时钟函数挂到 time 模块上。
+
+    ==========================================
+
+    Deterministic virtual clock in microseconds; time only advances when the firmware
+    calls sleep/ticks/peripheral functions.
+
+    Advancing the clock fires due timed events (machine.Timer, watchdog, stimuli injected by
+    scenario scripts) in deadline order, then runs soft callbacks queued by
+    micropython.schedule. While an interrupt callback runs no other event is fired; its
+    peripheral calls only add time, like an ISR running with interrupts disabled on a single core.
+
+    Attributes:
+        now (int): Current virtual time in microseconds.
+        limit (int | None): Simulation limit, SimTimeout is raised when reached; None for no limit.
+        stopped (bool): Whether a scenario script requested an early stop.
+        timed_out (bool): Whether the limit was reached (or a stop was requested).
+        calls (int): Total number of peripheral calls.
+        costs (dict[str, int]): Virtual time consumed per call kind, copied from COSTS.
+
+    Methods:
+        reset(limit_us: int | None = None) -> None: Clear events and rewind the clock.
+        call_at(due_us: int, callback, period_us: int = 0) -> _Event: Register an event at a time.
+        call_later(delay_us: int, callback, period_us: int = 0) -> _Event: Register an event after a delay.
+        schedule(func, arg) -> None: Implementation of micropython.schedule.
+        charge(kind: str, n: int = 1) -> None: Advance the clock by call kind.
+        advance(us: int) -> None: Advance the clock and fire events due in between.
+        idle(max_us: int) -> None: Advance to the next event or by max_us, used by machine.idle().
+        ticks_ms() / ticks_us() / ticks_cpu() -> int: Read ticks.
+        install_time() -> None: Install the virtual clock functions on the time module.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self.costs = dict(COSTS)
+        self.reset()
+
+    def reset(self, limit_us: int | None = None) -> None:
+        """
+        清空事件与软回调队列，时钟归零并设置仿真时长上限。
+
+        Args:
+            limit_us (int | None): 仿真时长上限，单位为微秒，None 表示不限制。
+
+        ==========================================
+
+        Clear events and the soft callback queue, rewind the clock and set the limit.
+
+        Args:
+            limit_us (int | None): Simulation limit in microseconds, None for no limit.
+        """
+        with self._lock:
+            self.now = 0
+            self.limit = limit_us
+            self.stopped = False
+            self.calls = 0
+            self._events = []
+            self._seq = 0
+            self._pending = deque()
+            self._depth = 0
+            self.timed_out = False
+
+    def call_at(self, due_us: int, callback, period_us: int = 0) -> _Event:
+        """
+        在虚拟时刻 due_us 调用 callback()，period_us 大于0时周期调用。
+
+        Args:
+            due_us (int): 首次触发时刻，单位为微秒。
+            callback (callable): 无参数回调。
+            period_us (int): 周期，单位为微秒，0 表示单次。
+
+        Returns:
+            _Event: 可调用 cancel() 取消的事件。
+
+        ==========================================
+
+        Call callback() at virtual time due_us, periodically when period_us is greater than 0.
+
+        Args:
+            due_us (int): First due time in microseconds.
+            callback (callable): Callback without arguments.
+            period_us (int): Period in microseconds, 0 for one-shot.
+
+        Returns:
+            _Event: Event that can be cancelled with cancel().
+        """
+        ev = _Event(max(due_us, self.now), period_us, callback)
+        with self._lock:
+            self._seq += 1
+            heapq.heappush(self._events, (ev.due, self._seq, ev))
+        return ev
+
+    def call_later(self, delay_us: int, callback, period_us: int = 0) -> _Event:
+        """
+        在 delay_us 微秒后调用 callback()，参见 call_at。
+
+        ==========================================
+
+        Call callback() after delay_us microseconds, see call_at.
+        """
+        return self.call_at(self.now + delay_us, callback, period_us)
+
+    def next_due(self) -> int | None:
+        """
+        返回下一个未取消事件的触发时刻，没有事件时返回 None。
+
+        ==========================================
+
+        Return the due time of the next live event, or None when there is none.
+        """
+        events = self._events
+        while events and events[0][2].cancelled:
+            heapq.heappop(events)
+        return events[0][0] if events else None
+
+    def schedule(self, func, arg) -> None:
+        """
+        micropython.schedule 的实现：排队软回调，在当前中断返回或时钟推进后执行。
+
+        Args:
+            func (callable): 回调函数。
+            arg (object): 传给回调的参数。
+
+        Raises:
+            RuntimeError: 队列已满，与 MicroPython 的行为一致。
+
+        ==========================================
+
+        Implementation of micropython.schedule: queue a soft callback that runs after the
+        current interrupt returns or the clock advances.
+
+        Args:
+            func (callable): Callback function.
+            arg (object): Argument passed to the callback.
+
+        Raises:
+            RuntimeError: The queue is full, as on MicroPython.
+        """
+        if len(self._pending) >= SCHEDULE_DEPTH:
+            raise RuntimeError("schedule queue full")
+        self._pending.append((func, arg))
+
+    def charge(self, kind: str, n: int = 1) -> None:
+        """
+        记录一次外设调用并按 costs[kind] * n 推进时钟。
+
+        Args:
+            kind (str): 调用类型，为 costs 的键。
+            n (int): 次数或数据量倍数。
+
+        ==========================================
+
+        Record a peripheral call and advance the clock by costs[kind] * n.
+
+        Args:
+            kind (str): Call kind, a key of costs.
+            n (int): Count or data size multiplier.
+        """
+        self.calls += 1
+        self.advance(self.costs[kind] * n)
+
+    def advance(self, us: int) -> None:
+        """
+        推进时钟 us 微秒，依次触发期间到期的事件并执行排队的软回调。
+
+        在中断回调内部调用时只累加时间。到达仿真时长上限后抛出 SimTimeout，
+        之后给应用 GRACE_US 的清理时间，超过后每次推进都再次抛出。
+
+        Args:
+            us (int): 推进的微秒数，不大于0时只处理已到期的事件。
+
+        Raises:
+            SimTimeout: 到达仿真时长上限或场景脚本请求结束。
+
+        ==========================================
+
+        Advance the clock by us microseconds, firing events due in between and running
+        queued soft callbacks.
+
+        Inside an interrupt callback it only adds time. Once the limit is reached SimTimeout
+        is raised; the application then gets GRACE_US to clean up, after which every advance
+        raises again.
+
+        Args:
+            us (int): Microseconds to advance; when not positive only due events are handled.
+
+        Raises:
+            SimTimeout: The limit is reached or a scenario script requested a stop.
+        """
+        with self._lock:
+            if self._depth:
+                self.now += max(us, 0)
+                return
+            target = self.now + max(us, 0)
+            events = self._events
+            self._depth += 1
+            try:
+                while events and events[0][0] <= target:
+                    due, _, ev = heapq.heappop(events)
+                    if ev.cancelled:
+                        continue
+                    if due > self.now:
+                        self.now = due
+                    if ev.period > 0:
+                        ev.due = due + ev.period
+                        self._seq += 1
+                        heapq.heappush(events, (ev.due, self._seq, ev))
+                    ev.callback()
+                    self._drain()
+                if target > self.now:
+                    self.now = target
+                self._drain()
+            finally:
+                self._depth -= 1
+            self._check_limit()
+
+    def _drain(self) -> None:
+        """
+        执行 micropython.schedule 排队的软回调。
+
+        ==========================================
+
+        Run soft callbacks queued by micropython.schedule.
+        """
+        pending = self._pending
+        while pending:
+            func, arg = pending.popleft()
+            func(arg)
+
+    def _check_limit(self) -> None:
+        """
+        到达仿真时长上限时抛出 SimTimeout，首次抛出后留出 GRACE_US 的清理时间。
+
+        ==========================================
+
+        Raise SimTimeout when the limit is reached, leaving GRACE_US for cleanup after the first raise.
+        """
+        if self.limit is None and not self.stopped:
+            return
+        if not self.timed_out:
+            if self.stopped or self.now >= self.limit:
+                self.timed_out = True
+                self.limit = self.now + GRACE_US
+                raise SimTimeout()
+        elif self.now >= self.limit:
+            raise SimTimeout()
+
+    def idle(self, max_us: int = 1000) -> None:
+        """
+        machine.idle() 的实现：推进到下一个事件，最多 max_us 微秒（RP2040 上 SysTick 每 1ms 唤醒一次）。
+
+        Args:
+            max_us (int): 最长等待时间，单位为微秒。
+
+        ==========================================
+
+        Implementation of machine.idle(): advance to the next event, at most max_us
+        microseconds (SysTick wakes the RP2040 every 1 ms).
+
+        Args:
+            max_us (int): Longest wait in microseconds.
+        """
+        due = self.next_due()
+        wait = max_us if due is None else min(max(due - self.now, 1), max_us)
+        self.advance(wait)
+
+    def ticks_us(self) -> int:
+        self.charge("ticks")
+        return self.now & TICKS_MAX
+
+    def ticks_ms(self) -> int:
+        self.charge("ticks")
+        return (self.now // 1000) & TICKS_MAX
+
+    def ticks_cpu(self) -> int:
+        self.charge("ticks")
+        return self.now & TICKS_MAX
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(int(seconds * 1_000_000))
+
+    def sleep_ms(self, ms: int) -> None:
+        self.advance(int(ms) * 1000)
+
+    def sleep_us(self, us: int) -> None:
+        self.advance(int(us))
+
+    def time(self) -> int:
+        return EPOCH_S + self.now // 1_000_000
+
+    def time_ns(self) -> int:
+        return EPOCH_S * 1_000_000_000 + self.now * 1000
+
+    def localtime(self, secs: float | None = None) -> tuple:
+        """
+        MicroPython 风格的 localtime，返回8元组，未指定 secs 时使用虚拟时间。
+
+        ==========================================
+
+        MicroPython style localtime returning an 8-tuple, using virtual time when secs is omitted.
+        """
+        t = _real_gmtime(self.time() if secs is None else secs)
+        return (t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec, t.tm_wday, t.tm_yday)
+
+    def install_time(self) -> None:
+        """
+        把虚拟时钟函数挂到 time 模块上，固件的 `from time import ticks_ms` 与 `import time` 都会用到虚拟时间。
+        time.monotonic()/perf_counter() 保持真实时间，供主机侧统计仿真耗时。
+
+        ==========================================
+
+        Install the virtual clock functions on the time module so both `from time import ticks_ms`
+        and `import time` in firmware use virtual time. time.monotonic()/perf_counter() keep
+        real time for measuring the simulation on the host.
+        """
+        time.ticks_ms = self.ticks_ms
+        time.ticks_us = self.ticks_us
+        time.ticks_cpu = self.ticks_cpu
+        time.ticks_add = ticks_add
+        time.ticks_diff = ticks_diff
+        time.sleep = self.sleep
+        time.sleep_ms = self.sleep_ms
+        time.sleep_us = self.sleep_us
+        time.time = self.time
+        time.time_ns = self.time_ns
+        time.localtime = self.localtime
+        time.gmtime = self.localtime
+
+# ======================================== 初始化配置 ==========================================
+
+# 全局唯一的虚拟时钟，fake 模块与运行器共享
+CLOCK = VirtualClock()
+
+# ========================================  主程序  ============================================
@@ -0,0 +1,282 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/10/22 下午3:40
+# @Author  : 李清水
+# @File    : watchdog.py
+# @Description : 调度器看门狗服务，所有任务存活时才喂狗，记录卡死的任务以便复位后排查
+# @License : MIT
+
+__version__ = "1.0.0"
+__author__ = "李清水"
+__license__ = "MIT"
+__platform__ = "MicroPython v1.23"
+__chip__ = "All"
+
+# ======================================== 导入相关模块 ========================================
+
+# 导入const常量标识符
+from micropython import const
+# 导入硬件相关模块
+import machine
+from machine import Pin, Timer
+# 导入时间相关模块
+from time import ticks_ms, ticks_diff
+# 导入系统模块，用于判断端口
+import sys
+# 导入调度器中的任务类与调度类
+from .scheduler import Task, Scheduler
+
+# ======================================== 全局变量 ============================================
+
+# RP2040 看门狗 SCRATCH0~SCRATCH3 寄存器地址，看门狗复位后内容保留，上电清零
+# （SCRATCH4~7 被 machine.reset() 与 bootrom 使用，不可占用）
+_SCRATCH0 = const(0x4005800C)
+_SCRATCH1 = const(0x40058010)
+_SCRATCH2 = const(0x40058014)
+_SCRATCH3 = const(0x40058018)
+# 崩溃记录有效标识，取小整数范围内的值，中断中写入时不分配内存
+_CRASH_MAGIC = const(0x2BAD7A5C)
+
+# 仅RP2040端口使用SCRATCH寄存器持久化崩溃记录
+_mem32 = getattr(machine, "mem32", None) if sys.platform == "rp2" else None
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 定义Watchdog看门狗服务类
+class Watchdog():
+    """
+    Watchdog 类，由调度器驱动的看门狗服务，同时喂外部看门狗的 WDI 引脚与芯片内部的 machine.WDT。
+
+    喂狗只在调度器主循环中进行，并且只在所有任务存活时进行：
+        - 运行时间检查：定时器中断周期检查正在执行的任务（包括核心1上的任务），
+          单次执行超过 Task 的 max_runtime 即判定卡死，例如回调中无限等待串口数据。
+        - 心跳检查：主循环喂狗前检查每个运行中任务距上次成功执行的时间，
+          超过 Task 的 heartbeat 即判定失效，例如任务被其他任务饿死或每次执行都抛出异常。
+
+    判定失效后停止喂狗，由看门狗在超时后复位芯片，复位前把失效任务写入崩溃记录。
+    RP2040 上崩溃记录保存在看门狗 SCRATCH0~3 寄存器中，看门狗复位后仍然有效，
+    重新启动后通过 last_crash() 读取；其他端口上崩溃记录不会保留。
+
+    machine.WDT 在调度器进入主循环时才启动，避免初始化阶段被复位；启动后无法停止，
+    主循环因 KeyboardInterrupt 退出后芯片将在超时后复位，调试时可设置 hw=False。
+    任务首次执行即卡死时主循环不会再喂狗，machine.WDT 已启动，超时后照常复位。
+    看门狗服务只适用于 Scheduler，AsyncScheduler 不运行同步主循环，传入时抛出 ValueError。
+
+    Attributes:
+        REASON_RUNTIME (int): 失效原因，单次执行超过 max_runtime。
+        REASON_HEARTBEAT (int): 失效原因，超过 heartbeat 未成功执行。
+        _sched (Scheduler): 被监视的调度器。
+        _timeout (int): 看门狗超时时间，单位为毫秒。
+        _feed_ms (int): 喂狗周期，为超时时间的四分之一。
+        _hw (bool): 是否启用 machine.WDT。
+        _wdt (machine.WDT): 内部看门狗实例，调度器进入主循环时创建。
+        _wdi (Pin): 外部看门狗的 WDI 引脚，未指定时为None。
+        _tmr (machine.Timer): 运行时间检查使用的定时器。
+        _last (int): 上一次喂狗的时刻（ticks_ms）。
+        _tripped (bool): 是否已判定任务失效并停止喂狗。
+
+    Methods:
+        __init__(self, sched: Scheduler, tm: Timer, timeout_ms: int = 4000, wdi: int = None, hw: bool = True, check_ms: int = 100) -> None:
+            初始化看门狗服务并挂接到调度器。
+        _check(self, t: Timer) -> None:
+            定时器中断回调，检查正在执行的任务是否超时。
+        _trip(self, sched: Scheduler, task: Task, reason: int, elapsed: int, limit: int) -> None:
+            记录失效任务并停止喂狗。
+        start(self) -> None:
+            由调度器进入主循环时调用，启动 machine.WDT。
+        feed(self) -> None:
+            由调度器主循环调用，所有任务存活时喂狗。
+        last_crash(sched: Scheduler = None) -> dict:
+            读取并清除上一次复位前的崩溃记录（静态方法）。
+
+    Example:
+        >>> sc = Scheduler(Timer(-1), interval=10)
+        >>> sc.add(Task(imu_task.tick, interval=50, max_runtime=500, heartbeat=2000))
+        >>> wd = Watchdog(sc, Timer(-1), timeout_ms=4000, wdi=board.get_fixed_pin("WATCHDOG_WDI"))
+        >>> print(Watchdog.last_crash(sc))
+        >>> sc.scheduler()
+    """
+
+    # 失效原因
+    REASON_RUNTIME   = const(1)
+    REASON_HEARTBEAT = const(2)
+
+    def __init__(self, sched: Scheduler, tm: Timer, timeout_ms: int = 4000, wdi: int = None,
+                 hw: bool = True, check_ms: int = 100) -> None:
+        """
+        初始化看门狗服务并挂接到调度器，启动运行时间检查定时器。
+
+        Args:
+            sched (Scheduler): 被监视的调度器，核心1上的任务一并检查。
+            tm (machine.Timer): 运行时间检查使用的定时器，不能与调度器共用。
+            timeout_ms (int, optional): 看门狗超时时间，单位为毫秒，默认为4000ms；
+                                        RP2040 的 machine.WDT 最长为8388ms。
+            wdi (int, optional): 外部看门狗 WDI 引脚编号，默认为None（不使用外部看门狗）。
+            hw (bool, optional): 是否启用 machine.WDT，默认为True。
+            check_ms (int, optional): 运行时间检查周期，单位为毫秒，默认为100ms。
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: 调度器不运行同步主循环（如 AsyncScheduler）、已挂接看门狗服务，或超时时间不大于检查周期。
+        """
+        if type(sched).scheduler is not Scheduler.scheduler:
+            # AsyncScheduler 等重写了 scheduler() 的调度器不会调用 start()/feed()，看门狗不会生效
+            raise ValueError('watchdog requires the Scheduler main loop')
+        if sched._watchdog is not None:
+            raise ValueError('scheduler already has a watchdog')
+        if timeout_ms <= check_ms:
+            raise ValueError('timeout_ms must be greater than check_ms')
+        self._sched = sched
+        self._timeout = timeout_ms
+        self._feed_ms = timeout_ms // 4
+        self._hw = hw
+        self._wdt = None
+        self._wdi = Pin(wdi, Pin.OUT, value=0) if wdi is not None else None
+        self._tmr = tm
+        self._last = ticks_ms()
+        self._tripped = False
+        sched._watchdog = self
+        tm.init(period=check_ms, callback=self._check)
+
+    def _check(self, t: Timer) -> None:
+        """
+        定时器中断回调，检查各核心正在执行的任务是否超过其 max_runtime，不分配内存。
+
+        Args:
+            t (machine.Timer): 触发中断的定时器。
+
+        Returns:
+            None
+        """
+        if self._tripped:
+            return
+        now = ticks_ms()
+        sc = self._sched
+        while sc is not None:
+            task = sc._cur
+            if task is not None and task._maxrt > 0:
+                elapsed = ticks_diff(now, sc._cur_t0)
+                if elapsed > task._maxrt:
+                    self._trip(sc, task, Watchdog.REASON_RUNTIME, elapsed, task._maxrt)
+                    return
+            sc = sc._core1
+
+    def _trip(self, sched: Scheduler, task: Task, reason: int, elapsed: int, limit: int) -> None:
+        """
+        记录失效任务并停止喂狗，可在中断中调用。
+
+        崩溃记录格式：SCRATCH0 为有效标识，SCRATCH1 低8位为任务句柄、8~11位为核心编号、
+        12位以上为失效原因，SCRATCH2 为实际耗时，SCRATCH3 为限制值（均为毫秒）。
+
+        Args:
+            sched (Scheduler): 任务所属的调度器。
+            task (Task): 失效的任务。
+            reason (int): 失效原因，REASON_RUNTIME 或 REASON_HEARTBEAT。
+            elapsed (int): 单次执行时间或距上次成功执行的时间，单位为毫秒。
+            limit (int): 对应的限制值，单位为毫秒。
+
+        Returns:
+            None
+        """
+        self._tripped = True
+        if _mem32 is not None:
+            _mem32[_SCRATCH1] = (task._pos & 0xFF) | (sched._core << 8) | (reason << 12)
+            _mem32[_SCRATCH2] = elapsed
+            _mem32[_SCRATCH3] = limit
+            # 最后写入有效标识，复位时记录要么完整要么无效
+            _mem32[_SCRATCH0] = _CRASH_MAGIC
+        if self._hw and self._wdt is None:
+            # 调度器主循环尚未启动看门狗（如未调用 scheduler()），此处启动，保证超时后复位
+            self._wdt = machine.WDT(timeout=self._timeout)
+
+    def start(self) -> None:
+        """
+        由调度器进入主循环时调用：启动 machine.WDT 并翻转 WDI 引脚，开始计算喂狗周期。
+
+        在此处而不是第一次喂狗时启动，任务首次执行即卡死时看门狗同样会超时复位。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self._last = ticks_ms()
+        if self._hw and self._wdt is None:
+            self._wdt = machine.WDT(timeout=self._timeout)
+        if self._wdi is not None:
+            self._wdi.toggle()
+
+    def feed(self) -> None:
+        """
+        由调度器主循环调用：到达喂狗周期且所有运行中任务的心跳未超时时，
+        喂 machine.WDT 并翻转 WDI 引脚；判定失效后不再喂狗。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self._tripped:
+            return
+        now = ticks_ms()
+        if ticks_diff(now, self._last) < self._feed_ms:
+            return
+        sc = self._sched
+        while sc is not None:
+            for task in sc._tasks:
+                if task._hb > 0 and task._state == Task.TASK_RUN:
+                    elapsed = ticks_diff(now, task._beat)
+                    if elapsed > task._hb:
+                        self._trip(sc, task, Watchdog.REASON_HEARTBEAT, elapsed, task._hb)
+                        print('watchdog: task {} missed heartbeat ({}ms > {}ms), stop feeding'.format(
+                            task._pos, elapsed, task._hb))
+                        return
+            sc = sc._core1
+        self._last = now
+        if self._wdt is not None:
+            self._wdt.feed()
+        if self._wdi is not None:
+            self._wdi.toggle()
+
+    @staticmethod
+    def last_crash(sched: Scheduler = None) -> dict:
+        """
+        读取并清除上一次复位前的崩溃记录，仅RP2040有效。
+
+        应用重启后按相同顺序添加任务时，传入调度器可解析出失效任务的回调名称。
+
+        Args:
+            sched (Scheduler, optional): 用于解析任务名称的调度器，默认为None。
+
+        Returns:
+            dict: 包含 task（任务句柄）、name（回调名称，无法解析时为None）、core、reason、
+                  elapsed_ms、limit_ms 的字典；无崩溃记录时返回None。
+        """
+        if _mem32 is None or _mem32[_SCRATCH0] != _CRASH_MAGIC:
+            return None
+        info = _mem32[_SCRATCH1]
+        rec = {
+            'task': info & 0xFF,
+            'name': None,
+            'core': (info >> 8) & 0x0F,
+            'reason': info >> 12,
+            'elapsed_ms': _mem32[_SCRATCH2],
+            'limit_ms': _mem32[_SCRATCH3],
+        }
+        _mem32[_SCRATCH0] = 0
+        if sched is not None:
+            if rec['core'] == 1:
+                sched = sched._core1
+            if sched is not None and rec['task'] < len(sched._tasks):
+                rec['name'] = getattr(sched._tasks[rec['task']]._callback, '__name__', None)
+        return rec
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ============================================
@@ -229,8 +229,9 @@ task_obj = TimeTask(ds1307, ssd1306, stop, buzzer)
 sensor_task = Task(task_obj.second, interval=1000,  state=Task.TASK_RUN)
 alarm_task = Task(task_obj.alarm, interval=200,  state=Task.TASK_RUN)
 
-# 创建任务调度器,定时周期为50ms
-sc = Scheduler(Timer(-1), interval=50, task_idle=task_idle_callback, task_err=task_err_callback)
+# 创建任务调度器，使用截止时刻堆调度，任务按绝对时刻执行、长期速率不漂移
+sc = Scheduler(Timer(-1), interval=50, task_idle=task_idle_callback, task_err=task_err_callback,
+               mode=Scheduler.MODE_HEAP)
 
 # 添加任务
 sc.add(sensor_task)
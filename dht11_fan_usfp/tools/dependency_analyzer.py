@@ -11,8 +11,12 @@
 import ast
 import os
 import sys
+import json
+import hashlib
 import argparse
+import fnmatch
 from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Set, Tuple, Callable
 import re
 import html
@@ -20,8 +24,86 @@ import math
 
 # ======================================== 全局变量 ============================================
 
+# 解析缓存格式版本，导入边的表示方式变化时递增，旧缓存整体作废 (Parse cache format version, bump when the edge format changes)
+PARSE_CACHE_VERSION = 1
+# 未命中缓存的文件数达到该值时才启用进程池，避免进程启动开销超过解析本身 (Minimum cache misses before using a process pool)
+PARALLEL_MIN_FILES = 64
+
 # ======================================== 功能函数 ============================================
 
+def extract_import_edges(tree: ast.AST) -> List[list]:
+    """
+    从AST中提取导入语句，得到与项目模块表无关、可JSON序列化的导入边列表。
+
+    边的格式：
+    - `import a.b, c`：["import", ["a.b", "c"]]；
+    - `from ..x import y, z`：["from", "x", 2, ["y", "z"]]（module可能为None）。
+
+    Args:
+        tree (ast.AST): 解析后的Python抽象语法树。
+
+    Returns:
+        List[list]: 按ast.walk顺序排列的导入边列表。
+
+    ==========================================
+
+    Extract import statements from the AST as a JSON-serializable list of import edges that does not depend on the
+    project's module table.
+
+    Edge format:
+    - `import a.b, c`: ["import", ["a.b", "c"]];
+    - `from ..x import y, z`: ["from", "x", 2, ["y", "z"]] (module may be None).
+
+    Args:
+        tree (ast.AST): Parsed Python abstract syntax tree.
+
+    Returns:
+        List[list]: Import edges in ast.walk order.
+    """
+    edges: List[list] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            edges.append(["import", [alias.name for alias in node.names]])
+        elif isinstance(node, ast.ImportFrom):
+            edges.append(["from", node.module, node.level, [alias.name for alias in node.names]])
+    return edges
+
+
+def parse_file_edges(path: str) -> Tuple[str, Optional[List[list]], Optional[str]]:
+    """
+    读取并解析一个Python文件，返回内容哈希与导入边。为模块级函数，可在进程池中执行。
+
+    Args:
+        path (str): 文件绝对路径。
+
+    Returns:
+        Tuple[str, Optional[List[list]], Optional[str]]: (内容的SHA-256, 导入边, 错误信息)，
+        解析失败时导入边为None、错误信息非空。
+
+    ==========================================
+
+    Read and parse one Python file and return its content hash and import edges. A module-level function so it can
+    run in a process pool.
+
+    Args:
+        path (str): Absolute file path.
+
+    Returns:
+        Tuple[str, Optional[List[list]], Optional[str]]: (SHA-256 of the content, import edges, error message);
+        on failure the edges are None and the error message is set.
+    """
+    try:
+        with open(path, "rb") as f:
+            data: bytes = f.read()
+    except OSError as e:
+        return "", None, str(e)
+    digest: str = hashlib.sha256(data).hexdigest()
+    try:
+        tree: ast.AST = ast.parse(data.decode("utf-8"), filename=path)
+    except Exception as e:
+        return digest, None, str(e)
+    return digest, extract_import_edges(tree), None
+
 # ======================================== 自定义类 ============================================
 
 
@@ -151,18 +233,23 @@ class DependencyAnalyzer:
         nodes (Dict[str, FileNode]): 模块节点集合，key为module_id，value为FileNode实例。
         fixed_packages (Set[str]): 固定包目录集合，包含"drivers"、"libs"、"tasks"，放宽__init__.py检查。
         forced_deps_module_ids (List[str]): 需要被main.py强制依赖的模块标识列表，对应特定__init__.py文件。
+        cache_path (Optional[str]): 解析缓存文件的绝对路径，None表示不使用缓存。
+        jobs (int): 解析未命中缓存的文件时的进程数。
+        parse_stats (Dict[str, int]): 最近一次parse_all_files的统计：文件数、缓存命中数、重新解析数、重新解析导入名数。
 
     Methods:
-        __init__(root: str, out_md: str = "dependencies.md", verbose: bool = True) -> None: 初始化分析器实例。
+        __init__(root: str, out_md: str = "dependencies.md", verbose: bool = True, cache_path: Optional[str] = None, use_cache: bool = True, jobs: int = 0) -> None: 初始化分析器实例。
         scan_files() -> None: 扫描根目录收集Python文件，构建module_map。
         _compute_dotted_name(rel_noext: str, abs_path: str) -> Optional[str]: 计算模块的点分名称，处理固定包目录。
         build_module_map() -> None: 构建FileNode实例集合，填充nodes和dotted_map。
         _parse_imports_from_ast(tree: ast.AST, cur_module_id: str) -> Tuple[Set[str], Set[str]]: 从AST树提取导入依赖，区分内部/外部模块。
         _resolve_name_to_module(fullname: str) -> Optional[str]: 将导入名解析为项目内的module_id，优化固定包解析。
-        parse_all_files() -> None: 解析所有Python文件的AST，收集依赖关系到FileNode。
+        _resolve_import_edges(edges: List[list], cur_module_id: str) -> Tuple[Set[str], Set[str]]: 把导入边解析为内部/外部依赖。
+        parse_all_files() -> None: 解析所有Python文件的AST（带磁盘缓存与进程池），收集依赖关系到FileNode。
         _add_main_forced_deps() -> None: 强制添加main.py对特定__init__.py的依赖（若文件存在）。
         link_reverse() -> None: 构建反向依赖关系（填充imported_by字段）。
         find_cycles() -> List[List[str]]: 检测项目中的循环依赖，返回循环路径列表。
+        reachable_modules(roots=("main", "boot"), keep=()) -> Set[str]: 从入口沿导入边遍历，返回可达的module_id集合。
         export_markdown(cycles: Optional[List[List[str]]] = None) -> None: 生成Markdown格式的依赖分析报告。
         run() -> None: 一键运行完整分析流程（扫描→构建→解析→添加强制依赖→反向链接→循环检测→导出报告）。
 
@@ -171,6 +258,7 @@ class DependencyAnalyzer:
         - 固定包目录（drivers/libs/tasks）下的模块无需__init__.py即可生成点分名称。
         - 强制依赖仅针对main.py（module_id为"main"），目标为三个固定目录的__init__.py。
         - 解析文件时若遇到语法错误，会跳过该文件并在verbose模式下打印错误信息。
+        - 解析缓存以文件绝对路径为键，记录mtime、大小、内容SHA-256与导入边；模块表指纹不变时还复用上次的解析结果。
 
     ==========================================
 
@@ -190,18 +278,23 @@ class DependencyAnalyzer:
         nodes (Dict[str, FileNode]): Collection of module nodes, key is module_id, value is FileNode instance.
         fixed_packages (Set[str]): Set of fixed package directories, including "drivers", "libs", "tasks", relaxing __init__.py check.
         forced_deps_module_ids (List[str]): List of module IDs that main.py must depend on, corresponding to specific __init__.py files.
+        cache_path (Optional[str]): Absolute path of the parse cache file, None when caching is disabled.
+        jobs (int): Processes used to parse files that miss the cache.
+        parse_stats (Dict[str, int]): Statistics of the last parse_all_files run: files, cache hits, files parsed and files whose imports were resolved again.
 
     Methods:
-        __init__(root: str, out_md: str = "dependencies.md", verbose: bool = True) -> None: Initialize analyzer instance.
+        __init__(root: str, out_md: str = "dependencies.md", verbose: bool = True, cache_path: Optional[str] = None, use_cache: bool = True, jobs: int = 0) -> None: Initialize analyzer instance.
         scan_files() -> None: Scan root directory to collect Python files and build module_map.
         _compute_dotted_name(rel_noext: str, abs_path: str) -> Optional[str]: Compute dotted name of module, handle fixed package directories.
         build_module_map() -> None: Build collection of FileNode instances, populate nodes and dotted_map.
         _parse_imports_from_ast(tree: ast.AST, cur_module_id: str) -> Tuple[Set[str], Set[str]]: Extract import dependencies from AST, distinguish internal/external modules.
         _resolve_name_to_module(fullname: str) -> Optional[str]: Resolve import name to module_id in the project, optimize fixed package parsing.
-        parse_all_files() -> None: Parse AST of all Python files, collect dependencies into FileNode.
+        _resolve_import_edges(edges: List[list], cur_module_id: str) -> Tuple[Set[str], Set[str]]: Resolve import edges into internal/external dependencies.
+        parse_all_files() -> None: Parse AST of all Python files (with an on-disk cache and a process pool), collect dependencies into FileNode.
         _add_main_forced_deps() -> None: Force add main.py's dependency on specific __init__.py (if file exists).
         link_reverse() -> None: Build reverse dependency relationships (populate imported_by field).
         find_cycles() -> List[List[str]]: Detect cyclic dependencies in the project, return list of cycle paths.
+        reachable_modules(roots=("main", "boot"), keep=()) -> Set[str]: Walk import edges from the entries and return the set of reachable module_ids.
         export_markdown(cycles: Optional[List[List[str]]] = None) -> None: Generate dependency analysis report in Markdown format.
         run() -> None: One-click run of the complete analysis process (scan→build→parse→add forced deps→reverse link→cycle detect→export report).
 
@@ -210,10 +303,17 @@ class DependencyAnalyzer:
         - Modules in fixed package directories (drivers/libs/tasks) can generate dotted names without __init__.py.
         - Forced dependencies only target main.py (module_id is "main"), with targets being __init__.py of three fixed directories.
         - If syntax errors are encountered during file parsing, the file will be skipped and errors printed in verbose mode.
+        - The parse cache is keyed by absolute file path and stores mtime, size, content SHA-256 and import edges; resolved results are reused too while the module table fingerprint is unchanged.
     """
 
     def __init__(
-        self, root: str, out_md: str = "dependencies.md", verbose: bool = True
+        self,
+        root: str,
+        out_md: str = "dependencies.md",
+        verbose: bool = True,
+        cache_path: Optional[str] = None,
+        use_cache: bool = True,
+        jobs: int = 0,
     ) -> None:
         """
         初始化依赖分析器实例，设置根目录、输出路径、日志模式，并初始化核心映射结构。
@@ -222,6 +322,10 @@ class DependencyAnalyzer:
             root (str): 项目根目录路径（支持相对路径或绝对路径，内部会转换为绝对路径）。
             out_md (str, optional): 输出Markdown报告的路径，默认值为"dependencies.md"。
             verbose (bool, optional): 是否启用过程日志打印，默认值为True。
+            cache_path (Optional[str], optional): 解析缓存文件路径，默认为报告同目录下的dep_cache.json；
+                多个项目可共用同一个缓存文件（条目以文件绝对路径为键）。
+            use_cache (bool, optional): 是否使用解析缓存，默认值为True。
+            jobs (int, optional): 解析未命中缓存的文件时的进程数，0表示CPU核数，1表示不使用进程池。
 
         ==========================================
 
@@ -231,6 +335,11 @@ class DependencyAnalyzer:
             root (str): Project root directory path (supports relative or absolute path, converted to absolute path internally).
             out_md (str, optional): Path for output Markdown report, default is "dependencies.md".
             verbose (bool, optional): Whether to enable process log printing, default is True.
+            cache_path (Optional[str], optional): Parse cache file path, dep_cache.json next to the report by default;
+                several projects may share one cache file (entries are keyed by absolute file path).
+            use_cache (bool, optional): Whether to use the parse cache, default is True.
+            jobs (int, optional): Processes used to parse files that miss the cache, 0 for the CPU count, 1 for no
+                process pool.
         """
         self.root: str = os.path.abspath(root)  # 根目录绝对路径 (Absolute path of root directory)
         self.out_md: str = out_md  # 输出 Markdown 文件路径 (Output Markdown file path)
@@ -246,6 +355,15 @@ class DependencyAnalyzer:
             "libs/__init__",
             "tasks/__init__",
         ]
+        # 解析缓存与并行解析设置 (Parse cache and parallel parsing settings)
+        self.cache_path: Optional[str] = None
+        if use_cache:
+            self.cache_path = os.path.abspath(
+                cache_path or os.path.join(os.path.dirname(os.path.abspath(out_md)), "dep_cache.json")
+            )
+        self.jobs: int = jobs or os.cpu_count() or 1
+        # 最近一次parse_all_files的统计 (Statistics of the last parse_all_files run)
+        self.parse_stats: Dict[str, int] = {}
 
     # ---------- 扫描与模块标识 ----------
     def scan_files(self) -> None:
@@ -447,16 +565,42 @@ class DependencyAnalyzer:
         Returns:
             Tuple[Set[str], Set[str]]: The first element is the set of module_ids for internal dependencies, the second is the set of module names for external dependencies.
         """
+        return self._resolve_import_edges(extract_import_edges(tree), cur_module_id)
+
+    def _resolve_import_edges(
+        self, edges: List[list], cur_module_id: str
+    ) -> Tuple[Set[str], Set[str]]:
+        """
+        内部方法：把extract_import_edges()得到的导入边解析为内部依赖与外部依赖，规则与_parse_imports_from_ast相同。
+
+        Args:
+            edges (List[list]): 导入边列表。
+            cur_module_id (str): 当前文件的module_id，用于解析相对导入。
+
+        Returns:
+            Tuple[Set[str], Set[str]]: 内部依赖的module_id集合与外部依赖的模块名集合。
+
+        ==========================================
+
+        Internal method: Resolve import edges from extract_import_edges() into internal and external dependencies,
+        with the same rules as _parse_imports_from_ast.
+
+        Args:
+            edges (List[list]): Import edges.
+            cur_module_id (str): module_id of the current file, used to resolve relative imports.
+
+        Returns:
+            Tuple[Set[str], Set[str]]: Set of module_ids of internal dependencies and set of external module names.
+        """
         internal: Set[str] = set()
         external: Set[str] = set()
         cur_node: Optional[FileNode] = self.nodes.get(cur_module_id)
         cur_dotted: Optional[str] = cur_node.dotted_name if cur_node else None
 
-        for node in ast.walk(tree):
+        for edge in edges:
             # 处理 `import a.b as c` (Handle `import a.b as c`)
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    name: str = alias.name  # 形如 pkg.sub.module 或 pkg (Format like pkg.sub.module or pkg)
+            if edge[0] == "import":
+                for name in edge[1]:  # 形如 pkg.sub.module 或 pkg (Format like pkg.sub.module or pkg)
                     resolved: Optional[str] = self._resolve_name_to_module(name)
                     if resolved:
                         internal.add(resolved)
@@ -464,9 +608,9 @@ class DependencyAnalyzer:
                         external.add(name)
 
             # 处理 `from x import y` (Handle `from x import y`)
-            elif isinstance(node, ast.ImportFrom):
-                module: Optional[str] = node.module  # 形如 'pkg.sub' 或 None (Format like 'pkg.sub' or None)
-                level: int = node.level  # 0 表示绝对导入，>0 表示相对导入 (0 for absolute import, >0 for relative import)
+            elif edge[0] == "from":
+                module: Optional[str] = edge[1]  # 形如 'pkg.sub' 或 None (Format like 'pkg.sub' or None)
+                level: int = edge[2]  # 0 表示绝对导入，>0 表示相对导入 (0 for absolute import, >0 for relative import)
 
                 # 计算实际被导入的模块基名 (Calculate the base name of the actually imported module)
                 base_candidates: List[str] = []
@@ -495,8 +639,7 @@ class DependencyAnalyzer:
                         base_candidates.append(module)
 
                 # 解析每个导入的名称 (Parse each imported name)
-                for alias in node.names:
-                    alias_name: str = alias.name
+                for alias_name in edge[3]:
                     resolved_any: bool = False
 
                     # 优先尝试固定包的特殊解析 (Prioritize special parsing of fixed packages)
@@ -627,17 +770,68 @@ class DependencyAnalyzer:
 
         return None
 
+    def _module_map_fingerprint(self) -> str:
+        """
+        内部方法：计算模块表指纹。导入名的解析结果只取决于模块表、点分名称与固定包集合，指纹不变时可复用缓存的解析结果。
+
+        ==========================================
+
+        Internal method: Compute the module table fingerprint. Import resolution only depends on the module table,
+        the dotted names and the fixed packages, so cached resolutions can be reused while the fingerprint is unchanged.
+        """
+        payload: str = json.dumps(
+            [sorted(self.dotted_map.items(), key=lambda kv: kv[0]), sorted(self.fixed_packages)],
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load_parse_cache(self) -> Dict[str, dict]:
+        """
+        内部方法：读取解析缓存，文件不存在、损坏或版本不符时返回空字典。
+
+        ==========================================
+
+        Internal method: Load the parse cache; return an empty dict when the file is missing, corrupt or of another version.
+        """
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data: dict = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != PARSE_CACHE_VERSION:
+            return {}
+        return data.get("files", {})
+
+    def _save_parse_cache(self, entries: Dict[str, dict]) -> None:
+        """
+        内部方法：写回解析缓存，先写临时文件再替换，避免并发运行时读到半个文件。
+
+        ==========================================
+
+        Internal method: Write the parse cache back through a temporary file and a rename, so concurrent runs never
+        read a half-written file.
+        """
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp: str = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": PARSE_CACHE_VERSION, "files": entries}, separators=(",", ":")))
+        os.replace(tmp, self.cache_path)
+
     def parse_all_files(self) -> None:
         """
         解析项目中所有Python文件的AST，提取依赖关系并写入对应的FileNode实例。
 
         处理流程：
-        1. 遍历nodes中的每个FileNode实例；
-        2. 读取文件内容并解析为AST（遇到语法错误则跳过并打印日志）；
-        3. 调用_parse_imports_from_ast提取内部/外部依赖；
-        4. 将依赖关系写入FileNode的imports_internal和imports_external字段。
+        1. 读取解析缓存，文件的mtime与大小未变时直接使用缓存的导入边；否则计算内容SHA-256，哈希相同也视为命中；
+        2. 未命中的文件读取并解析为AST（遇到语法错误则跳过并打印日志），数量较多时在进程池中并行解析；
+        3. 模块表指纹与缓存一致且文件未变时直接复用缓存的内部/外部依赖，否则调用_resolve_import_edges重新解析导入名；
+        4. 将依赖关系写入FileNode的imports_internal和imports_external字段，并写回缓存。
 
-        日志输出：在verbose模式下打印解析进度、错误信息和结果。
+        日志输出：在verbose模式下打印解析进度、错误信息和缓存统计。
 
         Returns:
             None
@@ -647,30 +841,98 @@ class DependencyAnalyzer:
         Parse AST of all Python files in the project, extract dependencies and write to corresponding FileNode instances.
 
         Processing flow:
-        1. Traverse each FileNode instance in nodes;
-        2. Read file content and parse to AST (skip and print log if syntax error occurs);
-        3. Call _parse_imports_from_ast to extract internal/external dependencies;
-        4. Write dependencies to imports_internal and imports_external fields of FileNode.
+        1. Load the parse cache; when a file's mtime and size are unchanged its cached import edges are used directly,
+           otherwise its content SHA-256 is computed and an equal hash counts as a hit too;
+        2. Files that miss the cache are read and parsed to AST (skip and print log if syntax error occurs), in a
+           process pool when there are many of them;
+        3. When the module table fingerprint matches the cache and the file is unchanged, the cached internal/external
+           dependencies are reused; otherwise _resolve_import_edges resolves the import names again;
+        4. Write dependencies to imports_internal and imports_external fields of FileNode and write the cache back.
 
-        Log output: Print parsing progress, error messages and results in verbose mode.
+        Log output: Print parsing progress, error messages and cache statistics in verbose mode.
 
         Returns:
             None
         """
         if self.verbose:
             print("[parse] parsing files and resolving imports ...")
+        entries: Dict[str, dict] = self._load_parse_cache()
+        fingerprint: str = self._module_map_fingerprint()
+        current: Dict[str, dict] = {}  # module_id -> 本次使用的缓存条目 (cache entry used in this run)
+        misses: List[Tuple[str, os.stat_result]] = []
+        hits: int = 0
+
         for module_id, node in self.nodes.items():
             try:
-                with open(node.path, "r", encoding="utf-8") as f:
-                    src: str = f.read()
-                tree: ast.AST = ast.parse(src, filename=node.path)
-            except Exception as e:
+                st: os.stat_result = os.stat(node.path)
+            except OSError as e:
                 if self.verbose:
                     print(f"[parse] failed to parse {node.path}: {e}")
                 continue
-            internal, external = self._parse_imports_from_ast(tree, module_id)
+            entry: Optional[dict] = entries.get(node.path)
+            if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                current[module_id] = entry
+                hits += 1
+            else:
+                misses.append((module_id, st))
+
+        # 未命中的文件：内容哈希相同则只更新mtime，否则重新解析 (Misses: refresh mtime on an equal hash, otherwise parse)
+        to_parse: List[Tuple[str, os.stat_result]] = []
+        for module_id, st in misses:
+            path: str = self.nodes[module_id].path
+            entry = entries.get(path)
+            if entry:
+                with open(path, "rb") as f:
+                    if hashlib.sha256(f.read()).hexdigest() == entry["sha256"]:
+                        entry.update(mtime_ns=st.st_mtime_ns, size=st.st_size)
+                        current[module_id] = entry
+                        hits += 1
+                        continue
+            to_parse.append((module_id, st))
+
+        paths: List[str] = [self.nodes[module_id].path for module_id, _ in to_parse]
+        workers: int = self.jobs if len(paths) >= PARALLEL_MIN_FILES else 1
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = list(pool.map(parse_file_edges, paths, chunksize=8))
+        else:
+            parsed = [parse_file_edges(path) for path in paths]
+        for (module_id, st), (digest, edges, error) in zip(to_parse, parsed):
+            current[module_id] = entries[self.nodes[module_id].path] = {
+                "mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest, "edges": edges, "error": error,
+            }
+
+        resolved: int = 0
+        for module_id, entry in current.items():
+            node = self.nodes[module_id]
+            if entry["edges"] is None:
+                if self.verbose:
+                    print(f"[parse] failed to parse {node.path}: {entry['error']}")
+                continue
+            cached: Optional[dict] = entry.get("resolved")
+            if cached and cached["fingerprint"] == fingerprint:
+                node.imports_internal = set(cached["internal"])
+                node.imports_external = set(cached["external"])
+                continue
+            internal, external = self._resolve_import_edges(entry["edges"], module_id)
             node.imports_internal = internal
             node.imports_external = external
+            entry["resolved"] = {"fingerprint": fingerprint, "internal": sorted(internal), "external": sorted(external)}
+            resolved += 1
+
+        self.parse_stats = {"files": len(self.nodes), "cached": hits, "parsed": len(to_parse), "resolved": resolved}
+        if self.cache_path and (to_parse or resolved or len(misses) > len(to_parse)):
+            # 删除本项目中已不存在的文件的条目，保留其他项目的条目 (Drop entries of deleted files in this project only)
+            prefix: str = self.root.rstrip(os.sep) + os.sep
+            live: Set[str] = {node.path for node in self.nodes.values()}
+            for path in [p for p in entries if p.startswith(prefix) and p not in live]:
+                del entries[path]
+            self._save_parse_cache(entries)
+        if self.verbose:
+            print(
+                f"[parse] {len(self.nodes)} files: {hits} cached, {len(to_parse)} parsed, "
+                f"{resolved} resolved (jobs={workers})"
+            )
 
     # ---------- 强制添加main.py依赖 ----------
     def _add_main_forced_deps(self) -> None:
@@ -847,6 +1109,63 @@ class DependencyAnalyzer:
             print(f"[cycles] found {len(cycles)} cycles")
         return cycles
 
+    # ---------- 可达性分析（tree shaking）----------
+    def reachable_modules(
+        self, roots: Tuple[str, ...] = ("main", "boot"), keep: Tuple[str, ...] = ()
+    ) -> Set[str]:
+        """
+        从入口模块出发沿内部导入边遍历依赖图，返回设备运行时可能被导入的全部module_id。
+
+        遍历规则：
+        1. 入口默认为main与boot（main对固定包__init__的强制依赖由_add_main_forced_deps添加，需先调用）；
+        2. 导入包内模块时设备会先执行各级父包的__init__.py，因此每个可达模块的父包__init__也视为可达；
+        3. 与keep中任一通配模式（fnmatch，匹配module_id，如"drivers/*/code/*"）匹配的模块作为额外入口，
+           用于保留只被动态导入的模块。
+
+        Args:
+            roots (Tuple[str, ...], optional): 入口module_id，默认值为("main", "boot")，不存在的入口会被忽略。
+            keep (Tuple[str, ...], optional): 强制保留的module_id通配模式。
+
+        Returns:
+            Set[str]: 可达的module_id集合。
+
+        ==========================================
+
+        Walk the dependency graph along internal import edges from the entry modules and return every module_id the
+        device may import at runtime.
+
+        Traversal rules:
+        1. The entries are main and boot by default (main's forced dependencies on the fixed package __init__ files
+           are added by _add_main_forced_deps, which must be called first);
+        2. Importing a module inside a package runs the __init__.py of every parent package first, so the parent
+           __init__ of each reachable module is reachable too;
+        3. Modules matching any fnmatch pattern in keep (matched against the module_id, such as "drivers/*/code/*")
+           are extra entries, for modules that are only imported dynamically.
+
+        Args:
+            roots (Tuple[str, ...], optional): Entry module_ids, default is ("main", "boot"); missing ones are ignored.
+            keep (Tuple[str, ...], optional): fnmatch patterns of module_ids to always keep.
+
+        Returns:
+            Set[str]: Set of reachable module_ids.
+        """
+        queue: deque = deque(m for m in roots if m in self.nodes)
+        queue.extend(m for m in self.nodes if any(fnmatch.fnmatch(m, pattern) for pattern in keep))
+        seen: Set[str] = set()
+        while queue:
+            module_id: str = queue.popleft()
+            if module_id in seen:
+                continue
+            seen.add(module_id)
+            queue.extend(self.nodes[module_id].imports_internal)
+            # 父包的__init__ (Parent package __init__ files)
+            parts: List[str] = module_id.split("/")
+            for depth in range(1, len(parts)):
+                init_id: str = "/".join(parts[:depth]) + "/__init__"
+                if init_id in self.nodes and init_id != module_id:
+                    queue.append(init_id)
+        return seen
+
     # ---------- 输出 Markdown ----------
     def export_markdown(self, cycles: Optional[List[List[str]]] = None) -> None:
         """
@@ -1984,6 +2303,9 @@ if __name__ == "__main__":
         
           # 生成可视化到指定路径
           python dependency_analyzer.py -z ./viz/dependencies.html
+
+          # 多个项目共用一个解析缓存（pre-commit 中批量分析）
+          python dependency_analyzer.py ../other_project/firmware --cache ~/.cache/graftport_deps.json
         """
     )
 
@@ -2015,6 +2337,25 @@ if __name__ == "__main__":
         action="store_true"
     )
 
+    # 可选参数：解析缓存与并行解析
+    parser.add_argument(
+        "--cache",
+        help="""解析缓存文件路径，多个项目可共用同一个文件。
+        默认值: Markdown 报告同目录下的 dep_cache.json
+        """,
+        default=None,
+    )
+    parser.add_argument("--no-cache", help="不使用解析缓存，重新解析所有文件", action="store_true")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help=f"""解析未命中缓存的文件时的进程数（至少 {PARALLEL_MIN_FILES} 个文件时才启用进程池）。
+        默认值: 0（CPU 核数）
+        """,
+    )
+
     # 可选参数：生成可视化
     parser.add_argument(
         "--visualize",
@@ -2049,7 +2390,10 @@ if __name__ == "__main__":
         analyzer = DependencyAnalyzer(
             root=args.root,
             out_md=args.output,
-            verbose=not args.quiet
+            verbose=not args.quiet,
+            cache_path=args.cache,
+            use_cache=not args.no_cache,
+            jobs=args.jobs,
         )
         analyzer.run()
 
@@ -0,0 +1,884 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/10/27 上午11:20
+# @Author  : 李清水
+# @File    : machine.py
+# @Description : 主机模拟器中的 machine 模块替身，Pin/Timer/I2C/UART/ADC/PWM 等运行在虚拟时钟上
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+import errno
+from .clock import CLOCK, SimReset
+
+# ======================================== 全局变量 ============================================
+
+# 复位原因常量，与 RP2040 端口一致
+PWRON_RESET = 1
+WDT_RESET = 3
+
+# 模拟的 CPU 主频，单位为Hz
+_freq = 125_000_000
+
+# 引脚、串口、I2C 总线与 ADC 通道的全局状态，同一编号多次构造时共享，场景脚本通过运行器访问
+_pins = {}
+_uarts = {}
+_i2c_buses = {}
+_adc_values = {}
+
+# ======================================== 功能函数 ============================================
+
+def _pin_id(pin) -> object:
+    """
+    把 Pin 对象、引脚编号或引脚名称统一为引脚编号。
+
+    ==========================================
+
+    Normalize a Pin object, pin number or pin name to a pin id.
+    """
+    return pin._id if isinstance(pin, Pin) else pin
+
+
+def reset_state() -> None:
+    """
+    清空所有外设状态，每次仿真开始前由运行器调用。
+
+    ==========================================
+
+    Clear all peripheral state; called by the runner before each simulation.
+    """
+    global _freq
+    _freq = 125_000_000
+    _pins.clear()
+    _uarts.clear()
+    _i2c_buses.clear()
+    _adc_values.clear()
+    mem32.clear()
+    mem16.clear()
+    mem8.clear()
+
+
+def freq(hz: int | None = None) -> int | None:
+    global _freq
+    if hz is None:
+        return _freq
+    _freq = hz
+
+
+def idle() -> None:
+    """
+    等待下一个中断，最长 1ms（SysTick 周期）。
+
+    ==========================================
+
+    Wait for the next interrupt, at most 1 ms (the SysTick period).
+    """
+    CLOCK.idle(1000)
+
+
+def lightsleep(ms: int | None = None) -> None:
+    """
+    睡眠 ms 毫秒，期间到期的定时器与场景激励会提前唤醒。
+
+    ==========================================
+
+    Sleep for ms milliseconds; due timers and scenario stimuli wake it early.
+    """
+    if ms is None:
+        CLOCK.idle(1 << 40)
+        return
+    CLOCK.idle(int(ms) * 1000)
+
+
+def deepsleep(ms: int | None = None) -> None:
+    raise SimReset("deepsleep")
+
+
+def reset() -> None:
+    raise SimReset("machine.reset")
+
+
+def soft_reset() -> None:
+    raise SimReset("machine.soft_reset")
+
+
+def reset_cause() -> int:
+    return PWRON_RESET
+
+
+def unique_id() -> bytes:
+    return b"\xe6\x61\x38\x52\x83\x4d\x2f\x2a"
+
+
+def disable_irq() -> int:
+    return 0
+
+
+def enable_irq(state: int = 0) -> None:
+    pass
+
+
+def time_pulse_us(pin, pulse_level: int, timeout_us: int = 1000000) -> int:
+    """
+    测量脉冲宽度。虚拟引脚上没有脉冲，等待 timeout_us 后返回 -2（等待脉冲开始超时）。
+
+    ==========================================
+
+    Measure a pulse width. Virtual pins carry no pulses, so it waits timeout_us and
+    returns -2 (timed out waiting for the pulse to start).
+    """
+    CLOCK.advance(timeout_us)
+    return -2
+
+
+def dht_readinto(pin, buf) -> None:
+    """
+    DHT 单总线读取。虚拟引脚上没有传感器应答，等待约 5ms 后抛出 ETIMEDOUT，与未接传感器时一致。
+
+    ==========================================
+
+    DHT one-wire read. No sensor answers on a virtual pin, so it waits about 5 ms and raises
+    ETIMEDOUT, as with no sensor connected.
+    """
+    CLOCK.advance(5000)
+    raise OSError(errno.ETIMEDOUT)
+
+# ======================================== 自定义类 ============================================
+
+
+class _PinState:
+    """
+    一个引脚的共享状态：输出值、外部驱动值、上下拉与中断配置。
+
+    ==========================================
+
+    Shared state of one pin: output value, externally driven value, pulls and interrupt setup.
+    """
+
+    __slots__ = ("id", "mode", "pull", "out", "ext", "handler", "trigger", "hard", "edges", "pwm")
+
+    def __init__(self, pin_id) -> None:
+        self.id = pin_id
+        self.mode = Pin.IN
+        self.pull = None
+        self.out = 0
+        self.ext = None
+        self.handler = None
+        self.trigger = 0
+        self.hard = False
+        self.edges = 0
+        self.pwm = None
+
+    def level(self) -> int:
+        if self.mode == Pin.OUT:
+            return self.out
+        if self.ext is not None:
+            return self.ext
+        return 1 if self.pull == Pin.PULL_UP else 0
+
+    def drive(self, value: int) -> None:
+        """
+        从外部驱动输入电平（场景脚本调用），电平跳变时按触发条件调用中断回调。
+
+        ==========================================
+
+        Drive the input level from outside (called by scenario scripts); on an edge the
+        interrupt handler is called if the trigger matches.
+        """
+        old = self.level()
+        self.ext = 1 if value else 0
+        new = self.level()
+        if old == new:
+            return
+        self.edges += 1
+        edge = Pin.IRQ_RISING if new else Pin.IRQ_FALLING
+        if self.handler is not None and self.trigger & edge:
+            pin = Pin(self.id)
+            if self.hard:
+                self.handler(pin)
+            else:
+                CLOCK.schedule(self.handler, pin)
+
+
+class Pin:
+    """
+    虚拟 GPIO 引脚。同一编号的 Pin 对象共享状态；输入电平由场景脚本驱动，未驱动时由上下拉决定。
+
+    ==========================================
+
+    Virtual GPIO pin. Pin objects with the same id share state; input levels are driven by
+    scenario scripts and default to the pull configuration.
+    """
+
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    ALT = 3
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_LOW_LEVEL = 1
+    IRQ_HIGH_LEVEL = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, id, mode: int = -1, pull: int = -1, *, value: int | None = None, **kwargs) -> None:
+        self._id = _pin_id(id)
+        st = _pins.get(self._id)
+        if st is None:
+            st = _pins[self._id] = _PinState(self._id)
+        self._st = st
+        if mode != -1 or pull != -1 or value is not None:
+            self.init(mode, pull, value=value)
+
+    def init(self, mode: int = -1, pull: int = -1, *, value: int | None = None, **kwargs) -> None:
+        st = self._st
+        if mode != -1:
+            st.mode = Pin.OUT if mode == Pin.OPEN_DRAIN else mode
+        if pull != -1:
+            st.pull = pull
+        if value is not None:
+            st.out = 1 if value else 0
+        CLOCK.charge("hal")
+
+    def value(self, v: int | None = None) -> int | None:
+        CLOCK.charge("hal")
+        if v is None:
+            return self._st.level()
+        self._st.out = 1 if v else 0
+
+    __call__ = value
+
+    def on(self) -> None:
+        self.value(1)
+
+    def off(self) -> None:
+        self.value(0)
+
+    high = on
+    low = off
+
+    def toggle(self) -> None:
+        CLOCK.charge("hal")
+        self._st.out ^= 1
+
+    def irq(self, handler=None, trigger: int = IRQ_FALLING | IRQ_RISING, hard: bool = False):
+        st = self._st
+        st.handler = handler
+        st.trigger = trigger if handler is not None else 0
+        st.hard = hard
+        return self
+
+    def mode(self, mode: int | None = None):
+        if mode is None:
+            return self._st.mode
+        self._st.mode = mode
+
+    def pull(self, pull: int | None = None):
+        if pull is None:
+            return self._st.pull
+        self._st.pull = pull
+
+    def __repr__(self) -> str:
+        return "Pin({})".format(self._id)
+
+
+class Signal:
+    def __init__(self, pin, *args, invert: bool = False, **kwargs) -> None:
+        self._pin = pin if isinstance(pin, Pin) else Pin(pin, *args, **kwargs)
+        self._invert = invert
+
+    def value(self, v: int | None = None):
+        if v is None:
+            return self._pin.value() ^ self._invert
+        self._pin.value(bool(v) ^ self._invert)
+
+    __call__ = value
+
+    def on(self) -> None:
+        self.value(1)
+
+    def off(self) -> None:
+        self.value(0)
+
+
+class Timer:
+    """
+    虚拟定时器，回调在虚拟时钟到达周期时触发；hard=False 时经 micropython.schedule 排队执行。
+
+    ==========================================
+
+    Virtual timer whose callback fires when the virtual clock reaches each period; with
+    hard=False it is queued through micropython.schedule.
+    """
+
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id: int = -1, **kwargs) -> None:
+        self._id = id
+        self._ev = None
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, *, mode: int = PERIODIC, freq: float = -1, period: int = -1, tick_hz: int = 1000,
+             callback=None, hard: bool = True) -> None:
+        self.deinit()
+        if freq > 0:
+            period_us = max(int(1_000_000 / freq), 1)
+        else:
+            period_us = max(int(period * 1_000_000 / tick_hz), 1)
+        self._callback = callback
+        self._hard = hard
+        self._ev = CLOCK.call_later(period_us, self._fire, period_us if mode == Timer.PERIODIC else 0)
+
+    def _fire(self) -> None:
+        cb = self._callback
+        if cb is None:
+            return
+        if self._hard:
+            cb(self)
+        else:
+            CLOCK.schedule(cb, self)
+
+    def deinit(self) -> None:
+        if self._ev is not None:
+            self._ev.cancel()
+            self._ev = None
+
+
+class WDT:
+    """
+    虚拟看门狗，超时未喂狗时抛出 SimReset 结束仿真，运行器记录为看门狗复位。
+
+    ==========================================
+
+    Virtual watchdog; when not fed in time it raises SimReset to end the simulation and the
+    runner reports a watchdog reset.
+    """
+
+    def __init__(self, id: int = 0, timeout: int = 5000) -> None:
+        self._timeout = timeout * 1000
+        self._ev = None
+        self.feed()
+
+    def _expire(self) -> None:
+        raise SimReset("watchdog timeout")
+
+    def feed(self) -> None:
+        if self._ev is not None:
+            self._ev.cancel()
+        self._ev = CLOCK.call_later(self._timeout, self._expire)
+
+
+class RTC:
+    _offset = 0
+
+    def __init__(self, id: int = 0) -> None:
+        pass
+
+    def datetime(self, dt: tuple | None = None):
+        """
+        读写 RTC 时间，格式为 (year, month, day, weekday, hours, minutes, seconds, subseconds)。
+
+        ==========================================
+
+        Read or set the RTC, format (year, month, day, weekday, hours, minutes, seconds, subseconds).
+        """
+        import calendar
+        if dt is None:
+            t = CLOCK.localtime(CLOCK.time() + RTC._offset)
+            return (t[0], t[1], t[2], t[6], t[3], t[4], t[5], 0)
+        secs = calendar.timegm((dt[0], dt[1], dt[2], dt[4], dt[5], dt[6], 0, 0, 0))
+        RTC._offset = secs - CLOCK.time()
+
+
+class ADC:
+    """
+    虚拟 ADC 通道，读数由场景脚本设置（常量或以毫秒时刻为参数的函数），默认为半量程。
+
+    ==========================================
+
+    Virtual ADC channel; readings are set by scenario scripts (a constant or a function of
+    the time in ms) and default to half scale.
+    """
+
+    CORE_TEMP = 4
+
+    def __init__(self, pin, *args, **kwargs) -> None:
+        ch = _pin_id(pin)
+        # RP2040 上 ADC(0)~ADC(4) 与 ADC(26)~ADC(29) 指向同一组通道
+        if isinstance(ch, int) and 0 <= ch <= 4:
+            ch += 26
+        self._ch = ch
+
+    def read_u16(self) -> int:
+        CLOCK.charge("hal")
+        v = _adc_values.get(self._ch, 32768)
+        if callable(v):
+            v = v(CLOCK.now // 1000)
+        return max(0, min(65535, int(v)))
+
+
+class PWM:
+    def __init__(self, pin, *, freq: int = 1000, duty_u16: int | None = None, duty_ns: int | None = None,
+                 invert: bool = False) -> None:
+        self._pin = pin if isinstance(pin, Pin) else Pin(pin, Pin.OUT)
+        self._freq = freq
+        self._duty = 0
+        self._pin._st.pwm = self
+        if duty_u16 is not None:
+            self._duty = duty_u16
+        elif duty_ns is not None:
+            self.duty_ns(duty_ns)
+
+    def init(self, *, freq: int | None = None, duty_u16: int | None = None, duty_ns: int | None = None) -> None:
+        if freq is not None:
+            self._freq = freq
+        if duty_u16 is not None:
+            self._duty = duty_u16
+        elif duty_ns is not None:
+            self.duty_ns(duty_ns)
+
+    def freq(self, value: int | None = None):
+        CLOCK.charge("hal")
+        if value is None:
+            return self._freq
+        self._freq = value
+
+    def duty_u16(self, value: int | None = None):
+        CLOCK.charge("hal")
+        if value is None:
+            return self._duty
+        self._duty = max(0, min(65535, int(value)))
+
+    def duty_ns(self, value: int | None = None):
+        period_ns = 1_000_000_000 // max(self._freq, 1)
+        if value is None:
+            return self._duty * period_ns // 65535
+        self.duty_u16(int(value) * 65535 // period_ns)
+
+    def deinit(self) -> None:
+        self._duty = 0
+
+
+class UART:
+    """
+    虚拟串口。发送的数据记录在 tx 中并按波特率消耗时间，接收数据由场景脚本通过 feed() 注入。
+
+    ==========================================
+
+    Virtual UART. Written data is kept in tx and takes time according to the baud rate;
+    received data is injected by scenario scripts through feed().
+    """
+
+    INV_TX = 1
+    INV_RX = 2
+    RTS = 1
+    CTS = 2
+
+    # 保留的发送数据上限，超过后丢弃最早的数据
+    TX_KEEP = 4096
+
+    def __new__(cls, id: int = 0, *args, **kwargs):
+        # 同一编号共享接收缓冲区，场景脚本注入的数据对任意实例可见
+        uart = _uarts.get(id)
+        if uart is None:
+            uart = _uarts[id] = super().__new__(cls)
+            uart._id = id
+            uart._rx = bytearray()
+            uart.tx = bytearray()
+            uart.tx_bytes = 0
+            uart._baud = 115200
+        return uart
+
+    def __init__(self, id: int = 0, baudrate: int | None = None, *args, **kwargs) -> None:
+        self.init(baudrate, **kwargs)
+
+    def init(self, baudrate: int | None = None, bits: int = 8, parity=None, stop: int = 1, **kwargs) -> None:
+        if baudrate:
+            self._baud = baudrate
+
+    def deinit(self) -> None:
+        pass
+
+    def feed(self, data: bytes) -> None:
+        self._rx += data
+
+    def any(self) -> int:
+        CLOCK.charge("hal")
+        return len(self._rx)
+
+    def read(self, nbytes: int | None = None) -> bytes | None:
+        CLOCK.charge("hal")
+        if not self._rx:
+            return None
+        n = len(self._rx) if nbytes is None else min(nbytes, len(self._rx))
+        data = bytes(self._rx[:n])
+        del self._rx[:n]
+        return data
+
+    def readinto(self, buf, nbytes: int | None = None) -> int | None:
+        data = self.read(len(buf) if nbytes is None else nbytes)
+        if data is None:
+            return None
+        buf[:len(data)] = data
+        return len(data)
+
+    def readline(self) -> bytes | None:
+        CLOCK.charge("hal")
+        if not self._rx:
+            return None
+        i = self._rx.find(b"\n")
+        n = len(self._rx) if i < 0 else i + 1
+        data = bytes(self._rx[:n])
+        del self._rx[:n]
+        return data
+
+    def write(self, buf) -> int:
+        data = buf.encode() if isinstance(buf, str) else bytes(buf)
+        self.tx += data
+        if len(self.tx) > UART.TX_KEEP:
+            del self.tx[:len(self.tx) - UART.TX_KEEP]
+        self.tx_bytes += len(data)
+        # 每字节 10 位（起始位 + 8 数据位 + 停止位）
+        CLOCK.advance(len(data) * 10_000_000 // self._baud)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def txdone(self) -> bool:
+        return True
+
+    def sendbreak(self) -> None:
+        pass
+
+
+class I2CDevice:
+    """
+    挂在虚拟 I2C 总线上的设备基类，子类重写 write()/read() 实现寄存器行为。
+
+    写寄存器类传输（writeto_mem、writevto）以 write() 传入完整数据；读寄存器类传输先以
+    stop=False 写入寄存器地址，再调用 read()。总线负责统计传输次数、字节数与占用时间。
+
+    Attributes:
+        addr (int): 7 位设备地址。
+        transactions (int): 寻址本设备的传输次数（一次 readfrom_mem 计为一次）。
+        bytes_written (int): 写入本设备的字节数，不含地址字节。
+        bytes_read (int): 从本设备读出的字节数。
+        bus_us (int): 与本设备通信占用的总线时间，单位为微秒。
+
+    ==========================================
+
+    Base class for devices on the virtual I2C bus; subclasses override write()/read() to
+    implement register behavior.
+
+    Register writes (writeto_mem, writevto) pass the whole payload to write(); register reads
+    first write the register address with stop=False, then call read(). The bus keeps the
+    transaction, byte and bus time counters.
+
+    Attributes:
+        addr (int): 7-bit device address.
+        transactions (int): Transactions addressed to this device (a readfrom_mem counts once).
+        bytes_written (int): Bytes written to this device, excluding address bytes.
+        bytes_read (int): Bytes read from this device.
+        bus_us (int): Bus time spent talking to this device, in microseconds.
+    """
+
+    def __init__(self, addr: int) -> None:
+        self.addr = addr
+        self.transactions = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.bus_us = 0
+
+    def write(self, data: bytes, stop: bool = True) -> None:
+        pass
+
+    def read(self, n: int) -> bytes:
+        return bytes(n)
+
+    def stats(self) -> dict:
+        return {
+            "device": type(self).__name__,
+            "addr": hex(self.addr),
+            "transactions": self.transactions,
+            "bytes_written": self.bytes_written,
+            "bytes_read": self.bytes_read,
+            "bus_us": self.bus_us,
+        }
+
+
+class RegisterDevice(I2CDevice):
+    """
+    通用寄存器设备：256 字节寄存器文件，写入的第一个字节为寄存器指针，读写后指针自动递增。
+    用于让未提供专用模拟器的芯片应答，读数为最近写入的值（初始为0）。
+
+    ==========================================
+
+    Generic register device: a 256-byte register file whose first written byte is the register
+    pointer, auto-incremented after each access. Lets chips without a dedicated emulator
+    acknowledge; reads return the last written values (initially 0).
+    """
+
+    def __init__(self, addr: int) -> None:
+        super().__init__(addr)
+        self.regs = bytearray(256)
+        self.ptr = 0
+
+    def write(self, data: bytes, stop: bool = True) -> None:
+        if not data:
+            return
+        self.ptr = data[0]
+        for b in data[1:]:
+            self.regs[self.ptr] = b
+            self.ptr = (self.ptr + 1) & 0xFF
+
+    def read(self, n: int) -> bytes:
+        out = bytearray(n)
+        for i in range(n):
+            out[i] = self.regs[self.ptr]
+            self.ptr = (self.ptr + 1) & 0xFF
+        return bytes(out)
+
+
+class _I2CBus:
+    """
+    一条虚拟 I2C 总线：设备表与总线统计，同一编号的 I2C 对象共享。
+
+    Attributes:
+        devices (dict[int, I2CDevice]): 按地址索引的设备。
+        transactions (int): 总传输次数，包括无应答的传输与 scan 的探测。
+        nacks (int): 地址无应答次数。
+        busy_us (int): 总线占用时间，单位为微秒。
+
+    ==========================================
+
+    One virtual I2C bus: device table and bus statistics, shared by I2C objects with the same id.
+
+    Attributes:
+        devices (dict[int, I2CDevice]): Devices by address.
+        transactions (int): Total transactions, including unacknowledged ones and scan probes.
+        nacks (int): Unacknowledged addresses.
+        busy_us (int): Bus busy time in microseconds.
+    """
+
+    def __init__(self, bus_id) -> None:
+        self.id = bus_id
+        self.devices = {}
+        self.transactions = 0
+        self.nacks = 0
+        self.busy_us = 0
+
+    def attach(self, dev: I2CDevice) -> I2CDevice:
+        self.devices[dev.addr] = dev
+        return dev
+
+    def device(self, addr: int) -> I2CDevice:
+        dev = self.devices.get(addr)
+        if dev is None:
+            self.nacks += 1
+            # 地址无应答，与 RP2040 端口一致抛出 EIO
+            raise OSError(errno.EIO)
+        return dev
+
+    def stats(self, elapsed_us: int) -> dict:
+        return {
+            "bus": self.id,
+            "transactions": self.transactions,
+            "nacks": self.nacks,
+            "busy_us": self.busy_us,
+            "util_pct": round(self.busy_us * 100 / elapsed_us, 2) if elapsed_us else 0.0,
+            "devices": [d.stats() for _, d in sorted(self.devices.items())],
+        }
+
+
+class I2C:
+    """
+    虚拟 I2C 主机。设备由场景脚本挂到总线上，未挂设备的地址无应答。
+
+    每次传输按位计时：起始位、每个地址/数据字节 9 位（含应答位）、重复起始与停止位，
+    按构造时的 freq（标准模式 100kHz、快速模式 400kHz 等）折算为总线时间推进虚拟时钟，
+    另计一次 "i2c" 调用开销。
+
+    ==========================================
+
+    Virtual I2C controller. Devices are attached to the bus by scenario scripts; addresses
+    without a device do not acknowledge.
+
+    Each transfer is timed bit by bit: start bit, 9 bits per address/data byte (including
+    ACK), repeated start and stop bits, converted to bus time at the freq given to the
+    constructor (100 kHz standard mode, 400 kHz fast mode, ...) to advance the virtual clock,
+    plus one "i2c" call overhead.
+    """
+
+    def __init__(self, id: int = 0, *, scl=None, sda=None, freq: int = 400000, timeout: int = 50000) -> None:
+        self._id = id
+        self._freq = freq
+        bus = _i2c_buses.get(id)
+        if bus is None:
+            bus = _i2c_buses[id] = _I2CBus(id)
+        self._bus = bus
+
+    def init(self, *args, freq: int | None = None, **kwargs) -> None:
+        if freq:
+            self._freq = freq
+
+    def deinit(self) -> None:
+        pass
+
+    def _xfer(self, addr: int, nwrite: int, nread: int = 0, restart: bool = False, probe: bool = False):
+        """
+        记一次传输的总线时间与统计，返回目标设备；地址无应答时只计起始、地址与停止位后抛出 EIO。
+
+        Args:
+            addr (int): 设备地址。
+            nwrite (int): 写入的字节数（含寄存器地址）。
+            nread (int): 读出的字节数。
+            restart (bool): 写后是否以重复起始再次寻址读取（readfrom_mem）。
+            probe (bool): 是否为 scan 的探测，探测无应答时返回 None 而不抛出异常。
+
+        Returns:
+            I2CDevice: 目标设备。
+
+        ==========================================
+
+        Account bus time and statistics for one transfer and return the target device; an
+        unacknowledged address costs only start, address and stop bits, then EIO is raised.
+
+        Args:
+            addr (int): Device address.
+            nwrite (int): Bytes written (including register address).
+            nread (int): Bytes read.
+            restart (bool): Whether a repeated start re-addresses the device for reading (readfrom_mem).
+            probe (bool): Whether this is a scan probe; an unacknowledged probe returns None instead of raising.
+
+        Returns:
+            I2CDevice: Target device.
+        """
+        bus = self._bus
+        bus.transactions += 1
+        CLOCK.charge("i2c")
+        dev = bus.devices.get(addr)
+        bits = 11 if dev is None else 11 + 9 * (nwrite + nread) + (10 if restart else 0)
+        us = bits * 1_000_000 // self._freq
+        bus.busy_us += us
+        CLOCK.advance(us)
+        if dev is None:
+            if probe:
+                return None
+            bus.device(addr)
+        dev.transactions += 1
+        dev.bytes_written += nwrite
+        dev.bytes_read += nread
+        dev.bus_us += us
+        return dev
+
+    def scan(self) -> list:
+        return [addr for addr in range(0x08, 0x78) if self._xfer(addr, 0, probe=True) is not None]
+
+    @staticmethod
+    def _reg(memaddr: int, addrsize: int) -> bytes:
+        return memaddr.to_bytes(addrsize // 8, "big")
+
+    def writeto(self, addr: int, buf, stop: bool = True) -> int:
+        self._xfer(addr, len(buf)).write(bytes(buf), stop)
+        return len(buf)
+
+    def writevto(self, addr: int, vector, stop: bool = True) -> int:
+        data = b"".join(bytes(b) for b in vector)
+        self._xfer(addr, len(data)).write(data, stop)
+        return len(vector)
+
+    def readfrom(self, addr: int, nbytes: int, stop: bool = True) -> bytes:
+        return bytes(self._xfer(addr, 0, nbytes).read(nbytes))
+
+    def readfrom_into(self, addr: int, buf, stop: bool = True) -> None:
+        buf[:] = self.readfrom(addr, len(buf), stop)
+
+    def writeto_mem(self, addr: int, memaddr: int, buf, *, addrsize: int = 8) -> None:
+        reg = self._reg(memaddr, addrsize)
+        self._xfer(addr, len(reg) + len(buf)).write(reg + bytes(buf))
+
+    def readfrom_mem(self, addr: int, memaddr: int, nbytes: int, *, addrsize: int = 8) -> bytes:
+        reg = self._reg(memaddr, addrsize)
+        dev = self._xfer(addr, len(reg), nbytes, restart=True)
+        dev.write(reg, False)
+        return bytes(dev.read(nbytes))
+
+    def readfrom_mem_into(self, addr: int, memaddr: int, buf, *, addrsize: int = 8) -> None:
+        buf[:] = self.readfrom_mem(addr, memaddr, len(buf), addrsize=addrsize)
+
+
+class SPI:
+    """
+    虚拟 SPI 主机，读取返回全 0xFF（MISO 悬空），按波特率消耗时间。
+
+    ==========================================
+
+    Virtual SPI controller; reads return 0xFF (floating MISO) and transfers take time
+    according to the baud rate.
+    """
+
+    MSB = 0
+    LSB = 1
+
+    def __init__(self, id: int = 0, baudrate: int = 1000000, **kwargs) -> None:
+        self._baud = baudrate
+
+    def init(self, baudrate: int | None = None, **kwargs) -> None:
+        if baudrate:
+            self._baud = baudrate
+
+    def deinit(self) -> None:
+        pass
+
+    def _xfer(self, n: int) -> None:
+        CLOCK.advance(n * 8_000_000 // self._baud)
+
+    def write(self, buf) -> None:
+        self._xfer(len(buf))
+
+    def read(self, nbytes: int, write: int = 0) -> bytes:
+        self._xfer(nbytes)
+        return b"\xff" * nbytes
+
+    def readinto(self, buf, write: int = 0) -> None:
+        self._xfer(len(buf))
+        buf[:] = b"\xff" * len(buf)
+
+    def write_readinto(self, write_buf, read_buf) -> None:
+        self._xfer(len(write_buf))
+        read_buf[:] = b"\xff" * len(read_buf)
+
+
+class _Mem(dict):
+    """
+    machine.mem8/mem16/mem32 的替身，按地址保存写入的值，未写入的地址读为0。
+
+    ==========================================
+
+    Stand-in for machine.mem8/mem16/mem32 keeping written values by address; unwritten
+    addresses read as 0.
+    """
+
+    def __init__(self, bits: int) -> None:
+        super().__init__()
+        self._mask = (1 << bits) - 1
+
+    def __getitem__(self, addr: int) -> int:
+        return self.get(addr, 0)
+
+    def __setitem__(self, addr: int, value: int) -> None:
+        super().__setitem__(addr, value & self._mask)
+
+# ======================================== 初始化配置 ==========================================
+
+SoftI2C = I2C
+SoftSPI = SPI
+
+mem8 = _Mem(8)
+mem16 = _Mem(16)
+mem32 = _Mem(32)
+
+# ========================================  主程序  ============================================
@@ -0,0 +1,664 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/10/30 上午10:15
+# @Author  : 李清水
+# @File    : raw_repl.py
+# @Description : 基于raw REPL的串口传输层：一次打开串口，在同一会话中执行代码、写文件、建目录并软复位
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+import time
+import zlib
+import struct
+import binascii
+
+try:
+    import serial
+    import serial.tools.list_ports
+except ImportError:  # pyserial为可选依赖，未安装时部署器改用mpremote
+    serial = None
+
+# ======================================== 全局变量 ============================================
+
+# raw REPL控制字符
+CTRL_A = b"\x01"  # 进入raw REPL
+CTRL_B = b"\x02"  # 退出raw REPL
+CTRL_C = b"\x03"  # 中断正在运行的程序
+CTRL_D = b"\x04"  # 执行代码 / 软复位
+CTRL_E = b"\x05"  # raw-paste模式请求前缀
+
+RAW_PROMPT = b"raw REPL; CTRL-B to exit\r\n"
+
+# 单次执行的代码长度上限（字节），设备需要先编译整段代码，过长会占用过多RAM
+EXEC_LIMIT = 4096
+# 写文件时每次a2b_base64解码的原始数据块大小
+WRITE_CHUNK = 1024
+
+# 压缩传输：主机用原始deflate格式压缩，设备端deflate.DeflateIO解压所用的窗口位数（2^12=4KB窗口RAM）
+DEFLATE_WBITS = 12
+# 压缩传输时文件按该大小（原始字节）分段独立压缩，设备端每次只缓存一段压缩数据
+DEFLATE_SEGMENT = 8192
+# 设备端解压函数：把一段压缩数据经DeflateIO解压后直接写入已打开的目标文件
+DEFLATE_PRELUDE = (
+    "import deflate,io\n"
+    "mv=memoryview(bytearray(512))\n"
+    "def dz(f,z):\n"
+    f"    d=deflate.DeflateIO(io.BytesIO(z),deflate.RAW,{DEFLATE_WBITS})\n"
+    "    while True:\n"
+    "        n=d.readinto(mv)\n"
+    "        if not n:\n"
+    "            break\n"
+    "        f.write(mv[:n])"
+)
+
+# MicroPython官方固件的USB VID（树莓派基金会，RP2040）
+MICROPYTHON_VIDS = (0x2E8A, 0xF055)
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+
+class RawREPLError(Exception):
+    """
+    raw REPL通信失败或设备端代码抛出异常时引发，异常信息为设备返回的错误输出。
+
+    ==========================================
+
+    Raised when raw REPL communication fails or code on the device raises; the message is the device's error output.
+    """
+
+
+class RawREPL:
+    """
+    基于raw REPL的持久串口会话，用于在一次连接中完成部署所需的全部操作。
+
+    mpremote每条命令都要重新打开串口、中断程序、进入raw REPL并在结束后断开，每次约数百毫秒。
+    本类只打开串口一次：进入raw REPL后，优先使用raw-paste模式（带流控、无需逐块等待）发送代码，
+    设备不支持时回退到普通raw模式；文件以base64分块写入，多个文件的写入合并到尽量少的执行中。
+
+    Attributes:
+        port (str): 串口端口号，如COM3或/dev/ttyACM0。
+        baudrate (int): 波特率，USB CDC下不影响实际速率。
+        timeout (float): 等待设备响应的超时时间，单位为秒。
+        use_raw_paste (bool): 是否使用raw-paste模式，检测到设备不支持时自动置为False。
+        round_trips (int): 本次会话执行代码的次数。
+        bytes_sent (int): 本次会话发送的字节数。
+        has_deflate (bool | None): 设备是否有deflate模块，首次压缩写入时检测，之前为None。
+        bytes_saved (int): 压缩传输节省的文件字节数（原始大小减压缩后大小）。
+
+    Methods:
+        find_port() -> str | None: 查找第一个MicroPython USB串口设备。
+        open() -> RawREPL: 打开串口并进入raw REPL。
+        close() -> None: 退出raw REPL并关闭串口。
+        interrupt() -> None: 中断正在运行的程序并进入raw REPL，不软复位。
+        exec(code: str, timeout: float | None = None) -> bytes: 执行代码并返回标准输出，设备端异常时抛出RawREPLError。
+        exec_nowait(code: str) -> None: 开始执行代码但不等待结束，输出由read_available()读取。
+        read_available() -> bytes: 读取设备当前已输出的数据，不阻塞。
+        fs_mkdirs(paths: list[str]) -> None: 由浅到深创建目录，已存在的目录忽略。
+        fs_remove(paths: list[str], dirs: list[str] = ()) -> None: 删除文件，再尝试删除可能变空的目录。
+        probe_deflate() -> bool: 检测设备是否有deflate模块。
+        compress(data: bytes) -> list[bytes]: 分段压缩为原始deflate流。
+        fs_write_many(items: list[tuple[str, bytes]], progress=None, compress: bool = False) -> None: 写入多个文件，合并为尽量少的执行，可压缩传输。
+        soft_reset(keep_open: bool = False) -> None: 退出raw REPL并软复位，设备随后运行boot.py与main.py。
+
+    ==========================================
+
+    Persistent serial session over the raw REPL, doing everything a deploy needs over one connection.
+
+    Every mpremote command reopens the port, interrupts the program, enters the raw REPL and disconnects afterwards,
+    several hundred milliseconds each. This class opens the port once: after entering the raw REPL it sends code in
+    raw-paste mode (flow-controlled, no per-chunk waits) when the device supports it and falls back to plain raw mode
+    otherwise; files are written base64-encoded in chunks, and writes of several files are merged into as few
+    executions as possible.
+
+    Attributes:
+        port (str): Serial port, such as COM3 or /dev/ttyACM0.
+        baudrate (int): Baud rate, irrelevant for the actual speed over USB CDC.
+        timeout (float): Timeout waiting for the device, in seconds.
+        use_raw_paste (bool): Whether to use raw-paste mode, set to False once the device turns out not to support it.
+        round_trips (int): Number of code executions in this session.
+        bytes_sent (int): Bytes sent in this session.
+        has_deflate (bool | None): Whether the device has the deflate module, probed on the first compressed write,
+            None before that.
+        bytes_saved (int): File bytes saved by compressed transfer (original size minus compressed size).
+
+    Methods:
+        find_port() -> str | None: Find the first MicroPython USB serial device.
+        open() -> RawREPL: Open the port and enter the raw REPL.
+        close() -> None: Leave the raw REPL and close the port.
+        interrupt() -> None: Interrupt the running program and enter the raw REPL without a soft reset.
+        exec(code: str, timeout: float | None = None) -> bytes: Execute code and return its stdout, raise RawREPLError on device-side exceptions.
+        exec_nowait(code: str) -> None: Start executing code without waiting for it to finish; read its output with read_available().
+        read_available() -> bytes: Read whatever the device has output so far, without blocking.
+        fs_mkdirs(paths: list[str]) -> None: Create directories shallowest first, ignoring existing ones.
+        fs_remove(paths: list[str], dirs: list[str] = ()) -> None: Delete files, then try to delete directories that may have become empty.
+        probe_deflate() -> bool: Probe whether the device has the deflate module.
+        compress(data: bytes) -> list[bytes]: Compress in segments into raw deflate streams.
+        fs_write_many(items: list[tuple[str, bytes]], progress=None, compress: bool = False) -> None: Write several files in as few executions as possible, optionally compressed.
+        soft_reset(keep_open: bool = False) -> None: Leave the raw REPL and soft-reset; the device then runs boot.py and main.py.
+    """
+
+    def __init__(self, port: str, baudrate: int = 115200, timeout: float = 10.0):
+        """
+        初始化会话参数，不打开串口。
+
+        Args:
+            port: 串口端口号。
+            baudrate: 波特率，默认为115200。
+            timeout: 等待设备响应的超时时间，单位为秒，默认为10。
+
+        Raises:
+            RuntimeError: 未安装pyserial。
+
+        ==========================================
+
+        Initialize session parameters without opening the port.
+
+        Args:
+            port: Serial port.
+            baudrate: Baud rate, default is 115200.
+            timeout: Timeout waiting for the device in seconds, default is 10.
+
+        Raises:
+            RuntimeError: pyserial is not installed.
+        """
+        if serial is None:
+            raise RuntimeError("raw REPL传输需要pyserial，请先执行 pip install pyserial")
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.use_raw_paste = True
+        self.round_trips = 0
+        self.bytes_sent = 0
+        self.has_deflate = None
+        self.bytes_saved = 0
+        self._serial = None
+        self._rx = bytearray()  # 已读出但尚未消费的数据
+
+    @staticmethod
+    def find_port() -> str | None:
+        """
+        查找第一个USB VID为MicroPython官方固件的串口设备。
+
+        Returns:
+            str | None: 端口号，未找到时返回None。
+
+        ==========================================
+
+        Find the first serial device whose USB VID belongs to official MicroPython firmware.
+
+        Returns:
+            str | None: Port name, None when not found.
+        """
+        if serial is None:
+            return None
+        for info in sorted(serial.tools.list_ports.comports(), key=lambda p: p.device):
+            if info.vid in MICROPYTHON_VIDS:
+                return info.device
+        return None
+
+    def __enter__(self) -> "RawREPL":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _write(self, data: bytes) -> None:
+        self._serial.write(data)
+        self.bytes_sent += len(data)
+
+    def _fill(self) -> bool:
+        """
+        从串口读取当前可用的数据追加到接收缓冲区，返回是否读到数据。
+
+        ==========================================
+
+        Append the currently available serial data to the receive buffer; return whether anything was read.
+        """
+        chunk = self._serial.read(max(1, min(self._serial.in_waiting, 4096)))
+        self._rx.extend(chunk)
+        return bool(chunk)
+
+    def _read(self, n: int) -> bytes:
+        """
+        读取n个字节，超时时返回已读到的部分。
+
+        ==========================================
+
+        Read n bytes; return what was read so far on timeout.
+        """
+        deadline = time.monotonic() + self.timeout
+        while len(self._rx) < n and (self._fill() or time.monotonic() < deadline):
+            pass
+        data = bytes(self._rx[:n])
+        del self._rx[:n]
+        return data
+
+    def _read_until(self, ending: bytes, timeout: float | None = None) -> bytes:
+        """
+        读取数据直到ending（含），之后的数据留在接收缓冲区；超时抛出RawREPLError。
+
+        ==========================================
+
+        Read up to and including ending, leaving later data in the receive buffer; raise RawREPLError on timeout.
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        start = 0
+        while True:
+            pos = self._rx.find(ending, start)
+            if pos >= 0:
+                data = bytes(self._rx[:pos + len(ending)])
+                del self._rx[:pos + len(ending)]
+                return data
+            start = max(0, len(self._rx) - len(ending) + 1)
+            if not self._fill() and time.monotonic() > deadline:
+                raise RawREPLError(f"等待设备响应超时，已收到: {bytes(self._rx[-80:])!r}")
+
+    def open(self) -> "RawREPL":
+        """
+        打开串口，中断正在运行的程序，进入raw REPL并软复位，得到干净的解释器状态。
+
+        软复位在raw REPL中进行，不会运行main.py，可以清除固件启动的定时器与中断回调。
+
+        Returns:
+            RawREPL: 自身，便于链式调用与with语句。
+
+        Raises:
+            RawREPLError: 设备未进入raw REPL。
+
+        ==========================================
+
+        Open the port, interrupt the running program, enter the raw REPL and soft-reset to get a clean interpreter.
+
+        The soft reset happens inside the raw REPL, so main.py does not run; it clears timers and IRQ handlers
+        started by the firmware.
+
+        Returns:
+            RawREPL: self, for chaining and with statements.
+
+        Raises:
+            RawREPLError: The device did not enter the raw REPL.
+        """
+        self._serial = serial.serial_for_url(self.port, baudrate=self.baudrate, timeout=0.05)
+        self.interrupt()
+        self._read_until(b">")
+        # raw REPL中空行Ctrl-D为软复位，完成后重新进入raw REPL
+        self._write(CTRL_D)
+        self._read_until(b"soft reboot\r\n")
+        self._read_until(RAW_PROMPT)
+        return self
+
+    def close(self) -> None:
+        """
+        退出raw REPL并关闭串口，可重复调用。
+
+        ==========================================
+
+        Leave the raw REPL and close the port; safe to call more than once.
+        """
+        if self._serial is None:
+            return
+        try:
+            self._write(CTRL_B)
+        finally:
+            self._serial.close()
+            self._serial = None
+
+    def interrupt(self) -> None:
+        """
+        中断正在运行的程序（固件的main.py或exec_nowait()启动的代码）并进入raw REPL，不软复位，已导入的模块保持不变。
+
+        ==========================================
+
+        Interrupt the running program (the firmware's main.py or code started with exec_nowait()) and enter the raw
+        REPL without a soft reset, so already imported modules stay loaded.
+        """
+        # 两次Ctrl-C中断程序（第一次可能被应用的KeyboardInterrupt处理吃掉）
+        self._write(b"\r" + CTRL_C + CTRL_C)
+        time.sleep(0.05)
+        self._serial.reset_input_buffer()
+        self._rx.clear()
+        self._write(b"\r" + CTRL_A)
+        self._read_until(RAW_PROMPT)
+
+    def _raw_paste(self, data: bytes) -> None:
+        """
+        raw-paste模式发送代码：设备先给出窗口大小，每消费一个窗口回送0x01增加窗口，收到0x04表示设备中止。
+
+        ==========================================
+
+        Send code in raw-paste mode: the device announces a window size, sends 0x01 each time it consumed a window to
+        extend it, and 0x04 to abort.
+        """
+        window = struct.unpack("<H", self._read(2))[0]
+        remain = window
+        i = 0
+        while i < len(data):
+            while remain == 0 or self._rx or self._serial.in_waiting:
+                flag = self._read(1)
+                if flag == b"\x01":
+                    remain += window
+                elif flag == CTRL_D:
+                    # 设备中止（如语法错误），确认后读取错误输出
+                    self._write(CTRL_D)
+                    return
+                elif not flag:
+                    raise RawREPLError("raw-paste流控等待超时")
+                else:
+                    raise RawREPLError(f"raw-paste中收到意外数据: {flag!r}")
+            block = data[i:i + remain]
+            self._write(block)
+            remain -= len(block)
+            i += len(block)
+        self._write(CTRL_D)
+        self._read_until(CTRL_D)
+
+    def exec(self, code: str, timeout: float | None = None) -> bytes:
+        """
+        在设备上执行一段代码，返回标准输出；设备端抛出异常时引发RawREPLError。
+
+        Args:
+            code: 待执行的MicroPython代码。
+            timeout: 等待执行结束的超时时间，单位为秒，None时使用构造时的timeout。
+
+        Returns:
+            bytes: 代码的标准输出。
+
+        Raises:
+            RawREPLError: 通信失败或代码执行出错。
+
+        ==========================================
+
+        Execute code on the device and return its stdout; raise RawREPLError when the code raises on the device.
+
+        Args:
+            code: MicroPython code to execute.
+            timeout: Timeout for the execution in seconds, the constructor's timeout when None.
+
+        Returns:
+            bytes: stdout of the code.
+
+        Raises:
+            RawREPLError: Communication failed or the code raised.
+        """
+        self._send_code(code)
+        out = self._read_until(CTRL_D, timeout)[:-1]
+        err = self._read_until(CTRL_D, timeout)[:-1]
+        if err:
+            raise RawREPLError(err.decode(errors="replace").strip())
+        return out
+
+    def exec_nowait(self, code: str) -> None:
+        """
+        开始执行一段代码但不等待结束，用于在raw REPL中启动长时间运行的程序（如重新运行main.py）。
+
+        代码的输出由read_available()读取，之后需先调用interrupt()才能继续执行其他代码。
+
+        Args:
+            code: 待执行的MicroPython代码。
+
+        ==========================================
+
+        Start executing code without waiting for it to finish, used to start a long-running program in the raw REPL
+        (such as running main.py again).
+
+        Read the output with read_available(); call interrupt() before executing anything else.
+
+        Args:
+            code: MicroPython code to execute.
+        """
+        self._send_code(code)
+
+    def read_available(self) -> bytes:
+        """
+        读取设备当前已输出的全部数据，不阻塞，用于显示运行中程序的输出。
+
+        Returns:
+            bytes: 读到的数据，没有数据时为空。
+
+        ==========================================
+
+        Read everything the device has output so far without blocking, used to show the output of a running program.
+
+        Returns:
+            bytes: Data read, empty when there is none.
+        """
+        if self._serial.in_waiting:
+            self._fill()
+        data = bytes(self._rx)
+        self._rx.clear()
+        return data
+
+    def _send_code(self, code: str) -> None:
+        """
+        在raw REPL提示符后发送一段代码（优先raw-paste模式），设备确认后立即返回，不读取输出。
+
+        ==========================================
+
+        Send code after the raw REPL prompt (raw-paste mode when supported) and return once the device acknowledged
+        it, without reading the output.
+        """
+        data = code.encode()
+        self._read_until(b">")
+        self.round_trips += 1
+        if self.use_raw_paste:
+            self._write(CTRL_E + b"A" + CTRL_A)
+            reply = self._read(2)
+            if reply == b"R\x01":
+                self._raw_paste(data)
+            else:
+                # 不支持raw-paste的旧固件会重新输出提示符，其前两个字节已被上面读走
+                self.use_raw_paste = False
+                if reply != b"R\x00":
+                    self._read_until(RAW_PROMPT[2:] + b">")
+        if not self.use_raw_paste:
+            for i in range(0, len(data), 256):
+                self._write(data[i:i + 256])
+                time.sleep(0.01)
+            self._write(CTRL_D)
+            if self._read(2) != b"OK":
+                raise RawREPLError("设备未确认代码")
+
+    def fs_mkdirs(self, paths: list[str]) -> None:
+        """
+        由浅到深创建目录，已存在的目录忽略，所有目录在一次执行中完成。
+
+        Args:
+            paths: 设备上的绝对路径列表。
+
+        ==========================================
+
+        Create directories shallowest first, ignoring existing ones, all in one execution.
+
+        Args:
+            paths: Absolute paths on the device.
+        """
+        if not paths:
+            return
+        ordered = sorted(set(paths), key=lambda p: (p.count("/"), p))
+        self.exec(
+            "import os\n"
+            f"for d in {ordered!r}:\n"
+            "    try:\n"
+            "        os.mkdir(d)\n"
+            "    except OSError:\n"
+            "        pass\n"
+        )
+
+    def fs_remove(self, paths: list[str], dirs: list[str] = ()) -> None:
+        """
+        删除文件，再由深到浅尝试删除dirs中的目录（非空目录忽略），在一次执行中完成。
+
+        Args:
+            paths: 待删除文件的绝对路径列表。
+            dirs: 删除文件后可能变空、需要删除的目录绝对路径列表。
+
+        ==========================================
+
+        Delete files, then try to delete the directories in dirs deepest first (non-empty ones are kept), in one execution.
+
+        Args:
+            paths: Absolute paths of files to delete.
+            dirs: Absolute paths of directories that may have become empty and should be removed.
+        """
+        if not paths and not dirs:
+            return
+        ordered = sorted(set(dirs), key=lambda p: (-p.count("/"), p))
+        self.exec(
+            "import os\n"
+            f"for p in {list(paths)!r}:\n"
+            "    os.remove(p)\n"
+            f"for d in {ordered!r}:\n"
+            "    try:\n"
+            "        os.rmdir(d)\n"
+            "    except OSError:\n"
+            "        pass\n"
+        )
+
+    def probe_deflate(self) -> bool:
+        """
+        检测设备是否有deflate模块（MicroPython v1.21起提供），结果缓存在has_deflate中。
+        检测成功时同时在设备上定义解压函数dz。
+
+        Returns:
+            bool: 设备是否支持deflate解压。
+
+        ==========================================
+
+        Probe whether the device has the deflate module (available since MicroPython v1.21); the result is cached in
+        has_deflate. On success the decompression helper dz is defined on the device as well.
+
+        Returns:
+            bool: Whether the device can inflate.
+        """
+        if self.has_deflate is None:
+            try:
+                self.exec(DEFLATE_PRELUDE)
+                self.has_deflate = True
+            except RawREPLError:
+                self.has_deflate = False
+        return self.has_deflate
+
+    @staticmethod
+    def compress(data: bytes) -> list[bytes]:
+        """
+        按DEFLATE_SEGMENT分段，每段独立压缩为原始deflate流（窗口为2^DEFLATE_WBITS字节）。
+
+        Args:
+            data: 文件内容。
+
+        Returns:
+            list[bytes]: 各段的压缩数据。
+
+        ==========================================
+
+        Split data into DEFLATE_SEGMENT-sized segments and compress each into an independent raw deflate stream
+        (with a 2^DEFLATE_WBITS byte window).
+
+        Args:
+            data: File content.
+
+        Returns:
+            list[bytes]: Compressed data per segment.
+        """
+        segments = []
+        for i in range(0, len(data), DEFLATE_SEGMENT):
+            c = zlib.compressobj(9, zlib.DEFLATED, -DEFLATE_WBITS)
+            segments.append(c.compress(data[i:i + DEFLATE_SEGMENT]) + c.flush())
+        return segments
+
+    def fs_write_many(self, items: list[tuple[str, bytes]], progress=None, compress: bool = False) -> None:
+        """
+        写入多个文件。每个文件以open/w(a2b_base64(...))/close语句表示，所有语句按EXEC_LIMIT分组执行，
+        小文件可多个合并为一次执行，大文件跨多次执行（设备端全局变量在执行之间保留）。
+
+        压缩传输时，每段压缩数据先在设备RAM中拼接，再由dz()经deflate.DeflateIO直接解压写入目标文件，
+        设备端最多缓存一段压缩数据。压缩后不变小的文件仍按原样传输；设备没有deflate模块时全部按原样传输。
+
+        Args:
+            items: (设备上的绝对路径, 文件内容) 列表，父目录须已存在。
+            progress: 每个文件写完后调用的回调，参数为(已完成数, 总数, 路径)，可为None。
+            compress: 是否压缩传输，节省的字节数累计到bytes_saved。
+
+        ==========================================
+
+        Write several files. Each file becomes open/w(a2b_base64(...))/close statements; the statements are executed
+        in groups of up to EXEC_LIMIT bytes, so small files share one execution and large files span several
+        (device globals persist between executions).
+
+        With compression, each compressed segment is first assembled in device RAM, then dz() inflates it through
+        deflate.DeflateIO straight into the destination file, so the device buffers at most one compressed segment.
+        Files that do not shrink are sent as they are; all files are sent as they are when the device lacks the
+        deflate module.
+
+        Args:
+            items: List of (absolute path on the device, content); parent directories must exist.
+            progress: Callback after each file, called with (done, total, path), may be None.
+            compress: Whether to compress the transfer; saved bytes accumulate in bytes_saved.
+        """
+        compress = compress and self.probe_deflate()
+        # (语句, 该语句写完的文件路径或None)
+        statements = [("import binascii\nub=binascii.a2b_base64", None)]
+        for path, data in items:
+            statements.append((f"f=open({path!r},'wb')\nw=f.write", None))
+            segments = self.compress(data) if compress else None
+            if segments and sum(len(seg) for seg in segments) < len(data):
+                self.bytes_saved += len(data) - sum(len(seg) for seg in segments)
+                for seg in segments:
+                    statements.append(("z=bytearray()", None))
+                    for i in range(0, len(seg), WRITE_CHUNK):
+                        statements.append((f"z+=ub({binascii.b2a_base64(seg[i:i + WRITE_CHUNK], newline=False)!r})", None))
+                    statements.append(("dz(f,z)", None))
+            else:
+                for i in range(0, len(data), WRITE_CHUNK):
+                    statements.append((f"w(ub({binascii.b2a_base64(data[i:i + WRITE_CHUNK], newline=False)!r}))", None))
+            statements.append(("f.close()", path))
+
+        done = 0
+        batch, size, finished = [], 0, []
+        for stmt, path in statements + [("", None)]:
+            if batch and (not stmt or size + len(stmt) + 1 > EXEC_LIMIT):
+                self.exec("\n".join(batch))
+                for p in finished:
+                    done += 1
+                    if progress:
+                        progress(done, len(items), p)
+                batch, size, finished = [], 0, []
+            if stmt:
+                batch.append(stmt)
+                size += len(stmt) + 1
+                if path:
+                    finished.append(path)
+
+    def soft_reset(self, keep_open: bool = False) -> None:
+        """
+        退出raw REPL，在普通REPL中按Ctrl-D软复位，设备随后运行boot.py与main.py，然后关闭串口。
+
+        Args:
+            keep_open: 为True时不关闭串口，main.py的输出可由read_available()读取，之后可用interrupt()重新进入raw REPL。
+
+        ==========================================
+
+        Leave the raw REPL and press Ctrl-D in the friendly REPL to soft-reset; the device then runs boot.py and
+        main.py. The port is closed afterwards.
+
+        Args:
+            keep_open: When True the port stays open, the output of main.py can be read with read_available(), and
+                interrupt() enters the raw REPL again.
+        """
+        self._read_until(b">")
+        self._write(CTRL_B)
+        self._read_until(b">>> ")
+        self._write(CTRL_D)
+        self._read_until(b"soft reboot\r\n")
+        if keep_open:
+            return
+        self._serial.close()
+        self._serial = None
+        self._rx.clear()
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ============================================
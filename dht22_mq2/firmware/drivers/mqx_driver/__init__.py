@@ -8,8 +8,7 @@
 
 # ======================================== 导入相关模块 =========================================
 
-# 显式导出子包或子模块
-from .code.mqx import MQX
+# 导出接口在首次访问时才导入对应子模块，见 __getattr__
 
 
 # ======================================== 全局变量 ============================================
@@ -19,6 +18,15 @@ __all__ = ["MQX"]
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问导出名称时才导入定义它的子模块，并缓存到包的命名空间中。"""
+    if name == "MQX":
+        from .code.mqx import MQX as value
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ==========================================
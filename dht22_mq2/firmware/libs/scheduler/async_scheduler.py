@@ -0,0 +1,362 @@
+# Python env   : MicroPython v1.23.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/10/20 上午10:12
+# @Author  : 李清水
+# @File    : async_scheduler.py
+# @Description : 基于uasyncio的任务调度类，任务回调可为协程，等待外设时不阻塞其他任务
+# @License : MIT
+
+__version__ = "1.0.0"
+__author__ = "李清水"
+__license__ = "MIT"
+__platform__ = "MicroPython v1.23"
+__chip__ = "All"
+
+# ======================================== 导入相关模块 ========================================
+
+# 导入异步IO模块
+import asyncio
+# 导入时间相关模块
+from time import ticks_ms, ticks_add, ticks_diff
+# 导入同步调度器中的任务类与调度类
+from .scheduler import Task, Scheduler
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+# 定义AsyncScheduler异步调度类
+class AsyncScheduler(Scheduler):
+    """
+    AsyncScheduler 类，基于 uasyncio 的任务调度器，保持与 Scheduler 相同的接口。
+
+    每个任务对应一个 asyncio 协程，按任务间隔周期执行。任务回调既可以是普通函数，
+    也可以是 async def 定义的协程函数：协程回调中可以 await asyncio.sleep_ms()、
+    await StreamReader.read() 等待 UART 数据，此时其他任务照常按周期运行，
+    不会像 time.sleep() 那样阻塞整个调度器。
+
+    暂停/恢复可在引脚中断回调中调用：resume() 通过 asyncio.ThreadSafeFlag 唤醒任务协程。
+    连续失败的任务与 Scheduler 相同地熔断，由任务协程等待退避时间后自动恢复。
+    绑定了 Event 的任务共用同一个标志，event.set() 立即唤醒任务协程执行。
+
+    Attributes:
+        task_idle (callable): 空闲回调函数，按 idle_interval 周期调用。
+        task_err (callable): 任务执行出错时调用的回调函数。
+        tasks (list): 任务列表，存储所有已注册的任务实例。
+        idle_interval (int): 空闲回调的调用周期，单位为毫秒。
+
+    Methods:
+        __init__(self, tm=None, interval: int = 100, task_idle: callable = None, task_err: callable = None, idle_interval: int = 100) -> None:
+            初始化异步调度器实例。
+
+        _aexec(self, task: Task) -> None:
+            执行任务回调，若返回协程则等待其完成，异常转交任务错误回调。
+
+        _runner(self, task: Task) -> None:
+            单个任务的协程主体，按间隔周期执行任务。
+
+        _idle_loop(self) -> None:
+            周期调用空闲回调的协程。
+
+        _main(self) -> None:
+            启动所有任务协程并等待。
+
+        scheduler(self) -> None:
+            启动 asyncio 事件循环，阻塞运行直至 KeyboardInterrupt。
+
+        add(self, task: Task, state: int = Task.TASK_RUN) -> None:
+            添加任务；事件循环已启动时立即创建任务协程。
+
+        delete(self, task: Task) -> None:
+            删除任务并取消其协程。
+
+        pause(self, task: Task) -> None:
+            暂停任务。
+
+        resume(self, task: Task) -> None:
+            恢复任务并唤醒其协程。
+
+        run(self, task: Task) -> None:
+            立即执行一次任务。
+
+    Example:
+        >>> async def rs485_tick():
+        ...     await reader.read(16)        # 等待UART数据期间其他任务继续运行
+        >>> sc = AsyncScheduler(task_idle=task_idle_callback, task_err=task_err_callback)
+        >>> sc.add(Task(rs485_tick, interval=200))
+        >>> sc.scheduler()
+    """
+
+    def __init__(self, tm=None, interval: int = 100, task_idle: callable = None,
+                 task_err: callable = None, idle_interval: int = 100) -> None:
+        """
+        初始化异步调度器实例，不使用硬件定时器。
+
+        Args:
+            tm (machine.Timer, optional): 为与Scheduler接口兼容而保留，不使用，默认为None。
+            interval (int, optional): 为与Scheduler接口兼容而保留，用于计算任务的_cnt。默认为100ms。
+            task_idle (callable, optional): 空闲回调函数，默认为None。
+            task_err (callable, optional): 任务出现错误时调用的回调函数，默认为None。
+            idle_interval (int, optional): 空闲回调的调用周期，单位为毫秒。默认为100ms。
+
+        Returns:
+            None
+        """
+        super().__init__(None, interval=interval, task_idle=task_idle,
+                         task_err=task_err, mode=Scheduler.MODE_HEAP)
+        self._idle_interval = idle_interval
+        self._started = False
+
+    async def _aexec(self, task: Task) -> None:
+        """
+        执行任务回调，若回调返回协程（async def）则等待其完成。
+
+        Args:
+            task (Task): 任务实例。
+
+        Returns:
+            None
+        """
+        try:
+            r = task.run()
+            # async def 回调返回生成器/协程对象，需等待其完成
+            if r is not None and hasattr(r, "send"):
+                await r
+            if task._fails:
+                task._fails = 0
+                task._backoff = 0
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # 记录异常，连续失败时熔断任务
+            self._on_error(task, e)
+
+    async def _runner(self, task: Task) -> None:
+        """
+        单个任务的协程主体：按任务间隔周期执行，暂停时等待恢复标志。
+
+        截止时刻在执行前按 ticks_ms 计算，协程回调等待外设的时间计入本周期。
+        绑定事件的任务在等待截止时刻期间同时等待事件，事件触发后立即执行，不改变周期相位。
+
+        Args:
+            task (Task): 任务实例。
+
+        Returns:
+            None
+        """
+        evt = task._event
+        deadline = ticks_add(ticks_ms(), task._intv)
+        while task._sched is self:
+            wait = ticks_diff(deadline, ticks_ms())
+            if task._evonly:
+                await task._flag.wait()
+            elif evt is not None:
+                if wait > 0:
+                    try:
+                        await asyncio.wait_for_ms(task._flag.wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+            elif wait > 0:
+                await asyncio.sleep_ms(wait)
+            if task._sched is not self:
+                break
+            if task._state != Task.TASK_RUN:
+                # 暂停期间挂起，直至resume()设置标志，期间触发的事件被丢弃
+                if evt is not None:
+                    evt._flag = False
+                if task._tripped:
+                    # 熔断暂停：等待退避时间后自动恢复试运行
+                    wait = ticks_diff(task._retry, ticks_ms())
+                    if wait > 0:
+                        try:
+                            await asyncio.wait_for_ms(task._flag.wait(), wait)
+                        except asyncio.TimeoutError:
+                            pass
+                    if task._tripped and task._sched is self:
+                        self._untrip(task)
+                    deadline = ticks_add(ticks_ms(), task._intv)
+                    continue
+                await task._flag.wait()
+                deadline = ticks_add(ticks_ms(), task._intv)
+                continue
+            if evt is not None and evt._flag:
+                evt._flag = False
+                await self._aexec(task)
+                continue
+            if task._evonly or ticks_diff(deadline, ticks_ms()) > 0:
+                # 被恢复标志提前唤醒，尚未到达截止时刻
+                continue
+            deadline = ticks_add(ticks_ms(), task._intv)
+            await self._aexec(task)
+
+    async def _idle_loop(self) -> None:
+        """
+        周期调用空闲回调（如垃圾回收），回调异常不影响调度器。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        while True:
+            try:
+                self._task_idle()
+            except Exception as e:
+                print('except {}'.format(e))
+            await asyncio.sleep_ms(self._idle_interval)
+
+    def _spawn(self, task: Task) -> None:
+        """
+        为任务创建协程。
+
+        Args:
+            task (Task): 任务实例。
+
+        Returns:
+            None
+        """
+        task._atask = asyncio.create_task(self._runner(task))
+
+    async def _main(self) -> None:
+        """
+        启动全部任务协程与空闲回调协程，并保持事件循环运行。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self._started = True
+        for task in self._tasks:
+            self._spawn(task)
+        if self._task_idle:
+            await self._idle_loop()
+        else:
+            while True:
+                await asyncio.sleep_ms(1000)
+
+    def scheduler(self) -> None:
+        """
+        调度器的主入口，启动 asyncio 事件循环并阻塞运行。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        try:
+            asyncio.run(self._main())
+        except KeyboardInterrupt:
+            return
+        finally:
+            self._started = False
+            # 清理事件循环状态，便于在REPL中再次启动
+            asyncio.new_event_loop()
+
+    def add(self, task: Task, state: int = Task.TASK_RUN) -> None:
+        """
+        添加任务到任务列表中，事件循环已启动时立即创建任务协程。
+
+        Args:
+            task (Task): 任务实例，需要添加的任务。
+            state (int, optional): 任务状态，默认为Task.TASK_RUN，表示任务正在运行。
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: 任务的事件已绑定其他任务。
+        """
+        if self.find(task) == None:
+            evt = task._event
+            if evt is not None and evt._task is not None and evt._task is not task:
+                raise ValueError('event already bound to another task')
+            task._sched = self
+            task._pos = len(self._tasks)
+            self._tasks.append(task)
+            task._cnt = task._intv // self._interval
+            task._flag = asyncio.ThreadSafeFlag()
+            task._atask = None
+            if evt is not None:
+                # 事件与恢复共用同一个唤醒标志
+                evt._task = task
+                evt._sched = self
+                evt._tsf = task._flag
+                self._evtasks.append(task)
+            if self._started:
+                self._spawn(task)
+            print('add task:', task._callback.__name__)
+        if state == Task.TASK_STOP:
+            self.pause(task)
+
+    def delete(self, task: Task) -> None:
+        """
+        删除任务并取消其协程。
+
+        Args:
+            task (Task): 任务实例，待删除的任务。
+
+        Returns:
+            None
+        """
+        atask = getattr(task, "_atask", None)
+        if task._event is not None and task._event._task is task:
+            task._event._tsf = None
+        super().delete(task)
+        if atask is not None:
+            task._atask = None
+            # 任务在自身回调中删除自己时不能取消自身，协程会在下一轮循环退出
+            if atask is not asyncio.current_task():
+                atask.cancel()
+
+    def clear(self) -> None:
+        """
+        清空任务列表并取消所有任务协程。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        while self._tasks:
+            self.delete(self._tasks[-1])
+
+    def resume(self, task: Task) -> None:
+        """
+        恢复任务，并唤醒处于暂停等待中的任务协程，可在中断回调中调用。
+
+        Args:
+            task (Task): 任务实例，待恢复的任务。
+
+        Returns:
+            None
+        """
+        if self.find(task) != None:
+            task.resume()
+            task._flag.set()
+
+    def run(self, task: Task) -> None:
+        """
+        立即执行一次任务，不影响其周期。
+
+        Args:
+            task (Task): 任务实例，包含要执行的回调函数。
+
+        Returns:
+            None
+        """
+        if self.find(task) != None and task._state == Task.TASK_RUN:
+            if self._started:
+                asyncio.create_task(self._aexec(task))
+            else:
+                self._exec(task)
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ============================================
\ No newline at end of file
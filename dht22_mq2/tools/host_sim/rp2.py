@@ -0,0 +1,118 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/10/27 下午3:05
+# @Author  : 李清水
+# @File    : rp2.py
+# @Description : 主机模拟器中的 rp2 模块替身，PIO 程序不执行，状态机只记录写入 FIFO 的数据
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+from .clock import CLOCK
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+def asm_pio(**kwargs):
+    """
+    PIO 汇编装饰器替身：不汇编程序，原样返回被装饰的函数。
+
+    ==========================================
+
+    PIO assembler decorator stand-in: the program is not assembled, the function is returned as is.
+    """
+    def wrap(func):
+        return func
+    return wrap
+
+
+def bootsel_button() -> int:
+    return 0
+
+# ======================================== 自定义类 ============================================
+
+
+class PIO:
+    IN_LOW = 0
+    IN_HIGH = 1
+    OUT_LOW = 2
+    OUT_HIGH = 3
+    SHIFT_LEFT = 0
+    SHIFT_RIGHT = 1
+    JOIN_NONE = 0
+    JOIN_TX = 1
+    JOIN_RX = 2
+    IRQ_SM0 = 0x100
+    IRQ_SM1 = 0x200
+    IRQ_SM2 = 0x400
+    IRQ_SM3 = 0x800
+
+    def __init__(self, id: int) -> None:
+        self._id = id
+
+    def irq(self, handler=None, trigger: int = 0xF00, hard: bool = False):
+        return None
+
+    def add_program(self, program) -> None:
+        pass
+
+    def remove_program(self, program=None) -> None:
+        pass
+
+    def state_machine(self, id: int, *args, **kwargs) -> "StateMachine":
+        return StateMachine(self._id * 4 + id, *args, **kwargs)
+
+
+class StateMachine:
+    """
+    状态机替身，put() 写入的数据保存在 tx 中，get() 返回0。
+
+    ==========================================
+
+    State machine stand-in; data written by put() is kept in tx and get() returns 0.
+    """
+
+    def __init__(self, id: int, program=None, *args, **kwargs) -> None:
+        self._id = id
+        self._active = False
+        self.tx = []
+
+    def init(self, program=None, *args, **kwargs) -> None:
+        pass
+
+    def active(self, value: int | None = None):
+        if value is None:
+            return self._active
+        self._active = bool(value)
+
+    def restart(self) -> None:
+        pass
+
+    def exec(self, instr) -> None:
+        pass
+
+    def put(self, value, shift: int = 0) -> None:
+        CLOCK.charge("hal")
+        if isinstance(value, int):
+            self.tx.append(value)
+        else:
+            self.tx.extend(value)
+        del self.tx[:-256]
+
+    def get(self, buf=None, shift: int = 0) -> int:
+        CLOCK.charge("hal")
+        return 0
+
+    def rx_fifo(self) -> int:
+        return 0
+
+    def tx_fifo(self) -> int:
+        return 0
+
+    def irq(self, handler=None, trigger: int = 0, hard: bool = False):
+        return None
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ============================================
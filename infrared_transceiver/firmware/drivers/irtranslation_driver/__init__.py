@@ -8,9 +8,7 @@
 
 # ======================================== 导入相关模块 =========================================
 
-# 导入 code 文件夹下的 Buzzer 类到包顶层
-from .ir_tx.nec import NEC
-from .ir_rx.nec import NEC_16
+# 导出接口在首次访问时才导入对应子模块，见 __getattr__
 
 # ======================================== 全局变量 ============================================
 
@@ -19,6 +17,17 @@ __all__ = ["NEC", "NEC_16"]
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问导出名称时才导入定义它的子模块，并缓存到包的命名空间中。"""
+    if name == "NEC":
+        from .ir_tx.nec import NEC as value
+    elif name == "NEC_16":
+        from .ir_rx.nec import NEC_16 as value
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ==========================================
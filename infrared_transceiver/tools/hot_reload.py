@@ -0,0 +1,636 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/11/10 下午4:05
+# @Author  : 李清水
+# @File    : hot_reload.py
+# @Description : 监视firmware目录，只重新编译并上传修改的模块，通过保持打开的raw REPL会话热重载到设备
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+import os
+import sys
+import time
+import errno
+import shutil
+import struct
+import select
+import hashlib
+import ctypes
+import ctypes.util
+from pathlib import Path
+
+from mpy_compiler import MPYCompiler
+from raw_repl import RawREPL, RawREPLError
+
+# ======================================== 全局变量 ============================================
+
+# inotify事件掩码（linux/inotify.h）
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+# 编辑器保存时常见的临时文件，不触发重载
+IGNORED_SUFFIXES = (".swp", ".swx", ".tmp", "~")
+
+# 修改后必须软复位的文件：boot.py只在启动时运行；main.py变化时从干净的解释器启动
+RESET_FILES = ("boot.py", "main.py")
+
+# 重新运行main.py前在设备上执行：Ctrl-C只中断主循环，定时器与引脚中断回调仍在运行；
+# 从main.py的全局变量出发（经对象属性、列表、元组、字典，深度有限）找到Timer与Pin，
+# 停止定时器并关闭引脚中断，避免与重新运行时创建的回调叠加（调度器的节拍定时器、看门狗检查定时器均在其中）
+STOP_SCRIPT = """
+import sys,machine
+def _hr_stop(o,d,seen):
+    if d>4 or id(o) in seen:
+        return
+    seen.add(id(o))
+    if isinstance(o,machine.Timer):
+        o.deinit()
+    elif isinstance(o,machine.Pin):
+        try:
+            o.irq(handler=None)
+        except Exception:
+            pass
+    elif isinstance(o,(list,tuple)):
+        for x in o:
+            _hr_stop(x,d+1,seen)
+    elif isinstance(o,dict):
+        for x in o.values():
+            _hr_stop(x,d+1,seen)
+    elif not isinstance(o,(type,type(sys))) and hasattr(o,'__dict__'):
+        _hr_stop(o.__dict__,d,seen)
+_hr_stop(globals(),0,set())
+del _hr_stop
+"""
+
+# 热重载方式
+RELOAD_MODES = ("auto", "reset")
+
+# ======================================== 功能函数 ============================================
+
+
+def create_watcher(root: Path, poll_interval: float = 0.5):
+    """
+    为目录创建文件监视器：Linux上使用inotify（ctypes调用libc），其他平台或inotify不可用时轮询文件修改时间。
+
+    Args:
+        root (Path): 被监视的目录。
+        poll_interval (float, optional): 轮询监视器扫描目录的间隔，单位为秒。
+
+    Returns:
+        InotifyWatcher | PollingWatcher: 监视器实例。
+
+    ==========================================
+
+    Create a file watcher for a directory: inotify (libc through ctypes) on Linux, polling modification times on
+    other platforms or when inotify is unavailable.
+
+    Args:
+        root (Path): Directory to watch.
+        poll_interval (float, optional): Interval between directory scans of the polling watcher, in seconds.
+
+    Returns:
+        InotifyWatcher | PollingWatcher: Watcher instance.
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except OSError:
+            pass
+    return PollingWatcher(root, poll_interval)
+
+
+def _ignored(rel_path: str) -> bool:
+    name = rel_path.rsplit("/", 1)[-1]
+    return "__pycache__" in rel_path.split("/") or name.startswith(".") or name.endswith(IGNORED_SUFFIXES)
+
+
+# ======================================== 自定义类 ============================================
+
+
+class InotifyWatcher:
+    """
+    基于inotify的递归目录监视器，通过ctypes调用libc，不依赖第三方库。
+
+    每个子目录单独添加监视，新建的子目录在收到事件时补充监视，并把其中已存在的文件报告为变化。
+    事件队列溢出时报告目录下的全部文件。
+
+    Attributes:
+        root (Path): 被监视的目录。
+        backend (str): 固定为"inotify"。
+
+    Methods:
+        poll(timeout: float) -> set[str]: 等待至多timeout秒，返回发生变化的文件（相对root的路径，以/分隔）。
+        close() -> None: 关闭inotify文件描述符。
+
+    ==========================================
+
+    Recursive inotify-based directory watcher calling libc through ctypes, without third-party libraries.
+
+    Every subdirectory gets its own watch; new subdirectories are added when their event arrives and the files
+    already in them are reported as changed. On event queue overflow every file under the directory is reported.
+
+    Attributes:
+        root (Path): Directory being watched.
+        backend (str): Always "inotify".
+
+    Methods:
+        poll(timeout: float) -> set[str]: Wait up to timeout seconds and return the changed files (paths relative to root, separated by /).
+        close() -> None: Close the inotify file descriptor.
+    """
+
+    backend = "inotify"
+
+    def __init__(self, root: Path):
+        """
+        初始化inotify并监视root下的所有目录。
+
+        Args:
+            root (Path): 被监视的目录。
+
+        Raises:
+            OSError: libc不提供inotify或初始化失败。
+
+        ==========================================
+
+        Initialize inotify and watch every directory under root.
+
+        Args:
+            root (Path): Directory to watch.
+
+        Raises:
+            OSError: libc has no inotify or initialization failed.
+        """
+        self.root = Path(root).resolve()
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "libc不提供inotify")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1失败")
+        self._dirs = {}  # {监视描述符: 相对路径}
+        self._add_tree(self.root)
+
+    def _add_tree(self, path: Path) -> set[str]:
+        """
+        递归监视path及其子目录，返回其中已存在的文件（相对root）。
+
+        ==========================================
+
+        Watch path and its subdirectories recursively; return the files already in them (relative to root).
+        """
+        found = set()
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                continue
+            rel = Path(dirpath).relative_to(self.root).as_posix()
+            self._dirs[wd] = "" if rel == "." else rel
+            for name in filenames:
+                found.add(f"{self._dirs[wd]}/{name}".lstrip("/"))
+        return found
+
+    def poll(self, timeout: float) -> set[str]:
+        """
+        等待至多timeout秒，读取所有已到达的事件，返回发生变化（写入完成、新建、删除、改名）的文件。
+
+        Args:
+            timeout (float): 最长等待时间，单位为秒。
+
+        Returns:
+            set[str]: 变化的文件，相对root的路径。
+
+        ==========================================
+
+        Wait up to timeout seconds, read every pending event and return the files that changed (written, created,
+        deleted or renamed).
+
+        Args:
+            timeout (float): Maximum wait in seconds.
+
+        Returns:
+            set[str]: Changed files, paths relative to root.
+        """
+        changed = set()
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return changed
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = struct.unpack_from("iIII", data, offset)
+                name = data[offset + 16:offset + 16 + length].rstrip(b"\0").decode(errors="replace")
+                offset += 16 + length
+                if mask & IN_Q_OVERFLOW:
+                    # 事件丢失，报告全部文件，由调用者按内容判断是否真的变化
+                    changed |= {p.relative_to(self.root).as_posix() for p in self.root.rglob("*") if p.is_file()}
+                    continue
+                base = self._dirs.get(wd)
+                if base is None or not name:
+                    if mask & IN_DELETE_SELF:
+                        self._dirs.pop(wd, None)
+                    continue
+                rel = f"{base}/{name}".lstrip("/")
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        changed |= self._add_tree(self.root / rel)
+                    continue
+                changed.add(rel)
+        return {p for p in changed if not _ignored(p)}
+
+    def close(self) -> None:
+        """
+        关闭inotify文件描述符，可重复调用。
+
+        ==========================================
+
+        Close the inotify file descriptor; safe to call more than once.
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """
+    轮询文件修改时间与大小的目录监视器，用于没有inotify的平台（Windows、macOS）。
+
+    Attributes:
+        root (Path): 被监视的目录。
+        interval (float): 两次扫描之间的间隔，单位为秒。
+        backend (str): 固定为"polling"。
+
+    Methods:
+        poll(timeout: float) -> set[str]: 等待至多timeout秒，返回发生变化的文件（相对root的路径，以/分隔）。
+        close() -> None: 无操作，与InotifyWatcher接口一致。
+
+    ==========================================
+
+    Directory watcher polling modification times and sizes, for platforms without inotify (Windows, macOS).
+
+    Attributes:
+        root (Path): Directory being watched.
+        interval (float): Interval between two scans, in seconds.
+        backend (str): Always "polling".
+
+    Methods:
+        poll(timeout: float) -> set[str]: Wait up to timeout seconds and return the changed files (paths relative to root, separated by /).
+        close() -> None: No-op, for interface parity with InotifyWatcher.
+    """
+
+    backend = "polling"
+
+    def __init__(self, root: Path, interval: float = 0.5):
+        self.root = Path(root).resolve()
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._next = time.monotonic() + interval
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+            for name in filenames:
+                path = Path(dirpath) / name
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                snapshot[path.relative_to(self.root).as_posix()] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def poll(self, timeout: float) -> set[str]:
+        """
+        到达扫描时间时重新扫描目录并与上次比较，否则等待至多timeout秒后返回空集合。
+
+        Args:
+            timeout (float): 最长等待时间，单位为秒。
+
+        Returns:
+            set[str]: 变化（新增、修改、删除）的文件，相对root的路径。
+
+        ==========================================
+
+        Rescan the directory and compare with the previous scan when the interval has elapsed, otherwise wait up to
+        timeout seconds and return an empty set.
+
+        Args:
+            timeout (float): Maximum wait in seconds.
+
+        Returns:
+            set[str]: Changed (added, modified or deleted) files, paths relative to root.
+        """
+        wait = self._next - time.monotonic()
+        if wait > 0:
+            time.sleep(min(wait, timeout))
+            if wait > timeout:
+                return set()
+        self._next = time.monotonic() + self.interval
+        snapshot = self._scan()
+        changed = {p for p in snapshot.keys() | self._snapshot.keys() if snapshot.get(p) != self._snapshot.get(p)}
+        self._snapshot = snapshot
+        return {p for p in changed if not _ignored(p)}
+
+    def close(self) -> None:
+        pass
+
+
+class HotReloader:
+    """
+    监视模式：监视firmware目录，只重新编译修改的模块，通过保持打开的raw REPL会话上传并热重载。
+
+    启动时完整编译并增量部署一次，之后每批文件变化：
+    1. 重新分析依赖（解析缓存只重新解析修改的文件），只对修改的模块调用mpy-cross，main.py、boot.py直接复制；
+    2. 与上次上传的内容比较，只上传真正变化的文件，删除已删除的文件；
+    3. 重载：修改的模块都是叶子模块（除main外没有其他模块导入它）时，中断程序，执行STOP_SCRIPT停止main.py创建的
+       定时器与引脚中断，从sys.modules中删除这些模块并重新运行main.py，其余已导入的模块保持不变；
+       否则（或boot.py、main.py变化、有文件删除、reload为"reset"时）软复位。
+    会话在两次重载之间保持打开，设备输出实时显示在终端中。
+
+    Attributes:
+        deployer (MPYDeployer): 提供端口、输出目录与压缩选项的部署器。
+        firmware_dir (Path): 被监视的源目录。
+        reload (str): 重载方式，"auto"或"reset"（总是软复位）。
+        debounce (float): 收到变化后等待更多变化的时间，单位为秒，用于合并编辑器的连续写入。
+        compiler (MPYCompiler): 编译修改模块用的编译器，输出到部署器的源目录。
+        reloads (int): 已完成的重载次数。
+
+    Methods:
+        __init__(deployer, firmware_dir, reload="auto", debounce=0.2) -> None: 初始化热重载器。
+        leaf_modules(changed: list[str]) -> bool: 判断修改的源文件是否都是叶子模块。
+        run() -> None: 初次部署后进入监视循环，直到Ctrl-C。
+
+    ==========================================
+
+    Watch mode: watch the firmware directory, recompile only the changed modules, and upload and hot-reload them
+    through a raw REPL session that stays open.
+
+    It compiles and delta-deploys once on start, then for every batch of file changes:
+    1. Re-analyze the dependencies (the parse cache reparses only changed files) and run mpy-cross only for the
+       changed modules; main.py and boot.py are copied;
+    2. Compare with the content uploaded last time, upload only files that really changed and delete removed files;
+    3. Reload: when every changed module is a leaf (no module other than main imports it), interrupt the program,
+       run STOP_SCRIPT to stop the timers and pin interrupts created by main.py, drop those modules from
+       sys.modules and run main.py again, keeping every other imported module; otherwise (or when boot.py or
+       main.py changed, files were deleted, or reload is "reset") soft-reset.
+    The session stays open between reloads and the device output is shown in the terminal as it arrives.
+
+    Attributes:
+        deployer (MPYDeployer): Deployer providing the port, the output directory and the compression option.
+        firmware_dir (Path): Source directory being watched.
+        reload (str): Reload mode, "auto" or "reset" (always soft-reset).
+        debounce (float): Time to wait for more changes after one arrives, in seconds, merging an editor's
+            consecutive writes.
+        compiler (MPYCompiler): Compiler for the changed modules, writing into the deployer's source directory.
+        reloads (int): Number of completed reloads.
+
+    Methods:
+        __init__(deployer, firmware_dir, reload="auto", debounce=0.2) -> None: Initialize the hot reloader.
+        leaf_modules(changed: list[str]) -> bool: Whether every changed source file is a leaf module.
+        run() -> None: Deploy once, then watch until Ctrl-C.
+    """
+
+    def __init__(self, deployer, firmware_dir: str, reload: str = "auto", debounce: float = 0.2):
+        """
+        初始化热重载器。
+
+        Args:
+            deployer (MPYDeployer): 部署器，需使用raw传输。
+            firmware_dir (str): 被监视的源目录。
+            reload (str, optional): 重载方式，"auto"或"reset"。
+            debounce (float, optional): 合并连续变化的等待时间，单位为秒。
+
+        Raises:
+            ValueError: 部署器不是raw传输，或重载方式无效。
+            FileNotFoundError: 源目录不存在或缺少必要文件。
+
+        ==========================================
+
+        Initialize the hot reloader.
+
+        Args:
+            deployer (MPYDeployer): Deployer, must use the raw transport.
+            firmware_dir (str): Source directory to watch.
+            reload (str, optional): Reload mode, "auto" or "reset".
+            debounce (float, optional): Time to merge consecutive changes, in seconds.
+
+        Raises:
+            ValueError: The deployer does not use the raw transport, or the reload mode is invalid.
+            FileNotFoundError: The source directory does not exist or lacks necessary files.
+        """
+        if deployer.transport != "raw":
+            raise ValueError("监视模式需要raw传输（pip install pyserial）")
+        if reload not in RELOAD_MODES:
+            raise ValueError(f"无效的重载方式: {reload}，可选 {', '.join(RELOAD_MODES)}")
+        self.deployer = deployer
+        self.firmware_dir = Path(firmware_dir).resolve()
+        self.reload = reload
+        self.debounce = debounce
+        self.compiler = MPYCompiler(source_dir=str(self.firmware_dir), output_dir=str(deployer.source_dir))
+        self.reloads = 0
+        self._session: RawREPL | None = None
+        self._pushed = {}  # {设备文件相对路径: SHA-256}，即设备上当前的内容
+
+    def _output_path(self, rel: str) -> str:
+        return rel if rel in ("main.py", "boot.py") else rel[:-3] + ".mpy"
+
+    def _build(self, changed: list[str]) -> list[str]:
+        """
+        重新分析依赖并编译修改的源文件，删除已删除源文件的输出，返回编译失败的文件。
+
+        ==========================================
+
+        Re-analyze the dependencies, compile the changed sources and delete the outputs of removed sources; return
+        the files that failed to compile.
+        """
+        self.compiler.analyze_dependencies()
+        failed = []
+        for rel in changed:
+            output = self.deployer.source_dir / self._output_path(rel)
+            if not (self.firmware_dir / rel).exists():
+                output.unlink(missing_ok=True)
+            elif rel in ("main.py", "boot.py"):
+                shutil.copy(self.firmware_dir / rel, output)
+            else:
+                try:
+                    self.compiler._compile_single_file(rel.replace("/", os.sep))
+                except Exception as e:
+                    failed.append(rel)
+                    print(f"✗ 编译失败 {rel}: {e}")
+        return failed
+
+    def leaf_modules(self, changed: list[str]) -> bool:
+        """
+        判断修改的源文件是否都是叶子模块：除main外没有其他模块导入它们，且不是boot.py或main.py。
+
+        叶子模块可以只从sys.modules中删除并由重新运行的main.py重新导入；被其他模块导入的模块在这些模块中仍保留旧的引用，需要软复位。
+
+        Args:
+            changed (list[str]): 修改的源文件，相对firmware目录的路径。
+
+        Returns:
+            bool: 全部是叶子模块时为True。
+
+        ==========================================
+
+        Whether every changed source file is a leaf module: not boot.py or main.py and imported by no module other
+        than main.
+
+        Leaf modules can simply be dropped from sys.modules and imported again by main.py when it runs again; modules
+        imported by other modules are still referenced there by their old objects, which needs a soft reset.
+
+        Args:
+            changed (list[str]): Changed source files, paths relative to the firmware directory.
+
+        Returns:
+            bool: True when all of them are leaf modules.
+        """
+        nodes = self.compiler.dependency_analyzer.nodes
+        for rel in changed:
+            if rel in RESET_FILES:
+                return False
+            node = nodes.get(rel[:-3])
+            if node is None or node.imported_by - {"main"}:
+                return False
+        return True
+
+    def _console(self) -> None:
+        data = self._session.read_available()
+        if data:
+            sys.stdout.write(data.replace(b"\x04", b"").decode(errors="replace"))
+            sys.stdout.flush()
+
+    def _initial_deploy(self) -> None:
+        """
+        完整编译（命中编译缓存的文件不调用mpy-cross），打开会话并增量部署，记录设备上的文件内容，软复位后保持会话打开。
+
+        ==========================================
+
+        Compile everything (cached files skip mpy-cross), open the session and delta-deploy, record the content on the
+        device, then soft-reset and keep the session open.
+        """
+        self.compiler.analyze_dependencies()
+        self.compiler.determine_compile_order()
+        self.compiler.compile_files()
+
+        self._session = self.deployer._open_session()
+        local = self.deployer.build_local_manifest()
+        remote = self.deployer.fetch_remote_manifest(self._session)
+        if remote is None:
+            raise RawREPLError("无法取回设备文件清单")
+        upload, remove = self.deployer.diff_manifests(local, remote)
+        print(f"初次部署：上传 {len(upload)} 个文件，删除 {len(remove)} 个文件")
+        self.deployer.apply_sync(self._session, local, upload, remove, progress=self.deployer._print_progress)
+        self._pushed = {path: sha for path, (_, sha) in local.items()}
+        self._session.soft_reset(keep_open=True)
+
+    def _push(self, changed: list[str]) -> None:
+        """
+        编译并上传一批变化，再按规则热重载或软复位。
+
+        ==========================================
+
+        Compile and upload one batch of changes, then hot-reload or soft-reset according to the rules.
+        """
+        start = time.perf_counter()
+        sources = sorted(p for p in changed if p.endswith(".py"))
+        if not sources:
+            return
+        if self._build(sources):
+            print("存在编译失败的文件，未上传，设备继续运行旧版本")
+            return
+
+        upload, remove, hashes = [], [], {}
+        for rel in sources:
+            target = self._output_path(rel)
+            path = self.deployer.source_dir / target
+            if not path.exists():
+                if target in self._pushed:
+                    remove.append(target)
+                continue
+            sha = hashlib.sha256(path.read_bytes()).hexdigest()
+            if self._pushed.get(target) != sha:
+                upload.append(target)
+                hashes[target] = sha
+        if not upload and not remove:
+            return
+
+        session = self._session
+        session.interrupt()
+        # 源目录中已不存在的目录在删除文件后一并删除（非空时设备端忽略）
+        gone = {d.as_posix() for p in remove for d in Path(p).parents if d != Path(".") and not (self.firmware_dir / d).is_dir()}
+        session.fs_remove([f"/{p}" for p in remove], [f"/{d}" for d in gone])
+        # 新文件可能位于新建的多级目录中，逐级创建，已存在的目录由设备端忽略
+        session.fs_mkdirs([f"/{d.as_posix()}" for p in upload for d in Path(p).parents if d != Path(".")])
+        session.fs_write_many(
+            [(f"/{p}", (self.deployer.source_dir / p).read_bytes()) for p in upload], compress=self.deployer.compress
+        )
+        # 写入与删除都成功后才更新记录；中途失败时再次保存同一文件仍会重新上传
+        for p in remove:
+            del self._pushed[p]
+        self._pushed.update(hashes)
+
+        changed_sources = [rel for rel in sources if self._output_path(rel) in upload]
+        if self.reload == "auto" and not remove and self.leaf_modules(changed_sources):
+            # 停止旧实例的定时器与引脚中断，再删除修改的模块
+            session.exec(STOP_SCRIPT)
+            modules = [rel[:-3].removesuffix("/__init__").replace("/", ".") for rel in changed_sources]
+            session.exec(f"import sys\nfor m in {modules!r}:\n    sys.modules.pop(m, None)")
+            # 在raw REPL中重新运行main.py，不等待结束，输出由_console()显示
+            session.exec_nowait("exec(open('/main.py').read())")
+            how = "重新导入"
+        else:
+            session.soft_reset(keep_open=True)
+            how = "软复位"
+        self.reloads += 1
+        names = ", ".join(upload + [f"-{p}" for p in remove])
+        print(f"\n✓ 热重载 #{self.reloads}（{how}，{time.perf_counter() - start:.2f}s）: {names}")
+
+    def run(self) -> None:
+        """
+        初次部署后进入监视循环：显示设备输出，收到文件变化后等待debounce秒合并连续写入，再编译、上传并重载，直到Ctrl-C。
+
+        ==========================================
+
+        Deploy once, then watch: show the device output, and on file changes wait debounce seconds to merge
+        consecutive writes, then compile, upload and reload, until Ctrl-C.
+        """
+        self._initial_deploy()
+        watcher = create_watcher(self.firmware_dir)
+        print(f"监视 {self.firmware_dir}（{watcher.backend}），Ctrl-C退出")
+        try:
+            while True:
+                self._console()
+                changed = watcher.poll(0.05)
+                if not changed:
+                    continue
+                # 合并编辑器保存时的连续写入与改名
+                deadline = time.monotonic() + self.debounce
+                while time.monotonic() < deadline:
+                    changed |= watcher.poll(max(0.0, deadline - time.monotonic()))
+                try:
+                    self._push(sorted(changed))
+                except RawREPLError as e:
+                    print(f"✗ 热重载失败: {e}")
+        except KeyboardInterrupt:
+            print(f"\n退出监视模式，共热重载 {self.reloads} 次")
+        finally:
+            watcher.close()
+            self._session.close()
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ============================================
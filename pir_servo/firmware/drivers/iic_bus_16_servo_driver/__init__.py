@@ -8,9 +8,7 @@
 
 # ======================================== 导入相关模块 =========================================
 
-# 导入 code 文件夹下的 Buzzer 类到包顶层
-from .code.pca9685 import PCA9685
-from .code.bus_servo import BusPWMServoController
+# 导出接口在首次访问时才导入对应子模块，见 __getattr__
 # ======================================== 全局变量 ============================================
 
 # 定义对外可访问的接口
@@ -18,6 +16,17 @@ __all__ = ["PCA9685", "BusPWMServoController"]
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问导出名称时才导入定义它的子模块，并缓存到包的命名空间中。"""
+    if name == "PCA9685":
+        from .code.pca9685 import PCA9685 as value
+    elif name == "BusPWMServoController":
+        from .code.bus_servo import BusPWMServoController as value
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ==========================================
@@ -8,8 +8,7 @@
 
 # ======================================== 导入相关模块 =========================================
 
-# 导入 code 文件夹下的 Buzzer 类到包顶层
-from .code.pir_sensor import PIRSensor
+# 导出接口在首次访问时才导入对应子模块，见 __getattr__
 # ======================================== 全局变量 ============================================
 
 # 定义对外可访问的接口
@@ -17,6 +16,15 @@ __all__ = ["PIRSensor"]
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问导出名称时才导入定义它的子模块，并缓存到包的命名空间中。"""
+    if name == "PIRSensor":
+        from .code.pir_sensor import PIRSensor as value
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ==========================================
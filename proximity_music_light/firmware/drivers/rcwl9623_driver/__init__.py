@@ -8,8 +8,7 @@
 
 # ======================================== 导入相关模块 =========================================
 
-# 将 code/rcwl9623.py 中的类导入到包顶层
-from .code.rcwl9623 import RCWL9623
+# 导出接口在首次访问时才导入对应子模块，见 __getattr__
 
 # ======================================== 全局变量 ============================================
 
@@ -18,6 +17,15 @@ __all__ = ["RCWL9623"]
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问导出名称时才导入定义它的子模块，并缓存到包的命名空间中。"""
+    if name == "RCWL9623":
+        from .code.rcwl9623 import RCWL9623 as value
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ==========================================
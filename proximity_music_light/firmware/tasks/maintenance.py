@@ -37,7 +37,15 @@ else:
 GC_THRESHOLD_BYTES = getattr(conf, "GC_THRESHOLD_BYTES", 100000)
 ERROR_REPEAT_DELAY_S = getattr(conf, "ERROR_REPEAT_DELAY_S", 1.0)
 
-__all__ = ["task_idle_callback", "task_err_callback", "GC_THRESHOLD_BYTES", "ERROR_REPEAT_DELAY_S"]
+# 错误打印限速状态：上次打印完整回溯的时刻（ticks_ms）与期间被省略的错误数
+_ERR_REPEAT_MS = int(ERROR_REPEAT_DELAY_S * 1000)
+_err_last_ms = None
+_err_suppressed = 0
+
+# 首次垃圾回收前假定的回收耗时（us），测得实际耗时后使用测量值
+_GC_GUESS_US = 5000
+
+__all__ = ["task_idle_callback", "task_err_callback", "GCManager", "GC_THRESHOLD_BYTES", "ERROR_REPEAT_DELAY_S"]
 
 # ======================================== 功能函数 ============================================
 
@@ -76,7 +84,7 @@ def task_idle_callback() -> None:
 
 def task_err_callback(e: Exception) -> None:
     """
-    任务异常回调：打印异常信息并做限速（防止刷屏）。
+    任务异常回调：打印异常信息并做限速（防止刷屏），不阻塞调度器。
 
     Args:
         e (Exception): 调度器捕获到的异常对象。
@@ -84,8 +92,24 @@ def task_err_callback(e: Exception) -> None:
     Behavior:
         - 使用 sys.print_exception 输出完整回溯（若可用）。
         - 若 print_exception 不可用或抛出错误，回退到 print(repr(e))。
-        - 在打印后 sleep ERROR_REPEAT_DELAY_S 秒以限速。
+        - 距上次打印不足 ERROR_REPEAT_DELAY_S 秒的错误只计数不打印，下次打印时输出省略的条数。
+        - 错误记录与连续失败任务的熔断由调度器完成，可在REPL中调用 sc.errors() 查看。
     """
+    global _err_last_ms, _err_suppressed
+
+    # 限速打印，避免在短时间内反复刷屏；不再sleep，其他任务照常运行
+    now = time.ticks_ms()
+    if _err_last_ms is not None and time.ticks_diff(now, _err_last_ms) < _ERR_REPEAT_MS:
+        _err_suppressed += 1
+        return
+    _err_last_ms = now
+    if _err_suppressed:
+        try:
+            print("task_err_callback: {} errors suppressed".format(_err_suppressed))
+        except Exception:
+            pass
+        _err_suppressed = 0
+
     try:
         # 优先打印完整回溯
         try:
@@ -103,15 +127,196 @@ def task_err_callback(e: Exception) -> None:
         except Exception:
             pass
 
-    # 限速打印，避免在短时间内反复刷屏
-    try:
-        time.sleep(ERROR_REPEAT_DELAY_S)
-    except Exception:
-        # 在某些环境 time.sleep 可能不可用或受限，忽略异常
-        pass
-
 # ======================================== 自定义类 ============================================
 
+class GCManager:
+    """
+    按调度器截止时刻安排垃圾回收的空闲回调，替代 task_idle_callback。
+
+    直接在空闲回调中 gc.collect() 时，回收可能恰好发生在对延迟敏感的任务（如10ms音频采样）之前，
+    造成5~20ms的随机卡顿。本类的做法：
+        - 测量每次回收的耗时，按滑动平均预测下一次回收的停顿时间。
+        - 按观测到的内存分配速率设置 gc.threshold()，使自动回收只作为兜底，
+          大部分回收由本类在空闲时主动完成。
+        - 只在距下一个任务截止时刻（Scheduler.next_wait_ms()）的空闲时间大于预测停顿时才回收；
+          空闲内存低于 GC_THRESHOLD_BYTES 的四分之一时不再等待，立即回收以免内存耗尽。
+        - 记录回收停顿统计，可在REPL中调用 stats() 查看。
+
+    Attributes:
+        _low (int): 空闲内存低水位，低于该值时需要回收，默认为 GC_THRESHOLD_BYTES。
+        _horizon (int): 主动回收的目标周期，单位为毫秒。
+        _margin (int): 预测停顿之外额外预留的时间，单位为微秒。
+        _sched (Scheduler): 提供截止时刻的调度器，未挂接时不检查空闲时间。
+        _rate (int): 内存分配速率的滑动平均，单位为字节/秒。
+        _cost (int): 回收停顿的滑动平均，单位为微秒。
+
+    Methods:
+        __init__(self, low_water: int = GC_THRESHOLD_BYTES, horizon_ms: int = 2000, margin_us: int = 1000, min_threshold: int = 4096) -> None:
+            初始化垃圾回收管理器。
+        attach(self, sched) -> GCManager:
+            挂接调度器，用于获取距下一个截止时刻的空闲时间。
+        collect(self) -> int:
+            立即执行一次垃圾回收并记录耗时。
+        __call__(self) -> None:
+            空闲回调入口，按需在空闲时间内回收。
+        stats(self) -> None:
+            打印垃圾回收统计。
+
+    Example:
+        >>> gcm = GCManager()
+        >>> sc = Scheduler(Timer(-1), interval=5, task_idle=gcm, task_err=task_err_callback)
+        >>> gcm.attach(sc)
+    """
+
+    def __init__(self, low_water: int = GC_THRESHOLD_BYTES, horizon_ms: int = 2000,
+                 margin_us: int = 1000, min_threshold: int = 4096) -> None:
+        """
+        初始化垃圾回收管理器。
+
+        Args:
+            low_water (int, optional): 空闲内存低水位，单位为字节，默认为GC_THRESHOLD_BYTES。
+            horizon_ms (int, optional): 主动回收的目标周期，单位为毫秒，默认为2000ms；
+                                        gc.threshold() 设为该周期内预计分配量的两倍。
+            margin_us (int, optional): 预测停顿之外额外预留的时间，单位为微秒，默认为1000us。
+            min_threshold (int, optional): gc.threshold() 的下限，单位为字节，默认为4096。
+
+        Returns:
+            None
+        """
+        self._low = low_water
+        self._horizon = horizon_ms
+        self._margin = margin_us
+        self._min_th = min_threshold
+        self._sched = None
+        self._rate = 0
+        self._cost = 0
+        # 分配速率测量窗口的起点，以及上次回收后的已分配量
+        self._t_win = time.ticks_ms()
+        self._a_win = gc.mem_alloc()
+        self._a_last = self._a_win
+        # 统计：回收次数、停顿最小/最大/累计（us）、推迟次数、强制次数、非本类触发的回收次数
+        self._n = 0
+        self._cost_min = 0
+        self._cost_max = 0
+        self._cost_sum = 0
+        self._deferred = 0
+        self._forced = 0
+        self._auto = 0
+        self._th = -1
+
+    def attach(self, sched) -> "GCManager":
+        """
+        挂接调度器，用于获取距下一个任务截止时刻的空闲时间，并执行一次回收以测量停顿初值。
+
+        Args:
+            sched (Scheduler): 调度器实例。
+
+        Returns:
+            GCManager: 自身，便于链式调用。
+        """
+        self._sched = sched
+        self.collect()
+        return self
+
+    def collect(self) -> int:
+        """
+        立即执行一次垃圾回收，记录耗时并按分配速率更新 gc.threshold()。
+
+        Args:
+            None
+
+        Returns:
+            int: 本次回收耗时，单位为微秒。
+        """
+        t0 = time.ticks_us()
+        gc.collect()
+        dt = time.ticks_diff(time.ticks_us(), t0)
+        if self._n == 0 or dt < self._cost_min:
+            self._cost_min = dt
+        if dt > self._cost_max:
+            self._cost_max = dt
+        # 预测停顿：滑动平均，但不低于最近一次，避免堆增长后低估
+        self._cost = dt if self._n == 0 else max(dt, (self._cost * 3 + dt) // 4)
+        self._n += 1
+        self._cost_sum += dt
+        self._a_last = gc.mem_alloc()
+        self._a_win = self._a_last
+        self._t_win = time.ticks_ms()
+        if self._rate > 0:
+            th = self._rate * self._horizon // 1000 * 2
+            if th < self._min_th:
+                th = self._min_th
+            gc.threshold(th)
+            self._th = th
+        return dt
+
+    def __call__(self) -> None:
+        """
+        空闲回调入口：更新分配速率，需要回收且空闲时间足够时回收。
+
+        满足以下任一条件即需要回收：空闲内存低于低水位且上次回收后已有新的分配；
+        上次回收后的分配量达到目标周期内的预计分配量。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        try:
+            now = time.ticks_ms()
+            alloc = gc.mem_alloc()
+            if alloc < self._a_win:
+                # 已分配量下降：发生了非本类触发的回收（gc.threshold 兜底或其他代码调用）
+                self._auto += 1
+                self._a_last = alloc
+                self._a_win = alloc
+                self._t_win = now
+            else:
+                dt = time.ticks_diff(now, self._t_win)
+                if dt >= 100:
+                    r = (alloc - self._a_win) * 1000 // dt
+                    self._rate = r if self._rate == 0 else (self._rate * 3 + r) // 4
+                    self._a_win = alloc
+                    self._t_win = now
+            used = alloc - self._a_last
+            free = gc.mem_free()
+            budget = self._rate * self._horizon // 1000
+            if not ((free < self._low and used >= self._min_th) or (budget > 0 and used >= budget)):
+                return
+            sched = self._sched
+            if sched is not None:
+                need = (self._cost if self._n else _GC_GUESS_US) + self._margin
+                if sched.next_wait_ms() * 1000 < need:
+                    if free >= self._low // 4:
+                        # 空闲时间不足，推迟到下一次空闲
+                        self._deferred += 1
+                        return
+                    self._forced += 1
+            self.collect()
+        except Exception as e:
+            # 任何异常都不应从空闲回调抛出
+            try:
+                print("GCManager error:", e)
+            except Exception:
+                pass
+
+    def stats(self) -> None:
+        """
+        打印垃圾回收统计，可在REPL中直接调用。
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        n = self._n
+        print('gc: runs {}, pause min/avg/max {}/{}/{}us, predicted {}us, deferred {}, forced {}, auto {}'.format(
+            n, self._cost_min, self._cost_sum // n if n else 0, self._cost_max,
+            self._cost, self._deferred, self._forced, self._auto))
+        print('gc: alloc rate {}B/s, threshold {}, free {}'.format(self._rate, self._th, gc.mem_free()))
+
 # ======================================== 初始化配置 ==========================================
 
 # ========================================  主程序  ===========================================
\ No newline at end of file
@@ -0,0 +1,191 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/10/29 下午2:10
+# @Author  : 李清水
+# @File    : bench.py
+# @Description : I2C 驱动基准测试：在芯片模拟器上反复调用驱动的热点方法，统计每次调用的总线时间与总线占用率
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+import re
+import sys
+import importlib
+from pathlib import Path
+
+from .clock import CLOCK
+from . import machine, i2c_devices
+
+# ======================================== 全局变量 ============================================
+
+# 默认对比的总线频率：标准模式与快速模式
+DEFAULT_FREQS = (100_000, 400_000)
+
+# ======================================== 功能函数 ============================================
+
+def find_class(source_dir: str, name: str):
+    """
+    在固件源码中查找类定义并按点分模块路径导入，返回类对象。调用前需已执行 install()。
+
+    Args:
+        source_dir (str): 固件目录。
+        name (str): 类名。
+
+    Returns:
+        type: 导入的类。
+
+    Raises:
+        LookupError: 固件中没有该类的定义。
+
+    ==========================================
+
+    Find a class definition in the firmware sources, import it by its dotted module path and
+    return the class. install() must have been called.
+
+    Args:
+        source_dir (str): Firmware directory.
+        name (str): Class name.
+
+    Returns:
+        type: The imported class.
+
+    Raises:
+        LookupError: The firmware does not define the class.
+    """
+    src = Path(source_dir).resolve()
+    pattern = re.compile(rf"^class\s+{name}\b", re.MULTILINE)
+    for path in sorted(src.rglob("*.py")):
+        if pattern.search(path.read_text(encoding="utf-8", errors="ignore")):
+            if str(src) not in sys.path:
+                sys.path.insert(0, str(src))
+            module = ".".join(path.relative_to(src).with_suffix("").parts)
+            return getattr(importlib.import_module(module), name)
+    raise LookupError(f"class {name} not found in {src}")
+
+
+def _ssd1306_show(source_dir: str, i2c):
+    cls = find_class(source_dir, "SSD1306_I2C")
+    i2c._bus.attach(i2c_devices.SSD1306(0x3C))
+    oled = cls(i2c, 0x3C, 128, 64, False)
+
+    def call(i: int) -> None:
+        oled.pixel(i % 128, i % 64, 1)
+        oled.show()
+    return call
+
+
+def _pca9685_pwm(source_dir: str, i2c):
+    cls = find_class(source_dir, "PCA9685")
+    i2c._bus.attach(i2c_devices.PCA9685(0x40))
+    pca = cls(i2c, 0x40)
+    pca.freq(50)
+
+    def call(i: int) -> None:
+        pca.pwm(i % 16, 0, (i * 37) % 4096)
+    return call
+
+
+def _bus_step_motor_step(source_dir: str, i2c):
+    cls = find_class(source_dir, "BusStepMotor")
+    i2c._bus.attach(i2c_devices.PCA9685(0x40))
+    # PCA9685 取驱动包内的同名类，BusStepMotor 用 isinstance 检查
+    pca = sys.modules[cls.__module__].PCA9685(i2c, 0x40)
+    motor = cls(pca, 1)
+    motor.steps[0] = 1 << 30
+
+    def call(i: int) -> None:
+        motor._next_step(0)
+    return call
+
+
+def run_bench(source_dir: str, name: str, freqs=DEFAULT_FREQS, calls: int = 100) -> list:
+    """
+    在每个总线频率下构造驱动并调用 calls 次热点方法，返回每种频率的统计。
+    构造与初始化阶段的传输不计入统计。
+
+    Args:
+        source_dir (str): 固件目录，驱动类从这里导入。
+        name (str): 基准名称，见 BENCHES。
+        freqs (tuple[int]): 总线频率列表，单位为 Hz。
+        calls (int): 调用次数。
+
+    Returns:
+        list[dict]: 每种频率一行，包括每次调用的虚拟耗时、总线时间、传输次数、字节数、
+                    总线占用率与最高调用频率。
+
+    ==========================================
+
+    Build the driver at every bus frequency and call the hot method calls times; return the
+    statistics per frequency. Transfers made while constructing and initializing the driver
+    are not counted.
+
+    Args:
+        source_dir (str): Firmware directory to import driver classes from.
+        name (str): Benchmark name, see BENCHES.
+        freqs (tuple[int]): Bus frequencies in Hz.
+        calls (int): Number of calls.
+
+    Returns:
+        list[dict]: One row per frequency with virtual time, bus time, transactions and bytes
+                    per call, bus utilization and the highest sustainable call rate.
+    """
+    from .runtime import install
+    setup = BENCHES[name]
+    install(None)
+    rows = []
+    for freq in freqs:
+        CLOCK.reset(None)
+        machine.reset_state()
+        i2c = machine.I2C(0, freq=freq)
+        call = setup(source_dir, i2c)
+        bus = i2c._bus
+        t0, busy0, tr0 = CLOCK.now, bus.busy_us, bus.transactions
+        bytes0 = sum(d.bytes_written + d.bytes_read for d in bus.devices.values())
+        for i in range(calls):
+            call(i)
+        elapsed = CLOCK.now - t0
+        busy = bus.busy_us - busy0
+        nbytes = sum(d.bytes_written + d.bytes_read for d in bus.devices.values()) - bytes0
+        per_call = elapsed / calls
+        rows.append({
+            "bench": name,
+            "freq": freq,
+            "calls": calls,
+            "call_us": round(per_call, 1),
+            "bus_us": round(busy / calls, 1),
+            "transactions": round((bus.transactions - tr0) / calls, 1),
+            "bytes": round(nbytes / calls, 1),
+            "util_pct": round(busy * 100 / elapsed, 1) if elapsed else 0.0,
+            "max_rate_hz": round(1_000_000 / per_call, 1) if per_call else 0.0,
+        })
+    return rows
+
+
+def format_bench(rows: list) -> str:
+    """
+    把 run_bench() 的结果格式化为文本表格。
+
+    ==========================================
+
+    Format run_bench() results as a text table.
+    """
+    lines = ["{:<22} {:>7} {:>9} {:>9} {:>6} {:>7} {:>6} {:>9}".format(
+        "bench", "kHz", "call_us", "bus_us", "xfers", "bytes", "util%", "max_Hz")]
+    for r in rows:
+        lines.append("{:<22} {:>7} {:>9} {:>9} {:>6} {:>7} {:>6} {:>9}".format(
+            r["bench"], r["freq"] // 1000, r["call_us"], r["bus_us"], r["transactions"], r["bytes"],
+            r["util_pct"], r["max_rate_hz"]))
+    return "\n".join(lines)
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# 基准名称 -> 构造函数，构造函数挂接模拟器、初始化驱动并返回以调用序号为参数的被测函数
+BENCHES = {
+    "ssd1306_show": _ssd1306_show,
+    "pca9685_pwm": _pca9685_pwm,
+    "bus_step_motor_step": _bus_step_motor_step,
+}
+
+# ========================================  主程序  ============================================
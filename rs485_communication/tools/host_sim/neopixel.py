@@ -0,0 +1,62 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/10/27 下午2:50
+# @Author  : 李清水
+# @File    : neopixel.py
+# @Description : 主机模拟器中的 neopixel 模块替身，write() 按 800kHz 时序消耗虚拟时间
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+from .clock import CLOCK
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+# ======================================== 自定义类 ============================================
+
+
+class NeoPixel:
+    """
+    WS2812 灯带替身，像素保存在 buf 中，frames 统计 write() 次数。
+
+    ==========================================
+
+    WS2812 strip stand-in; pixels live in buf and frames counts write() calls.
+    """
+
+    ORDER = (1, 0, 2, 3)
+
+    def __init__(self, pin, n: int, bpp: int = 3, timing: int = 1) -> None:
+        self.pin = pin
+        self.n = n
+        self.bpp = bpp
+        self.buf = bytearray(n * bpp)
+        self.timing = timing
+        self.frames = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __setitem__(self, i: int, v) -> None:
+        offset = i * self.bpp
+        for k in range(self.bpp):
+            self.buf[offset + self.ORDER[k]] = v[k]
+
+    def __getitem__(self, i: int) -> tuple:
+        offset = i * self.bpp
+        return tuple(self.buf[offset + self.ORDER[k]] for k in range(self.bpp))
+
+    def fill(self, v) -> None:
+        for i in range(self.n):
+            self[i] = v
+
+    def write(self) -> None:
+        # 每位 1.25us，另加 50us 复位低电平
+        self.frames += 1
+        CLOCK.advance(len(self.buf) * 10 + 50)
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ============================================
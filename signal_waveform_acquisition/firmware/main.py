@@ -219,8 +219,9 @@ print("Error repeat delay:", ERROR_REPEAT_DELAY_S)
 task_obj = ADSTask(signal, ssd1306)
 sensor_task = Task(task_obj.tick, interval=50,  state=Task.TASK_RUN)
 
-# 创建任务调度器,定时周期为50ms
-sc = Scheduler(Timer(-1), interval=20, task_idle=task_idle_callback, task_err=task_err_callback)
+# 创建任务调度器，使用截止时刻堆调度，任务按绝对时刻执行、长期速率不漂移
+sc = Scheduler(Timer(-1), interval=20, task_idle=task_idle_callback, task_err=task_err_callback,
+               mode=Scheduler.MODE_HEAP)
 
 # 添加任务
 sc.add(sensor_task)
@@ -3,26 +3,110 @@
 # @Time    : 2025/9/20 下午5:53
 # @Author  : 李清水
 # @File    : mpy_uploader.py
-# @Description : 使用mpremote将build/firmware_mpy/文件夹内容下载到MCU
+# @Description : 使用mpremote或raw REPL串口会话将build/firmware_mpy/文件夹内容下载到MCU
 # @License : CC BY-NC 4.0
 
 # ======================================== 导入相关模块 =========================================
 
 import sys
+import glob
+import time
+import hashlib
+import fnmatch
+import threading
 import subprocess
 import argparse
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import raw_repl
+from raw_repl import RawREPL, RawREPLError
+from hot_reload import HotReloader, RELOAD_MODES
+from boot_profiler import BootProfiler
 
 # ======================================== 全局变量 ============================================
 
+# 在设备上运行的清单脚本：递归遍历根目录，用hashlib计算每个文件的SHA-256，
+# 每个文件输出一行"@M<TAB>路径<TAB>大小<TAB>哈希"，一次往返取回整个文件系统的清单
+MANIFEST_SCRIPT = """
+import os,hashlib,binascii
+def _w(d):
+    for e in os.ilistdir(d):
+        p=d+'/'+e[0] if d!='/' else '/'+e[0]
+        if e[1]==0x4000:
+            _w(p)
+            continue
+        h=hashlib.sha256()
+        n=0
+        with open(p,'rb') as f:
+            while True:
+                b=f.read(512)
+                if not b:
+                    break
+                n+=len(b)
+                h.update(b)
+        print('@M\\t%s\\t%d\\t%s'%(p,n,binascii.hexlify(h.digest()).decode()))
+_w('/')
+"""
+
+# 写后校验脚本：只计算指定文件的SHA-256，输出格式与MANIFEST_SCRIPT相同，文件缺失时抛出OSError
+VERIFY_SCRIPT = """
+import hashlib,binascii
+for p in %r:
+    h=hashlib.sha256()
+    n=0
+    with open(p,'rb') as f:
+        while True:
+            b=f.read(512)
+            if not b:
+                break
+            n+=len(b)
+            h.update(b)
+    print('@M\\t%%s\\t%%d\\t%%s'%%(p,n,binascii.hexlify(h.digest()).decode()))
+"""
+
+# 单次mpremote调用中串联的fs cp命令数，避免命令行过长（Windows上限约32K字符）
+CP_BATCH = 40
+
+# 可选的传输方式：auto在安装了pyserial时使用raw，否则使用mpremote
+TRANSPORTS = ("auto", "raw", "mpremote")
+
 # ======================================== 功能函数 ============================================
 
+def parse_manifest(output: str) -> dict[str, tuple[int, str]]:
+    """
+    解析MANIFEST_SCRIPT的输出，忽略"@M"开头以外的行。
+
+    Args:
+        output: 设备端脚本的标准输出。
+
+    Returns:
+        dict[str, tuple[int, str]]: 以去掉开头"/"的路径为键、(大小, 十六进制SHA-256)为值的字典。
+
+    ==========================================
+
+    Parse the output of MANIFEST_SCRIPT, ignoring lines that do not start with "@M".
+
+    Args:
+        output: Stdout of the device-side script.
+
+    Returns:
+        dict[str, tuple[int, str]]: Dict keyed by path without the leading "/", with (size, hex SHA-256) values.
+    """
+    manifest = {}
+    for line in output.splitlines():
+        parts = line.rstrip("\r").split("\t")
+        if len(parts) == 4 and parts[0] == "@M":
+            manifest[parts[1].lstrip("/")] = (int(parts[2]), parts[3])
+    return manifest
+
+
 # ======================================== 自定义类 ============================================
 
 
 class MPYDeployer:
     """
-    MPY部署器类，Windows系统专用工具，用于通过mpremote将mpy文件及目录部署到MCU根目录。
+    MPY部署器类，Windows系统专用工具，用于通过mpremote或raw REPL串口会话将mpy文件及目录部署到MCU根目录。
 
     该类封装了与MCU设备的交互流程，包括列出可用串口设备、用户选择目标设备、部署单个mpy文件、
     部署整个目录结构以及查看MCU上的文件列表等核心功能。通过标准化的路径处理和命令调用，
@@ -32,22 +116,33 @@ class MPYDeployer:
         source_dir (Path): 源mpy文件及目录所在的绝对路径，默认为"..\\build\\firmware_mpy"。
         verbose (bool): 是否开启详细输出模式，True为开启，False为关闭。
         device_port (str | None): 目标MCU的串口端口号（如COM3），初始为None，需通过选择或指定获取。
+        transport (str): 实际使用的传输方式，"raw"（单次raw REPL会话）或"mpremote"（每个操作一次mpremote调用）。
+        compress (bool): 是否压缩传输（仅raw传输），设备端用deflate模块解压。
 
     Methods:
-        __init__(source_dir: str = "..\\build\\firmware_mpy", verbose: bool = False) -> None: 初始化部署器，验证源目录并输出基本信息。
+        __init__(source_dir: str = "..\\build\\firmware_mpy", verbose: bool = False, transport: str = "auto", compress: bool = False) -> None: 初始化部署器，验证源目录并输出基本信息。
         list_available_devices() -> list[dict[str, str]]: 列出系统中所有可用的串口设备，返回包含端口和描述的字典列表。
         select_device() -> str | None: 引导用户选择目标设备，支持手动选择或自动选择第一个设备。
         deploy_directories_to_root() -> bool: 将源目录下所有子目录部署到MCU根目录，返回是否全部部署成功。
         list_remote_files() -> bool: 列出MCU根目录下的所有文件及目录，返回是否执行成功。
+        build_local_manifest() -> dict[str, tuple[int, str]]: 计算源目录中每个文件的大小与SHA-256。
+        fetch_remote_manifest(session: RawREPL | None = None) -> dict[str, tuple[int, str]] | None: 在设备上计算每个文件的大小与SHA-256，一次往返取回。
+        diff_manifests(local, remote, keep=()) -> tuple[list[str], list[str]]: 比较本地与设备清单，返回需上传与需删除的文件。
+        plan_dirs(local, upload, remove) -> tuple[list[str], list[str]]: 计算需创建的目录与删除文件后可删除的空目录。
+        apply_sync(session, local, upload, remove, verify=False, progress=None) -> None: 在raw REPL会话中执行同步，可选写后校验。
+        sync_to_device(delete: bool = True, keep: tuple[str, ...] = (), verify: bool = False) -> bool: 增量部署，只上传新增或修改的文件并删除设备上的多余文件。
 
     Notes:
         1. 依赖mpremote工具，需确保其已安装并添加到系统环境变量中。
         2. 部署目录时会使用递归复制（-r参数），确保子目录结构完整同步。
         3. 所有命令执行设有超时限制（文件30秒，目录60秒），避免无限阻塞。
+        4. 增量部署在一次mpremote会话中串联建目录、删除与多个fs cp命令，文件内容以SHA-256判断是否变化。
+        5. raw传输只打开串口一次，清单查询、建目录、删除、写文件与最后的软复位都在同一raw REPL会话中完成，需安装pyserial。
 
     ==========================================
 
-    MPY Deployer class, a Windows-specific tool for deploying mpy files and directories to MCU root directory via mpremote.
+    MPY Deployer class, a Windows-specific tool for deploying mpy files and directories to MCU root directory via mpremote
+    or a raw REPL serial session.
 
     This class encapsulates the interaction process with MCU devices, including listing available serial port devices,
     guiding users to select target devices, deploying individual mpy files, deploying entire directory structures,
@@ -59,22 +154,33 @@ class MPYDeployer:
         source_dir (Path): Absolute path of the source mpy files and directories, default is "..\\build\\firmware_mpy".
         verbose (bool): Whether to enable verbose output mode, True for enabled, False for disabled.
         device_port (str | None): Serial port number of the target MCU (e.g., COM3), initially None, obtained via selection or specification.
+        transport (str): Transport in use, "raw" (one raw REPL session) or "mpremote" (one mpremote call per operation).
+        compress (bool): Whether to compress transfers (raw transport only); the device inflates with the deflate module.
 
     Methods:
-        __init__(source_dir: str = "..\\build\\firmware_mpy", verbose: bool = False) -> None: Initialize the deployer, verify the source directory and output basic information.
+        __init__(source_dir: str = "..\\build\\firmware_mpy", verbose: bool = False, transport: str = "auto", compress: bool = False) -> None: Initialize the deployer, verify the source directory and output basic information.
         list_available_devices() -> list[dict[str, str]]: List all available serial port devices in the system, return a list of dicts containing port and description.
         select_device() -> str | None: Guide users to select the target device, supporting manual selection or automatic selection of the first device.
         deploy_directories_to_root() -> bool: Deploy all subdirectories in the source directory to MCU root directory, return whether all deployments are successful.
         list_remote_files() -> bool: List all files and directories in the MCU root directory, return whether the execution is successful.
+        build_local_manifest() -> dict[str, tuple[int, str]]: Compute the size and SHA-256 of every file in the source directory.
+        fetch_remote_manifest(session: RawREPL | None = None) -> dict[str, tuple[int, str]] | None: Compute the size and SHA-256 of every file on the device, fetched in one round trip.
+        diff_manifests(local, remote, keep=()) -> tuple[list[str], list[str]]: Compare the local and device manifests, return the files to upload and to delete.
+        plan_dirs(local, upload, remove) -> tuple[list[str], list[str]]: Compute the directories to create and the empty directories to remove after deleting files.
+        apply_sync(session, local, upload, remove, verify=False, progress=None) -> None: Run a sync in a raw REPL session, optionally verifying after writing.
+        sync_to_device(delete: bool = True, keep: tuple[str, ...] = (), verify: bool = False) -> bool: Delta deploy: upload only new or changed files and delete extra files on the device.
 
     Notes:
         1. Depends on the mpremote tool, which must be installed and added to the system environment variables.
         2. Recursive copy (-r parameter) is used when deploying directories to ensure complete synchronization of subdirectory structures.
         3. All command executions have timeout limits (30s for files, 60s for directories) to avoid infinite blocking.
+        4. Delta deploy chains mkdirs, deletions and several fs cp commands in one mpremote session and uses SHA-256 to detect changed files.
+        5. The raw transport opens the port once; manifest queries, mkdirs, deletions, file writes and the final soft reset all happen in one raw REPL session. Requires pyserial.
     """
 
     def __init__(
-        self, source_dir: str = "../build/firmware_mpy", verbose: bool = False
+        self, source_dir: str = "../build/firmware_mpy", verbose: bool = False, transport: str = "auto",
+        compress: bool = False,
     ):
         """
         初始化MPY部署器实例，完成源目录路径规范化及有效性校验。
@@ -82,9 +188,12 @@ class MPYDeployer:
         Args:
             source_dir: 源mpy文件及目录的路径字符串，默认为"..\\build\\firmware_mpy"。
             verbose: 是否开启详细输出模式，True显示详细日志，False仅显示关键信息。
+            transport: 传输方式，"auto"（安装了pyserial时用raw，否则用mpremote）、"raw"或"mpremote"。
+            compress: 是否压缩传输，需要raw传输；设备没有deflate模块时自动回退为原样传输。
 
         Raises:
             FileNotFoundError: 若指定的源目录不存在。
+            ValueError: 传输方式无效，指定了"raw"但未安装pyserial，或在mpremote传输下要求压缩。
 
         ==========================================
 
@@ -93,9 +202,14 @@ class MPYDeployer:
         Args:
             source_dir: Path string of the source mpy files and directories, default is "..\\build\\firmware_mpy".
             verbose: Whether to enable verbose output mode, True for detailed logs, False for only key information.
+            transport: Transport, "auto" (raw when pyserial is installed, mpremote otherwise), "raw" or "mpremote".
+            compress: Whether to compress transfers; needs the raw transport and falls back to plain transfers when
+                the device lacks the deflate module.
 
         Raises:
             FileNotFoundError: If the specified source directory does not exist.
+            ValueError: Invalid transport, "raw" requested without pyserial installed, or compression requested with
+                the mpremote transport.
         """
         self.source_dir = Path(source_dir).resolve()
         self.verbose = verbose
@@ -105,8 +219,68 @@ class MPYDeployer:
         if not self.source_dir.exists():
             raise FileNotFoundError(f"源目录不存在: {self.source_dir}")
 
+        if transport not in TRANSPORTS:
+            raise ValueError(f"无效的传输方式: {transport}，可选 {', '.join(TRANSPORTS)}")
+        if transport == "auto":
+            transport = "raw" if raw_repl.serial is not None else "mpremote"
+        elif transport == "raw" and raw_repl.serial is None:
+            raise ValueError("raw传输需要pyserial，请先执行 pip install pyserial")
+        self.transport = transport
+        if compress and transport != "raw":
+            raise ValueError("压缩传输需要raw传输（pip install pyserial）")
+        self.compress = compress
+
         # 输出源目录的绝对路径
-        print(f"初始化部署器，源目录绝对路径: {self.source_dir}")
+        print(f"初始化部署器，源目录绝对路径: {self.source_dir}，传输方式: {self.transport}")
+
+    def _open_session(self) -> RawREPL:
+        """
+        打开raw REPL会话，端口为"auto"时查找第一个MicroPython USB串口设备。
+
+        Returns:
+            RawREPL: 已进入raw REPL的会话。
+
+        Raises:
+            RawREPLError: 未找到设备或设备无响应。
+
+        ==========================================
+
+        Open a raw REPL session; when the port is "auto", use the first MicroPython USB serial device.
+
+        Returns:
+            RawREPL: Session already in the raw REPL.
+
+        Raises:
+            RawREPLError: No device found or the device does not respond.
+        """
+        port = self.device_port
+        if port == "auto":
+            port = RawREPL.find_port()
+            if port is None:
+                raise RawREPLError("未找到MicroPython设备")
+        session = RawREPL(port)
+        try:
+            return session.open()
+        except (OSError, RawREPLError) as e:
+            session.close()
+            raise RawREPLError(f"无法打开串口 {port}: {e}") from e
+
+    def _print_progress(self, done: int, total: int, path: str) -> None:
+        if self.verbose:
+            print(f"✓ [{done}/{total}] {path}")
+
+    def _report_compression(self, session: RawREPL, total: int, log=print) -> None:
+        if not self.compress or not total:
+            return
+        if session.has_deflate is False:
+            log("设备没有deflate模块，已回退为原样传输")
+        else:
+            log(f"压缩传输: 原始 {total} 字节，节省 {session.bytes_saved} 字节（{session.bytes_saved * 100 // total}%）")
+
+    def _report_session(self, session: RawREPL, log=print) -> None:
+        if self.verbose:
+            mode = "raw-paste" if session.use_raw_paste else "raw"
+            log(f"会话统计: {mode}模式，执行 {session.round_trips} 次，发送 {session.bytes_sent} 字节")
 
     def list_available_devices(self) -> list[dict[str, str]]:
         """
@@ -238,6 +412,23 @@ class MPYDeployer:
 
         print(f"开始部署目录到设备根目录: {self.device_port}")
 
+        if self.transport == "raw":
+            files = sorted(path.relative_to(self.source_dir) for path in self.source_dir.rglob("*") if path.is_file())
+            dirs = {f"/{parent.as_posix()}" for path in files for parent in list(path.parents)[:-1]}
+            try:
+                with self._open_session() as session:
+                    session.fs_mkdirs(sorted(dirs))
+                    items = [(f"/{path.as_posix()}", (self.source_dir / path).read_bytes()) for path in files]
+                    session.fs_write_many(items, progress=self._print_progress, compress=self.compress)
+                    self._report_compression(session, sum(len(data) for _, data in items))
+                    self._report_session(session)
+                    session.soft_reset()
+            except RawREPLError as e:
+                print(f"✗ 部署失败: {e}")
+                return False
+            print(f"✓ 目录部署完成，共 {len(files)} 个文件，设备已软复位")
+            return True
+
         try:
             # 遍历目录下的所有文件和文件夹
             for item in self.source_dir.iterdir():
@@ -291,6 +482,15 @@ class MPYDeployer:
             if not self.device_port:
                 return False
 
+        if self.transport == "raw":
+            manifest = self.fetch_remote_manifest()
+            if manifest is None:
+                return False
+            print("MCU上的文件:")
+            for path, (size, _) in manifest.items():
+                print(f"{size:>9} {path}")
+            return True
+
         try:
             cmd = ["mpremote", "connect", self.device_port, "fs", "ls", "-r", ":"]
 
@@ -308,6 +508,635 @@ class MPYDeployer:
             print(f"错误: {e}")
             return False
 
+    def build_local_manifest(self) -> dict[str, tuple[int, str]]:
+        """
+        计算源目录中每个文件的大小与SHA-256，作为与设备比较的本地清单。
+
+        Returns:
+            dict[str, tuple[int, str]]: 以相对源目录的POSIX路径为键、(大小, 十六进制SHA-256)为值的字典。
+
+        ==========================================
+
+        Compute the size and SHA-256 of every file in the source directory as the local manifest to compare with the device.
+
+        Returns:
+            dict[str, tuple[int, str]]: Dict keyed by POSIX path relative to the source directory, with (size, hex SHA-256) values.
+        """
+        manifest = {}
+        for path in sorted(self.source_dir.rglob("*")):
+            if path.is_file():
+                data = path.read_bytes()
+                manifest[path.relative_to(self.source_dir).as_posix()] = (len(data), hashlib.sha256(data).hexdigest())
+        return manifest
+
+    def fetch_remote_manifest(self, session: RawREPL | None = None) -> dict[str, tuple[int, str]] | None:
+        """
+        在设备上运行MANIFEST_SCRIPT，一次往返取回设备文件系统中每个文件的大小与SHA-256。
+
+        Args:
+            session: 已打开的raw REPL会话。为None时raw传输单独打开一次会话并在结束后软复位，mpremote传输调用mpremote exec。
+
+        Returns:
+            dict[str, tuple[int, str]] | None: 与build_local_manifest()格式相同的设备清单（路径去掉开头的"/"），失败时返回None。
+
+        ==========================================
+
+        Run MANIFEST_SCRIPT on the device and fetch the size and SHA-256 of every file on its filesystem in one round trip.
+
+        Args:
+            session: Open raw REPL session. When None the raw transport opens a session of its own and soft-resets
+                afterwards, and the mpremote transport calls mpremote exec.
+
+        Returns:
+            dict[str, tuple[int, str]] | None: Device manifest in the same format as build_local_manifest() (paths without the leading "/"), None on failure.
+        """
+        if session is not None or self.transport == "raw":
+            try:
+                if session is not None:
+                    return parse_manifest(session.exec(MANIFEST_SCRIPT, timeout=60).decode())
+                with self._open_session() as session:
+                    manifest = parse_manifest(session.exec(MANIFEST_SCRIPT, timeout=60).decode())
+                    session.soft_reset()
+                    return manifest
+            except RawREPLError as e:
+                print(f"✗ 获取设备文件清单失败: {e}")
+                return None
+
+        try:
+            result = subprocess.run(
+                ["mpremote", "connect", self.device_port, "exec", MANIFEST_SCRIPT],
+                capture_output=True,
+                text=True,
+                timeout=60,
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+            print(f"✗ 获取设备文件清单失败: {e}")
+            return None
+
+        if result.returncode != 0:
+            print(f"✗ 获取设备文件清单失败: {result.stderr}")
+            return None
+
+        return parse_manifest(result.stdout)
+
+    @staticmethod
+    def diff_manifests(
+        local: dict[str, tuple[int, str]],
+        remote: dict[str, tuple[int, str]],
+        keep: tuple[str, ...] = (),
+    ) -> tuple[list[str], list[str]]:
+        """
+        比较本地与设备清单：本地新增或大小、哈希不同的文件需要上传，设备上有而本地没有的文件需要删除。
+
+        Args:
+            local: 本地清单。
+            remote: 设备清单。
+            keep: 不删除的设备文件的通配模式（fnmatch），如"data/*"。
+
+        Returns:
+            tuple[list[str], list[str]]: (需上传的文件, 需删除的文件)，均为相对路径并按路径排序。
+
+        ==========================================
+
+        Compare the local and device manifests: files that are new locally or differ in size or hash must be uploaded,
+        files present on the device but not locally must be deleted.
+
+        Args:
+            local: Local manifest.
+            remote: Device manifest.
+            keep: fnmatch patterns of device files never to delete, such as "data/*".
+
+        Returns:
+            tuple[list[str], list[str]]: (files to upload, files to delete), relative paths sorted by path.
+        """
+        upload = sorted(path for path, entry in local.items() if remote.get(path) != entry)
+        delete = sorted(
+            path for path in remote
+            if path not in local and not any(fnmatch.fnmatch(path, pattern) for pattern in keep)
+        )
+        return upload, delete
+
+    @staticmethod
+    def plan_dirs(
+        local: dict[str, tuple[int, str]], upload: list[str], remove: list[str]
+    ) -> tuple[list[str], list[str]]:
+        """
+        计算上传前需要创建的目录，以及删除文件后可能变空、本地也不存在的目录。
+
+        Args:
+            local: 本地清单。
+            upload: 需上传的文件。
+            remove: 需删除的文件。
+
+        Returns:
+            tuple[list[str], list[str]]: (需创建的目录，由浅到深, 可删除的目录，由深到浅)，均为相对路径。
+
+        ==========================================
+
+        Compute the directories to create before uploading and the directories that may become empty after deleting
+        files and do not exist locally.
+
+        Args:
+            local: Local manifest.
+            upload: Files to upload.
+            remove: Files to delete.
+
+        Returns:
+            tuple[list[str], list[str]]: (directories to create, shallowest first, directories to remove, deepest
+            first), relative paths.
+        """
+        local_dirs = {str(Path(path).parent.as_posix()) for path in local}
+        new_dirs = set()
+        for path in upload:
+            parent = Path(path).parent
+            while parent.as_posix() != ".":
+                new_dirs.add(parent.as_posix())
+                parent = parent.parent
+        old_dirs = set()
+        for path in remove:
+            parent = Path(path).parent
+            while parent.as_posix() != ".":
+                if parent.as_posix() not in local_dirs:
+                    old_dirs.add(parent.as_posix())
+                parent = parent.parent
+        return (sorted(new_dirs, key=lambda d: (d.count("/"), d)),
+                sorted(old_dirs, key=lambda d: (-d.count("/"), d)))
+
+    def apply_sync(
+        self, session: RawREPL, local: dict[str, tuple[int, str]], upload: list[str], remove: list[str],
+        verify: bool = False, progress=None,
+    ) -> None:
+        """
+        在raw REPL会话中执行同步：建目录、删除文件与空目录、写入文件，可选写后校验。不软复位。
+
+        Args:
+            session: 已打开的raw REPL会话。
+            local: 本地清单。
+            upload: 需上传的文件。
+            remove: 需删除的文件。
+            verify: 是否在写入后重新计算已上传文件的SHA-256并与本地比较。
+                压缩传输（compress属性）时节省的字节数累计在session.bytes_saved中。
+            progress: 每个文件写完后调用的回调，参数为(已完成数, 总数, 路径)，可为None。
+
+        Raises:
+            RawREPLError: 设备端出错，或校验发现文件与本地不一致。
+
+        ==========================================
+
+        Run a sync in a raw REPL session: create directories, delete files and empty directories, write files and
+        optionally verify after writing. Does not soft-reset.
+
+        Args:
+            session: Open raw REPL session.
+            local: Local manifest.
+            upload: Files to upload.
+            remove: Files to delete.
+            verify: Whether to recompute the SHA-256 of uploaded files after writing and compare with the local ones.
+                With compressed transfers (the compress attribute) the saved bytes accumulate in session.bytes_saved.
+            progress: Callback after each file, called with (done, total, path), may be None.
+
+        Raises:
+            RawREPLError: Device-side error, or verification found a file that differs from the local one.
+        """
+        new_dirs, old_dirs = self.plan_dirs(local, upload, remove)
+        # 先删除再建目录：设备上的旧文件可能与新目录同名
+        session.fs_remove([f"/{path}" for path in remove], [f"/{d}" for d in old_dirs])
+        session.fs_mkdirs([f"/{d}" for d in new_dirs])
+        session.fs_write_many(
+            [(f"/{path}", (self.source_dir / path).read_bytes()) for path in upload],
+            progress=progress,
+            compress=self.compress,
+        )
+        if verify and upload:
+            written = parse_manifest(session.exec(VERIFY_SCRIPT % [f"/{path}" for path in upload], timeout=60).decode())
+            bad = [path for path in upload if written.get(path) != local[path]]
+            if bad:
+                raise RawREPLError(f"写后校验失败: {', '.join(bad)}")
+
+    def sync_to_device(self, delete: bool = True, keep: tuple[str, ...] = (), verify: bool = False) -> bool:
+        """
+        增量部署：取回设备清单与本地清单比较，只上传新增或修改的文件，并删除设备上本地已不存在的文件。
+
+        建目录与删除文件合并为一段在设备上执行的脚本，与多个fs cp命令用"+"串联在同一次mpremote会话中执行，
+        每次最多串联CP_BATCH个文件。删除文件后，本地不存在的空目录也会被删除。
+        raw传输下清单查询、建目录、删除与写文件都在同一raw REPL会话中完成，最后软复位设备。
+
+        Args:
+            delete: 是否删除设备上本地已不存在的文件。
+            keep: 不删除的设备文件的通配模式（fnmatch）。
+            verify: 是否写后校验：重新计算已上传文件的SHA-256并与本地比较。
+
+        Returns:
+            bool: True表示同步成功（包括无需同步），False表示失败。
+
+        ==========================================
+
+        Delta deploy: fetch the device manifest and compare it with the local one, upload only new or changed files,
+        and delete files on the device that no longer exist locally.
+
+        Mkdirs and deletions are merged into one script executed on the device and chained with several fs cp commands
+        via "+" in the same mpremote session, at most CP_BATCH files per session. After deleting files, empty directories
+        that do not exist locally are removed too. With the raw transport the manifest query, mkdirs, deletions and file
+        writes all happen in one raw REPL session, followed by a soft reset of the device.
+
+        Args:
+            delete: Whether to delete device files that no longer exist locally.
+            keep: fnmatch patterns of device files never to delete.
+            verify: Whether to verify after writing: recompute the SHA-256 of uploaded files and compare with the local ones.
+
+        Returns:
+            bool: True if the sync succeeded (including nothing to do), False on failure.
+        """
+        if not self.device_port:
+            self.device_port = self.select_device()
+            if not self.device_port:
+                return False
+
+        local = self.build_local_manifest()
+        session = None
+        if self.transport == "raw":
+            try:
+                session = self._open_session()
+            except RawREPLError as e:
+                print(f"✗ 同步失败: {e}")
+                return False
+        try:
+            return self._sync(local, session, delete, keep, verify) is not None
+        except RawREPLError as e:
+            print(f"✗ 同步失败: {e}")
+            return False
+        finally:
+            if session is not None:
+                session.close()
+
+    def _sync(
+        self, local: dict[str, tuple[int, str]], session: RawREPL | None, delete: bool, keep: tuple[str, ...],
+        verify: bool, log=print, progress=None,
+    ) -> tuple[list[str], list[str]] | None:
+        """
+        增量同步的公共流程，sync_to_device与FleetDeployer共用：取回设备清单、比较、写入并软复位。
+
+        Args:
+            local: 本地清单。
+            session: 已打开的raw REPL会话，为None时使用mpremote传输。
+            delete: 是否删除设备上本地已不存在的文件。
+            keep: 不删除的设备文件通配模式。
+            verify: 是否写后校验。
+            log: 输出一行信息的函数，默认为print。
+            progress: 每个文件写完后调用的回调，默认为_print_progress。
+
+        Returns:
+            tuple[list[str], list[str]] | None: 已上传与已删除的文件；mpremote传输失败时返回None。
+
+        Raises:
+            RawREPLError: raw传输下设备端出错或写后校验失败。
+
+        ==========================================
+
+        Shared delta sync flow used by sync_to_device and FleetDeployer: fetch the device manifest, compare, write and
+        soft-reset.
+
+        Args:
+            local: Local manifest.
+            session: Open raw REPL session; None to use the mpremote transport.
+            delete: Whether to delete device files that no longer exist locally.
+            keep: fnmatch patterns of device files never to delete.
+            verify: Whether to verify after writing.
+            log: Function printing one line of output, print by default.
+            progress: Callback after each file, _print_progress by default.
+
+        Returns:
+            tuple[list[str], list[str]] | None: Uploaded and deleted files; None when the mpremote transport fails.
+
+        Raises:
+            RawREPLError: Device-side error or failed verification with the raw transport.
+        """
+        if session is not None:
+            # 会话中的错误交给调用方处理（报告或重试）
+            remote = parse_manifest(session.exec(MANIFEST_SCRIPT, timeout=60).decode())
+        else:
+            remote = self.fetch_remote_manifest()
+            if remote is None:
+                return None
+
+        upload, remove = self.diff_manifests(local, remote, keep)
+        if not delete:
+            remove = []
+
+        log(f"设备文件 {len(remote)} 个，本地文件 {len(local)} 个：上传 {len(upload)} 个，删除 {len(remove)} 个")
+        if self.verbose:
+            for path in upload:
+                log(f"  + {path}")
+            for path in remove:
+                log(f"  - {path}")
+        if not upload and not remove:
+            log("✓ 设备已是最新，无需部署")
+            if session is not None:
+                # 打开会话时已中断固件，软复位让它重新运行
+                session.soft_reset()
+            return upload, remove
+
+        if session is not None:
+            self.apply_sync(session, local, upload, remove, verify, progress=progress or self._print_progress)
+            self._report_compression(session, sum(local[path][0] for path in upload), log)
+            self._report_session(session, log)
+            session.soft_reset()
+        else:
+            if not self._sync_mpremote(upload, remove, *self.plan_dirs(local, upload, remove)):
+                return None
+            if verify:
+                remote = self.fetch_remote_manifest()
+                bad = [path for path in upload if remote is None or remote.get(path) != local[path]]
+                if bad:
+                    log(f"✗ 写后校验失败: {', '.join(bad)}")
+                    return None
+        if verify:
+            log(f"✓ 写后校验通过（{len(upload)} 个文件）")
+
+        saved = sum(size for path, (size, _) in local.items() if path not in upload)
+        log(f"✓ 增量部署完成，跳过未修改的 {len(local) - len(upload)} 个文件（{saved} 字节）")
+        return upload, remove
+
+    def _sync_mpremote(self, upload: list[str], remove: list[str], new_dirs: list[str], old_dirs: list[str]) -> bool:
+        lines = ["import os"]
+        for path in remove:
+            lines.append(f"os.remove('/{path}')")
+        for d in old_dirs:
+            lines.append(f"try:\n    os.rmdir('/{d}')\nexcept OSError:\n    pass")
+        for d in new_dirs:
+            lines.append(f"try:\n    os.mkdir('/{d}')\nexcept OSError:\n    pass")
+        prepare = ["exec", "\n".join(lines)] if len(lines) > 1 else []
+
+        try:
+            for start in range(0, max(len(upload), 1), CP_BATCH):
+                cmd = ["mpremote", "connect", self.device_port]
+                if start == 0 and prepare:
+                    cmd.extend(prepare)
+                for path in upload[start:start + CP_BATCH]:
+                    if len(cmd) > 3:
+                        cmd.append("+")
+                    cmd.extend(["fs", "cp", str(self.source_dir / path), f":{path}"])
+                if len(cmd) == 3:
+                    break
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+                if result.returncode != 0:
+                    print(f"✗ 同步失败: {result.stderr}")
+                    return False
+                if self.verbose:
+                    print(f"✓ 已上传 {min(start + CP_BATCH, len(upload))}/{len(upload)}")
+        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+            print(f"✗ 同步失败: {e}")
+            return False
+        return True
+
+
+class FleetDeployer:
+    """
+    批量部署器：把同一份构建结果并发同步到多块开发板。
+
+    每块开发板在线程池中各用一个raw REPL会话执行增量同步（复用MPYDeployer.sync_to_device的清单比较与写入流程），
+    本地清单只计算一次。串口读写期间线程不占用GIL，因此部署N块板的耗时接近部署一块板。失败的设备按重试次数
+    重新连接并再次同步（已写入的文件因哈希相同会被跳过）；任何异常都只记入该设备的结果，不中断其他设备，
+    全部结束后输出汇总表。
+
+    Attributes:
+        deployer (MPYDeployer): 提供源目录、清单与同步流程的单设备部署器。
+        ports (list[str]): 目标串口列表。
+        jobs (int): 线程数，0表示每个设备一个线程。
+        retries (int): 每个设备失败后的重试次数。
+        verify (bool): 是否写后校验。
+        delete (bool): 是否删除设备上本地已不存在的文件。
+        keep (tuple[str, ...]): 不删除的设备文件通配模式。
+
+    Methods:
+        resolve_ports(specs, list_devices) -> list[str]: 把端口列表、通配模式或"all"展开为去重后的端口列表。
+        run() -> list[dict]: 并发部署所有设备，返回每个设备的结果。
+        format_summary(results: list[dict]) -> str: 把run()的结果格式化为汇总表。
+
+    ==========================================
+
+    Fleet deployer: syncs one build to many boards concurrently.
+
+    Every board gets its own raw REPL session in a thread pool and runs the delta sync shared with
+    MPYDeployer.sync_to_device (manifest comparison and writes); the local manifest is computed once. Threads release
+    the GIL while waiting on the serial ports, so deploying N boards takes about as long as deploying one. Failed
+    devices reconnect and sync again up to the retry count (files already written are skipped because their hashes
+    match). Any exception is recorded in that device's result without stopping the other devices, and a summary
+    table is printed at the end.
+
+    Attributes:
+        deployer (MPYDeployer): Single-device deployer providing the source directory, manifests and sync steps.
+        ports (list[str]): Target serial ports.
+        jobs (int): Number of threads, 0 for one thread per device.
+        retries (int): Retries per device after a failure.
+        verify (bool): Whether to verify after writing.
+        delete (bool): Whether to delete device files that no longer exist locally.
+        keep (tuple[str, ...]): fnmatch patterns of device files never to delete.
+
+    Methods:
+        resolve_ports(specs, list_devices) -> list[str]: Expand port lists, glob patterns or "all" into a deduplicated port list.
+        run() -> list[dict]: Deploy to all devices concurrently and return one result per device.
+        format_summary(results: list[dict]) -> str: Format the results of run() as a summary table.
+    """
+
+    def __init__(
+        self, deployer: MPYDeployer, ports: list[str], jobs: int = 0, retries: int = 2, verify: bool = False,
+        delete: bool = True, keep: tuple[str, ...] = (),
+    ):
+        """
+        初始化批量部署器。
+
+        Args:
+            deployer: 单设备部署器，传输方式须为raw。
+            ports: 目标串口列表。
+            jobs: 线程数，0表示每个设备一个线程。
+            retries: 每个设备失败后的重试次数。
+            verify: 是否写后校验。
+            delete: 是否删除设备上本地已不存在的文件。
+            keep: 不删除的设备文件通配模式。
+
+        Raises:
+            ValueError: 部署器未使用raw传输，或端口列表为空。
+
+        ==========================================
+
+        Initialize the fleet deployer.
+
+        Args:
+            deployer: Single-device deployer, must use the raw transport.
+            ports: Target serial ports.
+            jobs: Number of threads, 0 for one thread per device.
+            retries: Retries per device after a failure.
+            verify: Whether to verify after writing.
+            delete: Whether to delete device files that no longer exist locally.
+            keep: fnmatch patterns of device files never to delete.
+
+        Raises:
+            ValueError: The deployer does not use the raw transport, or the port list is empty.
+        """
+        if deployer.transport != "raw":
+            raise ValueError("批量部署需要raw传输（pip install pyserial）")
+        if not ports:
+            raise ValueError("未找到目标设备")
+        self.deployer = deployer
+        self.ports = list(ports)
+        self.jobs = jobs
+        self.retries = retries
+        self.verify = verify
+        self.delete = delete
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def resolve_ports(specs: list[str], list_devices) -> list[str]:
+        """
+        展开端口说明：逗号分隔的端口、通配模式（如/dev/ttyACM*、COM1?，同时匹配已检测到的设备与文件系统中的路径）
+        或"all"（list_devices()返回的全部设备），按出现顺序去重。
+
+        Args:
+            specs: 端口说明列表。
+            list_devices: 返回设备字典列表（含"port"键）的函数，如MPYDeployer.list_available_devices，最多调用一次。
+
+        Returns:
+            list[str]: 端口列表。
+
+        ==========================================
+
+        Expand port specs: comma-separated ports, glob patterns (such as /dev/ttyACM* or COM1?, matched against both
+        detected devices and filesystem paths) or "all" (every device returned by list_devices()), deduplicated in
+        order of appearance.
+
+        Args:
+            specs: Port specs.
+            list_devices: Function returning device dicts with a "port" key, such as
+                MPYDeployer.list_available_devices; called at most once.
+
+        Returns:
+            list[str]: Ports.
+        """
+        detected = None
+        ports = []
+        for spec in specs:
+            for item in (part.strip() for part in spec.split(",")):
+                if not item:
+                    continue
+                if item == "all" or any(c in item for c in "*?["):
+                    if detected is None:
+                        detected = [device["port"] for device in list_devices()]
+                    if item == "all":
+                        matches = detected
+                    else:
+                        matches = sorted(set(fnmatch.filter(detected, item)) | set(glob.glob(item)))
+                else:
+                    matches = [item]
+                for port in matches:
+                    if port not in ports:
+                        ports.append(port)
+        return ports
+
+    def _log(self, port: str, message: str) -> None:
+        with self._lock:
+            print(f"[{port}] {message}", flush=True)
+
+    def _deploy_one(self, port: str, local: dict[str, tuple[int, str]]) -> dict:
+        """
+        对一个设备执行同步，失败时重试，返回结果字典。
+
+        ==========================================
+
+        Sync one device, retrying on failure, and return its result dict.
+        """
+        result = {"port": port, "ok": False, "attempts": 0, "uploaded": 0, "deleted": 0, "bytes": 0, "saved": 0,
+                  "seconds": 0.0, "error": ""}
+        start = time.perf_counter()
+
+        def progress(done: int, total: int, path: str) -> None:
+            if self.deployer.verbose:
+                self._log(port, f"[{done}/{total}] {path}")
+            elif done in (total // 4, total // 2, total * 3 // 4):
+                self._log(port, f"{done * 100 // total}%")
+
+        for attempt in range(1, self.retries + 2):
+            result["attempts"] = attempt
+            if attempt > 1:
+                self._log(port, f"第 {attempt} 次尝试")
+            try:
+                session = RawREPL(port)
+                try:
+                    session.open()
+                    upload, remove = self.deployer._sync(
+                        local, session, self.delete, self.keep, self.verify,
+                        log=lambda message: self._log(port, message), progress=progress,
+                    )
+                finally:
+                    session.close()
+            except Exception as e:
+                # 任何异常（包括struct.error、解码错误等意外错误）只记入该设备的结果，不中断其他设备的部署
+                name = type(e).__qualname__
+                if type(e).__module__ != "builtins":
+                    name = f"{type(e).__module__}.{name}"
+                message = str(e).strip().splitlines()[-1] if str(e).strip() else name
+                if not isinstance(e, (RawREPLError, OSError)) and message != name:
+                    message = f"{name}: {message}"
+                result["error"] = message
+                self._log(port, f"✗ {result['error']}")
+                if attempt <= self.retries:
+                    time.sleep(attempt)
+                continue
+            # 重试时统计的是最后一次尝试实际上传与删除的数量
+            result.update(ok=True, uploaded=len(upload), deleted=len(remove), error="",
+                          bytes=sum(local[path][0] for path in upload), saved=session.bytes_saved)
+            break
+        result["seconds"] = round(time.perf_counter() - start, 2)
+        self._log(port, f"✓ 完成，用时 {result['seconds']} 秒" if result["ok"] else "✗ 放弃")
+        return result
+
+    def run(self) -> list[dict]:
+        """
+        并发部署所有设备。
+
+        Returns:
+            list[dict]: 按ports顺序排列的结果，键为port、ok、attempts、uploaded、deleted、bytes、saved（压缩节省的字节数）、
+                seconds、error。
+
+        ==========================================
+
+        Deploy to all devices concurrently.
+
+        Returns:
+            list[dict]: Results in ports order, with keys port, ok, attempts, uploaded, deleted, bytes, saved (bytes saved
+                by compression), seconds, error.
+        """
+        local = self.deployer.build_local_manifest()
+        workers = self.jobs or len(self.ports)
+        print(f"批量部署到 {len(self.ports)} 个设备，线程数 {workers}，本地文件 {len(local)} 个")
+        results = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self._deploy_one, port, local): port for port in self.ports}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return [results[port] for port in self.ports]
+
+    @staticmethod
+    def format_summary(results: list[dict]) -> str:
+        """
+        把run()的结果格式化为汇总表。
+
+        ==========================================
+
+        Format the results of run() as a summary table.
+        """
+        width = max([len("port")] + [len(r["port"]) for r in results])
+        lines = [f"{'port':<{width}}  {'result':<6} {'tries':>5} {'up':>5} {'del':>5} {'bytes':>9} {'saved':>9} {'sec':>7}  error"]
+        for r in results:
+            lines.append(
+                f"{r['port']:<{width}}  {'OK' if r['ok'] else 'FAIL':<6} {r['attempts']:>5} {r['uploaded']:>5} "
+                f"{r['deleted']:>5} {r['bytes']:>9} {r['saved']:>9} {r['seconds']:>7}  {r['error']}"
+            )
+        failed = sum(1 for r in results if not r["ok"])
+        lines.append(f"成功 {len(results) - failed} 个，失败 {failed} 个")
+        return "\n".join(lines)
+
 
 # ======================================== 初始化配置 ==========================================
 
@@ -315,7 +1144,7 @@ class MPYDeployer:
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
-        description="使用mpremote工具部署mpy文件到MCU根目录",
+        description="使用mpremote工具或raw REPL串口会话部署mpy文件到MCU根目录",
         formatter_class=argparse.RawTextHelpFormatter,
     )
 
@@ -334,15 +1163,116 @@ if __name__ == "__main__":
 
     parser.add_argument("-l", "--list", help="只列出MCU上的文件，不部署", action="store_true")
 
+    parser.add_argument("--sync", help="增量部署：只上传新增或修改的文件，并删除设备上本地已不存在的文件", action="store_true")
+
+    parser.add_argument("--no-delete", help="增量部署时不删除设备上的多余文件", action="store_true")
+
+    parser.add_argument(
+        "--keep",
+        help="增量部署时不删除的设备文件通配模式，可多次指定，如--keep 'data/*'",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+    )
+
+    parser.add_argument(
+        "-z", "--compress", help="压缩传输：主机端deflate压缩，设备端用deflate模块解压（需raw传输）", action="store_true"
+    )
+
+    parser.add_argument("--verify", help="写后校验：重新计算已上传文件的SHA-256并与本地比较", action="store_true")
+
+    parser.add_argument(
+        "--fleet",
+        help="批量部署到多个设备：逗号分隔的端口、通配模式（如'/dev/ttyACM*'）或all，可多次指定",
+        action="append",
+        default=[],
+        metavar="PORTS",
+    )
+
+    parser.add_argument("-j", "--jobs", help="批量部署的线程数，默认每个设备一个线程", type=int, default=0)
+
+    parser.add_argument("--retries", help="批量部署时每个设备失败后的重试次数，默认2次", type=int, default=2)
+
+    parser.add_argument(
+        "--watch",
+        help="监视模式：监视--firmware目录，只重新编译并上传修改的模块，通过保持打开的串口会话热重载（需raw传输）",
+        action="store_true",
+    )
+
+    parser.add_argument("--firmware", help="监视模式的源代码目录，默认为./firmware", default="./firmware")
+
+    parser.add_argument(
+        "--reload",
+        help="监视模式的重载方式：auto（默认，叶子模块停止定时器与引脚中断后重新导入，其他情况软复位）或reset（总是软复位）",
+        choices=RELOAD_MODES,
+        default="auto",
+    )
+
+    parser.add_argument(
+        "--profile-boot",
+        help="启动分析：在设备上重新运行boot.py与main.py，记录每个模块的导入耗时与堆内存占用并输出报告（需raw传输）",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--profile-time", help="启动分析时运行boot.py与main.py的秒数，默认6秒", type=float, default=6.0
+    )
+
+    parser.add_argument("--profile-html", help="启动分析时另外写出HTML火焰图到该文件")
+
+    parser.add_argument(
+        "--transport",
+        help="传输方式：auto（默认，安装了pyserial时用raw）、raw（单次raw REPL会话）或mpremote",
+        choices=TRANSPORTS,
+        default="auto",
+    )
+
     args = parser.parse_args()
 
     try:
-        deployer = MPYDeployer(source_dir=args.source, verbose=args.verbose)
+        if args.watch:
+            # 监视模式先完整编译一次，输出目录可以尚不存在
+            Path(args.source).mkdir(parents=True, exist_ok=True)
+        deployer = MPYDeployer(
+            source_dir=args.source, verbose=args.verbose, transport=args.transport, compress=args.compress
+        )
 
         if args.device:
             deployer.device_port = args.device
-        if args.list:
+        if args.watch:
+            deployer.device_port = deployer.device_port or deployer.select_device()
+            if not deployer.device_port:
+                sys.exit(1)
+            HotReloader(deployer, args.firmware, reload=args.reload).run()
+        elif args.profile_boot:
+            profiler = BootProfiler(deployer, duration=args.profile_time)
+            profiler.run()
+            print(profiler.format_table())
+            print()
+            print(profiler.format_flame())
+            if args.profile_html:
+                profiler.write_html(args.profile_html)
+                print(f"火焰图已写入 {args.profile_html}")
+        elif args.fleet:
+            fleet = FleetDeployer(
+                deployer,
+                FleetDeployer.resolve_ports(args.fleet, deployer.list_available_devices),
+                jobs=args.jobs,
+                retries=args.retries,
+                verify=args.verify,
+                delete=not args.no_delete,
+                keep=tuple(args.keep),
+            )
+            results = fleet.run()
+            print(FleetDeployer.format_summary(results))
+            if not all(r["ok"] for r in results):
+                sys.exit(1)
+        elif args.list:
             deployer.list_remote_files()
+        elif args.sync:
+            print("开始增量部署：比较设备文件清单 -> 上传修改的文件 ...")
+            if not deployer.sync_to_device(delete=not args.no_delete, keep=tuple(args.keep), verify=args.verify):
+                sys.exit(1)
         else:
             print("开始部署：部署目录 -> 根目录 ...")
             deployer.deploy_directories_to_root()
@@ -25,6 +25,10 @@ GC_THRESHOLD_BYTES = 100000
 # task_err_callback 在多次发生时的打印间隔（防止刷屏）
 ERROR_REPEAT_DELAY_S = 1.0
 
+# 调度器无节拍低功耗模式：0 关闭；1 空闲时 machine.idle()；2 空闲时 machine.lightsleep()
+# 注意：lightsleep 期间 USB 与部分外设时钟会暂停，调试时建议使用 1
+TICKLESS_MODE = 1
+
 # ======================================== 功能函数 ============================================
 
 # ======================================== 自定义类 ============================================
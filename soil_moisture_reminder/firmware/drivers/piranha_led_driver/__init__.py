@@ -11,8 +11,7 @@
 
 # ======================================== 导入相关模块 =========================================
 
-# 从 code/piranha_led.py 导入类和常量
-from .code.piranha_led import PiranhaLED, POLARITY_CATHODE, POLARITY_ANODE
+# 导出接口在首次访问时才导入对应子模块，见 __getattr__
 
 # ======================================== 全局变量 ============================================
 
@@ -21,6 +20,19 @@ __all__ = ["PiranhaLED", "POLARITY_CATHODE", "POLARITY_ANODE"]
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问导出名称时才导入定义它的子模块，并缓存到包的命名空间中。"""
+    if name == "PiranhaLED":
+        from .code.piranha_led import PiranhaLED as value
+    elif name == "POLARITY_CATHODE":
+        from .code.piranha_led import POLARITY_CATHODE as value
+    elif name == "POLARITY_ANODE":
+        from .code.piranha_led import POLARITY_ANODE as value
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ==========================================
@@ -8,14 +8,25 @@
 
 # ======================================== 导入相关模块 =========================================
 
-from .code.ssd1306 import SSD1306_I2C, SSD1306
+# 导出接口在首次访问时才导入对应子模块，见 __getattr__
 
 # ======================================== 全局变量 ============================================
 
-__all__ = ['SSD1306_I2C', SSD1306]
+__all__ = ['SSD1306_I2C', 'SSD1306']
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问导出名称时才导入定义它的子模块，并缓存到包的命名空间中。"""
+    if name == "SSD1306_I2C":
+        from .code.ssd1306 import SSD1306_I2C as value
+    elif name == "SSD1306":
+        from .code.ssd1306 import SSD1306 as value
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ===========================================
@@ -260,8 +260,9 @@ sensor_task_obj = PlantHealthMonitorTask(
 )
 sensor_task = Task(sensor_task_obj.tick, interval=200, state=Task.TASK_RUN)
 
-# 创建任务调度器,定时周期为50ms
-sc = Scheduler(Timer(-1), interval=50, task_idle=task_idle_callback, task_err=task_err_callback)
+# 创建任务调度器,定时周期为50ms，按 TICKLESS_MODE 在任务间隙进入低功耗等待
+sc = Scheduler(Timer(-1), interval=50, task_idle=task_idle_callback, task_err=task_err_callback,
+               tickless=TICKLESS_MODE)
 
 # 添加任务
 sc.add(sensor_task)
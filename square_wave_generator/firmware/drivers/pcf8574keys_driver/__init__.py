@@ -8,9 +8,7 @@
 
 # ======================================== 导入相关模块 =========================================
 
-# 显式导出子包或子模块
-from .code.pcf8574 import PCF8574
-from .code.pcf8574keys import PCF8574Keys, KEYS_MAP
+# 导出接口在首次访问时才导入对应子模块，见 __getattr__
 
 # ======================================== 全局变量 ============================================
 
@@ -19,6 +17,19 @@ __all__ = ["PCF8574Keys","PCF8574","KEYS_MAP"]
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问导出名称时才导入定义它的子模块，并缓存到包的命名空间中。"""
+    if name == "PCF8574":
+        from .code.pcf8574 import PCF8574 as value
+    elif name == "PCF8574Keys":
+        from .code.pcf8574keys import PCF8574Keys as value
+    elif name == "KEYS_MAP":
+        from .code.pcf8574keys import KEYS_MAP as value
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ==========================================
@@ -8,8 +8,7 @@
 
 # ======================================== 导入相关模块 =========================================
 
-# 导入 code 文件夹下的 Buzzer 类到包顶层
-from .code.air_quality import PCA9546ADR, MEMSGasSensor, AirQualityMonitor 
+# 导出接口在首次访问时才导入对应子模块，见 __getattr__
 
 # ======================================== 全局变量 ============================================
 
@@ -18,6 +17,19 @@ __all__ = ["PCA9546ADR", "MEMSGasSensor", "AirQualityMonitor"]
 
 # ======================================== 功能函数 ============================================
 
+def __getattr__(name):
+    """按需导入：首次访问导出名称时才导入定义它的子模块，并缓存到包的命名空间中。"""
+    if name == "PCA9546ADR":
+        from .code.air_quality import PCA9546ADR as value
+    elif name == "MEMSGasSensor":
+        from .code.air_quality import MEMSGasSensor as value
+    elif name == "AirQualityMonitor":
+        from .code.air_quality import AirQualityMonitor as value
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ==========================================
@@ -0,0 +1,662 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/11/6 下午3:20
+# @Author  : 李清水
+# @File    : build_all.py
+# @Description : 仓库级构建编排工具：并行构建所有项目，相同内容的源文件在整个仓库中只调用一次mpy-cross编译
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+import io
+import os
+import sys
+import time
+import fnmatch
+import hashlib
+import argparse
+import contextlib
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+# ======================================== 全局变量 ============================================
+
+# 仓库根目录（本文件位于<仓库>/tools/下）
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# 每个项目中参与构建的工具文件，各项目的副本应逐字节相同
+TOOL_FILES = ("mpy_compiler.py", "dependency_analyzer.py")
+
+# ======================================== 功能函数 ============================================
+
+
+def find_projects(root: Path, patterns: tuple[str, ...] = ()) -> list[Path]:
+    """
+    查找仓库中的项目目录：同时包含firmware/main.py与tools/mpy_compiler.py的一级子目录。
+
+    Args:
+        root (Path): 仓库根目录。
+        patterns (tuple[str, ...], optional): 项目名通配模式，为空时返回全部项目。
+
+    Returns:
+        list[Path]: 按名称排序的项目目录列表。
+
+    ==========================================
+
+    Find the project directories of the repository: first-level subdirectories containing both firmware/main.py and tools/mpy_compiler.py.
+
+    Args:
+        root (Path): Repository root directory.
+        patterns (tuple[str, ...], optional): fnmatch patterns of project names, all projects when empty.
+
+    Returns:
+        list[Path]: Project directories sorted by name.
+    """
+    projects = []
+    for path in sorted(root.iterdir()):
+        if not ((path / "firmware" / "main.py").is_file() and (path / "tools" / "mpy_compiler.py").is_file()):
+            continue
+        if patterns and not any(fnmatch.fnmatch(path.name, pattern) for pattern in patterns):
+            continue
+        projects.append(path)
+    return projects
+
+
+def diverged_tools(projects: list[Path]) -> list[str]:
+    """
+    检查各项目的构建工具副本是否与第一个项目一致，返回不一致的"项目/文件"列表。
+
+    Args:
+        projects (list[Path]): 项目目录列表，第一个项目的工具作为基准。
+
+    Returns:
+        list[str]: 内容与基准不同的工具文件，如"countdown_alarm/tools/mpy_compiler.py"。
+
+    ==========================================
+
+    Check whether every project's copy of the build tools matches the first project, return the differing "project/file" entries.
+
+    Args:
+        projects (list[Path]): Project directories, the tools of the first one are the reference.
+
+    Returns:
+        list[str]: Tool files whose content differs from the reference, such as "countdown_alarm/tools/mpy_compiler.py".
+    """
+    diverged = []
+    for name in TOOL_FILES:
+        reference = hashlib.sha256((projects[0] / "tools" / name).read_bytes()).digest()
+        for project in projects[1:]:
+            path = project / "tools" / name
+            if not path.is_file() or hashlib.sha256(path.read_bytes()).digest() != reference:
+                diverged.append(f"{project.name}/tools/{name}")
+    return diverged
+
+
+def _load_compiler(tools_dir: str):
+    """
+    从指定的tools目录导入MPYCompiler类（进程池中的子进程同样调用）。
+
+    Args:
+        tools_dir (str): 包含mpy_compiler.py与dependency_analyzer.py的目录。
+
+    Returns:
+        type: MPYCompiler类。
+
+    ==========================================
+
+    Import the MPYCompiler class from the given tools directory (also called in process pool workers).
+
+    Args:
+        tools_dir (str): Directory containing mpy_compiler.py and dependency_analyzer.py.
+
+    Returns:
+        type: The MPYCompiler class.
+    """
+    if tools_dir not in sys.path:
+        sys.path.insert(0, tools_dir)
+    from mpy_compiler import MPYCompiler
+
+    return MPYCompiler
+
+
+def _make_compiler(tools_dir: str, project: str, options: dict):
+    """
+    为项目创建MPYCompiler实例：输出到<项目>/build/firmware_mpy，编译缓存使用共享的产物库，解析缓存按项目分开。
+
+    Args:
+        tools_dir (str): 导入MPYCompiler的tools目录。
+        project (str): 项目目录。
+        options (dict): 共享编译选项，键为store、mpy_cross_opts、tree_shake、keep。
+
+    Returns:
+        MPYCompiler: 编译器实例。
+
+    ==========================================
+
+    Create an MPYCompiler instance for a project: output to <project>/build/firmware_mpy, the shared artifact store as build cache, and a
+    per-project parse cache.
+
+    Args:
+        tools_dir (str): tools directory to import MPYCompiler from.
+        project (str): Project directory.
+        options (dict): Shared build options, keys store, mpy_cross_opts, tree_shake and keep.
+
+    Returns:
+        MPYCompiler: Compiler instance.
+    """
+    MPYCompiler = _load_compiler(tools_dir)
+    build_dir = Path(project) / "build"
+    return MPYCompiler(
+        source_dir=str(Path(project) / "firmware"),
+        output_dir=str(build_dir / "firmware_mpy"),
+        mpy_cross_opts=list(options["mpy_cross_opts"]),
+        cache_dir=options["store"],
+        tree_shake=options["tree_shake"],
+        keep=tuple(options["keep"]),
+        dep_cache=str(build_dir / "dep_cache.json"),
+    )
+
+
+def _plan_project(tools_dir: str, project: str, options: dict) -> dict:
+    """
+    子进程任务：分析项目依赖并确定编译顺序，返回每个待编译文件的产物库键。
+
+    Args:
+        tools_dir (str): 导入MPYCompiler的tools目录。
+        project (str): 项目目录。
+        options (dict): 共享编译选项。
+
+    Returns:
+        dict: 键为files（[(相对路径, 产物库键), ...]）、seconds、log与error（成功时为None）。
+
+    ==========================================
+
+    Worker task: analyze the project's dependencies and determine the compile order, return the artifact store key of every file to compile.
+
+    Args:
+        tools_dir (str): tools directory to import MPYCompiler from.
+        project (str): Project directory.
+        options (dict): Shared build options.
+
+    Returns:
+        dict: Keys files ([(relative path, store key), ...]), seconds, log and error (None on success).
+    """
+    start = time.perf_counter()
+    log = io.StringIO()
+    result = {"files": [], "error": None}
+    try:
+        with contextlib.redirect_stdout(log):
+            compiler = _make_compiler(tools_dir, project, options)
+            compiler.analyze_dependencies()
+            compiler.determine_compile_order()
+            result["files"] = [(f, compiler._cache_key(compiler.source_dir / f)) for f in compiler.compile_order]
+    except Exception as e:
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+    result["log"] = log.getvalue()
+    return result
+
+
+def _build_project(tools_dir: str, project: str, options: dict) -> dict:
+    """
+    子进程任务：完整构建项目。产物库已由编排器预先填充，此时各文件通常直接命中缓存。
+
+    Args:
+        tools_dir (str): 导入MPYCompiler的tools目录。
+        project (str): 项目目录。
+        options (dict): 共享编译选项。
+
+    Returns:
+        dict: 键为files、hits、failed（[(相对路径, 错误信息), ...]）、excluded、seconds、log与error。
+
+    ==========================================
+
+    Worker task: build the whole project. The orchestrator has filled the artifact store beforehand, so files normally hit the cache.
+
+    Args:
+        tools_dir (str): tools directory to import MPYCompiler from.
+        project (str): Project directory.
+        options (dict): Shared build options.
+
+    Returns:
+        dict: Keys files, hits, failed ([(relative path, error), ...]), excluded, seconds, log and error.
+    """
+    start = time.perf_counter()
+    log = io.StringIO()
+    result = {"files": 0, "hits": 0, "failed": [], "excluded": [], "error": None}
+    try:
+        with contextlib.redirect_stdout(log):
+            compiler = _make_compiler(tools_dir, project, options)
+            compiler.analyze_dependencies()
+            compiler.determine_compile_order()
+            compiler.compile_files()
+        result["files"] = len(compiler.compile_order)
+        result["hits"] = len(compiler.cache_hits)
+        result["failed"] = [f for f in compiler.compile_order if f not in compiler.timings]
+        result["excluded"] = list(compiler.excluded)
+    except Exception as e:
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+    result["log"] = log.getvalue()
+    return result
+
+
+# ======================================== 自定义类 ============================================
+
+
+class BuildOrchestrator:
+    """
+    仓库级构建编排器：并行构建所有项目，通过按内容寻址的共享产物库使相同源文件在整个仓库中只编译一次。
+
+    各项目的构建工具与驱动被逐字节复制到多个项目中，分别构建时相同的源文件会被mpy-cross重复编译。编排器分三步构建：
+    1. 规划：在进程池中并行分析每个项目的依赖并确定编译顺序，按源文件内容、mpy-cross版本与编译选项计算产物库键；
+    2. 去重编译：对产物库中尚不存在的每个键只挑选一个项目的源文件调用mpy-cross，结果存入产物库；
+    3. 组装：在进程池中并行执行各项目的完整构建，此时文件直接从产物库以硬链接取出。
+    产物库即MPYCompiler的编译缓存目录，各项目的解析缓存仍保存在<项目>/build/dep_cache.json中。
+
+    Attributes:
+        root (Path): 仓库根目录。
+        projects (list[Path]): 参与构建的项目目录。
+        store (Path): 共享产物库目录。
+        jobs (int): 并行进程数与mpy-cross并行数。
+        verbose (bool): 是否输出各项目的编译日志。
+        options (dict): 传给每个项目编译器的共享选项。
+        results (dict[str, dict]): 各项目的构建结果，键为项目名。
+        stats (dict): 仓库级统计：源文件数、不同内容数、mpy-cross调用次数、各阶段耗时等。
+
+    Methods:
+        __init__(root, projects, store, jobs=0, mpy_cross_opts=None, tree_shake=False, keep=(), verbose=False) -> None: 初始化编排器。
+        plan() -> dict[str, list[tuple[str, str]]]: 并行规划各项目，返回项目名到(相对路径, 产物库键)列表的映射。
+        compile_unique(plans) -> None: 对产物库中缺失的每个键只编译一次。
+        assemble() -> None: 并行完成各项目的构建。
+        run() -> int: 依次执行三个阶段，返回进程退出码。
+        format_report() -> str: 生成Markdown格式的构建报告。
+
+    ==========================================
+
+    Repository build orchestrator: builds every project in parallel, and a content-addressed shared artifact store makes each identical source
+    file compile only once across the whole repository.
+
+    The build tools and drivers are copied byte-for-byte into many projects, so building projects one by one makes mpy-cross compile the same
+    sources again and again. The orchestrator builds in three steps:
+    1. Plan: analyze the dependencies and determine the compile order of every project in a process pool, and compute the store key of each file
+       from the source content, the mpy-cross version and the compile options;
+    2. Deduplicated compile: for every key missing from the store, compile the source of just one project with mpy-cross and store the result;
+    3. Assemble: run the full build of every project in a process pool, which now takes each file from the store as a hardlink.
+    The artifact store is the build cache directory of MPYCompiler; each project keeps its parse cache in <project>/build/dep_cache.json.
+
+    Attributes:
+        root (Path): Repository root directory.
+        projects (list[Path]): Project directories to build.
+        store (Path): Shared artifact store directory.
+        jobs (int): Number of worker processes and parallel mpy-cross runs.
+        verbose (bool): Whether to print the compile log of every project.
+        options (dict): Shared options passed to the compiler of every project.
+        results (dict[str, dict]): Build result of every project, keyed by project name.
+        stats (dict): Repository statistics: source files, distinct contents, mpy-cross runs, phase times and so on.
+
+    Methods:
+        __init__(root, projects, store, jobs=0, mpy_cross_opts=None, tree_shake=False, keep=(), verbose=False) -> None: Initialize the orchestrator.
+        plan() -> dict[str, list[tuple[str, str]]]: Plan every project in parallel, return a map from project name to (relative path, store key) lists.
+        compile_unique(plans) -> None: Compile each key missing from the store exactly once.
+        assemble() -> None: Finish the build of every project in parallel.
+        run() -> int: Run the three phases in order and return the process exit code.
+        format_report() -> str: Produce the build report in Markdown.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        projects: list[Path],
+        store: Path,
+        jobs: int = 0,
+        mpy_cross_opts: list[str] | None = None,
+        tree_shake: bool = False,
+        keep: tuple[str, ...] = (),
+        verbose: bool = False,
+    ):
+        """
+        初始化编排器，以第一个项目的tools目录作为导入MPYCompiler的来源。
+
+        Args:
+            root (Path): 仓库根目录。
+            projects (list[Path]): 参与构建的项目目录，不能为空。
+            store (Path): 共享产物库目录。
+            jobs (int, optional): 并行数，小于1时使用CPU核心数。
+            mpy_cross_opts (list[str] | None, optional): 传给mpy-cross的编译选项。
+            tree_shake (bool, optional): 是否只编译各项目入口可达的模块。
+            keep (tuple[str, ...], optional): tree shaking时强制保留的module_id通配模式。
+            verbose (bool, optional): 是否输出各项目的编译日志。
+
+        Raises:
+            ValueError: 未找到任何项目时抛出。
+
+        ==========================================
+
+        Initialize the orchestrator, importing MPYCompiler from the tools directory of the first project.
+
+        Args:
+            root (Path): Repository root directory.
+            projects (list[Path]): Project directories to build, must not be empty.
+            store (Path): Shared artifact store directory.
+            jobs (int, optional): Parallelism, the CPU count when less than 1.
+            mpy_cross_opts (list[str] | None, optional): Compile options passed to mpy-cross.
+            tree_shake (bool, optional): Whether to compile only the modules reachable from each project's entries.
+            keep (tuple[str, ...], optional): fnmatch patterns of module_ids always kept when tree shaking.
+            verbose (bool, optional): Whether to print the compile log of every project.
+
+        Raises:
+            ValueError: If no project is given.
+        """
+        if not projects:
+            raise ValueError("未找到任何项目（需包含firmware/main.py与tools/mpy_compiler.py）")
+        self.root = Path(root).resolve()
+        self.projects = [Path(p).resolve() for p in projects]
+        self.store = Path(store).resolve()
+        self.jobs = jobs if jobs >= 1 else (os.cpu_count() or 1)
+        self.verbose = verbose
+        self.options = {
+            "store": str(self.store),
+            "mpy_cross_opts": list(mpy_cross_opts or []),
+            "tree_shake": tree_shake,
+            "keep": tuple(keep),
+        }
+        self.results = {p.name: {"plan_seconds": 0.0, "compile_seconds": 0.0, "compiled": 0} for p in self.projects}
+        self.stats = {}
+        self._tools_dir = str(self.projects[0] / "tools")
+
+    def _log(self, message: str) -> None:
+        print(message, flush=True)
+
+    def plan(self) -> dict[str, list[tuple[str, str]]]:
+        """
+        阶段一：在进程池中并行分析各项目，返回项目名到(相对路径, 产物库键)列表的映射；分析失败的项目不出现在结果中。
+
+        Returns:
+            dict[str, list[tuple[str, str]]]: 各项目待编译的文件及其产物库键。
+
+        ==========================================
+
+        Phase one: analyze every project in parallel in a process pool and return a map from project name to (relative path, store key) lists;
+        projects whose analysis fails are left out of the result.
+
+        Returns:
+            dict[str, list[tuple[str, str]]]: Files to compile and their store keys, per project.
+        """
+        plans = {}
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            futures = {
+                pool.submit(_plan_project, self._tools_dir, str(project), self.options): project.name
+                for project in self.projects
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                result = future.result()
+                self.results[name]["plan_seconds"] = result["seconds"]
+                if result["error"]:
+                    self.results[name]["error"] = result["error"]
+                    self._log(f"[{name}] 分析失败: {result['error']}")
+                    continue
+                if self.verbose and result["log"]:
+                    self._log(f"[{name}]\n{result['log'].rstrip()}")
+                plans[name] = result["files"]
+        return plans
+
+    def compile_unique(self, plans: dict[str, list[tuple[str, str]]]) -> None:
+        """
+        阶段二：收集所有项目的产物库键，对库中缺失的每个键只挑选一个项目的源文件调用mpy-cross编译，多个键并行编译。
+
+        编译耗时计入被选中项目的compile_seconds，编译失败的键记入stats["failed_keys"]，组装阶段各项目会再次尝试并报告错误。
+
+        Args:
+            plans (dict[str, list[tuple[str, str]]]): plan()的返回值。
+
+        ==========================================
+
+        Phase two: collect the store keys of all projects and, for each key missing from the store, compile the source of just one project with
+        mpy-cross, compiling several keys in parallel.
+
+        The compile time is charged to the compile_seconds of the chosen project; failed keys go to stats["failed_keys"], and every project tries
+        them again and reports the error in the assemble phase.
+
+        Args:
+            plans (dict[str, list[tuple[str, str]]]): Return value of plan().
+        """
+        owners = {}
+        total = 0
+        for name in sorted(plans):
+            for file_path, key in plans[name]:
+                total += 1
+                owners.setdefault(key, (name, file_path))
+        missing = {key: owner for key, owner in owners.items() if not (self.store / key[:2] / (key + ".mpy")).exists()}
+        self.stats.update(sources=total, distinct=len(owners), compiled=len(missing), failed_keys=0)
+
+        compilers = {}
+        for name, _ in missing.values():
+            if name not in compilers:
+                compilers[name] = _make_compiler(self._tools_dir, str(self.root / name), self.options)
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            # mpy-cross在独立进程中编译，线程只负责等待进程结束
+            futures = {
+                pool.submit(compilers[name]._compile_single_file, file_path): (name, file_path)
+                for name, file_path in missing.values()
+            }
+            for i, future in enumerate(as_completed(futures), 1):
+                name, file_path = futures[future]
+                try:
+                    seconds = future.result()
+                    self.results[name]["compile_seconds"] += seconds
+                    self.results[name]["compiled"] += 1
+                    if self.verbose:
+                        self._log(f"已编译 ({i}/{len(futures)}): {name}/{file_path} ({seconds:.2f}s)")
+                except Exception:
+                    self.stats["failed_keys"] += 1
+
+    def assemble(self) -> None:
+        """
+        阶段三：在进程池中并行执行各项目的完整构建（依赖分析命中解析缓存，文件命中产物库），合并结果到results。
+
+        ==========================================
+
+        Phase three: run the full build of every project in parallel in a process pool (the analysis hits the parse cache and the files hit the
+        store) and merge the outcome into results.
+        """
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            futures = {
+                pool.submit(_build_project, self._tools_dir, str(project), self.options): project.name
+                for project in self.projects
+                if "error" not in self.results[project.name]
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                result = future.result()
+                self.results[name].update(
+                    files=result["files"],
+                    hits=result["hits"],
+                    failed=result["failed"],
+                    excluded=result["excluded"],
+                    build_seconds=result["seconds"],
+                )
+                if result["error"]:
+                    self.results[name]["error"] = result["error"]
+                if self.verbose and result["log"]:
+                    self._log(f"[{name}]\n{result['log'].rstrip()}")
+                status = f"失败: {result['error']}" if result["error"] else (
+                    f"{result['files']} 个文件，{len(result['failed'])} 个编译失败" if result["failed"] else f"{result['files']} 个文件"
+                )
+                self._log(f"[{name}] {status}")
+
+    def run(self) -> int:
+        """
+        依次执行规划、去重编译与组装三个阶段，记录各阶段耗时。
+
+        Returns:
+            int: 所有项目构建流程正常完成时为0，有项目分析或构建抛出异常时为1（单个文件编译失败只在报告中列出）。
+
+        ==========================================
+
+        Run the plan, deduplicated compile and assemble phases in order and record the time of each phase.
+
+        Returns:
+            int: 0 when every project's build ran to completion, 1 when the analysis or build of a project raised (single files that fail
+                to compile are only listed in the report).
+        """
+        start = time.perf_counter()
+        self._log(f"规划 {len(self.projects)} 个项目（并行数 {self.jobs}）...")
+        plans = self.plan()
+        self.stats["plan_seconds"] = time.perf_counter() - start
+
+        mark = time.perf_counter()
+        self.compile_unique(plans)
+        self.stats["compile_seconds"] = time.perf_counter() - mark
+        self._log(
+            f"去重编译: 源文件 {self.stats['sources']} 个，不同内容 {self.stats['distinct']} 个，"
+            f"调用mpy-cross {self.stats['compiled']} 次（{self.stats['compile_seconds']:.2f}s）"
+        )
+
+        mark = time.perf_counter()
+        self.assemble()
+        self.stats["assemble_seconds"] = time.perf_counter() - mark
+        self.stats["total_seconds"] = time.perf_counter() - start
+        return 1 if any("error" in r for r in self.results.values()) else 0
+
+    def format_report(self) -> str:
+        """
+        生成Markdown格式的构建报告：仓库级统计、逐项目耗时表，以及编译失败与tree shaking排除的文件。
+
+        Returns:
+            str: 报告文本。
+
+        ==========================================
+
+        Produce the build report in Markdown: repository statistics, a per-project timing table, and the files that failed to compile or were
+        excluded by tree shaking.
+
+        Returns:
+            str: Report text.
+        """
+        stats = self.stats
+        lines = [
+            "# 仓库构建报告",
+            "",
+            f"- 项目数: {len(self.projects)}，并行数: {self.jobs}",
+            f"- 产物库: `{self.store}`",
+            f"- 编译选项: `{' '.join(self.options['mpy_cross_opts']) or '（默认）'}`"
+            + ("，tree shaking" if self.options["tree_shake"] else ""),
+            f"- 源文件: {stats.get('sources', 0)} 个，不同内容: {stats.get('distinct', 0)} 个，"
+            f"本次调用mpy-cross: {stats.get('compiled', 0)} 次（其中失败 {stats.get('failed_keys', 0)} 次）",
+            f"- 耗时: 规划 {stats.get('plan_seconds', 0):.2f}s，去重编译 {stats.get('compile_seconds', 0):.2f}s，"
+            f"组装 {stats.get('assemble_seconds', 0):.2f}s，总计 {stats.get('total_seconds', 0):.2f}s",
+            "",
+            "| 项目 | 文件数 | 首次编译 | 失败 | 规划(s) | 编译(s) | 组装(s) | 合计(s) |",
+            "| --- | ---: | ---: | ---: | ---: | ---: | ---: | ---: |",
+        ]
+        for name, r in self.results.items():
+            if "error" in r and "files" not in r:
+                lines.append(f"| {name} | - | - | - | {r['plan_seconds']:.2f} | - | - | 失败 |")
+                continue
+            subtotal = r["plan_seconds"] + r["compile_seconds"] + r.get("build_seconds", 0.0)
+            lines.append(
+                f"| {name} | {r.get('files', 0)} | {r['compiled']} | {len(r.get('failed', []))} | {r['plan_seconds']:.2f} | "
+                f"{r['compile_seconds']:.2f} | {r.get('build_seconds', 0.0):.2f} | {subtotal:.2f} |"
+            )
+
+        errors = [(name, r["error"]) for name, r in self.results.items() if "error" in r]
+        if errors:
+            lines += ["", "## 构建失败的项目", ""]
+            lines += [f"- {name}: {error}" for name, error in errors]
+
+        failed = [(name, f) for name, r in self.results.items() for f in r.get("failed", [])]
+        if failed:
+            lines += ["", "## 编译失败的文件", ""]
+            lines += [f"- {name}/firmware/{f}" for name, f in failed]
+
+        excluded = [(name, f) for name, r in self.results.items() for f in r.get("excluded", [])]
+        if excluded:
+            lines += ["", "## tree shaking排除的文件", ""]
+            lines += [f"- {name}/firmware/{f}" for name, f in excluded]
+        return "\n".join(lines) + "\n"
+
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
+
+if __name__ == "__main__":
+    """命令行入口函数"""
+    parser = argparse.ArgumentParser(
+        description="仓库构建编排工具 - 并行构建所有项目，相同源文件在整个仓库中只编译一次",
+        formatter_class=argparse.RawTextHelpFormatter,
+        epilog="""
+使用示例:
+  # 构建仓库中的全部项目
+  python tools/build_all.py
+
+  # 只构建名称匹配的项目，4个并行进程
+  python tools/build_all.py -p 'ws2812_*' -p countdown_alarm -j 4
+
+  # 发布构建：tree shaking并指定兼容版本
+  python tools/build_all.py --tree-shake --compat 1.23
+        """,
+    )
+    parser.add_argument("-r", "--root", help="仓库根目录，默认为本工具所在目录的上一级", default=str(REPO_ROOT))
+    parser.add_argument(
+        "-p", "--project", help="只构建名称匹配该通配模式的项目，可重复指定", action="append", default=[], metavar="PATTERN"
+    )
+    parser.add_argument("-j", "--jobs", help="并行数，默认为0（使用全部CPU核心）", type=int, default=0)
+    parser.add_argument("--store", help="共享产物库目录，默认为<仓库>/build/mpy_store", metavar="DIR")
+    parser.add_argument("--report", help="构建报告路径，默认为<仓库>/build/build_report.md", metavar="FILE")
+    parser.add_argument("-v", "--verbose", help="输出各项目的编译日志", action="store_true")
+    parser.add_argument("--tree-shake", help="各项目只编译从main.py、boot.py可达的模块", action="store_true")
+    parser.add_argument(
+        "--keep", help="开启--tree-shake时强制保留的module_id通配模式，可重复指定", action="append", default=[], metavar="PATTERN"
+    )
+    parser.add_argument("--compat", help="指定MicroPython兼容版本，如1.19", metavar="VERSION")
+    parser.add_argument("--bytecode", help="指定字节码版本", type=int, metavar="VERSION")
+    parser.add_argument("-O", help="字节码优化级别，如-O2", metavar="LEVEL")
+    parser.add_argument("--arch", help="指定目标架构，如armv7m, xtensa等", metavar="ARCH")
+
+    args = parser.parse_args()
+
+    # 构建mpy-cross编译选项，与mpy_compiler.py一致
+    mpy_cross_opts = []
+    if args.compat:
+        mpy_cross_opts.extend(["--compat", args.compat])
+    if args.bytecode:
+        mpy_cross_opts.extend(["--bytecode", str(args.bytecode)])
+    if args.O:
+        mpy_cross_opts.append(f"-{args.O}")
+    if args.arch:
+        mpy_cross_opts.extend(["-march", args.arch])
+
+    root = Path(args.root).resolve()
+    projects = find_projects(root, tuple(args.project))
+    if not projects:
+        print(f"错误: 在 {root} 中未找到匹配的项目", file=sys.stderr)
+        sys.exit(1)
+
+    # 各项目的工具副本不一致时提示，构建统一使用第一个项目的副本
+    diverged = diverged_tools(projects)
+    if diverged:
+        print(f"警告: 以下工具文件与 {projects[0].name} 中的副本不一致，构建将统一使用后者:", file=sys.stderr)
+        for entry in diverged:
+            print(f"  {entry}", file=sys.stderr)
+
+    orchestrator = BuildOrchestrator(
+        root=root,
+        projects=projects,
+        store=Path(args.store) if args.store else root / "build" / "mpy_store",
+        jobs=args.jobs,
+        mpy_cross_opts=mpy_cross_opts,
+        tree_shake=args.tree_shake,
+        keep=tuple(args.keep),
+        verbose=args.verbose,
+    )
+    code = orchestrator.run()
+
+    report = Path(args.report) if args.report else root / "build" / "build_report.md"
+    report.parent.mkdir(parents=True, exist_ok=True)
+    report.write_text(orchestrator.format_report(), encoding="utf-8")
+    print(f"\n总耗时: {orchestrator.stats['total_seconds']:.2f}s，构建报告: {report}")
+    sys.exit(code)
@@ -25,6 +25,11 @@ GC_THRESHOLD_BYTES = 100000
 # task_err_callback 在多次发生时的打印间隔（防止刷屏）
 ERROR_REPEAT_DELAY_S = 1.0
 
+# 是否启用芯片内部看门狗 machine.WDT（启动后无法停止，调试时停止调度器会导致复位，可设为False）
+WATCHDOG_ENABLE = True
+# 看门狗超时时间（单位是毫秒，RP2040最大8388ms），任务卡死后在该时间内复位
+WATCHDOG_TIMEOUT_MS = 4000
+
 # ======================================== 功能函数 ============================================
 
 # ======================================== 自定义类 ============================================
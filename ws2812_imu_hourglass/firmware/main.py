@@ -18,7 +18,7 @@ import board
 # 导入配置文件
 from conf import *
 # 导入lib文件夹下面自定义库
-from libs.scheduler import Scheduler, Task
+from libs.scheduler import Scheduler, Task, Watchdog
 # 导入drivers文件夹下面传感器模块驱动库
 from drivers.neopixel_matrix_driver import NeopixelMatrix
 from drivers.serial_imu_driver import IMU
@@ -179,7 +179,8 @@ print("Error repeat delay:", ERROR_REPEAT_DELAY_S)
 
 # 创建传感器-蜂鸣器-LED任务实例
 task_obj = ImuTask(imu, nm)
-sensor_task = Task(task_obj.tick, interval=50,  state=Task.TASK_RUN)
+# IMU.RecvData 在收齐三帧数据前不会返回，串口断开时会卡死，由看门狗检测单次执行时间与心跳
+sensor_task = Task(task_obj.tick, interval=50,  state=Task.TASK_RUN, max_runtime=1000, heartbeat=3000)
 
 # 创建任务调度器,定时周期为50ms
 sc = Scheduler(Timer(-1), interval=10, task_idle=task_idle_callback, task_err=task_err_callback)
@@ -191,6 +192,15 @@ sc.add(sensor_task)
 if not AUTO_START:
     sc.pause(sensor_task)
 
+# 创建看门狗服务，所有任务存活时喂外部看门狗与芯片内部看门狗
+wd = Watchdog(sc, Timer(-1), timeout_ms=WATCHDOG_TIMEOUT_MS,
+              wdi=board.get_fixed_pin("WATCHDOG_WDI"), hw=WATCHDOG_ENABLE)
+
+# 打印上一次看门狗复位前卡死的任务
+crash = Watchdog.last_crash(sc)
+if crash:
+    print("Last watchdog reset:", crash)
+
 # ========================================  主程序  ===========================================
 
 # 开启调度
@@ -0,0 +1,913 @@
+# Python env   : Python 3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2025/10/29 上午9:30
+# @Author  : 李清水
+# @File    : i2c_devices.py
+# @Description : 主机模拟器的 I2C 芯片寄存器级模拟器：SSD1306、PCA9685、PCF8574、ADS1115、BH1750、TCS34725、DS1307、VL53L0X、SI5351
+# @License : CC BY-NC 4.0
+
+# ======================================== 导入相关模块 =========================================
+
+import re
+import calendar
+from pathlib import Path
+
+from .clock import CLOCK
+from .machine import I2CDevice
+
+# ======================================== 全局变量 ============================================
+
+# 数值型激励（光照、距离、电压等）可以是常量，也可以是以毫秒时刻为参数的函数
+
+# ======================================== 功能函数 ============================================
+
+def _value(v) -> float:
+    """
+    取激励的当前值：常量直接返回，函数以当前虚拟毫秒时刻调用。
+
+    ==========================================
+
+    Current value of a stimulus: constants are returned as is, functions are called with the
+    current virtual time in ms.
+    """
+    return v(CLOCK.now // 1000) if callable(v) else v
+
+
+def _bcd(n: int) -> int:
+    return ((n // 10) << 4) | (n % 10)
+
+
+def _unbcd(b: int) -> int:
+    return (b >> 4) * 10 + (b & 0x0F)
+
+
+def _app_sources(source_dir: str) -> str:
+    """
+    拼接 drivers 目录之外的固件源码（main.py、tasks 等）。驱动包中可能带有未使用的驱动，
+    因此只看应用代码。
+
+    ==========================================
+
+    Concatenate the firmware sources outside the drivers directory (main.py, tasks, ...).
+    Driver packages may ship unused drivers, so only application code is considered.
+    """
+    src = Path(source_dir)
+    texts = []
+    for path in src.rglob("*.py"):
+        if "drivers" in path.relative_to(src).parts:
+            continue
+        try:
+            texts.append(path.read_text(encoding="utf-8", errors="ignore"))
+        except OSError:
+            continue
+    return "\n".join(texts)
+
+
+def detect(source_dir: str) -> dict:
+    """
+    扫描应用代码，返回用到的芯片及其地址。
+
+    应用代码中构造了驱动类即认为用到该芯片；地址取应用代码中出现的该芯片可选地址字面量，
+    没有出现时取芯片的全部可选地址（应用通常扫描总线后查找固定地址）。
+
+    Args:
+        source_dir (str): 固件目录。
+
+    Returns:
+        dict[str, tuple[int]]: 芯片名称（CHIPS 的键）到地址的映射，按 CHIPS 中的顺序排列。
+
+    ==========================================
+
+    Scan the application code and return the chips in use with their addresses.
+
+    A chip is in use when the application constructs its driver class; its addresses are the
+    selectable addresses that appear as literals in the application code, or all of them when
+    none appears (applications usually scan the bus and look for fixed addresses).
+
+    Args:
+        source_dir (str): Firmware directory.
+
+    Returns:
+        dict[str, tuple[int]]: Chip name (key of CHIPS) to addresses, in CHIPS order.
+    """
+    text = _app_sources(source_dir)
+    literals = {int(h, 16) for h in re.findall(r"\b0[xX]([0-9a-fA-F]{2})\b", text)}
+    found = {}
+    for name, (_, addrs, classes) in CHIPS.items():
+        if any(re.search(rf"\b{cls}\s*\(", text) for cls in classes):
+            found[name] = tuple(a for a in addrs if a in literals) or addrs
+    return found
+
+
+def attach_auto(source_dir: str, buses=(0, 1)) -> list:
+    """
+    按 detect() 的结果在每条总线上挂接模拟器；同一地址只挂接先检测到的芯片。
+
+    Args:
+        source_dir (str): 固件目录。
+        buses (tuple[int]): 挂接的总线编号。
+
+    Returns:
+        list[I2CDevice]: 挂接的模拟器。
+
+    ==========================================
+
+    Attach emulators on every bus according to detect(); an address gets only the first chip
+    detected.
+
+    Args:
+        source_dir (str): Firmware directory.
+        buses (tuple[int]): Bus ids to attach to.
+
+    Returns:
+        list[I2CDevice]: Attached emulators.
+    """
+    from .machine import I2C
+    attached = []
+    for name, addrs in detect(source_dir).items():
+        cls = CHIPS[name][0]
+        for bus_id in buses:
+            bus = I2C(bus_id)._bus
+            for addr in addrs:
+                if addr not in bus.devices:
+                    attached.append(bus.attach(cls(addr)))
+    return attached
+
+# ======================================== 自定义类 ============================================
+
+
+class SSD1306(I2CDevice):
+    """
+    SSD1306 OLED 控制器模拟器：解析控制字节与命令参数，按页/水平/垂直寻址模式写入 GDDRAM。
+
+    Attributes:
+        gddram (bytearray): 显存，按页排列（每页 width 字节，每字节为纵向 8 个像素）。
+        display_on (bool): 是否开屏。
+        contrast (int): 对比度。
+        inverted (bool): 是否反相显示。
+        frames (int): 水平/垂直寻址模式下写满整个窗口的次数，即完整刷新的帧数。
+        commands (int): 收到的命令字节数（含参数）。
+
+    ==========================================
+
+    SSD1306 OLED controller emulator: parses control bytes and command arguments and writes
+    GDDRAM in page/horizontal/vertical addressing mode.
+
+    Attributes:
+        gddram (bytearray): Display RAM by page (width bytes per page, 8 vertical pixels per byte).
+        display_on (bool): Whether the display is on.
+        contrast (int): Contrast.
+        inverted (bool): Whether the display is inverted.
+        frames (int): Times the whole window was written in horizontal/vertical mode, i.e. full refreshes.
+        commands (int): Command bytes received (including arguments).
+    """
+
+    # 带参数的命令及其参数个数
+    _ARGS = {0x20: 1, 0x21: 2, 0x22: 2, 0x26: 6, 0x27: 6, 0x29: 5, 0x2A: 5, 0x81: 1, 0x8D: 1,
+             0xA3: 2, 0xA8: 1, 0xD3: 1, 0xD5: 1, 0xD9: 1, 0xDA: 1, 0xDB: 1}
+
+    def __init__(self, addr: int = 0x3C, width: int = 128, height: int = 64) -> None:
+        super().__init__(addr)
+        self.width = width
+        self.pages = height // 8
+        self.gddram = bytearray(width * self.pages)
+        self.display_on = False
+        self.contrast = 0x7F
+        self.inverted = False
+        self.frames = 0
+        self.commands = 0
+        # 复位后为页寻址模式
+        self._mode = 2
+        self._col0, self._col1 = 0, width - 1
+        self._page0, self._page1 = 0, self.pages - 1
+        self._col = 0
+        self._page = 0
+        self._cmd = None
+        self._args = []
+
+    def write(self, data: bytes, stop: bool = True) -> None:
+        i, n = 0, len(data)
+        while i < n:
+            ctrl = data[i]
+            i += 1
+            is_data = ctrl & 0x40
+            if ctrl & 0x80:
+                # Co=1：后面只跟一个字节，再接下一个控制字节
+                if i < n:
+                    self._data(data[i]) if is_data else self._command(data[i])
+                    i += 1
+            else:
+                # Co=0：余下全部为命令或数据
+                for b in data[i:]:
+                    self._data(b) if is_data else self._command(b)
+                break
+
+    def _command(self, b: int) -> None:
+        self.commands += 1
+        if self._cmd is not None:
+            self._args.append(b)
+            if len(self._args) == SSD1306._ARGS[self._cmd]:
+                self._apply(self._cmd, self._args)
+                self._cmd = None
+            return
+        if b in SSD1306._ARGS:
+            self._cmd, self._args = b, []
+        elif b in (0xAE, 0xAF):
+            self.display_on = b == 0xAF
+        elif b in (0xA6, 0xA7):
+            self.inverted = b == 0xA7
+        elif 0xB0 <= b <= 0xB7:
+            self._page = b & 0x07
+        elif b <= 0x0F:
+            self._col = (self._col & 0xF0) | b
+        elif b <= 0x1F:
+            self._col = (self._col & 0x0F) | ((b & 0x0F) << 4)
+
+    def _apply(self, cmd: int, args: list) -> None:
+        if cmd == 0x20:
+            self._mode = args[0] & 0x03
+        elif cmd == 0x21:
+            self._col0, self._col1 = args[0] & 0x7F, args[1] & 0x7F
+            self._col = self._col0
+        elif cmd == 0x22:
+            self._page0, self._page1 = args[0] & 0x07, args[1] & 0x07
+            self._page = self._page0
+        elif cmd == 0x81:
+            self.contrast = args[0]
+
+    def _data(self, b: int) -> None:
+        col, page = self._col, self._page
+        # 64 像素宽的屏幕在驱动中左移了 32 列，显存只保存可见部分
+        x = col - (32 if self.width == 64 else 0)
+        if 0 <= x < self.width and page < self.pages:
+            self.gddram[page * self.width + x] = b
+        if self._mode == 0:
+            if col < self._col1:
+                self._col = col + 1
+            else:
+                self._col = self._col0
+                if page < self._page1:
+                    self._page = page + 1
+                else:
+                    self._page = self._page0
+                    self.frames += 1
+        elif self._mode == 1:
+            if page < self._page1:
+                self._page = page + 1
+            else:
+                self._page = self._page0
+                if col < self._col1:
+                    self._col = col + 1
+                else:
+                    self._col = self._col0
+                    self.frames += 1
+        else:
+            self._col = col + 1 if col < 127 else col
+
+    def pixel(self, x: int, y: int) -> int:
+        return (self.gddram[(y >> 3) * self.width + x] >> (y & 7)) & 1
+
+    def render(self) -> str:
+        """
+        以字符画返回当前显存内容，每个字符表示上下两个像素。
+
+        ==========================================
+
+        Return the display RAM as text art, one character per two vertical pixels.
+        """
+        chars = " ▀▄█"
+        rows = []
+        for y in range(0, self.pages * 8, 2):
+            rows.append("".join(chars[self.pixel(x, y) | (self.pixel(x, y + 1) << 1)] for x in range(self.width)))
+        return "\n".join(rows)
+
+
+class PCA9685(I2CDevice):
+    """
+    PCA9685 16 路 PWM 控制器模拟器：MODE1 的 AI 位控制寄存器自动递增，PRE_SCALE 只在睡眠时可写。
+
+    Attributes:
+        regs (bytearray): 256 字节寄存器。
+        led_writes (int): 写入 LEDn_ON/OFF 寄存器的字节数。
+
+    ==========================================
+
+    PCA9685 16-channel PWM controller emulator: the MODE1 AI bit controls register
+    auto-increment and PRE_SCALE is only writable in sleep mode.
+
+    Attributes:
+        regs (bytearray): 256-byte register file.
+        led_writes (int): Bytes written to LEDn_ON/OFF registers.
+    """
+
+    MODE1 = 0x00
+    PRE_SCALE = 0xFE
+    OSC_HZ = 25_000_000
+
+    def __init__(self, addr: int = 0x40) -> None:
+        super().__init__(addr)
+        self.regs = bytearray(256)
+        self.regs[0x00] = 0x11
+        self.regs[0x01] = 0x04
+        self.regs[PCA9685.PRE_SCALE] = 0x1E
+        self.led_writes = 0
+        self._ptr = 0
+
+    def _next(self) -> None:
+        if self.regs[PCA9685.MODE1] & 0x20:
+            self._ptr = (self._ptr + 1) & 0xFF
+
+    def write(self, data: bytes, stop: bool = True) -> None:
+        if not data:
+            return
+        self._ptr = data[0]
+        for b in data[1:]:
+            reg = self._ptr
+            if reg == PCA9685.MODE1:
+                # RESTART 位写1清零
+                self.regs[reg] = b & 0x7F
+            elif reg == PCA9685.PRE_SCALE:
+                if self.regs[PCA9685.MODE1] & 0x10:
+                    self.regs[reg] = max(b, 3)
+            else:
+                if 0x06 <= reg <= 0x45:
+                    self.led_writes += 1
+                self.regs[reg] = b
+            self._next()
+
+    def read(self, n: int) -> bytes:
+        out = bytearray(n)
+        for i in range(n):
+            out[i] = self.regs[self._ptr]
+            self._next()
+        return bytes(out)
+
+    def channel(self, index: int) -> tuple:
+        """
+        返回通道 index 的 (on, off) 计数，full on/off 位分别在第 12 位。
+
+        ==========================================
+
+        Return (on, off) counts of channel index; the full on/off flags are bit 12.
+        """
+        base = 0x06 + 4 * index
+        r = self.regs
+        return r[base] | (r[base + 1] << 8), r[base + 2] | (r[base + 3] << 8)
+
+    def duty(self, index: int) -> int:
+        on, off = self.channel(index)
+        if off & 0x1000:
+            return 0
+        if on & 0x1000:
+            return 4096
+        return (off - on) & 0x0FFF
+
+    @property
+    def freq(self) -> float:
+        return PCA9685.OSC_HZ / (4096 * (self.regs[PCA9685.PRE_SCALE] + 1))
+
+
+class PCF8574(I2CDevice):
+    """
+    PCF8574 8 位准双向 IO 扩展模拟器：写入设置输出锁存，读取返回锁存与外部输入的与。
+
+    Attributes:
+        latch (int): 输出锁存值，上电为 0xFF。
+        inputs (int): 外部对引脚的驱动（1 为悬空或高电平），场景脚本可修改以模拟按键。
+        writes (int): 端口写入次数。
+
+    ==========================================
+
+    PCF8574 8-bit quasi-bidirectional IO expander emulator: writes set the output latch,
+    reads return the latch ANDed with external inputs.
+
+    Attributes:
+        latch (int): Output latch, 0xFF at power-up.
+        inputs (int): External drive of the pins (1 is floating or high); scenario scripts change it to press keys.
+        writes (int): Port writes.
+    """
+
+    def __init__(self, addr: int = 0x20) -> None:
+        super().__init__(addr)
+        self.latch = 0xFF
+        self.inputs = 0xFF
+        self.writes = 0
+
+    def write(self, data: bytes, stop: bool = True) -> None:
+        for b in data:
+            self.latch = b
+            self.writes += 1
+
+    def read(self, n: int) -> bytes:
+        return bytes([self.latch & self.inputs]) * n
+
+
+class ADS1115(I2CDevice):
+    """
+    ADS1115 16 位 ADC 模拟器：按 MUX/PGA 把 inputs 中的电压换算为转换结果，
+    单次转换在 1/DR 秒后完成（配置寄存器 OS 位置1），连续模式始终返回最新值。
+
+    Attributes:
+        inputs (list): AIN0~AIN3 的电压，单位为伏，可为以毫秒时刻为参数的函数。
+        conversions (int): 完成的转换次数。
+
+    ==========================================
+
+    ADS1115 16-bit ADC emulator: converts the voltages in inputs according to MUX/PGA; a
+    single-shot conversion completes after 1/DR seconds (config OS bit set) and continuous
+    mode always returns the latest value.
+
+    Attributes:
+        inputs (list): Voltages on AIN0-AIN3 in volts, may be functions of the time in ms.
+        conversions (int): Completed conversions.
+    """
+
+    _FSR = (6.144, 4.096, 2.048, 1.024, 0.512, 0.256, 0.256, 0.256)
+    _SPS = (8, 16, 32, 64, 128, 250, 475, 860)
+    _MUX = ((0, 1), (0, 3), (1, 3), (2, 3), (0, None), (1, None), (2, None), (3, None))
+
+    def __init__(self, addr: int = 0x48) -> None:
+        super().__init__(addr)
+        self.inputs = [1.65, 0.0, 0.0, 0.0]
+        self.conversions = 0
+        self._regs = [0x0000, 0x8583, 0x8000, 0x7FFF]
+        self._ptr = 0
+        self._ready_at = 0
+
+    def _convert(self) -> int:
+        cfg = self._regs[1]
+        p, n = ADS1115._MUX[(cfg >> 12) & 0x07]
+        v = _value(self.inputs[p]) - (_value(self.inputs[n]) if n is not None else 0.0)
+        raw = int(v / ADS1115._FSR[(cfg >> 9) & 0x07] * 32768)
+        return max(-32768, min(32767, raw)) & 0xFFFF
+
+    def write(self, data: bytes, stop: bool = True) -> None:
+        if not data:
+            return
+        self._ptr = data[0] & 0x03
+        if len(data) < 3:
+            return
+        value = (data[1] << 8) | data[2]
+        if self._ptr != 1:
+            self._regs[self._ptr] = value
+            return
+        period_us = 1_000_000 // ADS1115._SPS[(value >> 5) & 0x07]
+        if not value & 0x0100 or value & 0x8000:
+            # 连续模式或写 OS=1 启动单次转换
+            self._ready_at = CLOCK.now + period_us
+        self._regs[1] = value & 0x7FFF
+
+    def read(self, n: int) -> bytes:
+        ptr = self._ptr
+        done = CLOCK.now >= self._ready_at
+        if ptr == 0:
+            if done or not self._regs[1] & 0x0100:
+                self.conversions += 1
+                self._regs[0] = self._convert()
+            value = self._regs[0]
+        elif ptr == 1:
+            value = self._regs[1] | (0x8000 if done else 0)
+        else:
+            value = self._regs[ptr]
+        return bytes([value >> 8, value & 0xFF] * ((n + 1) // 2))[:n]
+
+
+class BH1750(I2CDevice):
+    """
+    BH1750 环境光传感器模拟器：命令字节控制电源、模式与测量时间（MTreg），
+    测量在对应时间后完成，结果为 lux * 1.2 * MTreg / 69（H 分辨率模式 2 再乘 2）。
+
+    Attributes:
+        lux (float): 环境光照度，可为以毫秒时刻为参数的函数。
+        powered (bool): 是否上电。
+        measurements (int): 完成的测量次数。
+
+    ==========================================
+
+    BH1750 ambient light sensor emulator: command bytes control power, mode and measurement
+    time (MTreg); a measurement completes after the matching time and reads
+    lux * 1.2 * MTreg / 69 (doubled in H-resolution mode 2).
+
+    Attributes:
+        lux (float): Illuminance, may be a function of the time in ms.
+        powered (bool): Whether the sensor is powered.
+        measurements (int): Completed measurements.
+    """
+
+    def __init__(self, addr: int = 0x23) -> None:
+        super().__init__(addr)
+        self.lux = 300.0
+        self.powered = False
+        self.measurements = 0
+        self._mode = 0
+        self._mt = 69
+        self._ready_at = 0
+        self._result = 0
+
+    def _start(self, mode: int) -> None:
+        self._mode = mode
+        base_us = 16_000 if mode & 0x03 == 0x03 else 120_000
+        self._ready_at = CLOCK.now + base_us * self._mt // 69
+
+    def write(self, data: bytes, stop: bool = True) -> None:
+        for b in data:
+            if b == 0x00:
+                self.powered = False
+            elif b == 0x01:
+                self.powered = True
+            elif b == 0x07:
+                if self.powered:
+                    self._result = 0
+            elif b in (0x10, 0x11, 0x13, 0x20, 0x21, 0x23):
+                self.powered = True
+                self._start(b)
+            elif b & 0xF8 == 0x40:
+                self._mt = (self._mt & 0x1F) | ((b & 0x07) << 5)
+            elif b & 0xE0 == 0x60:
+                self._mt = (self._mt & 0xE0) | (b & 0x1F)
+
+    def read(self, n: int) -> bytes:
+        if self._mode and CLOCK.now >= self._ready_at:
+            count = _value(self.lux) * 1.2 * self._mt / 69
+            if self._mode & 0x03 == 0x01:
+                count *= 2
+            self._result = max(0, min(65535, int(count)))
+            self.measurements += 1
+            if self._mode & 0x20:
+                # 单次测量完成后自动掉电
+                self._mode = 0
+                self.powered = False
+            else:
+                self._start(self._mode)
+        return bytes([self._result >> 8, self._result & 0xFF])[:n]
+
+
+class TCS34725(I2CDevice):
+    """
+    TCS34725 颜色传感器模拟器：命令字节最高位为命令位，低 5 位为寄存器地址（读写自动递增），
+    PON 与 AEN 使能后经过一个积分周期 STATUS 的 AVALID 位置1，数据按 ATIME 与增益缩放。
+
+    Attributes:
+        rgbc (tuple): 满积分、1 倍增益下的 (R, G, B, C) 计数，可为以毫秒时刻为参数的函数。
+        regs (bytearray): 32 字节寄存器，ID 寄存器为 0x44。
+
+    ==========================================
+
+    TCS34725 color sensor emulator: the command byte has the command bit on top and the
+    register address in the low 5 bits (auto-incremented on access); AVALID in STATUS is set
+    one integration cycle after PON and AEN are enabled, and data scales with ATIME and gain.
+
+    Attributes:
+        rgbc (tuple): (R, G, B, C) counts at full integration and 1x gain, may be a function of the time in ms.
+        regs (bytearray): 32-byte register file, the ID register reads 0x44.
+    """
+
+    _GAIN = (1, 4, 16, 60)
+
+    def __init__(self, addr: int = 0x29) -> None:
+        super().__init__(addr)
+        self.rgbc = (12000, 9000, 6000, 30000)
+        self.regs = bytearray(32)
+        self.regs[0x01] = 0xFF
+        self.regs[0x03] = 0xFF
+        self.regs[0x12] = 0x44
+        self._ptr = 0
+        self._valid_at = None
+
+    def _integration_us(self) -> int:
+        return (256 - self.regs[0x01]) * 2400
+
+    def write(self, data: bytes, stop: bool = True) -> None:
+        if not data:
+            return
+        cmd = data[0]
+        if cmd & 0xE0 == 0xE0:
+            # 特殊功能：清除中断
+            self.regs[0x13] &= ~0x10
+            return
+        self._ptr = cmd & 0x1F
+        for b in data[1:]:
+            reg = self._ptr
+            if reg not in (0x12, 0x13):
+                self.regs[reg] = b
+            if reg == 0x00:
+                if b & 0x03 == 0x03:
+                    if self._valid_at is None:
+                        # 上电 2.4ms 后开始第一次积分
+                        self._valid_at = CLOCK.now + 2400 + self._integration_us()
+                else:
+                    self._valid_at = None
+            self._ptr = (reg + 1) & 0x1F
+
+    def _latch(self) -> None:
+        valid = self._valid_at is not None and CLOCK.now >= self._valid_at
+        self.regs[0x13] = (self.regs[0x13] & ~0x01) | (0x01 if valid else 0)
+        if not valid:
+            return
+        cycles = 256 - self.regs[0x01]
+        gain = TCS34725._GAIN[self.regs[0x0F] & 0x03]
+        full = min(65535, 1024 * cycles)
+        r, g, b, c = _value(self.rgbc)
+        for reg, v in ((0x14, c), (0x16, r), (0x18, g), (0x1A, b)):
+            v = max(0, min(full, int(v * gain * cycles / 256)))
+            self.regs[reg] = v & 0xFF
+            self.regs[reg + 1] = v >> 8
+
+    def read(self, n: int) -> bytes:
+        if self._ptr in (0x13, 0x14):
+            self._latch()
+        out = bytearray(n)
+        for i in range(n):
+            out[i] = self.regs[self._ptr]
+            self._ptr = (self._ptr + 1) & 0x1F
+        return bytes(out)
+
+
+class DS1307(I2CDevice):
+    """
+    DS1307 实时时钟模拟器：时间寄存器（BCD）随虚拟时钟走时，CH 位停振，
+    0x08~0x3F 为 56 字节 RAM，寄存器指针在 0x3F 之后回绕到 0。
+
+    Attributes:
+        ram (bytearray): 64 字节寄存器与 RAM。
+
+    ==========================================
+
+    DS1307 real-time clock emulator: the time registers (BCD) run on the virtual clock, the CH
+    bit halts the oscillator, 0x08-0x3F is 56 bytes of RAM and the register pointer wraps to 0
+    after 0x3F.
+
+    Attributes:
+        ram (bytearray): 64-byte registers and RAM.
+    """
+
+    def __init__(self, addr: int = 0x68) -> None:
+        super().__init__(addr)
+        self.ram = bytearray(64)
+        self._ptr = 0
+        self._base = CLOCK.time()
+        self._base_us = CLOCK.now
+        self._halted = False
+
+    def _now(self) -> int:
+        if self._halted:
+            return self._base
+        return self._base + (CLOCK.now - self._base_us) // 1_000_000
+
+    def _materialize(self) -> None:
+        """
+        把当前时间编码到 0x00~0x06，保留 12/24 小时制与 CH 位。
+
+        ==========================================
+
+        Encode the current time into 0x00-0x06, keeping the 12/24-hour and CH bits.
+        """
+        t = CLOCK.localtime(self._now())
+        r = self.ram
+        r[0] = _bcd(t[5]) | (0x80 if self._halted else 0)
+        r[1] = _bcd(t[4])
+        if r[2] & 0x40:
+            h = t[3] % 12 or 12
+            r[2] = 0x40 | (0x20 if t[3] >= 12 else 0) | _bcd(h)
+        else:
+            r[2] = _bcd(t[3])
+        r[3] = t[6] + 1
+        r[4] = _bcd(t[2])
+        r[5] = _bcd(t[1])
+        r[6] = _bcd(t[0] % 100)
+
+    def _commit(self) -> None:
+        r = self.ram
+        if r[2] & 0x40:
+            hour = _unbcd(r[2] & 0x1F) % 12 + (12 if r[2] & 0x20 else 0)
+        else:
+            hour = _unbcd(r[2] & 0x3F)
+        try:
+            secs = calendar.timegm((2000 + _unbcd(r[6]), _unbcd(r[5] & 0x1F) or 1, _unbcd(r[4] & 0x3F) or 1,
+                                    hour, _unbcd(r[1] & 0x7F), _unbcd(r[0] & 0x7F), 0, 0, 0))
+        except (ValueError, OverflowError):
+            return
+        self._base = secs
+        self._base_us = CLOCK.now
+        self._halted = bool(r[0] & 0x80)
+
+    def write(self, data: bytes, stop: bool = True) -> None:
+        if not data:
+            return
+        self._ptr = data[0] & 0x3F
+        if len(data) == 1:
+            return
+        self._materialize()
+        touched = False
+        for b in data[1:]:
+            self.ram[self._ptr] = b
+            touched |= self._ptr <= 6
+            self._ptr = (self._ptr + 1) & 0x3F
+        if touched:
+            self._commit()
+
+    def read(self, n: int) -> bytes:
+        self._materialize()
+        out = bytearray(n)
+        for i in range(n):
+            out[i] = self.ram[self._ptr]
+            self._ptr = (self._ptr + 1) & 0x3F
+        return bytes(out)
+
+
+class VL53L0X(I2CDevice):
+    """
+    VL53L0X 激光测距传感器模拟器：寄存器文件加上初始化与测距流程需要的状态位。
+    写 SYSRANGE_START 启动单次或连续测距，经过 timing_budget_us 后 RESULT_INTERRUPT_STATUS
+    低 3 位置为就绪，RESULT_RANGE_STATUS + 10 处为以毫米为单位的距离，写 SYSTEM_INTERRUPT_CLEAR 清除。
+
+    Attributes:
+        distance_mm (int): 目标距离，可为以毫秒时刻为参数的函数。
+        timing_budget_us (int): 单次测距耗时，默认为 33ms。
+        ranges (int): 完成的测距次数。
+
+    ==========================================
+
+    VL53L0X time-of-flight sensor emulator: a register file plus the status bits used by the
+    init and ranging sequences. Writing SYSRANGE_START starts single or continuous ranging;
+    after timing_budget_us the low 3 bits of RESULT_INTERRUPT_STATUS report ready, the distance
+    in mm is at RESULT_RANGE_STATUS + 10, and SYSTEM_INTERRUPT_CLEAR clears it.
+
+    Attributes:
+        distance_mm (int): Target distance, may be a function of the time in ms.
+        timing_budget_us (int): Duration of one measurement, 33 ms by default.
+        ranges (int): Completed measurements.
+    """
+
+    SYSRANGE_START = 0x00
+    SYSTEM_INTERRUPT_CLEAR = 0x0B
+    RESULT_INTERRUPT_STATUS = 0x13
+    RESULT_RANGE_STATUS = 0x14
+
+    def __init__(self, addr: int = 0x29) -> None:
+        super().__init__(addr)
+        self.distance_mm = 500
+        self.timing_budget_us = 33_000
+        self.ranges = 0
+        self.regs = bytearray(256)
+        # 型号与版本标识
+        self.regs[0xC0] = 0xEE
+        self.regs[0xC1] = 0xAA
+        self.regs[0xC2] = 0x10
+        # SPAD 数量与类型（5 个孔径 SPAD）
+        self.regs[0x92] = 0x85
+        self.regs[0x89] = 0x01
+        self._ptr = 0
+        self._ready_at = None
+        self._continuous = False
+
+    def write(self, data: bytes, stop: bool = True) -> None:
+        if not data:
+            return
+        self._ptr = data[0]
+        for b in data[1:]:
+            reg = self._ptr
+            if reg == VL53L0X.SYSRANGE_START:
+                if b & 0x01:
+                    self._continuous = False
+                    self._ready_at = CLOCK.now + self.timing_budget_us
+                elif b & 0x02:
+                    self._continuous = True
+                    self._ready_at = CLOCK.now + self.timing_budget_us
+                else:
+                    self._continuous = False
+                # 启动位由芯片自动清零
+                b &= ~0x01
+            elif reg == VL53L0X.SYSTEM_INTERRUPT_CLEAR and b & 0x01:
+                self.regs[VL53L0X.RESULT_INTERRUPT_STATUS] = 0
+                if self._continuous:
+                    self._ready_at = CLOCK.now + self.timing_budget_us
+            self.regs[reg] = b
+            self._ptr = (reg + 1) & 0xFF
+
+    def _update(self) -> None:
+        if self._ready_at is None or CLOCK.now < self._ready_at:
+            return
+        self._ready_at = None
+        d = max(0, min(8190, int(_value(self.distance_mm))))
+        r = self.regs
+        r[VL53L0X.RESULT_INTERRUPT_STATUS] = 0x07
+        # 量程状态 11 表示测距有效
+        r[VL53L0X.RESULT_RANGE_STATUS] = 11 << 3
+        r[VL53L0X.RESULT_RANGE_STATUS + 10] = d >> 8
+        r[VL53L0X.RESULT_RANGE_STATUS + 11] = d & 0xFF
+        self.ranges += 1
+
+    def read(self, n: int) -> bytes:
+        self._update()
+        out = bytearray(n)
+        for i in range(n):
+            reg = self._ptr
+            if reg == 0x83:
+                # 初始化流程中轮询 0x83 直到非零
+                out[i] = self.regs[reg] or 0x01
+            else:
+                out[i] = self.regs[reg]
+            self._ptr = (reg + 1) & 0xFF
+        return bytes(out)
+
+
+class SI5351(I2CDevice):
+    """
+    SI5351 时钟发生器模拟器：寄存器自动递增写入，DEVICE_STATUS 报告初始化完成且 PLL 锁定，
+    可按 PLL 与 Multisynth 参数计算各输出频率。
+
+    Attributes:
+        regs (bytearray): 256 字节寄存器。
+        crystal_hz (float): 晶振频率，默认为 25MHz。
+        pll_resets (int): 写 PLL_RESET 寄存器的次数。
+
+    ==========================================
+
+    SI5351 clock generator emulator: auto-increment register writes, DEVICE_STATUS reports init
+    done and PLLs locked, and output frequencies can be computed from the PLL and Multisynth
+    parameters.
+
+    Attributes:
+        regs (bytearray): 256-byte register file.
+        crystal_hz (float): Crystal frequency, 25 MHz by default.
+        pll_resets (int): Writes to the PLL_RESET register.
+    """
+
+    def __init__(self, addr: int = 0x60, crystal_hz: float = 25_000_000) -> None:
+        super().__init__(addr)
+        self.regs = bytearray(256)
+        self.regs[3] = 0xFF
+        self.crystal_hz = crystal_hz
+        self.pll_resets = 0
+        self._ptr = 0
+
+    def write(self, data: bytes, stop: bool = True) -> None:
+        if not data:
+            return
+        self._ptr = data[0]
+        for b in data[1:]:
+            if self._ptr == 177:
+                self.pll_resets += 1
+            if self._ptr != 0:
+                self.regs[self._ptr] = b
+            self._ptr = (self._ptr + 1) & 0xFF
+
+    def read(self, n: int) -> bytes:
+        out = bytearray(n)
+        for i in range(n):
+            # 寄存器 0：SYS_INIT 与 LOL 位为 0 表示已就绪
+            out[i] = 0 if self._ptr == 0 else self.regs[self._ptr]
+            self._ptr = (self._ptr + 1) & 0xFF
+        return bytes(out)
+
+    def _ratio(self, base: int) -> tuple:
+        """
+        解码从 base 开始的 8 字节 P1/P2/P3 参数，返回 (分频比, R 分频指数)。
+
+        ==========================================
+
+        Decode the 8-byte P1/P2/P3 parameters starting at base and return (ratio, R divider exponent).
+        """
+        r = self.regs[base:base + 8]
+        p3 = ((r[5] & 0xF0) << 12) | (r[0] << 8) | r[1]
+        p1 = ((r[2] & 0x03) << 16) | (r[3] << 8) | r[4]
+        p2 = ((r[5] & 0x0F) << 16) | (r[6] << 8) | r[7]
+        rdiv = (r[2] >> 4) & 0x07
+        if p3 == 0:
+            return 0.0, rdiv
+        return (p1 + 512 + p2 / p3) / 128, rdiv
+
+    def output_hz(self, output: int) -> float:
+        """
+        计算输出 output（0~2）的频率，输出被禁用或参数未配置时返回 0。
+
+        ==========================================
+
+        Compute the frequency of output (0-2); returns 0 when disabled or not configured.
+        """
+        if self.regs[3] & (1 << output) or self.regs[16 + output] & 0x80:
+            return 0.0
+        pll_base = 34 if self.regs[16 + output] & 0x20 else 26
+        pll, _ = self._ratio(pll_base)
+        ms, rdiv = self._ratio(42 + 8 * output)
+        if not pll or not ms:
+            return 0.0
+        return self.crystal_hz * pll / ms / (1 << rdiv)
+
+# ======================================== 初始化配置 ==========================================
+
+# 芯片名称 -> (模拟器类, 可选地址, 驱动中的类名)
+CHIPS = {
+    "ssd1306": (SSD1306, (0x3C, 0x3D), ("SSD1306_I2C",)),
+    "pca9685": (PCA9685, (0x40,), ("PCA9685",)),
+    "pcf8574": (PCF8574, tuple(range(0x20, 0x28)), ("PCF8574", "PCF8574IO8", "PCF8574Keys")),
+    "ads1115": (ADS1115, tuple(range(0x48, 0x4C)), ("ADS1115",)),
+    "bh1750": (BH1750, (0x23,), ("BH1750",)),
+    "tcs34725": (TCS34725, (0x29,), ("TCS34725",)),
+    "ds1307": (DS1307, (0x68,), ("DS1307",)),
+    "vl53l0x": (VL53L0X, (0x29,), ("VL53L0X",)),
+    "si5351": (SI5351, (0x60,), ("SI5351_I2C",)),
+}
+
+# ========================================  主程序  ============================================